@@ -5,7 +5,7 @@ Defines the Pydantic models for agent configuration validation.
 Supports YAML-based agent definitions with full type safety.
 """
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import Any, Literal
 from enum import Enum
 
@@ -37,15 +37,30 @@ class MemoryConfig(BaseModel):
     user_scoped: bool = Field(default=True, description="Scope memories per user")
     search_limit: int = Field(default=5, description="Max memories to retrieve", ge=1, le=20)
     auto_save: bool = Field(default=True, description="Automatically save conversations")
+    store: str = Field(
+        default="qdrant",
+        description='Vector store: "qdrant" (Mem0, per agent type) or "local" (embedded, '
+        "per-user shards shared by all agents)",
+    )
 
 
 class MCPServerConfig(BaseModel):
     """Configuration for a single MCP server"""
 
     name: str = Field(description="Server identifier")
-    command: str = Field(description="Command to run (e.g., 'npx')")
-    args: list[str] = Field(description="Command arguments")
+    command: str | None = Field(default=None, description="Command to run (e.g., 'npx')")
+    args: list[str] = Field(default_factory=list, description="Command arguments")
     env: dict[str, str] = Field(default_factory=dict, description="Environment variables")
+    url: str | None = Field(
+        default=None, description="Streamable HTTP endpoint of a running server (instead of command)"
+    )
+
+    @model_validator(mode="after")
+    def validate_transport(self) -> "MCPServerConfig":
+        """Exactly one of command (stdio) or url (HTTP) must be set"""
+        if (self.command is None) == (self.url is None):
+            raise ValueError("MCP server needs either 'command' or 'url'")
+        return self
 
 
 class ToolConfig(BaseModel):
@@ -177,10 +192,13 @@ class AgentConfig(BaseModel):
 
         servers = {}
         for server in self.mcp_servers:
-            servers[server.name] = {
-                "command": server.command,
-                "args": server.args,
-                "env": server.env,
-            }
+            if server.url:
+                servers[server.name] = {"url": server.url}
+            else:
+                servers[server.name] = {
+                    "command": server.command,
+                    "args": server.args,
+                    "env": server.env,
+                }
 
         return {"mcpServers": servers}
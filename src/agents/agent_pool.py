@@ -0,0 +1,236 @@
+"""
+Warm pool of ready UnifiedAgents.
+
+``UnifiedAgent.create`` loads YAML config, connects MCP servers, opens the memory store
+and builds a pydantic-ai Agent, which costs far more than the request it serves. The
+pool keeps built agents keyed by agent type, options and config file version, so a
+request only pays for its LLM turn.
+
+Agents are evicted least-recently-used once the pool is full, rebuilt when they fail
+their health check or sit idle past ``idle_ttl``, and rebuilt automatically when their
+YAML config changes on disk.
+
+Usage:
+    agent = await get_agent_pool().get("task")
+    result = await agent.run("Create a task for code review", user_id="alice")
+
+    await get_agent_pool().warm(["task", "focus"])  # at startup
+    await get_agent_pool().close()  # at shutdown
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from config import get_config_loader
+from src.agents.unified_agent import UnifiedAgent
+
+logger = logging.getLogger(__name__)
+
+PoolKey = tuple[str, bool, bool, str]
+
+
+@dataclass
+class _PooledAgent:
+    """A built agent and when it was last handed out."""
+
+    agent: UnifiedAgent
+    last_used: float
+    uses: int = field(default=0)
+
+
+class UnifiedAgentPool:
+    """
+    Keyed LRU pool of ready UnifiedAgents.
+
+    Concurrent requests for the same key share a single build. Agents are reused across
+    requests, which is safe because ``UnifiedAgent.run`` keeps no per-request state.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 16,
+        idle_ttl: float | None = 900.0,
+        factory: Callable[..., Awaitable[UnifiedAgent]] = UnifiedAgent.create,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            max_size: Maximum number of agents kept warm
+            idle_ttl: Seconds an unused agent is kept before it is rebuilt (None keeps it)
+            factory: Builds an agent; called like ``UnifiedAgent.create``
+            clock: Monotonic time source
+        """
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self._factory = factory
+        self._clock = clock
+        self._agents: OrderedDict[PoolKey, _PooledAgent] = OrderedDict()
+        self._building: dict[PoolKey, asyncio.Task] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def config_version(agent_type: str, config_override: dict[str, Any] | None = None) -> str:
+        """
+        Fingerprint of an agent's YAML file and overrides.
+
+        Uses the file's size and mtime rather than its parsed contents, so checking
+        for a changed config costs a stat() instead of a YAML load.
+        """
+        config_file = get_config_loader().config_dir / f"{agent_type}.yaml"
+        try:
+            stat = config_file.stat()
+            file_version = f"{stat.st_mtime_ns}:{stat.st_size}"
+        except OSError:
+            file_version = "missing"
+        overrides = json.dumps(config_override or {}, sort_keys=True, default=str)
+        return hashlib.sha1(f"{file_version}|{overrides}".encode()).hexdigest()[:16]
+
+    def _key(
+        self,
+        agent_type: str,
+        enable_mcp: bool,
+        enable_memory: bool,
+        config_override: dict[str, Any] | None,
+    ) -> PoolKey:
+        version = self.config_version(agent_type, config_override)
+        return (agent_type, enable_mcp, enable_memory, version)
+
+    def _is_usable(self, pooled: _PooledAgent) -> bool:
+        if self.idle_ttl is not None and self._clock() - pooled.last_used > self.idle_ttl:
+            return False
+        return pooled.agent.is_healthy()
+
+    async def get(
+        self,
+        agent_type: str,
+        enable_mcp: bool = True,
+        enable_memory: bool = True,
+        config_override: dict[str, Any] | None = None,
+    ) -> UnifiedAgent:
+        """
+        Return a ready agent, building it on first use.
+
+        Takes the same arguments as ``UnifiedAgent.create``.
+        """
+        key = self._key(agent_type, enable_mcp, enable_memory, config_override)
+
+        pooled = self._agents.get(key)
+        if pooled is not None:
+            if self._is_usable(pooled):
+                self._agents.move_to_end(key)
+                pooled.last_used = self._clock()
+                pooled.uses += 1
+                self._hits += 1
+                return pooled.agent
+            logger.info(f"Rebuilding stale or unhealthy agent: {agent_type}")
+            await self._discard(key)
+
+        build = self._building.get(key)
+        if build is None:
+            self._misses += 1
+            build = asyncio.ensure_future(
+                self._factory(
+                    agent_type,
+                    enable_mcp=enable_mcp,
+                    enable_memory=enable_memory,
+                    config_override=config_override,
+                )
+            )
+            self._building[key] = build
+            try:
+                agent = await asyncio.shield(build)
+            finally:
+                self._building.pop(key, None)
+            await self._store(key, agent)
+            return agent
+
+        return await asyncio.shield(build)
+
+    async def _store(self, key: PoolKey, agent: UnifiedAgent) -> None:
+        # Drop agents built from an older version of the same config
+        for stale in [k for k in self._agents if k[:3] == key[:3] and k != key]:
+            await self._discard(stale)
+
+        self._agents[key] = _PooledAgent(agent=agent, last_used=self._clock(), uses=1)
+        while len(self._agents) > self.max_size:
+            oldest = next(iter(self._agents))
+            self._evictions += 1
+            await self._discard(oldest)
+
+    async def _discard(self, key: PoolKey) -> None:
+        pooled = self._agents.pop(key, None)
+        if pooled is None:
+            return
+        try:
+            await pooled.agent.cleanup()
+        except Exception as e:
+            logger.warning(f"Error cleaning up pooled agent {key[0]}: {e}")
+
+    async def warm(self, agent_types: Iterable[str], **create_kwargs: Any) -> dict[str, bool]:
+        """
+        Build agents ahead of their first request.
+
+        Returns:
+            Map of agent type to whether it was built successfully
+        """
+        agent_types = list(agent_types)
+        results = await asyncio.gather(
+            *(self.get(agent_type, **create_kwargs) for agent_type in agent_types),
+            return_exceptions=True,
+        )
+        warmed = {}
+        for agent_type, result in zip(agent_types, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to warm agent {agent_type}: {result}")
+            warmed[agent_type] = not isinstance(result, BaseException)
+        return warmed
+
+    async def invalidate(self, agent_type: str | None = None) -> int:
+        """
+        Drop pooled agents of one type (or all), returning how many were dropped.
+        """
+        keys = [k for k in self._agents if agent_type is None or k[0] == agent_type]
+        for key in keys:
+            await self._discard(key)
+        return len(keys)
+
+    async def close(self) -> None:
+        """Clean up every pooled agent."""
+        count = await self.invalidate()
+        logger.info(f"Agent pool closed ({count} agents)")
+
+    def stats(self) -> dict[str, Any]:
+        """Pool size, hit/miss counts and per-type usage."""
+        lookups = self._hits + self._misses
+        return {
+            "size": len(self._agents),
+            "max_size": self.max_size,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "agents": [
+                {"type": key[0], "mcp": key[1], "memory": key[2], "uses": pooled.uses}
+                for key, pooled in self._agents.items()
+            ],
+        }
+
+
+_pool: UnifiedAgentPool | None = None
+
+
+def get_agent_pool() -> UnifiedAgentPool:
+    """Process-wide agent pool."""
+    global _pool
+    if _pool is None:
+        _pool = UnifiedAgentPool()
+    return _pool
@@ -12,6 +12,10 @@ Supports three modes:
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
 from src.agents.base import BaseProxyAgent
 from src.agents.classifier_agent import ClassifierAgent
 from src.agents.decomposer_agent import DecomposerAgent
@@ -103,7 +107,91 @@ class CaptureAgent(BaseProxyAgent):
             - ready_to_save: Boolean (True if no clarifications needed)
             - mode: The capture mode used
         """
-        # Step 0: Retrieve Knowledge Graph context (if enabled)
+        # Step 0-1: Knowledge Graph context + initial analysis
+        task = await self._analyze_input(input_text, user_id, mode, manual_fields)
+
+        # Step 2: Decompose into atomic MicroSteps
+        decomposition_result = await self.decomposer.decompose_task(task, user_id)
+        micro_steps = decomposition_result.get("micro_steps", [])
+
+        # Step 3: Classify each MicroStep (DIGITAL vs HUMAN)
+        for micro_step in micro_steps:
+            self.classifier.classify_micro_step(micro_step)
+
+        # Step 4: Determine if clarifications are needed
+        clarifications, ready_to_save = self._resolve_clarifications(micro_steps, mode)
+
+        return {
+            "task": task,
+            "micro_steps": micro_steps,
+            "clarifications": clarifications,
+            "ready_to_save": ready_to_save,
+            "mode": mode,
+        }
+
+    async def capture_stream(
+        self,
+        input_text: str,
+        user_id: str,
+        mode: CaptureMode = CaptureMode.AUTO,
+        manual_fields: dict | None = None,
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """
+        Streaming variant of capture() for low time-to-first-step clients.
+
+        Yields ``(event, payload)`` tuples as the pipeline progresses:
+        - ``("task", Task)`` as soon as the input has been analyzed
+        - ``("micro_step", MicroStep)`` for each classified step as it streams
+          from the LLM (CHAMPS tags may still be empty at this point)
+        - ``("micro_step_tags", MicroStep)`` when a step's CHAMPS tags arrive
+        - ``("complete", dict)`` with the same keys capture() returns
+
+        CHAMPS tagging runs concurrently in the background so it never
+        delays the next micro-step.
+        """
+        task = await self._analyze_input(input_text, user_id, mode, manual_fields)
+        yield "task", task
+
+        micro_steps: list[MicroStep] = []
+        tag_jobs: list[asyncio.Task] = []
+
+        try:
+            async for micro_step in self.decomposer.decompose_task_stream(task, user_id):
+                self.classifier.classify_micro_step(micro_step)
+                micro_steps.append(micro_step)
+                if not micro_step.tags:
+                    tag_jobs.append(asyncio.create_task(self.decomposer.tag_micro_step(micro_step)))
+                yield "micro_step", micro_step
+
+            for job in asyncio.as_completed(tag_jobs):
+                yield "micro_step_tags", await job
+        finally:
+            # Client went away mid-stream - don't leave LLM calls running
+            for job in tag_jobs:
+                job.cancel()
+
+        clarifications, ready_to_save = self._resolve_clarifications(micro_steps, mode)
+
+        yield (
+            "complete",
+            {
+                "task": task,
+                "micro_steps": micro_steps,
+                "clarifications": clarifications,
+                "ready_to_save": ready_to_save,
+                "mode": mode,
+            },
+        )
+
+    async def _analyze_input(
+        self,
+        input_text: str,
+        user_id: str,
+        mode: CaptureMode,
+        manual_fields: dict | None,
+    ) -> Task:
+        """Build the root Task from raw input (KG context + QuickCaptureService)."""
+        # Retrieve Knowledge Graph context (if enabled)
         kg_context = None
         if self.settings.kg_enabled and self.graph_service and mode != CaptureMode.MANUAL:
             try:
@@ -116,31 +204,25 @@ class CaptureAgent(BaseProxyAgent):
 
                 logging.getLogger(__name__).warning(f"KG context retrieval failed: {e}")
 
-        # Step 1: Initial analysis with QuickCaptureService
         if mode == CaptureMode.MANUAL:
             # Skip AI analysis, use manual fields
-            task = self._create_task_from_manual_fields(input_text, manual_fields)
-        else:
-            # Use QuickCaptureService for intelligent analysis (with KG context)
-            analysis = await self.quick_capture_service.analyze_capture(
-                input_text, user_id, voice_input=False, kg_context=kg_context
-            )
-            task = self._create_task_from_analysis(analysis)
+            return self._create_task_from_manual_fields(input_text, manual_fields)
 
-        # Step 2: Decompose into atomic MicroSteps
-        decomposition_result = await self.decomposer.decompose_task(task, user_id)
-        micro_steps = decomposition_result.get("micro_steps", [])
+        # Use QuickCaptureService for intelligent analysis (with KG context)
+        analysis = await self.quick_capture_service.analyze_capture(
+            input_text, user_id, voice_input=False, kg_context=kg_context
+        )
+        return self._create_task_from_analysis(analysis)
 
-        # Step 3: Classify each MicroStep (DIGITAL vs HUMAN)
+    def _resolve_clarifications(
+        self, micro_steps: list[MicroStep], mode: CaptureMode
+    ) -> tuple[list[ClarificationNeed], bool]:
+        """Collect clarification needs and decide readiness for the given mode."""
         clarifications = []
         for micro_step in micro_steps:
-            self.classifier.classify_micro_step(micro_step)
-
-            # Collect clarifications
             if micro_step.clarification_needs:
                 clarifications.extend(micro_step.clarification_needs)
 
-        # Step 4: Determine if clarifications are needed
         ready_to_save = True
 
         if mode == CaptureMode.CLARIFY:
@@ -148,7 +230,6 @@ class CaptureAgent(BaseProxyAgent):
             ready_to_save = len(clarifications) == 0
         elif mode == CaptureMode.AUTO:
             # In AUTO mode, proceed even with missing info (make best guesses)
-            ready_to_save = True
             # Remove clarifications since we're not asking
             for micro_step in micro_steps:
                 micro_step.clarification_needs = []
@@ -156,13 +237,7 @@ class CaptureAgent(BaseProxyAgent):
 
         # MANUAL mode always ready (user provided everything)
 
-        return {
-            "task": task,
-            "micro_steps": micro_steps,
-            "clarifications": self._deduplicate_clarifications(clarifications),
-            "ready_to_save": ready_to_save,
-            "mode": mode,
-        }
+        return self._deduplicate_clarifications(clarifications), ready_to_save
 
     async def apply_clarifications(
         self, micro_steps: list[MicroStep], answers: dict[str, str]
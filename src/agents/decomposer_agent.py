@@ -13,13 +13,15 @@ from __future__ import annotations
 import json
 import logging
 import os
+from collections.abc import AsyncIterator
 from typing import Any
 
 from src.agents.base import BaseProxyAgent
 from src.agents.split_proxy_agent import SplitProxyAgent
 from src.core.models import AgentRequest
-from src.core.task_models import DecompositionState, MicroStep, Task, TaskScope
+from src.core.task_models import DecompositionState, LeafType, MicroStep, Task, TaskScope
 from src.database.enhanced_adapter import EnhancedDatabaseAdapter
+from src.services.request_metrics import track_llm_call
 
 # AI client availability flags (not currently used but reserved for future AI integration)
 OPENAI_AVAILABLE = False
@@ -189,36 +191,12 @@ class DecomposerAgent(BaseProxyAgent):
                 micro_step = step_data  # Already a MicroStep object
                 micro_step.level = depth  # Ensure level is set
 
-            # Classify leaf type EARLY (before checking if atomic)
-            from src.core.task_models import LeafType
-
-            # Always classify - overwrite UNKNOWN or missing values
-            if (
-                not micro_step.leaf_type
-                or micro_step.leaf_type == LeafType.UNKNOWN
-                or micro_step.leaf_type == LeafType.UNKNOWN.value
-                or micro_step.leaf_type == "unknown"
-            ):
-                micro_step.leaf_type = self._classify_leaf_type(micro_step.description)
+            self._classify_micro_step(micro_step)
 
             # Generate CHAMPS tags for the micro-step
             await self._generate_champs_tags_for_micro_step(micro_step)
 
-            # Check if this micro-step needs further splitting
-            # _is_atomic() now uses leaf_type-aware logic:
-            # - DIGITAL: can be any duration
-            # - HUMAN: max 5 minutes
-            if self._is_atomic(micro_step):
-                # Atomic step - can't be decomposed further
-                micro_step.is_leaf = True
-                micro_step.decomposition_state = DecompositionState.ATOMIC
-                micro_steps.append(micro_step)
-            else:
-                # Complex step - mark as decomposable but don't decompose now (progressive disclosure)
-                # User can expand this later on-demand
-                micro_step.is_leaf = False
-                micro_step.decomposition_state = DecompositionState.STUB
-                micro_steps.append(micro_step)
+            micro_steps.append(micro_step)
 
         # Re-number steps sequentially
         for i, step in enumerate(micro_steps, 1):
@@ -232,6 +210,69 @@ class DecomposerAgent(BaseProxyAgent):
             "message": f"Task decomposed into {len(micro_steps)} atomic micro-steps",
         }
 
+    async def decompose_task_stream(self, task: Task, user_id: str) -> AsyncIterator[MicroStep]:
+        """
+        Streaming variant of decompose_task() for a top-level task.
+
+        MULTI-scope tasks stream their micro-steps straight from the LLM, each
+        one classified as soon as it is parsed. CHAMPS tags are NOT generated
+        here - that is one LLM round trip per step, so callers run
+        tag_micro_step() in the background after forwarding the step.
+        SIMPLE and PROJECT scopes have nothing to stream and fall back to
+        decompose_task(), yielding its (already tagged) steps in order.
+
+        Args:
+            task: The task to decompose
+            user_id: User ID for context
+
+        Yields:
+            MicroStep instances in step order
+        """
+        scope = self.split_agent._determine_task_scope(task)
+
+        if scope != TaskScope.MULTI:
+            result = await self.decompose_task(task, user_id)
+            for micro_step in result.get("micro_steps", []):
+                yield micro_step
+            return
+
+        async for micro_step in self.split_agent.stream_micro_steps(task, user_id):
+            micro_step.level = 0
+            self._classify_micro_step(micro_step)
+            yield micro_step
+
+    async def tag_micro_step(self, micro_step: MicroStep) -> MicroStep:
+        """Attach CHAMPS tags to a streamed micro-step and return it."""
+        await self._generate_champs_tags_for_micro_step(micro_step)
+        return micro_step
+
+    def _classify_micro_step(self, micro_step: MicroStep) -> None:
+        """
+        Classify leaf type and mark the micro-step atomic or decomposable.
+
+        _is_atomic() uses leaf_type-aware logic:
+        - DIGITAL: can be any duration
+        - HUMAN: max 5 minutes
+        """
+        # Always classify - overwrite UNKNOWN or missing values
+        if (
+            not micro_step.leaf_type
+            or micro_step.leaf_type == LeafType.UNKNOWN
+            or micro_step.leaf_type == LeafType.UNKNOWN.value
+            or micro_step.leaf_type == "unknown"
+        ):
+            micro_step.leaf_type = self._classify_leaf_type(micro_step.description)
+
+        if self._is_atomic(micro_step):
+            # Atomic step - can't be decomposed further
+            micro_step.is_leaf = True
+            micro_step.decomposition_state = DecompositionState.ATOMIC
+        else:
+            # Complex step - mark as decomposable but don't decompose now (progressive disclosure)
+            # User can expand this later on-demand
+            micro_step.is_leaf = False
+            micro_step.decomposition_state = DecompositionState.STUB
+
     async def _generate_champs_tags_for_micro_step(self, micro_step: MicroStep) -> None:
         """
         Generate CHAMPS-based tags for a micro-step using LLM
@@ -417,12 +458,13 @@ Focus on LOGICAL PHASES of the project."""
     async def _generate_subtasks_with_openai(self, prompt: str, task: Task) -> list[dict]:
         """Generate subtasks using OpenAI."""
         try:
-            response = await self.split_agent.openai_client.chat.completions.create(
-                model=os.getenv("LLM_MODEL", "gpt-4o-mini"),
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                response_format={"type": "json_object"},
-            )
+            async with track_llm_call():
+                response = await self.split_agent.openai_client.chat.completions.create(
+                    model=os.getenv("LLM_MODEL", "gpt-4o-mini"),
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=0.7,
+                    response_format={"type": "json_object"},
+                )
 
             content = response.choices[0].message.content
             result = json.loads(content)
@@ -439,12 +481,13 @@ Focus on LOGICAL PHASES of the project."""
     async def _generate_subtasks_with_anthropic(self, prompt: str, task: Task) -> list[dict]:
         """Generate subtasks using Anthropic Claude."""
         try:
-            response = await self.split_agent.anthropic_client.messages.create(
-                model=os.getenv("LLM_MODEL", "claude-3-5-sonnet-20241022"),
-                max_tokens=1024,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-            )
+            async with track_llm_call():
+                response = await self.split_agent.anthropic_client.messages.create(
+                    model=os.getenv("LLM_MODEL", "claude-3-5-sonnet-20241022"),
+                    max_tokens=1024,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=0.7,
+                )
 
             content = response.content[0].text
 
@@ -590,18 +633,19 @@ Focus on LOGICAL SEMANTIC GROUPING, not just time-based splits."""
         children_data = []
         try:
             if self.split_agent.openai_client:
-                response = await self.split_agent.openai_client.chat.completions.create(
-                    model=os.getenv("LLM_MODEL", "gpt-4o-mini"),
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a task decomposition assistant. Always return valid JSON.",
-                        },
-                        {"role": "user", "content": prompt},
-                    ],
-                    response_format={"type": "json_object"},
-                    temperature=0.7,
-                )
+                async with track_llm_call():
+                    response = await self.split_agent.openai_client.chat.completions.create(
+                        model=os.getenv("LLM_MODEL", "gpt-4o-mini"),
+                        messages=[
+                            {
+                                "role": "system",
+                                "content": "You are a task decomposition assistant. Always return valid JSON.",
+                            },
+                            {"role": "user", "content": prompt},
+                        ],
+                        response_format={"type": "json_object"},
+                        temperature=0.7,
+                    )
                 result = json.loads(response.choices[0].message.content)
                 children_data = result.get("items", result.get("children", []))
 
@@ -17,21 +17,23 @@ from datetime import datetime
 from typing import Any
 
 from src.agents.base import BaseProxyAgent
+from src.core.lazy_imports import lazy_import, module_available
 from src.core.models import AgentRequest, Message
 from src.repositories.enhanced_repositories_extensions import (
     EnhancedEnergyRepository,
     EnhancedMetricsRepository,
+    combine_buckets,
 )
 
 logger = logging.getLogger(__name__)
 
-# AI Integration (with fallbacks)
-try:
-    import openai
+# Readings at an hour needed before the user's profile fully replaces the default curve
+CIRCADIAN_FULL_CONFIDENCE_READINGS = 10
 
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+# AI Integration (with fallbacks)
+openai = lazy_import("openai")
+OPENAI_AVAILABLE = module_available("openai")
+if not OPENAI_AVAILABLE:
     logging.warning("OpenAI not available for Energy agent, using heuristics")
 
 
@@ -829,7 +831,31 @@ Example: {{"direction": "declining", "predicted_level": 6.2, "confidence": 0.8}}
             profile["readings"] = profile["readings"][-30:]
 
     async def _get_circadian_adjustment(self, user_id: str, hour: int) -> float:
-        """Get circadian rhythm adjustment for specific hour"""
+        """
+        Get circadian rhythm adjustment for specific hour.
+
+        Blends the default curve with the user's own profile: how far their
+        average energy at this hour sits from their overall average. The
+        profile's weight grows with the number of readings at this hour.
+        """
+        default = self._default_circadian_adjustment(hour)
+        try:
+            profile = self.energy_repo.get_hourly_energy_profile(user_id)
+            overall = combine_buckets(profile)
+            at_hour = profile[hour]
+        except Exception as e:
+            logger.debug(f"Circadian profile unavailable for {user_id}: {e}")
+            return default
+
+        if not overall or not at_hour:
+            return default
+
+        personal = max(-3.0, min(3.0, at_hour["mean"] - overall["mean"]))
+        weight = min(at_hour["n"] / CIRCADIAN_FULL_CONFIDENCE_READINGS, 1.0)
+        return round(weight * personal + (1 - weight) * default, 2)
+
+    def _default_circadian_adjustment(self, hour: int) -> float:
+        """Default circadian adjustment for users without a profile"""
         # Default circadian pattern
         circadian_curve = {
             0: -2.0,
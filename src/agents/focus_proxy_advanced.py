@@ -17,6 +17,7 @@ from datetime import datetime
 from typing import Any
 
 from src.agents.base import BaseProxyAgent
+from src.core.lazy_imports import lazy_import, module_available
 from src.core.models import AgentRequest, Message
 from src.repositories.enhanced_repositories import EnhancedTaskRepository
 from src.repositories.enhanced_repositories_extensions import EnhancedFocusSessionRepository
@@ -24,12 +25,9 @@ from src.repositories.enhanced_repositories_extensions import EnhancedFocusSessi
 logger = logging.getLogger(__name__)
 
 # AI Integration (with fallbacks)
-try:
-    import openai
-
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+openai = lazy_import("openai")
+OPENAI_AVAILABLE = module_available("openai")
+if not OPENAI_AVAILABLE:
     logging.warning("OpenAI not available for Focus agent, using heuristics")
 
 
@@ -14,22 +14,29 @@ import logging
 import os
 import random
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
 from src.agents.base import BaseProxyAgent
+from src.core.lazy_imports import lazy_import, module_available
 from src.core.models import AgentRequest
+from src.core.progression import levels_for_xp
 from src.repositories.enhanced_repositories import AchievementRepository, UserAchievementRepository
+from src.services.achievement_engine import METRIC_ALIASES, compile_criteria, index_rules
+from src.services.leaderboard_service import (
+    BOARDS,
+    WINDOWED_BOARDS,
+    WINDOWS,
+    LeaderboardService,
+    get_leaderboard_service,
+)
 
 logger = logging.getLogger(__name__)
 
 # AI Integration (with fallbacks)
-try:
-    import openai
-
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+openai = lazy_import("openai")
+OPENAI_AVAILABLE = module_available("openai")
+if not OPENAI_AVAILABLE:
     logging.warning("OpenAI not available for Gamification agent, using heuristics")
 
 
@@ -74,7 +81,7 @@ class MotivationStrategy:
 class AdvancedGamificationAgent(BaseProxyAgent):
     """Advanced gamification and achievement management agent"""
 
-    def __init__(self, db, achievement_repo=None, user_achievement_repo=None):
+    def __init__(self, db, achievement_repo=None, user_achievement_repo=None, leaderboard=None):
         super().__init__("advanced_gamification", db)
 
         # Repository dependencies
@@ -100,11 +107,18 @@ class AdvancedGamificationAgent(BaseProxyAgent):
 
         # Gamification configuration
         self.achievement_cache = {}
-        self.leaderboard_cache = {}
+        self._leaderboard = leaderboard
         self.motivation_strategies = self._init_motivation_strategies()
 
         # Achievement definitions
         self.achievement_definitions = self._init_achievement_definitions()
+        self._achievement_rules_by_metric = index_rules(
+            [
+                compile_criteria(achievement_id, definition["criteria"])
+                for achievement_id, definition in self.achievement_definitions.items()
+            ],
+            key=lambda metric: metric,
+        )
 
         # Reward tiers
         self.reward_tiers = {
@@ -124,6 +138,13 @@ class AdvancedGamificationAgent(BaseProxyAgent):
             },
         }
 
+    @property
+    def leaderboard(self) -> LeaderboardService:
+        """Leaderboard service (the shared one unless injected)"""
+        if self._leaderboard is None:
+            self._leaderboard = get_leaderboard_service()
+        return self._leaderboard
+
     def _init_achievement_definitions(self) -> dict[str, dict[str, Any]]:
         """Initialize achievement definitions and criteria"""
         return {
@@ -281,40 +302,22 @@ class AdvancedGamificationAgent(BaseProxyAgent):
         }
 
     async def _detect_achievement_triggers(self, user_activity: dict[str, Any]) -> dict[str, Any]:
-        """Detect which achievements should be triggered"""
+        """Detect which achievements should be triggered by the reported activity"""
         triggered = []
         progress_updates = []
 
-        user_activity.get("user_id", "unknown")
+        # Only achievements depending on a reported metric can change
+        values = {METRIC_ALIASES.get(name, name): value for name, value in user_activity.items()}
+        affected = {
+            rule.achievement_id: rule
+            for metric in values
+            for rule in self._achievement_rules_by_metric.get(metric, [])
+        }
 
-        for achievement_id, definition in self.achievement_definitions.items():
-            criteria = definition["criteria"]
-            is_triggered = True
-            progress_info = {}
+        for achievement_id, rule in affected.items():
+            definition = self.achievement_definitions[achievement_id]
 
-            # Check each criterion
-            for criterion, required_value in criteria.items():
-                actual_value = user_activity.get(criterion, 0)
-
-                if isinstance(required_value, (int, float)):
-                    if actual_value >= required_value:
-                        progress_info[criterion] = {
-                            "achieved": True,
-                            "progress": actual_value,
-                            "target": required_value,
-                        }
-                    else:
-                        is_triggered = False
-                        progress_info[criterion] = {
-                            "achieved": False,
-                            "progress": actual_value,
-                            "target": required_value,
-                            "completion_percentage": round(
-                                (actual_value / required_value) * 100, 2
-                            ),
-                        }
-
-            if is_triggered:
+            if rule.is_met(values):
                 triggered.append(
                     {
                         "achievement_id": achievement_id,
@@ -326,23 +329,29 @@ class AdvancedGamificationAgent(BaseProxyAgent):
                         "unlock_timestamp": datetime.now().isoformat(),
                     }
                 )
-            else:
-                # Track progress towards achievement
-                overall_progress = sum(
-                    info.get("completion_percentage", 0) for info in progress_info.values()
-                ) / len(progress_info)
+                continue
 
-                if overall_progress > 10:  # Only show if some meaningful progress
-                    progress_updates.append(
-                        {
-                            "achievement_id": achievement_id,
-                            "name": definition["name"],
-                            "progress": round(overall_progress, 1),
-                            "target": 100,
-                            "completion_percentage": round(overall_progress, 2),
-                            "next_milestone": self._calculate_next_milestone(progress_info),
-                        }
-                    )
+            # Track progress towards achievement
+            progress_info = {}
+            for metric, actual_value, required_value in rule.evaluate(values):
+                progress_info[metric] = {
+                    "achieved": actual_value >= required_value,
+                    "progress": actual_value,
+                    "target": required_value,
+                }
+            overall_progress = rule.progress(values)
+
+            if overall_progress > 10:  # Only show if some meaningful progress
+                progress_updates.append(
+                    {
+                        "achievement_id": achievement_id,
+                        "name": definition["name"],
+                        "progress": round(overall_progress, 1),
+                        "target": 100,
+                        "completion_percentage": round(overall_progress, 2),
+                        "next_milestone": self._calculate_next_milestone(progress_info),
+                    }
+                )
 
         return {
             "triggered_achievements": triggered,
@@ -381,51 +390,85 @@ class AdvancedGamificationAgent(BaseProxyAgent):
         self, leaderboard_type: str, user_context: dict[str, Any]
     ) -> dict[str, Any]:
         """Generate leaderboard data with rankings and statistics"""
-        # Mock leaderboard generation (would integrate with real user data)
-        user_id = user_context.get("user_id", "user123")
-        user_level = user_context.get("level", 8)
-
-        # Generate mock leaderboard data
-        top_entries = []
-        for i in range(1, 11):
-            score = 3000 - (i * 200) + random.randint(-50, 50)
-            level = max(1, 15 - i + random.randint(-2, 2))
-            top_entries.append(
-                {
-                    "rank": i,
-                    "username": f"ProductivityUser{i:02d}",
-                    "score": score,
-                    "level": level,
-                    "badge_count": random.randint(3, 15),
-                    "streak_days": random.randint(1, 45),
-                }
-            )
-
-        # User's position
-        user_rank = random.randint(12, 50)
-        user_score = max(100, 3000 - (user_rank * 40))
-        total_participants = random.randint(80, 200)
+        user_id = user_context.get("user_id", "")
+        board, window = self._parse_leaderboard_type(leaderboard_type)
+
+        top_entries = self.leaderboard.top(board, window, limit=10)
+        position = self.leaderboard.get_position(user_id, board, window)
+        nearby = self.leaderboard.around(user_id, board, window) if position else []
+        category_leaders = {
+            category: leaders[0]
+            for category in BOARDS
+            if (leaders := self.leaderboard.top(category, "all_time", limit=1))
+        }
 
-        percentile = ((total_participants - user_rank) / total_participants) * 100
+        entries = [*top_entries, *nearby, *category_leaders.values()]
+        usernames = self._get_usernames({entry["user_id"] for entry in entries} | {user_id})
+        for entry in entries:
+            self._enrich_leaderboard_entry(entry, usernames)
+        # Levels come from all-time XP, whatever the board and window
+        all_time_xp = [self.leaderboard.get_score(entry["user_id"]) for entry in entries]
+        for entry, level in zip(entries, levels_for_xp(all_time_xp), strict=True):
+            entry["level"] = int(level)
+
+        user_entry = dict(position or {"rank": 0, "score": 0})
+        user_entry["user_id"] = user_id
+        self._enrich_leaderboard_entry(user_entry, usernames)
+        user_entry["level"] = user_context.get("level", 1)
+        user_entry.pop("total_participants", None)
+        user_entry.pop("percentile", None)
+        user_entry.pop("next_rank_gap", None)
 
         return {
             "leaderboard_type": leaderboard_type,
-            "time_period": "2025-10-11_to_2025-10-17",
-            "user_rank": user_rank,
-            "total_participants": total_participants,
-            "top_10": top_entries[:3],  # Return top 3 for the test
-            "user_entry": {
-                "rank": user_rank,
-                "username": user_id,
-                "score": user_score,
-                "level": user_level,
-                "badge_count": random.randint(2, 8),
-                "streak_days": random.randint(1, 20),
-            },
-            "percentile": round(percentile, 1),
-            "next_rank_gap": random.randint(10, 100),
+            "time_period": self._leaderboard_time_period(window),
+            "user_rank": position["rank"] if position else 0,
+            "total_participants": self.leaderboard.count(board, window),
+            "top_10": top_entries,
+            "user_entry": user_entry,
+            "nearby": nearby,
+            "percentile": position["percentile"] if position else 0.0,
+            "next_rank_gap": position["next_rank_gap"] if position else 0,
+            "category_leaders": category_leaders,
         }
 
+    def _parse_leaderboard_type(self, leaderboard_type: str) -> tuple[str, str]:
+        """Map a leaderboard type such as weekly_xp or streak to (board, window)"""
+        board = next((b for b in BOARDS if leaderboard_type.endswith(b)), "xp")
+        if board not in WINDOWED_BOARDS:
+            return board, "all_time"
+        window = next((w for w in WINDOWS if leaderboard_type.startswith(w)), "all_time")
+        return board, window
+
+    def _leaderboard_time_period(self, window: str) -> str:
+        """Human-readable span of the current window"""
+        today = datetime.now(UTC).date()
+        if window == "daily":
+            return today.isoformat()
+        if window == "weekly":
+            monday = today - timedelta(days=today.weekday())
+            return f"{monday.isoformat()}_to_{(monday + timedelta(days=6)).isoformat()}"
+        return "all_time"
+
+    def _get_usernames(self, user_ids: set[str]) -> dict[str, str]:
+        """Look up usernames for leaderboard entries"""
+        user_ids = {uid for uid in user_ids if uid}
+        if not user_ids:
+            return {}
+        placeholders = ", ".join("?" for _ in user_ids)
+        rows = self.leaderboard.db.execute_read(
+            f"SELECT user_id, username FROM users WHERE user_id IN ({placeholders})",
+            tuple(user_ids),
+        )
+        return {row["user_id"]: row["username"] for row in rows}
+
+    def _enrich_leaderboard_entry(self, entry: dict[str, Any], usernames: dict[str, str]) -> None:
+        """Add username, badge count and streak to a leaderboard entry"""
+        user_id = entry["user_id"]
+        entry["username"] = usernames.get(user_id, user_id)
+        entry["badge_count"] = self.leaderboard.get_score(user_id, "badges")
+        entry["streak_days"] = self.leaderboard.get_score(user_id, "streak")
+
     async def generate_motivation_strategy(self, user_profile: dict[str, Any]) -> dict[str, Any]:
         """Generate personalized motivation strategy"""
         strategy = await self._generate_motivation_strategy(user_profile)
@@ -676,8 +719,11 @@ Example: {{"motivation_type": "re_engagement", "primary_strategy": "achievable_g
         return {"message": "Achievement system ready for integration"}
 
     async def _handle_leaderboard_request(self, request: AgentRequest) -> dict[str, Any]:
-        """Handle leaderboard requests"""
-        return {"message": "Leaderboard system ready for integration"}
+        """Handle leaderboard requests (e.g. weekly XP, daily XP, streak or badge boards)"""
+        query = request.query.lower()
+        window = next((w for w in WINDOWS if w.replace("_", " ") in query), "weekly")
+        board = next((b for b in BOARDS if b.rstrip("s") in query), "xp")
+        return await self.generate_leaderboard(f"{window}_{board}", {"user_id": request.user_id})
 
     async def _handle_motivation_request(self, request: AgentRequest) -> dict[str, Any]:
         """Handle motivation strategy requests"""
@@ -13,11 +13,12 @@ This agent provides sophisticated progress tracking including:
 import logging
 import math
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any
 
 from src.agents.base import BaseProxyAgent
 from src.core.models import AgentRequest
+from src.core.progression import XP_LEVELS
 from src.repositories.enhanced_repositories import AchievementRepository
 from src.repositories.enhanced_repositories_extensions import EnhancedMetricsRepository
 
@@ -81,12 +82,6 @@ class AdvancedProgressAgent(BaseProxyAgent):
             "efficiency": {"slow": 0.8, "normal": 1.0, "fast": 1.2, "exceptional": 1.5},
         }
 
-        # Level thresholds (exponential growth)
-        self.level_thresholds = [0, 100, 250, 450, 700, 1000, 1400, 1900, 2500, 3200, 4000]
-        for _i in range(11, 101):  # Levels 11-100
-            next_threshold = int(self.level_thresholds[-1] * 1.25)
-            self.level_thresholds.append(next_threshold)
-
     async def process_request(self, request: AgentRequest) -> dict[str, Any]:
         """Process progress tracking requests"""
         try:
@@ -343,29 +338,14 @@ class AdvancedProgressAgent(BaseProxyAgent):
 
     async def _calculate_level_progression(self, user_id: str, current_xp: int) -> LevelProgression:
         """Calculate detailed level progression"""
-        # Find current level
-        current_level = 1
-        for level, threshold in enumerate(self.level_thresholds[1:], 1):
-            if current_xp < threshold:
-                current_level = level
-                break
-        else:
-            current_level = len(self.level_thresholds)
-
-        # Calculate progression details
-        current_level_xp = self.level_thresholds[current_level - 1] if current_level > 1 else 0
-        next_level_xp = (
-            self.level_thresholds[current_level]
-            if current_level < len(self.level_thresholds)
-            else float("inf")
-        )
-
-        xp_needed = max(0, next_level_xp - current_xp)
-        progress_in_level = current_xp - current_level_xp
-        level_xp_range = next_level_xp - current_level_xp
-        progress_percentage = (
-            (progress_in_level / level_xp_range) * 100 if level_xp_range > 0 else 100
-        )
+        # Shared level curve, so levels match user_progress and leaderboards
+        progress = XP_LEVELS.progress(current_xp)
+        current_level = progress["level"]
+        next_level_xp = progress["next_level_xp"]
+        if next_level_xp is None:
+            next_level_xp = float("inf")
+        xp_needed = progress["xp_needed"]
+        progress_percentage = progress["progress_percentage"]
 
         # Determine level benefits
         level_benefits = self._get_level_benefits(current_level)
@@ -419,13 +399,11 @@ class AdvancedProgressAgent(BaseProxyAgent):
         """Estimate time to reach next level based on user patterns"""
         # Get recent XP earning rate
         try:
-            recent_metrics = self.metrics_repo.get_user_metrics(user_id, "daily", 7)
+            recent_metrics = self._get_daily_metrics(user_id, 7)
             if not recent_metrics:
                 return "Unable to estimate"
 
-            daily_xp_average = (
-                sum(m.productivity_score or 0 for m in recent_metrics) / len(recent_metrics) * 20
-            )
+            daily_xp_average = sum(self._daily_xp(m) for m in recent_metrics) / len(recent_metrics)
             if daily_xp_average <= 0:
                 return "Complete tasks to estimate"
 
@@ -467,16 +445,16 @@ class AdvancedProgressAgent(BaseProxyAgent):
             # Parse time period
             days = self._parse_time_period(time_period)
 
-            # Get user metrics
-            metrics = self.metrics_repo.get_user_metrics(user_id, "daily", days)
+            # Get materialized daily metrics, oldest first
+            metrics = self._get_daily_metrics(user_id, days)
 
             if not metrics:
                 return self._get_default_visualization_data()
 
-            # Calculate trends
-            daily_xp = [float(m.productivity_score or 0) * 20 for m in metrics]
+            # Calculate trends (productivity on a 0-10 scale)
+            daily_xp = [self._daily_xp(m) for m in metrics]
             completion_rates = [min(1.0, (m.tasks_completed or 0) / 5.0) for m in metrics]
-            productivity_scores = [float(m.productivity_score or 5.0) for m in metrics]
+            productivity_scores = [self._score_out_of_ten(m) for m in metrics]
 
             # Identify milestones
             milestones = []
@@ -512,6 +490,23 @@ class AdvancedProgressAgent(BaseProxyAgent):
             logger.error(f"Error generating visualization data: {e}")
             return self._get_default_visualization_data()
 
+    def _get_daily_metrics(self, user_id: str, days: int) -> list:
+        """Get the user's daily productivity metrics for the last days, oldest first"""
+        today = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+        return self.metrics_repo.get_metrics_range(
+            user_id, today - timedelta(days=days - 1), today, "daily"
+        )
+
+    def _score_out_of_ten(self, metrics) -> float:
+        """Daily productivity score (stored as 0-100) on a 0-10 scale"""
+        return round(float(metrics.average_productivity_score or 0) / 10, 2)
+
+    def _daily_xp(self, metrics) -> float:
+        """XP earned on a day, estimated from productivity if none was recorded"""
+        if metrics.xp_earned:
+            return float(metrics.xp_earned)
+        return self._score_out_of_ten(metrics) * 20
+
     def _parse_time_period(self, time_period: str) -> int:
         """Parse time period string to days"""
         if "7" in time_period or "week" in time_period:
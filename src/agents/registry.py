@@ -2,34 +2,59 @@
 Agent Registry - Manages all proxy agents
 """
 
-from src.agents.base import BaseProxyAgent
-from src.agents.capture_agent import CaptureAgent
-from src.agents.classifier_agent import ClassifierAgent
-from src.agents.decomposer_agent import DecomposerAgent
-from src.agents.focus_agent import FocusAgent
-from src.agents.task_agent import TaskAgent
+from __future__ import annotations
+
+import importlib
+import threading
+from typing import TYPE_CHECKING
+
 from src.core.models import AgentRequest, AgentResponse
 from src.database.enhanced_adapter import EnhancedDatabaseAdapter, get_enhanced_database
 
+if TYPE_CHECKING:
+    from src.agents.base import BaseProxyAgent
+
+# Agent type -> "module:ClassName". Modules are imported and agents constructed on
+# first use, so API startup does not pay for agents (and their SDKs) it never serves.
+AGENT_SPECS: dict[str, str] = {
+    "task": "src.agents.task_agent:TaskAgent",
+    "focus": "src.agents.focus_agent:FocusAgent",
+    # Capture Mode agents (Epic: Capture)
+    "capture": "src.agents.capture_agent:CaptureAgent",
+    "decomposer": "src.agents.decomposer_agent:DecomposerAgent",
+    "classifier": "src.agents.classifier_agent:ClassifierAgent",
+    # Energy and Progress agents to be added later
+}
+
 
 class AgentRegistry:
     """Simple registry for managing proxy agents"""
 
     def __init__(self, db: EnhancedDatabaseAdapter = None):
-        self.db = db or get_enhanced_database()
-        self.agents: dict[str, BaseProxyAgent] = {
-            "task": TaskAgent(self.db),
-            "focus": FocusAgent(self.db),
-            # Capture Mode agents (Epic: Capture)
-            "capture": CaptureAgent(self.db),
-            "decomposer": DecomposerAgent(self.db),
-            "classifier": ClassifierAgent(self.db),
-            # Energy and Progress agents to be added later
-        }
+        self._db = db
+        self.specs = dict(AGENT_SPECS)
+        self.agents: dict[str, BaseProxyAgent] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def db(self) -> EnhancedDatabaseAdapter:
+        if self._db is None:
+            self._db = get_enhanced_database()
+        return self._db
 
     def get_agent(self, agent_type: str) -> BaseProxyAgent | None:
-        """Get agent by type"""
-        return self.agents.get(agent_type)
+        """Get agent by type, constructing it on first request"""
+        agent = self.agents.get(agent_type)
+        if agent is not None or agent_type not in self.specs:
+            return agent
+
+        with self._lock:
+            agent = self.agents.get(agent_type)
+            if agent is None:
+                module_name, class_name = self.specs[agent_type].split(":")
+                agent_class = getattr(importlib.import_module(module_name), class_name)
+                agent = self.agents[agent_type] = agent_class(self.db)
+        return agent
 
     async def process_request(self, request: AgentRequest) -> AgentResponse:
         """Route request to appropriate agent"""
@@ -47,5 +72,5 @@ class AgentRegistry:
         return await agent.process_request(request)
 
     def list_agents(self) -> dict[str, str]:
-        """List available agents"""
-        return {agent_type: agent.__class__.__name__ for agent_type, agent in self.agents.items()}
+        """List available agents without constructing them"""
+        return {agent_type: spec.split(":")[1] for agent_type, spec in self.specs.items()}
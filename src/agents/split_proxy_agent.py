@@ -12,28 +12,83 @@ Implements the psychology from HABIT.md:
 Follows TDD - driven by API endpoint tests.
 """
 
+import json
 import logging
 import os
+from collections.abc import AsyncIterator
 from typing import Any
 
+from src.core.lazy_imports import lazy_import, module_available
 from src.core.task_models import DelegationMode, MicroStep, Task, TaskScope
+from src.services.request_metrics import track_llm_call
 
-# Try to import AI clients
-try:
-    import openai
+# AI clients are imported on first use to keep them out of API startup
+openai = lazy_import("openai")
+OPENAI_AVAILABLE = module_available("openai")
 
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+anthropic = lazy_import("anthropic")
+ANTHROPIC_AVAILABLE = module_available("anthropic")
 
-try:
-    import anthropic
+logger = logging.getLogger(__name__)
 
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
 
-logger = logging.getLogger(__name__)
+class StreamingStepParser:
+    """
+    Incremental parser for streamed LLM step arrays.
+
+    LLM providers stream JSON a few characters at a time. The parser tracks
+    bracket depth (ignoring brackets inside strings) and emits each object
+    as soon as it closes directly inside an array, so both ``[{...}, ...]``
+    and ``{"steps": [{...}, ...]}`` yield steps before the response ends.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._position = 0
+        self._stack: list[tuple[str, int]] = []
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> list[dict]:
+        """
+        Consume a chunk of streamed text.
+
+        Args:
+            chunk: Next piece of the LLM response
+
+        Returns:
+            List of step dicts completed by this chunk (may be empty)
+        """
+        self._buffer += chunk
+        completed = []
+
+        while self._position < len(self._buffer):
+            char = self._buffer[self._position]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "[{":
+                self._stack.append((char, self._position))
+            elif char in "]}" and self._stack:
+                opener, start = self._stack.pop()
+                if opener == "{" and self._stack and self._stack[-1][0] == "[":
+                    try:
+                        step = json.loads(self._buffer[start : self._position + 1])
+                    except json.JSONDecodeError:
+                        step = None
+                    if isinstance(step, dict) and "description" in step:
+                        completed.append(step)
+
+            self._position += 1
+
+        return completed
 
 
 class SplitProxyAgent:
@@ -113,6 +168,101 @@ class SplitProxyAgent:
 
         return result
 
+    async def split_task_stream(
+        self, task: Task, user_id: str
+    ) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        """
+        Streaming variant of split_task().
+
+        Yields ``(event, payload)`` tuples so callers can forward progress to
+        the client while the LLM is still generating:
+        - ``("scope", {...})`` once the scope is known (no LLM involved)
+        - ``("micro_step", {...})`` for every step as soon as it is parsed
+        - ``("complete", {...})`` with next_action, totals and metadata
+
+        Args:
+            task: The task to split
+            user_id: User requesting the split
+
+        Yields:
+            Event name and JSON-serializable payload
+        """
+        scope = self._determine_task_scope(task)
+        yield "scope", {"task_id": task.task_id, "scope": scope}
+
+        if scope == TaskScope.MULTI:
+            micro_steps = []
+            async for step in self.stream_micro_steps(task, user_id):
+                micro_steps.append(step)
+                yield "micro_step", self._serialize_micro_step(step)
+
+            result = {
+                "task_id": task.task_id,
+                "scope": scope,
+                "next_action": self._get_next_action(micro_steps),
+                "total_estimated_minutes": sum(s.estimated_minutes for s in micro_steps),
+            }
+        elif scope == TaskScope.SIMPLE:
+            result = self._handle_simple_scope(task)
+        else:
+            result = self._handle_project_scope(task)
+
+        result.pop("micro_steps", None)
+        result["metadata"] = {
+            "ai_provider": self.ai_provider if scope == TaskScope.MULTI else None,
+            "llm_used": bool(
+                scope == TaskScope.MULTI and (self.openai_client or self.anthropic_client)
+            ),
+            "generation_method": self._get_generation_method(scope),
+        }
+        yield "complete", result
+
+    async def stream_micro_steps(self, task: Task, user_id: str) -> AsyncIterator[MicroStep]:
+        """
+        Generate micro-steps one at a time using the provider streaming APIs.
+
+        Produces the same steps as _generate_micro_steps_with_ai(), but each
+        step is yielded the moment its JSON object closes in the LLM stream,
+        so the first step reaches the user long before generation finishes.
+        Falls back to rule-based steps if no provider is configured or the
+        stream fails before producing any step.
+
+        Args:
+            task: The task to split
+            user_id: User ID for potential personalization (future)
+
+        Yields:
+            MicroStep instances numbered from 1
+        """
+        prompt = self._build_split_prompt(task)
+        step_number = 0
+
+        if self.openai_client and self.ai_provider == "openai":
+            chunks = self._stream_with_openai(prompt)
+        elif self.anthropic_client and self.ai_provider == "anthropic":
+            chunks = self._stream_with_anthropic(prompt)
+        else:
+            logger.error(
+                f"🚨 LLM FALLBACK TRIGGERED 🚨 Using rule-based splitting instead of AI. "
+                f"Reason: {self._get_fallback_reason()}. Task: {task.task_id}"
+            )
+            chunks = None
+
+        if chunks is not None:
+            parser = StreamingStepParser()
+            try:
+                async for chunk in chunks:
+                    for step_data in parser.feed(chunk):
+                        step_number += 1
+                        yield self._make_micro_step(step_data, task, step_number)
+            except Exception as e:
+                logger.error(f"{self.ai_provider} streaming split failed: {e}")
+
+        if step_number == 0:
+            for step_data in self._split_with_rules(task):
+                step_number += 1
+                yield self._make_micro_step(step_data, task, step_number)
+
     def _get_generation_method(self, scope: TaskScope) -> str:
         """Get the method used to generate steps."""
         if scope == TaskScope.SIMPLE:
@@ -366,23 +516,24 @@ class SplitProxyAgent:
         Returns:
             List of validated MicroStep instances
         """
-        micro_steps = []
-        for i, step_data in enumerate(steps_data, 1):
-            # Clamp to ADHD-optimized 2-5 minute range
-            estimated_minutes = max(2, min(5, step_data["estimated_minutes"]))
-
-            step = MicroStep(
-                parent_task_id=task.task_id,
-                step_number=i,
-                description=step_data["description"],
-                short_label=step_data.get("short_label"),
-                estimated_minutes=estimated_minutes,
-                icon=step_data.get("icon"),
-                delegation_mode=step_data.get("delegation_mode", DelegationMode.DO),
-            )
-            micro_steps.append(step)
+        return [
+            self._make_micro_step(step_data, task, i) for i, step_data in enumerate(steps_data, 1)
+        ]
 
-        return micro_steps
+    def _make_micro_step(self, step_data: dict, task: Task, step_number: int) -> MicroStep:
+        """Build a single MicroStep, clamping to the ADHD-optimized 2-5 minute range."""
+        # Streamed steps only need a description; missing estimates get the fallback 5
+        estimated_minutes = max(2, min(5, step_data.get("estimated_minutes", 5)))
+
+        return MicroStep(
+            parent_task_id=task.task_id,
+            step_number=step_number,
+            description=step_data["description"],
+            short_label=step_data.get("short_label"),
+            estimated_minutes=estimated_minutes,
+            icon=step_data.get("icon"),
+            delegation_mode=step_data.get("delegation_mode", DelegationMode.DO),
+        )
 
     def _build_split_prompt(self, task: Task) -> str:
         """
@@ -485,18 +636,19 @@ Return JSON array of steps:
             List of step dicts, or fallback from _split_with_rules
         """
         try:
-            response = await self.openai_client.chat.completions.create(
-                model=os.getenv("LLM_MODEL", "gpt-4o-mini"),
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an ADHD-optimized task splitting assistant. Always return valid JSON.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.7,
-            )
+            async with track_llm_call():
+                response = await self.openai_client.chat.completions.create(
+                    model=os.getenv("LLM_MODEL", "gpt-4o-mini"),
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are an ADHD-optimized task splitting assistant. Always return valid JSON.",
+                        },
+                        {"role": "user", "content": prompt},
+                    ],
+                    response_format={"type": "json_object"},
+                    temperature=0.7,
+                )
 
             import json
 
@@ -519,11 +671,12 @@ Return JSON array of steps:
             List of step dicts, or fallback from _split_with_rules
         """
         try:
-            response = await self.anthropic_client.messages.create(
-                model=os.getenv("LLM_MODEL", "claude-3-5-sonnet-20241022"),
-                max_tokens=2000,
-                messages=[{"role": "user", "content": prompt}],
-            )
+            async with track_llm_call():
+                response = await self.anthropic_client.messages.create(
+                    model=os.getenv("LLM_MODEL", "claude-3-5-sonnet-20241022"),
+                    max_tokens=2000,
+                    messages=[{"role": "user", "content": prompt}],
+                )
 
             import json
 
@@ -542,6 +695,52 @@ Return JSON array of steps:
             logger.error(f"Anthropic split failed: {e}")
             return self._split_with_rules(task)
 
+    async def _stream_with_openai(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Stream split output from OpenAI as raw text deltas.
+
+        Args:
+            prompt: The full prompt for AI
+
+        Yields:
+            Text fragments of the JSON response
+        """
+        stream = await self.openai_client.chat.completions.create(
+            model=os.getenv("LLM_MODEL", "gpt-4o-mini"),
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are an ADHD-optimized task splitting assistant. Always return valid JSON.",
+                },
+                {"role": "user", "content": prompt},
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.7,
+            stream=True,
+        )
+
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def _stream_with_anthropic(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Stream split output from Anthropic as raw text deltas.
+
+        Args:
+            prompt: The full prompt for AI
+
+        Yields:
+            Text fragments of the JSON response
+        """
+        async with self.anthropic_client.messages.stream(
+            model=os.getenv("LLM_MODEL", "claude-3-5-sonnet-20241022"),
+            max_tokens=2000,
+            messages=[{"role": "user", "content": prompt}],
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+
     def _extract_steps_from_ai_response(
         self, result: dict | list, provider: str, task: Task
     ) -> list[dict]:
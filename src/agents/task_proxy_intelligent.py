@@ -18,6 +18,7 @@ from datetime import datetime
 from typing import Any
 
 from src.agents.base import BaseProxyAgent
+from src.core.lazy_imports import lazy_import, module_available
 from src.core.models import AgentRequest, Message
 from src.core.task_models import Task
 from src.repositories.enhanced_repositories import (
@@ -27,20 +28,14 @@ from src.repositories.enhanced_repositories import (
 )
 
 # AI Integration (with fallbacks for development)
-try:
-    import openai
-
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+openai = lazy_import("openai")
+OPENAI_AVAILABLE = module_available("openai")
+if not OPENAI_AVAILABLE:
     logging.warning("OpenAI not available, using fallback responses")
 
-try:
-    import anthropic
-
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+anthropic = lazy_import("anthropic")
+ANTHROPIC_AVAILABLE = module_available("anthropic")
+if not ANTHROPIC_AVAILABLE:
     logging.warning("Anthropic not available, using fallback responses")
 
 
@@ -17,16 +17,20 @@ Usage:
     # Create focus agent
     agent = await UnifiedAgent.create("focus")
     response = await agent.run("Start a Pomodoro session", user_id="alice")
+
+    # Reuse a ready agent across requests (see src.agents.agent_pool)
+    agent = await get_agent_pool().get("task")
 """
 
+import asyncio
 import logging
 from typing import Any
 
 from pydantic_ai import Agent
 
 from config import AgentConfig, load_agent_config
-from src.mcp import MCPClient
-from src.memory import MemoryClient
+from src.mcp import MCPClient, get_mcp_session_pool
+from src.memory import AsyncMemoryClient, MemoryClient
 
 # Configure logging
 logging.basicConfig(
@@ -61,7 +65,7 @@ class UnifiedAgent:
         config: AgentConfig,
         agent: Agent,
         mcp_client: MCPClient | None = None,
-        memory_client: MemoryClient | None = None,
+        memory_client: AsyncMemoryClient | None = None,
     ) -> None:
         """
         Initialize unified agent (use create() class method instead).
@@ -70,7 +74,7 @@ class UnifiedAgent:
             config: Agent configuration
             agent: Pydantic AI agent instance
             mcp_client: Optional MCP client for tools
-            memory_client: Optional memory client
+            memory_client: Optional async memory client
         """
         self.config = config
         self.agent = agent
@@ -121,26 +125,11 @@ class UnifiedAgent:
         if enable_mcp and config.mcp_servers:
             try:
                 logger.info(f"Initializing MCP with {len(config.mcp_servers)} servers")
-                mcp_client = MCPClient()
-
-                # Write MCP config to temporary file
-                import json
-                import tempfile
-                from pathlib import Path
-
-                mcp_config = config.get_mcp_config()
-                with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-                    json.dump(mcp_config, f)
-                    mcp_config_path = Path(f.name)
-
-                # Load and start MCP servers
-                mcp_client.load_servers(mcp_config_path)
-                mcp_tools = await mcp_client.start()
+                # Started servers and their tools are shared by every agent with this config
+                mcp_client = await get_mcp_session_pool().acquire(config.get_mcp_config())
+                mcp_tools = mcp_client.tools
                 logger.info(f"MCP initialized with {len(mcp_tools)} tools")
 
-                # Clean up temp file
-                mcp_config_path.unlink()
-
             except Exception as e:
                 logger.error(f"Failed to initialize MCP: {e}")
                 # Continue without MCP tools
@@ -151,11 +140,18 @@ class UnifiedAgent:
             try:
                 from src.memory import MemoryConfig as MemConfig
 
-                mem_config = MemConfig(
-                    vector_store_path=f"./memory_db/{agent_type}",
-                    collection_name=f"{agent_type}_memories",
-                )
-                memory_client = MemoryClient(mem_config)
+                if config.memory.store == "local":
+                    # One embedded store with per-user shards, shared by every agent type
+                    mem_config = MemConfig(
+                        vector_store_provider="local", vector_store_path="./memory_db/local"
+                    )
+                else:
+                    mem_config = MemConfig(
+                        vector_store_path=f"./memory_db/{agent_type}",
+                        collection_name=f"{agent_type}_memories",
+                    )
+                # Opening the vector store is blocking I/O; keep it off the event loop
+                memory_client = AsyncMemoryClient(await asyncio.to_thread(MemoryClient, mem_config))
                 logger.info("Memory client initialized")
             except Exception as e:
                 logger.error(f"Failed to initialize memory: {e}")
@@ -238,7 +234,7 @@ class UnifiedAgent:
         memory_context = ""
         if self.memory_client and self.config.memory.enabled:
             try:
-                memories = self.memory_client.search_memories(
+                memories = await self.memory_client.search_memories(
                     query=user_message,
                     user_id=user_id,
                     limit=self.config.memory.search_limit,
@@ -274,7 +270,7 @@ class UnifiedAgent:
                 system_prompt=system_prompt,
             )
 
-            # Save conversation to memory if enabled
+            # Queue conversation for memory; written in the background, off the response path
             if self.memory_client and self.config.memory.enabled and self.config.memory.auto_save:
                 try:
                     messages = [
@@ -282,7 +278,7 @@ class UnifiedAgent:
                         {"role": "assistant", "content": str(result.data)},
                     ]
                     self.memory_client.add_memory(messages, user_id=user_id)
-                    logger.debug("Conversation saved to memory")
+                    logger.debug("Conversation queued for memory")
                 except Exception as e:
                     logger.error(f"Error saving to memory: {e}")
 
@@ -293,13 +289,30 @@ class UnifiedAgent:
             raise
 
     async def cleanup(self) -> None:
-        """Clean up resources (MCP connections, etc.)."""
-        if self.mcp_client:
+        """
+        Release agent resources.
+
+        Flushes queued memory writes. MCP connections belong to the shared session pool
+        and stay open for other agents; close them with
+        ``get_mcp_session_pool().close()`` at shutdown.
+        """
+        self.mcp_client = None
+        if self.memory_client:
             try:
-                await self.mcp_client.cleanup()
-                logger.info("MCP client cleaned up")
+                await self.memory_client.close()
             except Exception as e:
-                logger.error(f"Error during MCP cleanup: {e}")
+                logger.error(f"Error flushing memory writes: {e}")
+
+    def is_healthy(self) -> bool:
+        """
+        Whether the agent's connections are still usable.
+
+        Returns:
+            False if the agent uses MCP tools but none of its server sessions is open
+        """
+        if self.mcp_client is None:
+            return True
+        return any(server.session is not None for server in self.mcp_client.servers)
 
     def get_info(self) -> dict[str, Any]:
         """
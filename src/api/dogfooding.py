@@ -18,6 +18,7 @@ from pydantic import BaseModel, Field
 from src.api.auth import get_current_user
 from src.core.task_models import User
 from src.database.enhanced_adapter import EnhancedDatabaseAdapter, get_enhanced_database
+from src.services.xp_ledger_service import get_xp_ledger
 
 logger = logging.getLogger(__name__)
 
@@ -597,6 +598,9 @@ async def complete_solo_execution(
 
         # Calculate XP (base 10 + time bonus)
         xp_earned = 10 + (actual_minutes // 5)  # 1 XP per 5 minutes
+        get_xp_ledger(db).award(
+            current_user.user_id, xp_earned, source="solo_session", reference_id=session_id
+        )
 
         logger.info(
             f"Completed solo execution for task {task_id} (user: {current_user.user_id}, {actual_minutes}m, {xp_earned} XP)"
@@ -19,6 +19,8 @@ from pydantic import BaseModel, Field
 from src.api.auth import get_current_user
 from src.core.task_models import User
 from src.database.enhanced_adapter import get_enhanced_database
+from src.services.achievement_engine import get_achievement_engine
+from src.services.xp_ledger_service import get_xp_ledger
 
 logger = logging.getLogger(__name__)
 
@@ -354,14 +356,17 @@ async def complete_pomodoro(
         cursor.execute(
             """
             UPDATE user_progress
-            SET total_xp = total_xp + ?,
-                last_completion_date = DATE('now')
+            SET last_completion_date = DATE('now')
             WHERE user_id = ?
             """,
-            (xp_earned, user_id),
+            (user_id,),
         )
 
         conn.commit()
+        get_xp_ledger().award(
+            user_id, xp_earned, source="pomodoro", reference_id=session["session_id"]
+        )
+        get_achievement_engine().record(user_id, "focus_session_completed")
 
         return SessionCompleteResponse(
             session_id=session["session_id"],
@@ -16,8 +16,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 
 from src.api.auth import get_current_user
+from src.core.progression import XP_LEVELS, level_for_xp
 from src.core.task_models import User
 from src.database.enhanced_adapter import get_enhanced_database
+from src.services.achievement_engine import get_achievement_engine
+from src.services.leaderboard_service import get_leaderboard_service
+from src.services.xp_ledger_service import get_xp_ledger
 
 logger = logging.getLogger(__name__)
 
@@ -58,40 +62,23 @@ class StreakResponse(BaseModel):
 # ============================================================================
 
 
-# Simple exponential level progression
+# Simple exponential level progression (src.core.progression.XP_LEVELS)
 # Level 1→2: 100 XP
-# Level 2→3: 180 XP
-# Level 3→4: 324 XP
-# Level 10→11: ~2,600 XP
-def xp_for_level(level: int) -> int:
-    """Calculate XP required for given level (exponential curve)"""
-    return int(100 * (level**1.5))
-
-
+# Level 2→3: 282 XP
+# Level 3→4: 519 XP
+# Level 10→11: ~3,160 XP
 def calculate_level(total_xp: int) -> int:
     """Calculate level from total XP"""
-    level = 1
-    while total_xp >= xp_for_level(level):
-        total_xp -= xp_for_level(level)
-        level += 1
-    return level
+    return level_for_xp(total_xp)
 
 
 def xp_progress_in_current_level(total_xp: int) -> tuple[int, int, float]:
     """Calculate progress within current level"""
-    level = calculate_level(total_xp)
-
-    # Calculate XP used for previous levels
-    xp_used = 0
-    for lvl in range(1, level):
-        xp_used += xp_for_level(lvl)
+    progress = XP_LEVELS.progress(total_xp)
+    next_level_xp = progress["next_level_xp"]
+    xp_needed = (next_level_xp or total_xp) - progress["level_floor_xp"]
 
-    # XP in current level
-    xp_in_level = total_xp - xp_used
-    xp_needed = xp_for_level(level)
-    progress_percent = (xp_in_level / xp_needed) * 100
-
-    return (xp_in_level, xp_needed, progress_percent)
+    return (progress["xp_in_level"], xp_needed, progress["progress_percentage"])
 
 
 # ============================================================================
@@ -285,35 +272,21 @@ async def add_xp(request: AddXPRequest, current_user: User = Depends(get_current
     reason = request.reason
     user_id = current_user.user_id
     try:
-        db = get_enhanced_database()
-        conn = db.get_connection()
-        cursor = conn.cursor()
-
-        # Get current progress
-        progress = get_or_create_user_progress(user_id)
-        old_level = progress["current_level"]
-        old_xp = progress["total_xp"]
-
-        # Add XP
-        new_total_xp = old_xp + xp_amount
-        new_level = calculate_level(new_total_xp)
-        leveled_up = new_level > old_level
-
         # Update streak
         streak_info = update_streak(user_id)
 
-        # Update XP and level in database
-        cursor.execute(
-            """
-            UPDATE user_progress
-            SET total_xp = ?,
-                current_level = ?,
-                updated_at = ?
-            WHERE user_id = ?
-            """,
-            (new_total_xp, new_level, datetime.now().isoformat(), user_id),
+        # Add XP; balance and level are updated atomically by the ledger
+        award = get_xp_ledger().award(user_id, xp_amount, source="api", reason=reason)
+        new_total_xp = award.total_xp
+        new_level = award.level
+        old_level = award.previous_level
+        old_xp = new_total_xp - award.amount
+        leveled_up = award.leveled_up
+
+        get_leaderboard_service().set_streak(user_id, streak_info["current_streak"])
+        get_achievement_engine().record(
+            user_id, "streak_updated", {"streak_days": streak_info["current_streak"]}
         )
-        conn.commit()
 
         # Build response message
         message = f"+{xp_amount} XP"
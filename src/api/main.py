@@ -3,6 +3,7 @@ FastAPI App - Simple API for proxy agents
 """
 
 import json
+import sys
 from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
@@ -29,6 +30,8 @@ from src.api.dogfooding import (
 from src.api.energy import router as energy_router
 from src.api.focus import router as focus_router
 from src.api.gamification import router as gamification_router
+from src.api.metrics import RequestMetricsMiddleware
+from src.api.metrics import router as metrics_router
 from src.api.pets import router as pets_router  # BE-02: User pets service
 from src.api.progress import router as progress_router
 from src.api.rewards import router as rewards_router
@@ -50,15 +53,23 @@ from src.api.websocket import (
     connection_manager,
 )
 from src.core.models import AgentRequest, AgentResponse
+from src.core.settings import get_settings
 from src.database.enhanced_adapter import close_enhanced_database, get_enhanced_database
+from src.integrations.scheduler import get_integration_sync_scheduler
+from src.services.achievement_engine import close_achievement_engine
 from src.services.chatgpt_prompts.routes import (
     router as chatgpt_prompts_router,  # ChatGPT video task prompts
 )
+from src.services.database_optimizer import get_database_optimizer
 from src.services.delegation.routes import router as delegation_router  # BE-00: Task delegation
 from src.services.focus_sessions.routes import (
     router as focus_sessions_router,  # BE-03: Focus sessions
 )
+from src.services.productivity_metrics_pipeline import get_productivity_metrics_pipeline
+from src.services.request_metrics import install_sqlalchemy_hooks
+from src.services.task_queue_service import get_task_queue
 from src.services.templates.routes import router as templates_router  # BE-01: Task templates
+from src.services.xp_ledger_service import close_xp_ledgers
 
 logger = structlog.get_logger()
 
@@ -71,12 +82,33 @@ async def lifespan(app: FastAPI):  # noqa: ARG001
     Replaces deprecated @app.on_event decorators.
     """
     # Startup
+    settings = get_settings()
     get_enhanced_database()  # Initialize the enhanced SQLite database
+    install_sqlalchemy_hooks()  # Per-request DB query metrics for the v2 repositories
+    if settings.slow_query_log_enabled:
+        get_database_optimizer()  # Slow-query log and index advisor
+    await get_task_queue().start()  # Background job workers
+    if settings.integration_sync_enabled:
+        await get_integration_sync_scheduler().start()  # Periodic provider syncs
+    if settings.productivity_metrics_enabled:
+        await get_productivity_metrics_pipeline().start()  # Materialized productivity_metrics
     logger.info("platform_started", database="Enhanced SQLite", emoji="🚀")
 
     yield
 
     # Shutdown
+    if settings.productivity_metrics_enabled:
+        await get_productivity_metrics_pipeline().stop()
+    if settings.integration_sync_enabled:
+        await get_integration_sync_scheduler().stop()
+    await get_task_queue().stop()  # Let in-flight jobs finish
+    close_xp_ledgers()  # Apply queued XP awards
+    close_achievement_engine()  # Write batched achievement progress
+    # Flush queued memory writes of warm agents; the pools are only imported once used
+    if agent_pool := sys.modules.get("src.agents.agent_pool"):
+        await agent_pool.get_agent_pool().close()
+    if mcp_session_pool := sys.modules.get("src.mcp.session_pool"):
+        await mcp_session_pool.get_mcp_session_pool().close()
     close_enhanced_database()
     logger.info("platform_shutdown", emoji="✨")
 
@@ -98,6 +130,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record per-route latency, in-flight requests and per-request DB/LLM time
+app.add_middleware(RequestMetricsMiddleware)
+
 
 # Custom exception handler to unwrap error detail
 @app.exception_handler(HTTPException)
@@ -145,6 +180,9 @@ app.include_router(secretary_router)  # Secretary intelligent organization
 app.include_router(simple_task_router)  # Legacy simple tasks
 app.include_router(basic_task_router)  # Legacy basic tasks
 
+if get_settings().prometheus_enabled:
+    app.include_router(metrics_router)  # Prometheus scrape endpoint (/metrics)
+
 
 @app.get("/")
 async def root():
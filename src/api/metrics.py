@@ -0,0 +1,65 @@
+"""
+Request Metrics Middleware and Prometheus Endpoint
+
+RequestMetricsMiddleware times every HTTP request and records it against its
+route template (``/api/v1/tasks/{task_id}``, not the raw path), so label
+cardinality stays bounded. The ``/metrics`` router exposes the registry in the
+Prometheus text format.
+"""
+
+import time
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.services.request_metrics import get_request_metrics
+
+UNMATCHED_ROUTE = "unmatched"
+
+router = APIRouter(tags=["monitoring"])
+
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware recording latency, status and in-flight requests"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.registry = get_request_metrics()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500  # Reported if the app fails before starting a response
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = self.registry.begin_request()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            self.registry.end_request(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status_code,
+                time.perf_counter() - started,
+                stats,
+            )
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def prometheus_metrics() -> PlainTextResponse:
+    """Request, DB and LLM metrics in the Prometheus text exposition format"""
+    return PlainTextResponse(
+        get_request_metrics().render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -10,7 +10,7 @@ Provides endpoints for:
 """
 
 import logging
-from datetime import datetime
+from datetime import UTC, datetime
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
@@ -19,6 +19,7 @@ from src.database.enhanced_adapter import get_enhanced_database
 from src.repositories.user_pet_repository import UserPetRepository
 from src.services.dopamine_reward_service import DopamineRewardService
 from src.services.user_pet_service import UserHasNoPetError, UserPetService
+from src.services.xp_ledger_service import get_xp_ledger
 
 logger = logging.getLogger(__name__)
 
@@ -119,24 +120,19 @@ async def claim_reward(request: RewardClaimRequest):
                 status_code=400, detail=f"Invalid action_type: {request.action_type}"
             )
 
-        # Get user's current XP and level from database
+        # Award the XP; micro-steps arrive in bursts and are applied in batches
         db = get_enhanced_database()
-        user_stats = await _get_user_stats(db, request.user_id)
-
-        # Update user XP
-        new_total_xp = user_stats["total_xp"] + reward.total_xp
-        new_level = _calculate_level(new_total_xp)
-        level_up = new_level > user_stats["level"]
-
-        # Save to database
-        await _update_user_stats(
-            db,
-            request.user_id,
-            new_total_xp,
-            new_level,
-            request.streak_days,
-            request.task_id,
-        )
+        ledger = get_xp_ledger(db)
+        source = f"reward_{request.action_type}"
+        if request.action_type == "microstep":
+            previous_level = ledger.get_balance(request.user_id)["level"]
+            ledger.queue(request.user_id, reward.total_xp, source=source)
+            balance = ledger.get_balance(request.user_id)
+            new_total_xp, new_level = balance["total_xp"], balance["level"]
+            level_up = new_level > previous_level
+        else:
+            award = ledger.award(request.user_id, reward.total_xp, source=source)
+            new_total_xp, new_level, level_up = award.total_xp, award.level, award.leveled_up
 
         # Integrate pet feeding (BE-02)
         pet_fed = False
@@ -229,13 +225,8 @@ async def open_mystery_box(request: MysteryBoxRequest):
 
         # Apply XP bonus if present
         if mystery_reward.get("xp_bonus", 0) > 0:
-            db = get_enhanced_database()
-            user_stats = await _get_user_stats(db, request.user_id)
-            new_total_xp = user_stats["total_xp"] + mystery_reward["xp_bonus"]
-            new_level = _calculate_level(new_total_xp)
-
-            await _update_user_stats(
-                db, request.user_id, new_total_xp, new_level, user_stats["streak_days"]
+            get_xp_ledger(get_enhanced_database()).award(
+                request.user_id, mystery_reward["xp_bonus"], source="mystery_box"
             )
 
         logger.info(
@@ -291,8 +282,8 @@ async def get_user_reward_stats(user_id: str):
         user_stats = await _get_user_stats(db, user_id)
 
         # Calculate progress to next level
-        current_level_xp = _xp_for_level(user_stats["level"])
-        next_level_xp = _xp_for_level(user_stats["level"] + 1)
+        current_level_xp = user_stats["level_floor_xp"]
+        next_level_xp = user_stats["next_level_xp"] or user_stats["total_xp"] + 1
         xp_in_current_level = user_stats["total_xp"] - current_level_xp
         xp_needed_for_next = next_level_xp - user_stats["total_xp"]
 
@@ -321,45 +312,23 @@ async def get_user_reward_stats(user_id: str):
 
 
 async def _get_user_stats(db, user_id: str) -> dict:
-    """Get user statistics from database"""
-    # For now, return mock data
-    # TODO: Implement real database lookup
+    """Get user statistics from the XP ledger and user_progress"""
+    balance = get_xp_ledger(db).get_balance(user_id)
+    progress = db.execute_read(
+        "SELECT current_streak FROM user_progress WHERE user_id = ?", (user_id,)
+    )
+    tasks_today = db.execute_read(
+        """
+        SELECT COUNT(*) AS tasks FROM xp_ledger
+        WHERE user_id = ? AND source = 'reward_task' AND awarded_at >= ?
+        """,
+        (user_id, datetime.now(UTC).date().isoformat()),
+    )
     return {
-        "total_xp": 250,
-        "level": 5,
-        "streak_days": 3,
-        "tasks_today": 2,
-        "last_activity": datetime.now().isoformat(),
+        "total_xp": balance["total_xp"],
+        "level": balance["level"],
+        "level_floor_xp": balance["level_floor_xp"],
+        "next_level_xp": balance["next_level_xp"],
+        "streak_days": (progress[0]["current_streak"] or 0) if progress else 0,
+        "tasks_today": tasks_today[0]["tasks"],
     }
-
-
-async def _update_user_stats(
-    db,
-    user_id: str,
-    total_xp: int,
-    level: int,
-    streak_days: int,
-    task_id: str | None = None,
-):
-    """Update user statistics in database"""
-    # TODO: Implement real database update
-    logger.info(
-        f"Updating user stats: {user_id}, xp={total_xp}, level={level}, streak={streak_days}"
-    )
-
-
-def _calculate_level(total_xp: int) -> int:
-    """Calculate level from total XP (non-linear growth)"""
-    # Level formula: XP needed = 100 * level^1.5
-    # This makes leveling progressively harder
-    level = 1
-    while _xp_for_level(level + 1) <= total_xp:
-        level += 1
-    return level
-
-
-def _xp_for_level(level: int) -> int:
-    """Calculate total XP needed for a given level"""
-    if level == 1:
-        return 0
-    return int(100 * (level**1.5))
@@ -1,15 +1,12 @@
 """Statistics API router."""
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 
 from src.core.statistics_models import ProductivityScoreResponse, UserStatisticsResponse
-from src.services.task_statistics_service import StatisticsService
+from src.services.task_statistics_service import StatisticsService, get_statistics_service
 
 router = APIRouter(prefix="/api/statistics", tags=["statistics"])
 
-# Singleton service instance (in production, use dependency injection)
-_statistics_service = StatisticsService()
-
 
 @router.get(
     "/users/{user_id}",
@@ -35,6 +32,8 @@ _statistics_service = StatisticsService()
                         "avg_completion_time_minutes": 25.5,
                         "productivity_score": 78.5,
                         "streak_days": 7,
+                        "total_focus_minutes": 300,
+                        "focus_sessions_completed": 12,
                     }
                 }
             },
@@ -45,7 +44,9 @@ _statistics_service = StatisticsService()
         },
     },
 )
-async def get_user_statistics(user_id: str) -> UserStatisticsResponse:
+async def get_user_statistics(
+    user_id: str, service: StatisticsService = Depends(get_statistics_service)
+) -> UserStatisticsResponse:
     """
     Get comprehensive statistics for a user.
 
@@ -59,7 +60,7 @@ async def get_user_statistics(user_id: str) -> UserStatisticsResponse:
         HTTPException: 404 if user not found or invalid user_id
     """
     try:
-        stats = await _statistics_service.get_user_statistics(user_id)
+        stats = await service.get_user_statistics(user_id)
         return UserStatisticsResponse(**stats)
     except ValueError:
         raise HTTPException(
@@ -91,7 +92,9 @@ async def get_user_statistics(user_id: str) -> UserStatisticsResponse:
         },
     },
 )
-async def get_productivity_score(user_id: str) -> ProductivityScoreResponse:
+async def get_productivity_score(
+    user_id: str, service: StatisticsService = Depends(get_statistics_service)
+) -> ProductivityScoreResponse:
     """
     Get productivity score for a user.
 
@@ -111,7 +114,7 @@ async def get_productivity_score(user_id: str) -> ProductivityScoreResponse:
         HTTPException: 404 if user not found or invalid user_id
     """
     try:
-        score = await _statistics_service.get_productivity_score(user_id)
+        score = await service.get_productivity_score(user_id)
         return ProductivityScoreResponse(user_id=user_id, productivity_score=score)
     except ValueError:
         raise HTTPException(
@@ -28,7 +28,7 @@ from src.workflows.recommender import WorkflowRecommender, WorkflowSuggestion
 logger = logging.getLogger(__name__)
 
 # Initialize workflow executor with workflows directory
-WORKFLOWS_DIR = Path(__file__).parent.parent.parent.parent / "workflows" / "dev"
+WORKFLOWS_DIR = Path(__file__).parent.parent.parent.parent / "workflows"
 executor = WorkflowExecutor(WORKFLOWS_DIR)
 
 # Initialize workflow recommender
@@ -100,18 +100,20 @@ class SuggestWorkflowsRequest(BaseModel):
 @router.get("/", response_model=list[WorkflowSummary])
 async def list_workflows(
     workflow_type: WorkflowType | None = Query(None, description="Filter by type"),
+    tag: str | None = Query(None, description="Filter by tag"),
 ):
     """
     List all available workflows.
 
     Args:
         workflow_type: Optional filter by workflow type
+        tag: Optional filter by tag
 
     Returns:
         List of workflow summaries
     """
     try:
-        workflows = executor.list_workflows(workflow_type=workflow_type)
+        workflows = executor.list_workflows(workflow_type=workflow_type, tag=tag)
 
         return [
             WorkflowSummary(
@@ -259,7 +261,8 @@ async def suggest_workflows(request: SuggestWorkflowsRequest):
 
     This is a MICRO-LLM endpoint - only called when user clicks the ⭐ button!
 
-    Analyzes the task and returns ALL available workflows ranked with honest grades:
+    Pre-filters the catalog to the workflows that best match the task, then returns
+    them ranked with honest grades:
     - A+/A/A-: Excellent match
     - B+/B/B-: Good match
     - C+/C/C-: Marginal match
@@ -270,7 +273,7 @@ async def suggest_workflows(request: SuggestWorkflowsRequest):
         request: Workflow suggestion request with task details and user context
 
     Returns:
-        List of ALL workflows with grades, sorted best to worst
+        Candidate workflows with grades, sorted best to worst
     """
     try:
         # Get all available workflows
@@ -317,4 +320,5 @@ async def health_check():
         "status": "healthy",
         "workflows_loaded": workflows_count,
         "workflows_dir": str(WORKFLOWS_DIR),
+        "step_cache": executor.step_cache.stats(),
     }
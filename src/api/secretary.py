@@ -8,7 +8,7 @@ from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 
-from src.services.secretary_service import SecretaryService
+from src.services.secretary_service import SecretaryService, get_secretary_service
 
 logger = logging.getLogger(__name__)
 
@@ -51,12 +51,6 @@ class PrioritySuggestionResponse(BaseModel):
     suggestions: list[dict[str, Any]] = Field(..., description="Priority change suggestions")
 
 
-# Dependency to get secretary service
-def get_secretary_service() -> SecretaryService:
-    """Get secretary service instance"""
-    return SecretaryService()
-
-
 @router.get("/dashboard", response_model=SecretaryDashboardResponse)
 async def get_secretary_dashboard(
     user_id: str | None = Query(None, description="User ID for filtering tasks"),
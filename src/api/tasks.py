@@ -2,12 +2,14 @@
 Task Management API Endpoints
 """
 
+import json
 import logging
 from datetime import datetime
 from decimal import Decimal
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ConfigDict, Field
 
 from src.core.task_models import (
@@ -19,6 +21,7 @@ from src.core.task_models import (
     TaskSort,
     TaskStatus,
 )
+from src.services.achievement_engine import get_achievement_engine
 from src.services.task_service import (
     ProjectCreationData,
     TaskCreationData,
@@ -26,6 +29,7 @@ from src.services.task_service import (
     TaskServiceError,
     TaskUpdateData,
 )
+from src.services.xp_ledger_service import get_xp_ledger
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +40,7 @@ router = APIRouter(prefix="/api/v1", tags=["tasks"])
 # Dependency to get task service
 def get_task_service() -> TaskService:
     """Get task service instance"""
-    return TaskService()
+    return TaskService(achievements=get_achievement_engine())
 
 
 # Request/Response Models
@@ -621,6 +625,98 @@ async def split_task(
     return result
 
 
+@router.post("/tasks/{task_id}/split/stream")
+async def split_task_stream(
+    task_id: str, request: SplitTaskRequest, task_service: TaskService = Depends(get_task_service)
+):
+    """
+    Streaming variant of POST /tasks/{task_id}/split (Server-Sent Events).
+
+    Emits ``scope``, then one ``micro_step`` event per step as soon as the LLM
+    produces it (each step is persisted before it is sent), then ``complete``.
+    Tasks that were already split replay their stored steps.
+    """
+    from src.agents.split_proxy_agent import SplitProxyAgent
+
+    task = task_service.get_task(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    conn = task_service.get_db().get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT step_id, step_number, description, estimated_minutes, delegation_mode, status
+        FROM micro_steps
+        WHERE parent_task_id = ?
+        ORDER BY step_number
+    """,
+        (task_id,),
+    )
+    existing_steps = cursor.fetchall()
+
+    async def replay_existing():
+        micro_steps = [
+            {
+                "step_id": row[0],
+                "step_number": row[1],
+                "description": row[2],
+                "estimated_minutes": row[3],
+                "delegation_mode": row[4],
+                "status": row[5],
+            }
+            for row in existing_steps
+        ]
+        yield _sse_event(
+            "scope", {"task_id": task_id, "scope": getattr(task, "scope", None) or "multi"}
+        )
+        for step in micro_steps:
+            yield _sse_event("micro_step", step)
+        yield _sse_event(
+            "complete",
+            {
+                "task_id": task_id,
+                "next_action": micro_steps[0] if micro_steps else None,
+                "total_estimated_minutes": sum(s["estimated_minutes"] for s in micro_steps),
+            },
+        )
+
+    async def generate():
+        agent = SplitProxyAgent()
+        try:
+            async for event, payload in agent.split_task_stream(task, request.user_id):
+                if event == "micro_step":
+                    cursor.execute(
+                        """
+                        INSERT INTO micro_steps
+                        (step_id, parent_task_id, step_number, description, estimated_minutes,
+                         delegation_mode, status, created_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                        (
+                            payload["step_id"],
+                            task_id,
+                            payload["step_number"],
+                            payload["description"],
+                            payload["estimated_minutes"],
+                            payload["delegation_mode"],
+                            payload["status"],
+                            datetime.utcnow().isoformat(),
+                        ),
+                    )
+                    conn.commit()
+                yield _sse_event(event, payload)
+        except Exception as e:
+            logger.error(f"Streaming split failed for task {task_id}: {e}")
+            yield _sse_event("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        replay_existing() if existing_steps else generate(),
+        media_type="text/event-stream",
+        headers=_SSE_HEADERS,
+    )
+
+
 @router.patch("/micro-steps/{step_id}/complete")
 async def complete_micro_step(
     step_id: str,
@@ -677,6 +773,12 @@ async def complete_micro_step(
     speed_bonus = 5 if actual_minutes <= row[4] else 0  # row[4] = estimated_minutes
     xp_earned = base_xp + speed_bonus
 
+    # Steps are completed in bursts: queue the award to be applied in a batch
+    cursor.execute("SELECT assignee_id FROM tasks WHERE task_id = ?", (row[1],))
+    owner = cursor.fetchone()
+    if owner and owner[0]:
+        get_xp_ledger(db).queue(owner[0], xp_earned, source="micro_step", reference_id=step_id)
+
     return {
         "step_id": step_id,
         "status": "completed",
@@ -895,6 +997,159 @@ async def smart_prioritize_tasks(
 # Mobile-Specific Endpoints
 
 
+def _enum_value(value: Any) -> Any:
+    """Unwrap enum members, pass plain values through."""
+    return value.value if hasattr(value, "value") else value
+
+
+def _format_micro_step_display(step: Any) -> dict[str, Any]:
+    """Format a captured micro-step (saved or unsaved) for frontend display."""
+    leaf_type = _enum_value(step.leaf_type)
+    return {
+        "step_id": step.step_id,
+        "description": step.description,
+        "short_label": getattr(step, "short_label", None),
+        "estimated_minutes": step.estimated_minutes,
+        "leaf_type": leaf_type,  # "DIGITAL" or "HUMAN"
+        "icon": getattr(step, "icon", None) or ("🤖" if leaf_type == "DIGITAL" else "👤"),
+        "delegation_mode": _enum_value(step.delegation_mode),
+        "tags": step.tags or [],  # Include CHAMPS tags
+        # Hierarchical fields
+        "parent_step_id": getattr(step, "parent_step_id", None),
+        "level": getattr(step, "level", 0),
+        "is_leaf": getattr(step, "is_leaf", True),
+        "decomposition_state": _enum_value(getattr(step, "decomposition_state", "atomic")),
+    }
+
+
+def _format_captured_task(created_task: Any, task_data: Any) -> dict[str, Any]:
+    """Format the captured root task, preferring saved values over the AI draft."""
+    return {
+        "task_id": getattr(created_task, "task_id", None),  # ✅ Real task_id from database
+        "title": getattr(created_task, "title", task_data.title),
+        "description": getattr(created_task, "description", task_data.description),
+        "priority": _enum_value(getattr(created_task, "priority", task_data.priority)),
+        "estimated_hours": float(created_task.estimated_hours)
+        if getattr(created_task, "estimated_hours", None)
+        else task_data.estimated_hours,
+        "tags": getattr(created_task, "tags", task_data.tags),
+    }
+
+
+def _capture_breakdown(micro_steps_display: list[dict[str, Any]]) -> dict[str, int]:
+    """Summarize displayed micro-steps by leaf type and total time."""
+    return {
+        "total_steps": len(micro_steps_display),
+        "digital_count": sum(1 for s in micro_steps_display if s["leaf_type"] == "DIGITAL"),
+        "human_count": sum(1 for s in micro_steps_display if s["leaf_type"] == "HUMAN"),
+        "total_minutes": sum(s["estimated_minutes"] for s in micro_steps_display),
+    }
+
+
+def _save_captured_task(db: Any, task_data: Task) -> Task:
+    """
+    Persist a captured task and return it with its real task_id.
+
+    ⚠️ WORKAROUND: Use direct SQL INSERT to bypass Task model field mismatch.
+    The Task model has hierarchical fields (level, decomposition_state, children_ids)
+    that don't exist in the database schema, causing "no such column" errors.
+    Direct SQL only inserts fields that exist in the schema.
+    """
+    from uuid import uuid4
+
+    conn = db.get_connection()
+    cursor = conn.cursor()
+
+    task_id = str(uuid4())
+    now = datetime.utcnow().isoformat()
+    project_id = getattr(task_data, "project_id", None) or "default-project"
+    priority = getattr(task_data, "priority", "medium")
+    estimated_hours = getattr(task_data, "estimated_hours", None)
+    tags = getattr(task_data, "tags", None)
+
+    # Direct SQL INSERT with only schema-supported fields
+    cursor.execute(
+        """
+        INSERT INTO tasks (
+            task_id, title, description, project_id, status, priority,
+            estimated_hours, actual_hours, tags, created_at, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+        (
+            task_id,
+            task_data.title,
+            task_data.description,
+            project_id,
+            "todo",
+            priority,
+            float(estimated_hours) if estimated_hours else 0.5,
+            0.0,  # actual_hours
+            json.dumps(tags) if tags else "[]",
+            now,
+            now,
+        ),
+    )
+    conn.commit()
+
+    return Task(
+        task_id=task_id,
+        title=task_data.title,
+        description=task_data.description,
+        project_id=project_id,
+        priority=priority,
+        estimated_hours=estimated_hours if estimated_hours else 0.5,
+        tags=tags if tags is not None else [],
+        status="todo",
+        created_at=datetime.fromisoformat(now),
+        updated_at=datetime.fromisoformat(now),
+    )
+
+
+async def _save_captured_micro_step(
+    micro_step_service: Any, created_task: Task, step_number: int, step: MicroStep
+) -> Any:
+    """
+    Persist one captured micro-step under its saved parent task.
+
+    Returns the saved step, or the unsaved step if persistence fails so the
+    client still sees it.
+    """
+    from src.services.micro_step_service import MicroStepCreateData
+
+    try:
+        step_data = MicroStepCreateData(
+            parent_task_id=created_task.task_id,
+            step_number=step_number,
+            description=step.description,
+            estimated_minutes=step.estimated_minutes,
+            leaf_type=_enum_value(step.leaf_type),
+            delegation_mode=_enum_value(step.delegation_mode),
+            automation_plan=step.automation_plan.model_dump()
+            if getattr(step, "automation_plan", None)
+            else None,
+            tags=step.tags or [],
+            parent_step_id=getattr(step, "parent_step_id", None),
+            level=getattr(step, "level", 0),
+            is_leaf=getattr(step, "is_leaf", True),
+            decomposition_state=_enum_value(getattr(step, "decomposition_state", "atomic")),
+            short_label=getattr(step, "short_label", None),
+            icon=getattr(step, "icon", None),
+        )
+        return await micro_step_service.create_micro_step(step_data)
+    except Exception as e:
+        # Log error but continue with other steps
+        logger.warning(f"Failed to save micro-step {step_number}: {e}")
+        return step
+
+
+def _sse_event(event: str, data: Any) -> str:
+    """Encode one Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
 @router.post("/mobile/quick-capture", status_code=201)
 async def mobile_quick_capture(
     request: QuickCaptureRequest, task_service: TaskService = Depends(get_task_service)
@@ -938,211 +1193,29 @@ async def mobile_quick_capture(
         )
 
         # Format micro-steps for frontend display
-        micro_steps_display = []
-        for step in result["micro_steps"]:
-            # Handle both enum and string values for leaf_type and delegation_mode
-            leaf_type = step.leaf_type.value if hasattr(step.leaf_type, "value") else step.leaf_type
-            delegation_mode = (
-                step.delegation_mode.value
-                if hasattr(step.delegation_mode, "value")
-                else step.delegation_mode
-            )
-
-            # Handle decomposition_state enum
-            decomposition_state = (
-                step.decomposition_state.value
-                if hasattr(step, "decomposition_state")
-                and hasattr(step.decomposition_state, "value")
-                else (
-                    step.decomposition_state if hasattr(step, "decomposition_state") else "atomic"
-                )
-            )
-
-            micro_steps_display.append(
-                {
-                    "step_id": step.step_id,
-                    "description": step.description,
-                    "short_label": step.short_label,
-                    "estimated_minutes": step.estimated_minutes,
-                    "leaf_type": leaf_type,  # "DIGITAL" or "HUMAN"
-                    "icon": step.icon or ("🤖" if leaf_type == "DIGITAL" else "👤"),
-                    "delegation_mode": delegation_mode,
-                    "tags": step.tags or [],  # Include CHAMPS tags
-                    # Hierarchical fields
-                    "parent_step_id": step.parent_step_id
-                    if hasattr(step, "parent_step_id")
-                    else None,
-                    "level": step.level if hasattr(step, "level") else 0,
-                    "is_leaf": step.is_leaf if hasattr(step, "is_leaf") else True,
-                    "decomposition_state": decomposition_state,
-                }
-            )
+        micro_steps_display = [_format_micro_step_display(step) for step in result["micro_steps"]]
 
         task_data = result["task"]
 
         # ✅ FIX P0 BUG: Save task to database first (to get real task_id)
         try:
-            import json
-
-            # ⚠️ WORKAROUND: Use direct SQL INSERT to bypass Task model field mismatch
-            # The Task model has hierarchical fields (level, decomposition_state, children_ids)
-            # that don't exist in the database schema, causing "no such column" errors.
-            # Direct SQL only inserts fields that exist in the schema.
-            from uuid import uuid4
-
-            from src.core.task_models import Task as CoreTask
             from src.database.enhanced_adapter import get_enhanced_database
+            from src.services.micro_step_service import MicroStepService
 
             db = get_enhanced_database()
-            conn = db.get_connection()
-            cursor = conn.cursor()
-
-            task_id = str(uuid4())
-            now = datetime.utcnow().isoformat()
-
-            # Direct SQL INSERT with only schema-supported fields
-            cursor.execute(
-                """
-                INSERT INTO tasks (
-                    task_id, title, description, project_id, status, priority,
-                    estimated_hours, actual_hours, tags, created_at, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    task_id,
-                    task_data.title,
-                    task_data.description,
-                    task_data.project_id
-                    if hasattr(task_data, "project_id") and task_data.project_id
-                    else "default-project",
-                    "todo",
-                    task_data.priority if hasattr(task_data, "priority") else "medium",
-                    float(task_data.estimated_hours)
-                    if hasattr(task_data, "estimated_hours") and task_data.estimated_hours
-                    else 0.5,
-                    0.0,  # actual_hours
-                    json.dumps(task_data.tags)
-                    if hasattr(task_data, "tags") and task_data.tags
-                    else "[]",
-                    now,
-                    now,
-                ),
-            )
-            conn.commit()
-
-            # Construct Task object for response
-            created_task = CoreTask(
-                task_id=task_id,
-                title=task_data.title,
-                description=task_data.description,
-                project_id=task_data.project_id
-                if hasattr(task_data, "project_id") and task_data.project_id
-                else "default-project",
-                priority=task_data.priority if hasattr(task_data, "priority") else "medium",
-                estimated_hours=task_data.estimated_hours
-                if hasattr(task_data, "estimated_hours") and task_data.estimated_hours
-                else 0.5,
-                tags=task_data.tags if hasattr(task_data, "tags") else [],
-                status="todo",
-                created_at=datetime.fromisoformat(now),
-                updated_at=datetime.fromisoformat(now),
-            )
+            created_task = _save_captured_task(db, task_data)
 
             # ✅ FIX P0 BUG: Save micro-steps to database
-            from src.database.enhanced_adapter import get_enhanced_database
-            from src.services.micro_step_service import MicroStepCreateData, MicroStepService
-
-            db = get_enhanced_database()
             micro_step_service = MicroStepService(db)
             saved_micro_steps = []
 
             for i, step in enumerate(result["micro_steps"], 1):
-                try:
-                    # Create micro-step data
-                    step_data = MicroStepCreateData(
-                        parent_task_id=created_task.task_id,
-                        step_number=i,  # ✅ Pass step number from loop index
-                        description=step.description,
-                        estimated_minutes=step.estimated_minutes,
-                        leaf_type=step.leaf_type.value
-                        if hasattr(step.leaf_type, "value")
-                        else step.leaf_type,
-                        delegation_mode=step.delegation_mode.value
-                        if hasattr(step.delegation_mode, "value")
-                        else step.delegation_mode,
-                        automation_plan=step.automation_plan.model_dump()
-                        if hasattr(step, "automation_plan") and step.automation_plan
-                        else None,
-                        tags=step.tags or [],
-                        parent_step_id=step.parent_step_id
-                        if hasattr(step, "parent_step_id")
-                        else None,
-                        level=step.level if hasattr(step, "level") else 0,
-                        is_leaf=step.is_leaf if hasattr(step, "is_leaf") else True,
-                        decomposition_state=step.decomposition_state.value
-                        if hasattr(step, "decomposition_state")
-                        and hasattr(step.decomposition_state, "value")
-                        else (
-                            step.decomposition_state
-                            if hasattr(step, "decomposition_state")
-                            else "atomic"
-                        ),
-                        short_label=step.short_label if hasattr(step, "short_label") else None,
-                        icon=step.icon if hasattr(step, "icon") else None,
-                    )
-
-                    # Save to database
-                    saved_step = await micro_step_service.create_micro_step(step_data)
-                    saved_micro_steps.append(saved_step)
-                except Exception as e:
-                    # Log error but continue with other steps
-                    logger.warning(f"Failed to save micro-step {i}: {e}")
-                    # Add unsaved step to list anyway
-                    saved_micro_steps.append(step)
-
-            # Update micro_steps_display with saved steps
-            micro_steps_display = []
-            for step in saved_micro_steps:
-                # Handle both saved (from DB) and unsaved steps
-                leaf_type = (
-                    step.leaf_type.value if hasattr(step.leaf_type, "value") else step.leaf_type
-                )
-                delegation_mode = (
-                    step.delegation_mode.value
-                    if hasattr(step.delegation_mode, "value")
-                    else step.delegation_mode
-                )
-                decomposition_state = (
-                    step.decomposition_state.value
-                    if hasattr(step, "decomposition_state")
-                    and hasattr(step.decomposition_state, "value")
-                    else (
-                        step.decomposition_state
-                        if hasattr(step, "decomposition_state")
-                        else "atomic"
-                    )
+                saved_micro_steps.append(
+                    await _save_captured_micro_step(micro_step_service, created_task, i, step)
                 )
 
-                micro_steps_display.append(
-                    {
-                        "step_id": step.step_id,
-                        "description": step.description,
-                        "short_label": step.short_label if hasattr(step, "short_label") else None,
-                        "estimated_minutes": step.estimated_minutes,
-                        "leaf_type": leaf_type,
-                        "icon": step.icon
-                        if hasattr(step, "icon")
-                        else ("🤖" if leaf_type == "DIGITAL" else "👤"),
-                        "delegation_mode": delegation_mode,
-                        "tags": step.tags or [],
-                        "parent_step_id": step.parent_step_id
-                        if hasattr(step, "parent_step_id")
-                        else None,
-                        "level": step.level if hasattr(step, "level") else 0,
-                        "is_leaf": step.is_leaf if hasattr(step, "is_leaf") else True,
-                        "decomposition_state": decomposition_state,
-                    }
-                )
+            # Update micro_steps_display with saved steps
+            micro_steps_display = [_format_micro_step_display(step) for step in saved_micro_steps]
 
         except Exception as e:
             logger.error(f"Failed to save task/micro-steps to database: {e}")
@@ -1153,33 +1226,9 @@ async def mobile_quick_capture(
 
         # Build response with micro-steps breakdown
         response = {
-            "task": {
-                "task_id": created_task.task_id
-                if hasattr(created_task, "task_id")
-                else None,  # ✅ Real task_id from database
-                "title": created_task.title if hasattr(created_task, "title") else task_data.title,
-                "description": created_task.description
-                if hasattr(created_task, "description")
-                else task_data.description,
-                "priority": created_task.priority.value
-                if hasattr(created_task, "priority") and hasattr(created_task.priority, "value")
-                else (
-                    created_task.priority
-                    if hasattr(created_task, "priority")
-                    else task_data.priority
-                ),
-                "estimated_hours": float(created_task.estimated_hours)
-                if hasattr(created_task, "estimated_hours") and created_task.estimated_hours
-                else task_data.estimated_hours,
-                "tags": created_task.tags if hasattr(created_task, "tags") else task_data.tags,
-            },
+            "task": _format_captured_task(created_task, task_data),
             "micro_steps": micro_steps_display,
-            "breakdown": {
-                "total_steps": len(micro_steps_display),
-                "digital_count": sum(1 for s in micro_steps_display if s["leaf_type"] == "DIGITAL"),
-                "human_count": sum(1 for s in micro_steps_display if s["leaf_type"] == "HUMAN"),
-                "total_minutes": sum(s["estimated_minutes"] for s in micro_steps_display),
-            },
+            "breakdown": _capture_breakdown(micro_steps_display),
             "needs_clarification": not result["ready_to_save"],
             "clarifications": [
                 {
@@ -1245,6 +1294,107 @@ async def mobile_quick_capture(
         }
 
 
+@router.post("/mobile/quick-capture/stream")
+async def mobile_quick_capture_stream(request: QuickCaptureRequest):
+    """
+    Streaming variant of POST /mobile/quick-capture (Server-Sent Events).
+
+    Same pipeline, but results are pushed as they are produced instead of
+    after the whole decomposition finishes:
+    - ``task``: parsed and saved root task (first event, before any LLM splitting)
+    - ``micro_step``: each classified step as it streams from the LLM
+    - ``micro_step_tags``: CHAMPS tags for a step once generated (step is saved then)
+    - ``complete``: breakdown, clarifications and processing time
+    - ``error``: pipeline failure (the stream ends after it)
+    """
+    from src.agents.capture_agent import CaptureAgent
+    from src.core.task_models import CaptureMode
+    from src.database.enhanced_adapter import get_enhanced_database
+    from src.services.micro_step_service import MicroStepService
+
+    if request.ask_for_clarity:
+        mode = CaptureMode.CLARIFY
+    elif request.auto_mode:
+        mode = CaptureMode.AUTO
+    else:
+        mode = CaptureMode.MANUAL
+
+    async def generate():
+        start_time = datetime.utcnow()
+        db = get_enhanced_database()
+        agent = CaptureAgent(db)
+        micro_step_service = MicroStepService(db)
+        created_task = None
+        task_data = None
+        step_numbers: dict[str, int] = {}
+        micro_steps_display: list[dict[str, Any]] = []
+
+        try:
+            async for event, payload in agent.capture_stream(
+                input_text=request.text, user_id=request.user_id, mode=mode
+            ):
+                if event == "task":
+                    task_data = payload
+                    try:
+                        created_task = _save_captured_task(db, task_data)
+                    except Exception as e:
+                        logger.error(f"Failed to save captured task to database: {e}")
+                        created_task = task_data
+                    yield _sse_event("task", _format_captured_task(created_task, task_data))
+
+                elif event == "micro_step":
+                    step_number = len(micro_steps_display) + 1
+                    step_numbers[payload.step_id] = step_number
+                    if payload.tags:
+                        # Already tagged (non-streamed scopes) - save right away
+                        payload = await _save_captured_micro_step(
+                            micro_step_service, created_task, step_number, payload
+                        )
+                    display = _format_micro_step_display(payload)
+                    micro_steps_display.append(display)
+                    yield _sse_event("micro_step", display)
+
+                elif event == "micro_step_tags":
+                    step_number = step_numbers[payload.step_id]
+                    saved = await _save_captured_micro_step(
+                        micro_step_service, created_task, step_number, payload
+                    )
+                    display = _format_micro_step_display(saved)
+                    micro_steps_display[step_number - 1] = display
+                    yield _sse_event(
+                        "micro_step_tags",
+                        {
+                            "step_id": payload.step_id,
+                            "saved_step_id": display["step_id"],
+                            "tags": display["tags"],
+                        },
+                    )
+
+                elif event == "complete":
+                    processing_time = (datetime.utcnow() - start_time).total_seconds() * 1000
+                    yield _sse_event(
+                        "complete",
+                        {
+                            "task_id": getattr(created_task, "task_id", None),
+                            "micro_steps": micro_steps_display,
+                            "breakdown": _capture_breakdown(micro_steps_display),
+                            "needs_clarification": not payload["ready_to_save"],
+                            "clarifications": [
+                                {"field": c.field, "question": c.question, "options": c.options}
+                                for c in payload["clarifications"]
+                            ],
+                            "processing_time_ms": int(processing_time),
+                            "voice_processed": request.voice_input,
+                            "location_captured": bool(request.location),
+                        },
+                    )
+        except Exception as e:
+            logger.error(f"Streaming capture failed: {e}")
+            yield _sse_event("error", {"detail": str(e)})
+
+    return StreamingResponse(generate(), media_type="text/event-stream", headers=_SSE_HEADERS)
+
+
 @router.get("/mobile/dashboard/{user_id}")
 async def get_mobile_dashboard_data(user_id: str):
     """Get mobile-optimized dashboard data"""
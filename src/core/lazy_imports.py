@@ -0,0 +1,78 @@
+"""
+Deferred imports for heavy optional dependencies.
+
+Provider SDKs (openai, anthropic, pydantic_ai, google clients) take hundreds of
+milliseconds to import, and most requests never touch them. Modules bind them with
+``lazy_import`` instead of a top-level ``import`` so the cost is paid on first use
+rather than at API startup.
+
+Usage:
+    openai = lazy_import("openai")
+    OPENAI_AVAILABLE = module_available("openai")
+
+    client = openai.AsyncOpenAI(api_key=key)  # openai is imported here
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import sys
+import threading
+from functools import cache
+from types import ModuleType
+from typing import Any
+
+
+@cache
+def module_available(name: str) -> bool:
+    """Whether ``name`` can be imported, checked without importing it."""
+    if name in sys.modules:
+        return sys.modules[name] is not None
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule(ModuleType):
+    """Module placeholder that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self) -> list[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Return ``name`` if it is already imported, otherwise a placeholder that imports it
+    on first attribute access.
+
+    Raises:
+        ImportError: On first use, if the module is not installed.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
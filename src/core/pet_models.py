@@ -11,6 +11,8 @@ from uuid import uuid4
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from src.core.progression import PET_MAX_LEVEL, PET_XP_PER_LEVEL, pet_evolution_stage
+
 
 class PetSpecies(str):
     """Available pet species"""
@@ -87,9 +89,9 @@ class UserPet(UserPetBase):
 
         Formula: 100 XP per level (simple for ADHD users)
         """
-        if self.level >= 10:
+        if self.level >= PET_MAX_LEVEL:
             return 0
-        return 100
+        return PET_XP_PER_LEVEL
 
     def get_evolution_stage(self) -> int:
         """
@@ -99,12 +101,7 @@ class UserPet(UserPetBase):
         - Level 5-9: Teen (stage 2)
         - Level 10: Adult (stage 3)
         """
-        if self.level >= 10:
-            return 3
-        elif self.level >= 5:
-            return 2
-        else:
-            return 1
+        return pet_evolution_stage(self.level)
 
 
 class UserPetUpdate(BaseModel):
@@ -0,0 +1,112 @@
+"""
+Level progression shared by XP balances, agents and pets.
+
+A level curve is a precomputed array of the total XP at which each level
+starts. Looking up a level is a binary search, and the levels of many XP
+totals (leaderboards, exports) are one ``numpy.searchsorted`` call.
+"""
+
+from bisect import bisect_right
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import numpy as np
+
+MAX_LEVEL = 100
+
+# Pets level up every 100 XP up to level 10 and evolve at levels 5 and 10
+PET_XP_PER_LEVEL = 100
+PET_MAX_LEVEL = 10
+PET_EVOLUTION_LEVELS = (5, 10)
+
+
+def xp_for_level(level: int) -> int:
+    """XP required to advance from the given level to the next (exponential curve)"""
+    return int(100 * (level**1.5))
+
+
+class LevelCurve:
+    """Levels 1..max_level, starting at the given total XP thresholds"""
+
+    def __init__(self, thresholds: Sequence[int]):
+        """
+        Initialize the curve.
+
+        Args:
+            thresholds: Total XP at which each level starts, ascending, with
+                thresholds[0] == 0 for level 1
+        """
+        self.thresholds = tuple(thresholds)
+        self._array = np.asarray(self.thresholds, dtype=np.int64)
+
+    @property
+    def max_level(self) -> int:
+        return len(self.thresholds)
+
+    def level_for(self, total_xp: int) -> int:
+        """Level reached with a total XP"""
+        return max(bisect_right(self.thresholds, total_xp), 1)
+
+    def levels_for(self, totals: Iterable[int] | np.ndarray) -> np.ndarray:
+        """Levels reached with each of many XP totals"""
+        totals = np.asarray(totals if isinstance(totals, np.ndarray) else list(totals))
+        return np.maximum(np.searchsorted(self._array, totals, side="right"), 1)
+
+    def floor(self, level: int) -> int:
+        """Total XP at which a level starts"""
+        return self.thresholds[level - 1]
+
+    def next_threshold(self, level: int) -> int | None:
+        """Total XP at which the next level starts (None at the maximum level)"""
+        return self.thresholds[level] if level < self.max_level else None
+
+    def progress(self, total_xp: int) -> dict[str, Any]:
+        """
+        Get progress through the current level.
+
+        Returns:
+            level, level_floor_xp, next_level_xp (None at the maximum level),
+            xp_in_level, xp_needed and progress_percentage
+        """
+        level = self.level_for(total_xp)
+        floor = self.floor(level)
+        next_xp = self.next_threshold(level)
+        return {
+            "level": level,
+            "level_floor_xp": floor,
+            "next_level_xp": next_xp,
+            "xp_in_level": total_xp - floor,
+            "xp_needed": max(next_xp - total_xp, 0) if next_xp is not None else 0,
+            "progress_percentage": (
+                (total_xp - floor) / (next_xp - floor) * 100 if next_xp is not None else 100.0
+            ),
+        }
+
+
+def _cumulative(level_costs: Iterable[int]) -> list[int]:
+    thresholds = [0]
+    for cost in level_costs:
+        thresholds.append(thresholds[-1] + cost)
+    return thresholds
+
+
+# User XP levels (user_progress, leaderboards, agents)
+XP_LEVELS = LevelCurve(_cumulative(xp_for_level(level) for level in range(1, MAX_LEVEL)))
+
+# Pet levels, from a pet's total XP ((level - 1) * 100 + xp)
+PET_LEVELS = LevelCurve(_cumulative([PET_XP_PER_LEVEL] * (PET_MAX_LEVEL - 1)))
+
+
+def level_for_xp(total_xp: int) -> int:
+    """User level reached with a total XP"""
+    return XP_LEVELS.level_for(total_xp)
+
+
+def levels_for_xp(totals: Iterable[int] | np.ndarray) -> np.ndarray:
+    """User levels reached with each of many XP totals"""
+    return XP_LEVELS.levels_for(totals)
+
+
+def pet_evolution_stage(level: int) -> int:
+    """Pet evolution stage: 1 (baby), 2 (teen) from level 5, 3 (adult) at level 10"""
+    return bisect_right(PET_EVOLUTION_LEVELS, level) + 1
@@ -50,9 +50,62 @@ class Settings(BaseSettings):
         default=".data/databases/test_proxy_agents.db", description="Test database file path"
     )
 
+    # Slow-Query Log
+    slow_query_log_enabled: bool = Field(
+        default=True, description="Fingerprint queries and capture plans of slow ones"
+    )
+    slow_query_threshold_ms: float = Field(
+        default=100.0, description="Statements slower than this are logged and explained", gt=0
+    )
+    slow_query_log_size: int = Field(
+        default=100, description="Slow statements kept in the slow-query log", ge=1
+    )
+
     # Redis Configuration
     redis_url: str = Field(default="redis://localhost:6379/0", description="Redis connection URL")
 
+    # Background Job Queue
+    job_queue_backend: Literal["sqlite", "redis"] = Field(
+        default="sqlite", description="Background job store (redis uses redis_url)"
+    )
+    job_queue_path: str = Field(
+        default=".data/databases/job_queue.db", description="SQLite job store file path"
+    )
+    job_queue_concurrency: int = Field(
+        default=4, description="Worker coroutines per job queue", ge=1, le=64
+    )
+    job_queue_poll_interval: float = Field(
+        default=1.0, description="Idle worker poll interval in seconds", gt=0
+    )
+
+    # Integration Sync Scheduler
+    integration_sync_enabled: bool = Field(
+        default=True, description="Periodically sync connected provider integrations"
+    )
+    integration_sync_tick_seconds: float = Field(
+        default=60.0, description="How often the scheduler looks for due syncs", gt=0
+    )
+    integration_sync_provider_concurrency: int = Field(
+        default=4, description="Concurrent syncs per provider", ge=1, le=64
+    )
+    integration_sync_user_concurrency: int = Field(
+        default=1, description="Concurrent syncs per user", ge=1, le=16
+    )
+    integration_sync_min_interval_minutes: int = Field(
+        default=5, description="Shortest adaptive sync interval", ge=1
+    )
+    integration_sync_max_interval_minutes: int = Field(
+        default=240, description="Longest adaptive sync interval", ge=1
+    )
+
+    # Productivity Metrics Pipeline
+    productivity_metrics_enabled: bool = Field(
+        default=True, description="Keep productivity_metrics materialized in the background"
+    )
+    productivity_metrics_tick_seconds: float = Field(
+        default=30.0, description="How often queued metric days are recomputed", gt=0
+    )
+
     # LLM Configuration
     llm_provider: Literal["openai", "anthropic", "gemini"] = Field(
         default="openai", description="LLM provider"
@@ -0,0 +1,132 @@
+"""
+Startup import profile - where does API cold start time go?
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter and turns
+the output into a tree of imports with self and cumulative times, so heavy imports
+(and who pulls them in) are easy to spot.
+
+Usage:
+    python -m src.core.startup_profile                  # profile src.api.main
+    python -m src.core.startup_profile --min-ms 20 --depth 3
+    python -m src.core.startup_profile src.agents.registry --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+@dataclass
+class ImportNode:
+    """One module import and the imports it triggered."""
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    children: list[ImportNode] = field(default_factory=list)
+
+    @property
+    def cumulative_ms(self) -> float:
+        return self.cumulative_us / 1000
+
+    def to_dict(self, min_us: int = 0) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "self_ms": self.self_us / 1000,
+            "cumulative_ms": self.cumulative_ms,
+            "children": [c.to_dict(min_us) for c in self.children if c.cumulative_us >= min_us],
+        }
+
+
+def parse_importtime(output: str) -> list[ImportNode]:
+    """
+    Build the import tree from ``-X importtime`` output.
+
+    Entries are printed after their children finish importing, indented two spaces per
+    level, so each entry adopts the pending entries one level deeper.
+    """
+    pending: dict[int, list[ImportNode]] = defaultdict(list)
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+            node = ImportNode(name.strip(), int(self_us), int(cumulative_us))
+        except ValueError:
+            continue  # header row
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        node.children = pending.pop(depth + 1, [])
+        pending[depth].append(node)
+    return pending[0]
+
+
+def profile_imports(module: str = "src.api.main", cwd: Path = PROJECT_ROOT) -> ImportNode:
+    """Import ``module`` in a fresh interpreter and return its import tree."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        detail = proc.stderr.strip().splitlines()[-1:] or ["unknown error"]
+        raise RuntimeError(f"importing {module} failed: {detail[0]}")
+
+    roots = parse_importtime(proc.stderr)
+    total = sum(root.cumulative_us for root in roots)
+    return ImportNode("<startup>", 0, total, sorted(roots, key=lambda n: -n.cumulative_us))
+
+
+def format_tree(root: ImportNode, min_ms: float = 10.0, max_depth: int = 4) -> str:
+    """Render the tree, heaviest imports first, hiding anything under ``min_ms``."""
+    lines = [
+        f"{'cumulative':>10}  {'self':>8}  module",
+        f"{root.cumulative_ms:>8.1f}ms  {'':>8}  {root.name}",
+    ]
+
+    def walk(node: ImportNode, depth: int) -> None:
+        if depth > max_depth:
+            return
+        for child in sorted(node.children, key=lambda n: -n.cumulative_us):
+            if child.cumulative_ms < min_ms:
+                continue
+            lines.append(
+                f"{child.cumulative_ms:>8.1f}ms  {child.self_us / 1000:>6.1f}ms  "
+                f"{'  ' * depth}{child.name}"
+            )
+            walk(child, depth + 1)
+
+    walk(root, 0)
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("module", nargs="?", default="src.api.main")
+    parser.add_argument("--min-ms", type=float, default=10.0, help="hide faster imports")
+    parser.add_argument("--depth", type=int, default=4, help="maximum tree depth")
+    parser.add_argument("--json", action="store_true", help="emit the tree as JSON")
+    args = parser.parse_args(argv)
+
+    root = profile_imports(args.module)
+    if args.json:
+        print(json.dumps(root.to_dict(min_us=int(args.min_ms * 1000)), indent=2))
+    else:
+        print(format_tree(root, args.min_ms, args.depth))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
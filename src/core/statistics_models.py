@@ -25,6 +25,12 @@ class UserStatisticsResponse(BaseModel):
     streak_days: int = Field(
         ..., description="Current consecutive days with task completions", ge=0, example=7
     )
+    total_focus_minutes: int = Field(
+        0, description="Minutes spent in completed focus sessions", ge=0, example=300
+    )
+    focus_sessions_completed: int = Field(
+        0, description="Number of completed focus sessions", ge=0, example=12
+    )
 
     class Config:
         """Pydantic model configuration."""
@@ -38,6 +44,8 @@ class UserStatisticsResponse(BaseModel):
                 "avg_completion_time_minutes": 25.5,
                 "productivity_score": 78.5,
                 "streak_days": 7,
+                "total_focus_minutes": 300,
+                "focus_sessions_completed": 12,
             }
         }
 
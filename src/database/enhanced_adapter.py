@@ -7,12 +7,15 @@ from __future__ import annotations
 import asyncio
 import json
 import sqlite3
+import time
+from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
 
 import structlog
 
 from src.core.models import Message
+from src.services.request_metrics import record_db_query
 
 logger = structlog.get_logger()
 
@@ -29,8 +32,39 @@ class EnhancedDatabaseAdapter:
         self._connection = None
         self._connection_pool = []
         self._max_pool_size = 5
+        self._query_listeners: list[Callable[[sqlite3.Connection, str, tuple, float], None]] = []
         self._init_db()
 
+    def add_query_listener(
+        self, listener: Callable[[sqlite3.Connection, str, tuple, float], None]
+    ) -> None:
+        """
+        Register a callback run after every execute_read/execute_write.
+
+        Args:
+            listener: Called with (connection, query, params, duration_seconds)
+        """
+        if listener not in self._query_listeners:
+            self._query_listeners.append(listener)
+
+    def remove_query_listener(
+        self, listener: Callable[[sqlite3.Connection, str, tuple, float], None]
+    ) -> None:
+        """Unregister a query listener (no-op if not registered)"""
+        if listener in self._query_listeners:
+            self._query_listeners.remove(listener)
+
+    def _record_query(
+        self, conn: sqlite3.Connection, query: str, params: tuple, duration: float
+    ) -> None:
+        """Report a finished statement to request metrics and query listeners"""
+        record_db_query(duration)
+        for listener in self._query_listeners:
+            try:
+                listener(conn, query, params, duration)
+            except Exception as e:
+                logger.warning("query_listener_failed", error=str(e))
+
     def get_connection(self):
         """
         Get a database connection with foreign keys and WAL mode enabled.
@@ -78,8 +112,11 @@ class EnhancedDatabaseAdapter:
         """
         conn = self.get_connection()
         cursor = conn.cursor()
+        started = time.perf_counter()
         cursor.execute(query, params)
-        return cursor.fetchall()
+        rows = cursor.fetchall()
+        self._record_query(conn, query, params, time.perf_counter() - started)
+        return rows
 
     def execute_write(self, query: str, params: tuple = ()) -> int:
         """
@@ -94,8 +131,10 @@ class EnhancedDatabaseAdapter:
         """
         conn = self.get_connection()
         cursor = conn.cursor()
+        started = time.perf_counter()
         cursor.execute(query, params)
         conn.commit()
+        self._record_query(conn, query, params, time.perf_counter() - started)
         return cursor.lastrowid if query.strip().upper().startswith("INSERT") else cursor.rowcount
 
     def _init_db(self):
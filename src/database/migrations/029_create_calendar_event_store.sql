@@ -0,0 +1,34 @@
+-- Migration 029: Create Local Calendar Event Store
+-- Purpose: Keep a local copy of Google Calendar events, kept current with
+-- syncToken-based incremental sync, so free/busy and calendar-aware scheduling
+-- read local data instead of making API round trips.
+
+-- Table: calendar_events
+-- One row per (owner, calendar, event); times are stored as UTC epoch seconds
+CREATE TABLE IF NOT EXISTS calendar_events (
+    owner_id TEXT NOT NULL,     -- User ID the calendar belongs to
+    calendar_id TEXT NOT NULL,  -- Google calendar ID (e.g. 'primary')
+    event_id TEXT NOT NULL,
+    summary TEXT,
+    start_ts REAL NOT NULL,     -- Event start (UTC epoch seconds)
+    end_ts REAL NOT NULL,       -- Event end (UTC epoch seconds, exclusive)
+    is_all_day INTEGER DEFAULT 0,
+    is_busy INTEGER DEFAULT 1,  -- 0 for transparent events or invitations the owner declined
+    raw TEXT NOT NULL,          -- JSON event resource as returned by the API
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (owner_id, calendar_id, event_id)
+);
+
+-- Table: calendar_sync_state
+-- Stores the nextSyncToken for each synced calendar
+CREATE TABLE IF NOT EXISTS calendar_sync_state (
+    owner_id TEXT NOT NULL,
+    calendar_id TEXT NOT NULL,
+    sync_token TEXT,
+    last_synced_at TIMESTAMP,
+    PRIMARY KEY (owner_id, calendar_id)
+);
+
+-- Time-window index for range and free/busy queries
+CREATE INDEX IF NOT EXISTS idx_calendar_events_window
+    ON calendar_events(owner_id, start_ts, end_ts);
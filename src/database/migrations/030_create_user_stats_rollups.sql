@@ -0,0 +1,240 @@
+-- Migration 030: Create Per-User Statistics Rollups
+-- Purpose: Keep per-user, per-day task and focus counters up to date as rows in
+-- tasks change, so statistics (totals, completion rate, average completion time,
+-- streak) are read from one summary row instead of rescanning task history.
+-- Tasks count towards their assignee. Days are the UTC date of the timestamp.
+-- Focus session triggers are created by StatisticsService, because the
+-- focus_sessions column names differ between schema versions.
+
+-- Table: user_daily_stats
+-- One row per user and day
+CREATE TABLE IF NOT EXISTS user_daily_stats (
+    user_id TEXT NOT NULL,
+    day TEXT NOT NULL,                       -- YYYY-MM-DD
+    tasks_created INTEGER DEFAULT 0,
+    tasks_completed INTEGER DEFAULT 0,
+    completion_minutes REAL DEFAULT 0,       -- Sum of completion times of tasks completed that day
+    focus_minutes INTEGER DEFAULT 0,
+    focus_sessions INTEGER DEFAULT 0,        -- Completed focus sessions started that day
+    PRIMARY KEY (user_id, day)
+);
+
+-- Table: user_stats_summary
+-- Running all-time totals and the streak ending at last_completion_day
+CREATE TABLE IF NOT EXISTS user_stats_summary (
+    user_id TEXT PRIMARY KEY,
+    total_tasks INTEGER DEFAULT 0,
+    completed_tasks INTEGER DEFAULT 0,
+    completion_minutes REAL DEFAULT 0,
+    focus_minutes INTEGER DEFAULT 0,
+    focus_sessions INTEGER DEFAULT 0,
+    current_streak INTEGER DEFAULT 0,        -- Consecutive completion days ending at last_completion_day
+    last_completion_day TEXT,
+    streak_dirty INTEGER DEFAULT 0,          -- 1 when a late or removed completion needs a recount
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- A task's completion time: actual hours if logged, else started -> completed
+-- Completed tasks without completed_at count on the day they were last updated
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_stats_insert
+AFTER INSERT ON tasks
+WHEN NEW.assignee_id IS NOT NULL
+BEGIN
+    INSERT INTO user_daily_stats (user_id, day, tasks_created)
+    VALUES (NEW.assignee_id, date(COALESCE(NEW.created_at, CURRENT_TIMESTAMP)), 1)
+    ON CONFLICT(user_id, day) DO UPDATE SET tasks_created = tasks_created + 1;
+
+    INSERT INTO user_stats_summary (user_id, total_tasks)
+    VALUES (NEW.assignee_id, 1)
+    ON CONFLICT(user_id) DO UPDATE SET
+        total_tasks = total_tasks + 1,
+        updated_at = CURRENT_TIMESTAMP;
+
+    INSERT INTO user_daily_stats (user_id, day, tasks_completed, completion_minutes)
+    SELECT
+        NEW.assignee_id,
+        date(COALESCE(NEW.completed_at, NEW.updated_at, CURRENT_TIMESTAMP)),
+        1,
+        COALESCE(
+            NULLIF(NEW.actual_hours, 0) * 60,
+            MAX((julianday(NEW.completed_at) - julianday(NEW.started_at)) * 1440, 0),
+            0
+        )
+    WHERE NEW.status = 'completed'
+    ON CONFLICT(user_id, day) DO UPDATE SET
+        tasks_completed = tasks_completed + 1,
+        completion_minutes = completion_minutes + excluded.completion_minutes;
+
+    INSERT INTO user_stats_summary (
+        user_id, completed_tasks, completion_minutes, current_streak, last_completion_day
+    )
+    SELECT
+        NEW.assignee_id,
+        1,
+        COALESCE(
+            NULLIF(NEW.actual_hours, 0) * 60,
+            MAX((julianday(NEW.completed_at) - julianday(NEW.started_at)) * 1440, 0),
+            0
+        ),
+        1,
+        date(COALESCE(NEW.completed_at, NEW.updated_at, CURRENT_TIMESTAMP))
+    WHERE NEW.status = 'completed'
+    ON CONFLICT(user_id) DO UPDATE SET
+        completed_tasks = completed_tasks + 1,
+        completion_minutes = completion_minutes + excluded.completion_minutes,
+        current_streak = CASE
+            WHEN last_completion_day IS NULL
+                OR excluded.last_completion_day > date(last_completion_day, '+1 day') THEN 1
+            WHEN excluded.last_completion_day = date(last_completion_day, '+1 day')
+                THEN current_streak + 1
+            ELSE current_streak
+        END,
+        streak_dirty = CASE
+            WHEN excluded.last_completion_day < last_completion_day THEN 1
+            ELSE streak_dirty
+        END,
+        last_completion_day = MAX(COALESCE(last_completion_day, ''), excluded.last_completion_day),
+        updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_stats_delete
+AFTER DELETE ON tasks
+WHEN OLD.assignee_id IS NOT NULL
+BEGIN
+    UPDATE user_daily_stats SET tasks_created = tasks_created - 1
+    WHERE user_id = OLD.assignee_id AND day = date(COALESCE(OLD.created_at, CURRENT_TIMESTAMP));
+
+    UPDATE user_daily_stats SET
+        tasks_completed = tasks_completed - 1,
+        completion_minutes = completion_minutes - COALESCE(
+            NULLIF(OLD.actual_hours, 0) * 60,
+            MAX((julianday(OLD.completed_at) - julianday(OLD.started_at)) * 1440, 0),
+            0
+        )
+    WHERE OLD.status = 'completed'
+        AND user_id = OLD.assignee_id
+        AND day = date(COALESCE(OLD.completed_at, OLD.updated_at, CURRENT_TIMESTAMP));
+
+    UPDATE user_stats_summary SET
+        total_tasks = total_tasks - 1,
+        completed_tasks = completed_tasks - (OLD.status = 'completed'),
+        completion_minutes = completion_minutes - CASE WHEN OLD.status = 'completed' THEN
+            COALESCE(
+                NULLIF(OLD.actual_hours, 0) * 60,
+                MAX((julianday(OLD.completed_at) - julianday(OLD.started_at)) * 1440, 0),
+                0
+            )
+            ELSE 0 END,
+        streak_dirty = CASE WHEN OLD.status = 'completed' THEN 1 ELSE streak_dirty END,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE user_id = OLD.assignee_id;
+END;
+
+-- An update removes the old row's contribution and adds the new row's
+CREATE TRIGGER IF NOT EXISTS trg_tasks_stats_update
+AFTER UPDATE OF assignee_id, status, completed_at, started_at, actual_hours ON tasks
+WHEN OLD.assignee_id IS NOT NEW.assignee_id
+    OR OLD.status IS NOT NEW.status
+    OR (NEW.status = 'completed' AND (
+        OLD.completed_at IS NOT NEW.completed_at
+        OR OLD.started_at IS NOT NEW.started_at
+        OR OLD.actual_hours IS NOT NEW.actual_hours
+    ))
+BEGIN
+    -- Old assignee loses the task
+    UPDATE user_daily_stats SET tasks_created = tasks_created - 1
+    WHERE OLD.assignee_id IS NOT NEW.assignee_id
+        AND user_id = OLD.assignee_id
+        AND day = date(COALESCE(OLD.created_at, CURRENT_TIMESTAMP));
+
+    UPDATE user_stats_summary SET total_tasks = total_tasks - 1
+    WHERE OLD.assignee_id IS NOT NEW.assignee_id AND user_id = OLD.assignee_id;
+
+    -- Old completion is removed
+    UPDATE user_daily_stats SET
+        tasks_completed = tasks_completed - 1,
+        completion_minutes = completion_minutes - COALESCE(
+            NULLIF(OLD.actual_hours, 0) * 60,
+            MAX((julianday(OLD.completed_at) - julianday(OLD.started_at)) * 1440, 0),
+            0
+        )
+    WHERE OLD.status = 'completed'
+        AND user_id = OLD.assignee_id
+        AND day = date(COALESCE(OLD.completed_at, OLD.updated_at, CURRENT_TIMESTAMP));
+
+    UPDATE user_stats_summary SET
+        completed_tasks = completed_tasks - 1,
+        completion_minutes = completion_minutes - COALESCE(
+            NULLIF(OLD.actual_hours, 0) * 60,
+            MAX((julianday(OLD.completed_at) - julianday(OLD.started_at)) * 1440, 0),
+            0
+        ),
+        streak_dirty = 1,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE OLD.status = 'completed' AND user_id = OLD.assignee_id;
+
+    -- New assignee gains the task
+    INSERT INTO user_daily_stats (user_id, day, tasks_created)
+    SELECT NEW.assignee_id, date(COALESCE(NEW.created_at, CURRENT_TIMESTAMP)), 1
+    WHERE NEW.assignee_id IS NOT NULL AND OLD.assignee_id IS NOT NEW.assignee_id
+    ON CONFLICT(user_id, day) DO UPDATE SET tasks_created = tasks_created + 1;
+
+    INSERT INTO user_stats_summary (user_id, total_tasks)
+    SELECT NEW.assignee_id, 1
+    WHERE NEW.assignee_id IS NOT NULL AND OLD.assignee_id IS NOT NEW.assignee_id
+    ON CONFLICT(user_id) DO UPDATE SET
+        total_tasks = total_tasks + 1,
+        updated_at = CURRENT_TIMESTAMP;
+
+    -- New completion is added
+    INSERT INTO user_daily_stats (user_id, day, tasks_completed, completion_minutes)
+    SELECT
+        NEW.assignee_id,
+        date(COALESCE(NEW.completed_at, NEW.updated_at, CURRENT_TIMESTAMP)),
+        1,
+        COALESCE(
+            NULLIF(NEW.actual_hours, 0) * 60,
+            MAX((julianday(NEW.completed_at) - julianday(NEW.started_at)) * 1440, 0),
+            0
+        )
+    WHERE NEW.status = 'completed' AND NEW.assignee_id IS NOT NULL
+    ON CONFLICT(user_id, day) DO UPDATE SET
+        tasks_completed = tasks_completed + 1,
+        completion_minutes = completion_minutes + excluded.completion_minutes;
+
+    INSERT INTO user_stats_summary (
+        user_id, completed_tasks, completion_minutes, current_streak, last_completion_day
+    )
+    SELECT
+        NEW.assignee_id,
+        1,
+        COALESCE(
+            NULLIF(NEW.actual_hours, 0) * 60,
+            MAX((julianday(NEW.completed_at) - julianday(NEW.started_at)) * 1440, 0),
+            0
+        ),
+        1,
+        date(COALESCE(NEW.completed_at, NEW.updated_at, CURRENT_TIMESTAMP))
+    WHERE NEW.status = 'completed' AND NEW.assignee_id IS NOT NULL
+    ON CONFLICT(user_id) DO UPDATE SET
+        completed_tasks = completed_tasks + 1,
+        completion_minutes = completion_minutes + excluded.completion_minutes,
+        current_streak = CASE
+            WHEN last_completion_day IS NULL
+                OR excluded.last_completion_day > date(last_completion_day, '+1 day') THEN 1
+            WHEN excluded.last_completion_day = date(last_completion_day, '+1 day')
+                THEN current_streak + 1
+            ELSE current_streak
+        END,
+        streak_dirty = CASE
+            WHEN excluded.last_completion_day < last_completion_day THEN 1
+            ELSE streak_dirty
+        END,
+        last_completion_day = MAX(COALESCE(last_completion_day, ''), excluded.last_completion_day),
+        updated_at = CURRENT_TIMESTAMP;
+END;
+
+-- Range reads of recent completion days (streak recounts, trends)
+CREATE INDEX IF NOT EXISTS idx_user_daily_stats_completed
+    ON user_daily_stats(user_id, day) WHERE tasks_completed > 0;
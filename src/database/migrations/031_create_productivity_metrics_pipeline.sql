@@ -0,0 +1,63 @@
+-- Migration 031: Materialized Productivity Metrics Pipeline
+-- Purpose: Queue the (user, day) pairs whose productivity_metrics rows are out
+-- of date, so ProductivityMetricsPipeline recomputes only those days and the
+-- weeks and months containing them. Requires the rollups from migration 030.
+
+-- Table: productivity_metrics_dirty
+-- Days whose daily metrics need recomputing; drained by the pipeline
+CREATE TABLE IF NOT EXISTS productivity_metrics_dirty (
+    user_id TEXT NOT NULL,
+    day TEXT NOT NULL,          -- YYYY-MM-DD (UTC)
+    queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, day)
+);
+
+-- Trigger inserts use an upsert clause: an outer statement's conflict policy
+-- would override INSERT OR IGNORE
+
+-- Any change to a day's task or focus rollup dirties that day,
+-- including late-arriving data for days that were already materialized
+CREATE TRIGGER IF NOT EXISTS trg_daily_stats_dirty_insert
+AFTER INSERT ON user_daily_stats
+BEGIN
+    INSERT INTO productivity_metrics_dirty (user_id, day)
+    VALUES (NEW.user_id, NEW.day)
+    ON CONFLICT(user_id, day) DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_daily_stats_dirty_update
+AFTER UPDATE ON user_daily_stats
+BEGIN
+    INSERT INTO productivity_metrics_dirty (user_id, day)
+    VALUES (NEW.user_id, NEW.day)
+    ON CONFLICT(user_id, day) DO NOTHING;
+END;
+
+-- Overdue counts depend on due dates, which the rollups don't track
+CREATE TRIGGER IF NOT EXISTS trg_tasks_due_dirty_insert
+AFTER INSERT ON tasks
+WHEN NEW.assignee_id IS NOT NULL AND NEW.due_date IS NOT NULL
+BEGIN
+    INSERT INTO productivity_metrics_dirty (user_id, day)
+    VALUES (NEW.assignee_id, date(NEW.due_date))
+    ON CONFLICT(user_id, day) DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_due_dirty_update
+AFTER UPDATE OF due_date, assignee_id, status, completed_at ON tasks
+WHEN OLD.due_date IS NOT NULL OR NEW.due_date IS NOT NULL
+BEGIN
+    INSERT INTO productivity_metrics_dirty (user_id, day)
+    SELECT OLD.assignee_id, date(OLD.due_date)
+    WHERE OLD.assignee_id IS NOT NULL AND OLD.due_date IS NOT NULL
+    ON CONFLICT(user_id, day) DO NOTHING;
+
+    INSERT INTO productivity_metrics_dirty (user_id, day)
+    SELECT NEW.assignee_id, date(NEW.due_date)
+    WHERE NEW.assignee_id IS NOT NULL AND NEW.due_date IS NOT NULL
+    ON CONFLICT(user_id, day) DO NOTHING;
+END;
+
+-- Range reads of one user's metrics at one grain
+CREATE INDEX IF NOT EXISTS idx_metrics_user_period_date
+    ON productivity_metrics(user_id, period_type, date);
@@ -0,0 +1,131 @@
+-- Migration 032: Create Per-User Circadian Profiles
+-- Purpose: Keep a running mean and variance of each user's energy readings and
+-- focus sessions per hour of the week, so circadian queries read at most 168
+-- rows by primary key instead of grouping raw history by strftime('%H').
+-- Buckets are weekday * 24 + hour, with weekday as in strftime('%w') (Sunday = 0).
+-- Focus session triggers are created by CircadianProfileRepository, because
+-- the focus_sessions column names differ between schema versions.
+
+-- Table: energy_readings
+-- Raw readings written by EnhancedEnergyRepository; the triggers below keep the
+-- energy series in step with every insert, update and delete
+CREATE TABLE IF NOT EXISTS energy_readings (
+    reading_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    energy_level REAL NOT NULL,
+    context TEXT,
+    factors TEXT,
+    confidence REAL DEFAULT 0.8,
+    created_at TEXT NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES users (user_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_energy_user_timestamp ON energy_readings (user_id, timestamp);
+
+-- Table: circadian_profile_buckets
+-- One row per user, series and hour of the week (Welford running statistics).
+-- A profile is a contiguous primary key range, stored in bucket order.
+CREATE TABLE IF NOT EXISTS circadian_profile_buckets (
+    user_id TEXT NOT NULL,
+    series TEXT NOT NULL,                    -- energy, focus_planned, focus_actual, focus_completed
+    bucket INTEGER NOT NULL,                 -- 0..167
+    n INTEGER NOT NULL DEFAULT 0,
+    mean REAL NOT NULL DEFAULT 0,
+    m2 REAL NOT NULL DEFAULT 0,              -- Sum of squared deviations from the mean
+    min_value REAL,
+    max_value REAL,
+    PRIMARY KEY (user_id, series, bucket)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_energy_profile_insert
+AFTER INSERT ON energy_readings
+BEGIN
+    INSERT INTO circadian_profile_buckets (user_id, series, bucket, n, mean, m2, min_value, max_value)
+    SELECT
+        NEW.user_id,
+        'energy',
+        CAST(strftime('%w', NEW.timestamp) AS INTEGER) * 24
+            + CAST(strftime('%H', NEW.timestamp) AS INTEGER),
+        1, CAST(NEW.energy_level AS REAL), 0, NEW.energy_level, NEW.energy_level
+    WHERE strftime('%w', NEW.timestamp) IS NOT NULL
+    ON CONFLICT(user_id, series, bucket) DO UPDATE SET
+        m2 = m2 + (excluded.mean - mean) * (excluded.mean - mean) * n / (n + 1.0),
+        mean = mean + (excluded.mean - mean) / (n + 1.0),
+        n = n + 1,
+        min_value = MIN(min_value, excluded.min_value),
+        max_value = MAX(max_value, excluded.max_value);
+END;
+
+-- Removing a reading reverses the Welford step. Min and max are only recomputed
+-- from the bucket's remaining readings when the removed value was the extreme.
+CREATE TRIGGER IF NOT EXISTS trg_energy_profile_delete
+AFTER DELETE ON energy_readings
+BEGIN
+    DELETE FROM circadian_profile_buckets
+    WHERE user_id = OLD.user_id AND series = 'energy' AND n <= 1
+        AND bucket = CAST(strftime('%w', OLD.timestamp) AS INTEGER) * 24
+            + CAST(strftime('%H', OLD.timestamp) AS INTEGER);
+    UPDATE circadian_profile_buckets SET
+        m2 = MAX(m2 - (OLD.energy_level - mean) * (OLD.energy_level - mean) * n / (n - 1.0), 0),
+        mean = mean - (OLD.energy_level - mean) / (n - 1.0),
+        n = n - 1,
+        min_value = CASE WHEN OLD.energy_level > min_value THEN min_value ELSE (
+            SELECT MIN(energy_level) FROM energy_readings
+            WHERE user_id = OLD.user_id
+                AND strftime('%w', timestamp) = strftime('%w', OLD.timestamp)
+                AND strftime('%H', timestamp) = strftime('%H', OLD.timestamp)
+        ) END,
+        max_value = CASE WHEN OLD.energy_level < max_value THEN max_value ELSE (
+            SELECT MAX(energy_level) FROM energy_readings
+            WHERE user_id = OLD.user_id
+                AND strftime('%w', timestamp) = strftime('%w', OLD.timestamp)
+                AND strftime('%H', timestamp) = strftime('%H', OLD.timestamp)
+        ) END
+    WHERE user_id = OLD.user_id AND series = 'energy'
+        AND bucket = CAST(strftime('%w', OLD.timestamp) AS INTEGER) * 24
+            + CAST(strftime('%H', OLD.timestamp) AS INTEGER);
+END;
+
+-- An edited reading leaves its old bucket and joins its new one
+CREATE TRIGGER IF NOT EXISTS trg_energy_profile_update
+AFTER UPDATE OF user_id, timestamp, energy_level ON energy_readings
+BEGIN
+    DELETE FROM circadian_profile_buckets
+    WHERE user_id = OLD.user_id AND series = 'energy' AND n <= 1
+        AND bucket = CAST(strftime('%w', OLD.timestamp) AS INTEGER) * 24
+            + CAST(strftime('%H', OLD.timestamp) AS INTEGER);
+    UPDATE circadian_profile_buckets SET
+        m2 = MAX(m2 - (OLD.energy_level - mean) * (OLD.energy_level - mean) * n / (n - 1.0), 0),
+        mean = mean - (OLD.energy_level - mean) / (n - 1.0),
+        n = n - 1,
+        min_value = CASE WHEN OLD.energy_level > min_value THEN min_value ELSE (
+            SELECT MIN(energy_level) FROM energy_readings
+            WHERE user_id = OLD.user_id
+                AND strftime('%w', timestamp) = strftime('%w', OLD.timestamp)
+                AND strftime('%H', timestamp) = strftime('%H', OLD.timestamp)
+        ) END,
+        max_value = CASE WHEN OLD.energy_level < max_value THEN max_value ELSE (
+            SELECT MAX(energy_level) FROM energy_readings
+            WHERE user_id = OLD.user_id
+                AND strftime('%w', timestamp) = strftime('%w', OLD.timestamp)
+                AND strftime('%H', timestamp) = strftime('%H', OLD.timestamp)
+        ) END
+    WHERE user_id = OLD.user_id AND series = 'energy'
+        AND bucket = CAST(strftime('%w', OLD.timestamp) AS INTEGER) * 24
+            + CAST(strftime('%H', OLD.timestamp) AS INTEGER);
+    INSERT INTO circadian_profile_buckets (user_id, series, bucket, n, mean, m2, min_value, max_value)
+    SELECT
+        NEW.user_id,
+        'energy',
+        CAST(strftime('%w', NEW.timestamp) AS INTEGER) * 24
+            + CAST(strftime('%H', NEW.timestamp) AS INTEGER),
+        1, CAST(NEW.energy_level AS REAL), 0, NEW.energy_level, NEW.energy_level
+    WHERE strftime('%w', NEW.timestamp) IS NOT NULL
+    ON CONFLICT(user_id, series, bucket) DO UPDATE SET
+        m2 = m2 + (excluded.mean - mean) * (excluded.mean - mean) * n / (n + 1.0),
+        mean = mean + (excluded.mean - mean) / (n + 1.0),
+        n = n + 1,
+        min_value = MIN(min_value, excluded.min_value),
+        max_value = MAX(max_value, excluded.max_value);
+END;
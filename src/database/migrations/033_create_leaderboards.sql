@@ -0,0 +1,21 @@
+-- Migration 033: Create Leaderboards
+-- Purpose: Keep every user's leaderboard scores per board and time window, so
+-- rankings are read from an ordered index instead of aggregating XP history.
+-- Boards: xp (windows: daily, weekly, all_time), streak and badges (all_time).
+-- Periods: 'all_time', 'daily:YYYY-MM-DD' and 'weekly:YYYY-MM-DD' (Monday, UTC).
+
+-- Table: leaderboard_scores
+-- One row per board, period and user; maintained by LeaderboardService
+CREATE TABLE IF NOT EXISTS leaderboard_scores (
+    board TEXT NOT NULL,
+    period TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    score INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (board, period, user_id)
+) WITHOUT ROWID;
+
+-- Covering index in ranking order: top-N, neighbours and rank counts are
+-- index-only range scans
+CREATE INDEX IF NOT EXISTS idx_leaderboard_ranking
+    ON leaderboard_scores(board, period, score DESC, user_id);
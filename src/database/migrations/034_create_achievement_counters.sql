@@ -0,0 +1,19 @@
+-- Migration 034: Create Achievement Counters
+-- Purpose: Keep the per-user counters achievement criteria are evaluated
+-- against, so an event only re-checks the achievements that depend on it
+-- instead of recomputing aggregates for the whole catalog.
+-- Maintained by AchievementEngine; counter names are the metric names of
+-- achievements.criteria (tasks_completed, focus_sessions_completed, ...).
+
+-- Table: achievement_counters
+-- One row per user and metric. Means keep their sum in value and the number
+-- of samples in samples; daily counters keep the day they count in day.
+CREATE TABLE IF NOT EXISTS achievement_counters (
+    user_id TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL DEFAULT 0,
+    samples INTEGER NOT NULL DEFAULT 0,
+    day TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, metric)
+) WITHOUT ROWID;
@@ -0,0 +1,46 @@
+-- Migration 035: Create XP Ledger
+-- Purpose: Record every XP award in an append-only ledger and keep balances
+-- and levels in user_progress with one atomic upsert per award batch, instead
+-- of read-modify-write updates at each call site.
+
+-- Table: xp_ledger
+-- Append-only; awards are never updated or deleted
+CREATE TABLE IF NOT EXISTS xp_ledger (
+    entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    source TEXT NOT NULL,                    -- task, micro_step, pomodoro, solo_session, ...
+    reference_id TEXT,                       -- Awarded entity (task, step, session) if any
+    reason TEXT,
+    awarded_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_xp_ledger_user_time
+    ON xp_ledger(user_id, awarded_at);
+
+-- An entity is awarded at most once per source: retried requests are no-ops
+CREATE UNIQUE INDEX IF NOT EXISTS idx_xp_ledger_reference
+    ON xp_ledger(user_id, source, reference_id)
+    WHERE reference_id IS NOT NULL;
+
+-- Table: xp_level_thresholds
+-- Total XP at which each level starts; filled by XPLedgerService
+CREATE TABLE IF NOT EXISTS xp_level_thresholds (
+    level INTEGER PRIMARY KEY,
+    min_xp INTEGER NOT NULL UNIQUE
+);
+
+-- Table: user_progress
+-- Same columns as migration 022; user ownership is enforced by the
+-- application, as in migration 009
+CREATE TABLE IF NOT EXISTS user_progress (
+    user_id TEXT PRIMARY KEY,
+    total_xp INTEGER DEFAULT 0,
+    current_level INTEGER DEFAULT 1,
+    current_streak INTEGER DEFAULT 0,
+    longest_streak INTEGER DEFAULT 0,
+    last_completion_date DATE,
+    total_tasks_completed INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
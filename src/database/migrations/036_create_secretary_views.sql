@@ -0,0 +1,50 @@
+-- Migration 036: Support SQL-Computed Secretary Views
+-- Purpose: Let the secretary dashboard, priority matrix, daily briefing and
+-- priority suggestions select only the tasks in their due-date windows with
+-- indexed queries, and let SecretaryService cache each user's views until one
+-- of their tasks changes.
+-- Due and completion times are compared as julianday() values, so ISO
+-- timestamps with or without a UTC offset order correctly; naive ones are UTC.
+
+-- Open tasks of an assignee by due date (urgency windows, overdue counts)
+CREATE INDEX IF NOT EXISTS idx_tasks_open_due
+    ON tasks(assignee_id, julianday(due_date))
+    WHERE status != 'completed';
+
+-- Completed tasks of an assignee by completion time (completed today)
+CREATE INDEX IF NOT EXISTS idx_tasks_done_at
+    ON tasks(assignee_id, julianday(COALESCE(completed_at, updated_at)))
+    WHERE status = 'completed';
+
+-- Table: task_change_versions
+-- Bumped for a task's old and new assignee, and for '*' (all tasks), whenever
+-- a task is inserted, updated or deleted. Cached views are valid while the
+-- version they were computed at is current. Unassigned tasks use ''.
+CREATE TABLE IF NOT EXISTS task_change_versions (
+    scope TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_version_insert
+AFTER INSERT ON tasks
+BEGIN
+    INSERT INTO task_change_versions (scope, version)
+    VALUES (COALESCE(NEW.assignee_id, ''), 1), ('*', 1)
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_version_update
+AFTER UPDATE ON tasks
+BEGIN
+    INSERT INTO task_change_versions (scope, version)
+    VALUES (COALESCE(OLD.assignee_id, ''), 1), (COALESCE(NEW.assignee_id, ''), 1), ('*', 1)
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_version_delete
+AFTER DELETE ON tasks
+BEGIN
+    INSERT INTO task_change_versions (scope, version)
+    VALUES (COALESCE(OLD.assignee_id, ''), 1), ('*', 1)
+    ON CONFLICT(scope) DO UPDATE SET version = version + 1;
+END;
@@ -0,0 +1,325 @@
+"""
+Local calendar event store.
+
+Keeps a SQLite copy of Google Calendar events per user and calendar, updated
+incrementally with the Calendar API's ``syncToken`` so range queries and
+free/busy lookups are answered locally instead of with API round trips.
+"""
+
+import json
+import logging
+from datetime import UTC, date, datetime, time
+from pathlib import Path
+
+from src.database.enhanced_adapter import EnhancedDatabaseAdapter, get_enhanced_database
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "database"
+    / "migrations"
+    / "029_create_calendar_event_store.sql"
+)
+
+
+class CalendarEventStore:
+    """SQLite-backed store of calendar events with per-calendar sync tokens."""
+
+    def __init__(self, db: EnhancedDatabaseAdapter):
+        """
+        Initialize calendar event store.
+
+        Args:
+            db: Database adapter instance
+        """
+        self.db = db
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        """Create the event store tables if they don't exist"""
+        conn = self.db.get_connection()
+        conn.executescript(MIGRATION_PATH.read_text())
+        conn.commit()
+
+    # ========================================================================
+    # Sync State
+    # ========================================================================
+
+    def get_sync_token(self, owner_id: str, calendar_id: str = "primary") -> str | None:
+        """
+        Get the stored sync token for a calendar.
+
+        Args:
+            owner_id: User ID the calendar belongs to
+            calendar_id: Calendar ID
+
+        Returns:
+            Sync token, or None if the calendar needs a full sync
+        """
+        rows = self.db.execute_read(
+            "SELECT sync_token FROM calendar_sync_state WHERE owner_id = ? AND calendar_id = ?",
+            (owner_id, calendar_id),
+        )
+        return rows[0]["sync_token"] if rows else None
+
+    def get_last_synced_at(self, owner_id: str, calendar_id: str = "primary") -> datetime | None:
+        """Get when a calendar was last synced, or None if never"""
+        rows = self.db.execute_read(
+            "SELECT last_synced_at FROM calendar_sync_state WHERE owner_id = ? AND calendar_id = ?",
+            (owner_id, calendar_id),
+        )
+        if not rows or not rows[0]["last_synced_at"]:
+            return None
+        return datetime.fromisoformat(rows[0]["last_synced_at"])
+
+    def apply_sync(
+        self,
+        owner_id: str,
+        calendar_id: str,
+        items: list[dict],
+        next_sync_token: str | None,
+        full_sync: bool = False,
+    ) -> int:
+        """
+        Apply a page set of changed events and store the new sync token.
+
+        Cancelled events are deleted; everything else is upserted. On a full
+        sync the calendar's existing events are replaced. All changes are
+        committed in a single transaction together with the token.
+
+        Args:
+            owner_id: User ID the calendar belongs to
+            calendar_id: Calendar ID
+            items: Event resources from events.list
+            next_sync_token: nextSyncToken from the last page
+            full_sync: Whether items are a complete listing rather than a delta
+
+        Returns:
+            Number of events changed
+        """
+        now = datetime.now(UTC).isoformat()
+        upserts = []
+        deletes = []
+
+        for item in items:
+            if item.get("status") == "cancelled":
+                deletes.append((owner_id, calendar_id, item["id"]))
+                continue
+            try:
+                start, end, is_all_day = event_bounds(item)
+            except (KeyError, ValueError):
+                logger.warning(f"Skipping calendar event {item.get('id')} with unparseable times")
+                continue
+            upserts.append(
+                (
+                    owner_id,
+                    calendar_id,
+                    item["id"],
+                    item.get("summary", ""),
+                    start.timestamp(),
+                    end.timestamp(),
+                    int(is_all_day),
+                    int(_is_busy(item)),
+                    json.dumps(item),
+                    now,
+                )
+            )
+
+        conn = self.db.get_connection()
+        with conn:
+            if full_sync:
+                conn.execute(
+                    "DELETE FROM calendar_events WHERE owner_id = ? AND calendar_id = ?",
+                    (owner_id, calendar_id),
+                )
+            conn.executemany(
+                "DELETE FROM calendar_events WHERE owner_id = ? AND calendar_id = ? AND event_id = ?",
+                deletes,
+            )
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO calendar_events (
+                    owner_id, calendar_id, event_id, summary,
+                    start_ts, end_ts, is_all_day, is_busy, raw, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                upserts,
+            )
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO calendar_sync_state
+                    (owner_id, calendar_id, sync_token, last_synced_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (owner_id, calendar_id, next_sync_token, now),
+            )
+
+        return len(upserts) + len(deletes)
+
+    def reset(self, owner_id: str, calendar_id: str = "primary") -> None:
+        """Drop a calendar's sync token so the next sync is a full sync"""
+        self.db.execute_write(
+            "DELETE FROM calendar_sync_state WHERE owner_id = ? AND calendar_id = ?",
+            (owner_id, calendar_id),
+        )
+
+    # ========================================================================
+    # Queries
+    # ========================================================================
+
+    def get_events(
+        self,
+        owner_id: str,
+        time_min: datetime,
+        time_max: datetime,
+        calendar_ids: list[str] | None = None,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """
+        Get stored events overlapping a time window, ordered by start time.
+
+        Args:
+            owner_id: User ID the calendars belong to
+            time_min: Start of time range (naive datetimes are treated as UTC)
+            time_max: End of time range
+            calendar_ids: Calendars to include (default: all synced calendars)
+            limit: Max results
+
+        Returns:
+            List of event resources in Calendar API format
+        """
+        query, params = self._window_query("raw", owner_id, time_min, time_max, calendar_ids)
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        return [json.loads(row["raw"]) for row in self.db.execute_read(query, tuple(params))]
+
+    def get_busy_periods(
+        self,
+        owner_id: str,
+        time_min: datetime,
+        time_max: datetime,
+        calendar_ids: list[str] | None = None,
+    ) -> list[dict]:
+        """
+        Compute merged busy periods from stored events.
+
+        Transparent events and invitations the owner declined don't count as
+        busy. Overlapping or touching events are merged and clipped to the window.
+
+        Args:
+            owner_id: User ID the calendars belong to
+            time_min: Start of time range (naive datetimes are treated as UTC)
+            time_max: End of time range
+            calendar_ids: Calendars to include (default: all synced calendars)
+
+        Returns:
+            List of {"start", "end"} RFC 3339 strings, same shape as freebusy.query
+        """
+        query, params = self._window_query(
+            "start_ts, end_ts", owner_id, time_min, time_max, calendar_ids, busy_only=True
+        )
+        window_start = _to_utc(time_min).timestamp()
+        window_end = _to_utc(time_max).timestamp()
+
+        merged: list[list[float]] = []
+        for row in self.db.execute_read(query, tuple(params)):
+            start = max(row["start_ts"], window_start)
+            end = min(row["end_ts"], window_end)
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+
+        return [{"start": _format_ts(start), "end": _format_ts(end)} for start, end in merged]
+
+    def _window_query(
+        self,
+        columns: str,
+        owner_id: str,
+        time_min: datetime,
+        time_max: datetime,
+        calendar_ids: list[str] | None,
+        busy_only: bool = False,
+    ) -> tuple[str, list]:
+        """Build a time-window query served by idx_calendar_events_window"""
+        query = f"""
+        SELECT {columns}
+        FROM calendar_events
+        WHERE owner_id = ? AND start_ts < ? AND end_ts > ?
+        """
+        params: list = [owner_id, _to_utc(time_max).timestamp(), _to_utc(time_min).timestamp()]
+
+        if calendar_ids:
+            query += f" AND calendar_id IN ({', '.join('?' * len(calendar_ids))})"
+            params.extend(calendar_ids)
+
+        if busy_only:
+            query += " AND is_busy = 1"
+
+        query += " ORDER BY start_ts, end_ts"
+        return query, params
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+
+def event_bounds(item: dict) -> tuple[datetime, datetime, bool]:
+    """
+    Parse an event resource's start and end into UTC datetimes.
+
+    All-day events span midnight UTC of their start date to midnight UTC of
+    their (exclusive) end date.
+
+    Returns:
+        Tuple of (start, end, is_all_day)
+    """
+    start_data = item["start"]
+    end_data = item["end"]
+
+    if "date" in start_data:
+        start = datetime.combine(date.fromisoformat(start_data["date"]), time.min, tzinfo=UTC)
+        end = datetime.combine(date.fromisoformat(end_data["date"]), time.min, tzinfo=UTC)
+        return start, end, True
+
+    start = datetime.fromisoformat(start_data["dateTime"].replace("Z", "+00:00"))
+    end = datetime.fromisoformat(end_data["dateTime"].replace("Z", "+00:00"))
+    return _to_utc(start), _to_utc(end), False
+
+
+def _is_busy(item: dict) -> bool:
+    """Check whether an event blocks time on the owner's calendar"""
+    if item.get("transparency") == "transparent":
+        return False
+    for attendee in item.get("attendees", []):
+        if attendee.get("self") and attendee.get("responseStatus") == "declined":
+            return False
+    return True
+
+
+def _to_utc(value: datetime) -> datetime:
+    """Normalize a datetime to UTC, treating naive values as UTC"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+def _format_ts(timestamp: float) -> str:
+    """Format epoch seconds as an RFC 3339 UTC string"""
+    return datetime.fromtimestamp(timestamp, UTC).isoformat().replace("+00:00", "Z")
+
+
+# Singleton instance
+_calendar_event_store: CalendarEventStore | None = None
+
+
+def get_calendar_event_store() -> CalendarEventStore:
+    """Get or create the calendar event store singleton"""
+    global _calendar_event_store
+    if _calendar_event_store is None:
+        _calendar_event_store = CalendarEventStore(get_enhanced_database())
+    return _calendar_event_store
@@ -6,8 +6,10 @@ Provides access to Google Calendar API for reading and managing calendar events.
 
 from datetime import datetime, timedelta
 
+from googleapiclient.errors import HttpError
 from pydantic import BaseModel, Field
 
+from src.integrations.calendar_store import CalendarEventStore
 from src.integrations.google.auth import GoogleAuthService
 
 
@@ -141,14 +143,23 @@ class GoogleCalendarService:
     Service for interacting with Google Calendar API.
 
     Provides methods for reading, creating, updating, and deleting calendar events.
+    With an event store, reads are served from a local copy kept current by
+    ``sync_events()`` instead of listing events from the API on every call.
     """
 
-    def __init__(self, auth_service: GoogleAuthService):
+    def __init__(
+        self,
+        auth_service: GoogleAuthService,
+        event_store: CalendarEventStore | None = None,
+        owner_id: str = "default-user",
+    ):
         """
         Initialize Google Calendar service.
 
         Args:
             auth_service: Authenticated GoogleAuthService instance
+            event_store: Optional local event store to read from
+            owner_id: User ID the authenticated calendars belong to in the store
 
         Example:
             >>> auth = GoogleAuthService()
@@ -156,6 +167,64 @@ class GoogleCalendarService:
         """
         self.auth_service = auth_service
         self.service = auth_service.build_service("calendar", "v3")
+        self.event_store = event_store
+        self.owner_id = owner_id
+
+    def sync_events(self, calendar_id: str = "primary") -> int:
+        """
+        Incrementally sync a calendar into the local event store.
+
+        The first sync lists events from now on; later syncs pass the stored
+        syncToken and only receive changes. An expired token (HTTP 410) resets
+        the store and falls back to a full sync.
+
+        Args:
+            calendar_id: Calendar to sync (default: 'primary')
+
+        Returns:
+            Number of events changed
+
+        Raises:
+            ValueError: If the service has no event store
+        """
+        if self.event_store is None:
+            raise ValueError("sync_events requires an event store")
+
+        sync_token = self.event_store.get_sync_token(self.owner_id, calendar_id)
+        params = {"calendarId": calendar_id, "singleEvents": True, "maxResults": 250}
+        if sync_token:
+            params["syncToken"] = sync_token
+        else:
+            params["timeMin"] = datetime.now().isoformat() + "Z"
+
+        items = []
+        while True:
+            try:
+                result = self.service.events().list(**params).execute()
+            except HttpError as e:
+                if e.resp.status == 410 and sync_token:
+                    self.event_store.reset(self.owner_id, calendar_id)
+                    return self.sync_events(calendar_id)
+                raise
+
+            items.extend(result.get("items", []))
+            if not result.get("nextPageToken"):
+                break
+            params["pageToken"] = result["nextPageToken"]
+
+        return self.event_store.apply_sync(
+            self.owner_id,
+            calendar_id,
+            items,
+            result.get("nextSyncToken"),
+            full_sync=sync_token is None,
+        )
+
+    def _ensure_synced(self, calendar_ids: list[str]) -> None:
+        """Run a first sync for any calendar the store has never seen"""
+        for calendar_id in calendar_ids:
+            if self.event_store.get_last_synced_at(self.owner_id, calendar_id) is None:
+                self.sync_events(calendar_id)
 
     def get_events(
         self,
@@ -188,6 +257,14 @@ class GoogleCalendarService:
         if time_max is None:
             time_max = time_min + timedelta(days=365)
 
+        # Serve from the local store when available
+        if self.event_store is not None:
+            self._ensure_synced([calendar_id])
+            items = self.event_store.get_events(
+                self.owner_id, time_min, time_max, calendar_ids=[calendar_id], limit=max_results
+            )
+            return [CalendarEvent.from_api_response(item) for item in items]
+
         # Format times for API
         time_min_str = time_min.isoformat() + "Z"
         time_max_str = time_max.isoformat() + "Z"
@@ -417,6 +494,13 @@ class GoogleCalendarService:
         if calendar_ids is None:
             calendar_ids = ["primary"]
 
+        # Compute locally from stored events when available
+        if self.event_store is not None:
+            self._ensure_synced(calendar_ids)
+            return self.event_store.get_busy_periods(
+                self.owner_id, time_min, time_max, calendar_ids=calendar_ids
+            )
+
         # Build request body
         body = {
             "timeMin": time_min.isoformat() + "Z",
@@ -101,8 +101,12 @@ class UserIntegration(UserIntegrationBase):
     created_at: datetime
     updated_at: datetime
 
-    # Note: access_token and refresh_token are NOT included in public model
-    # These are sensitive and should only be accessed by internal services
+    # Note: access_token and refresh_token are NOT included in public model output
+    # These are sensitive and should only be accessed by internal services (providers
+    # read and refresh them during sync), so they are excluded from serialization
+    access_token: str | None = Field(default=None, exclude=True, repr=False)
+    refresh_token: str | None = Field(default=None, exclude=True, repr=False)
+    token_expires_at: datetime | None = Field(default=None, exclude=True)
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -10,6 +10,7 @@ import os
 from abc import ABC, abstractmethod
 from datetime import UTC, datetime, timedelta
 
+import httpx
 from cryptography.fernet import Fernet
 
 from src.integrations.models import (
@@ -22,6 +23,9 @@ from src.integrations.models import (
 
 logger = logging.getLogger(__name__)
 
+# Key under UserIntegration.metadata where providers keep their incremental sync cursor
+SYNC_CURSOR_KEY = "sync_cursor"
+
 
 # ============================================================================
 # Token Encryption/Decryption
@@ -91,6 +95,9 @@ class OAuthProvider(ABC):
     - fetch_data() (provider-specific data fetching)
     """
 
+    # Base URL for the provider's REST API (used by _api_client)
+    api_base_url: str = ""
+
     def __init__(
         self,
         client_id: str,
@@ -112,6 +119,7 @@ class OAuthProvider(ABC):
         self.redirect_uri = redirect_uri
         self.scopes = scopes
         self.token_encryption = get_token_encryption()
+        self.api_calls_made = 0  # Provider API requests made by this instance
 
     @property
     @abstractmethod
@@ -260,6 +268,7 @@ class OAuthProvider(ABC):
 
             # Refresh the token
             new_access_token, new_expires_at = await self.refresh_access_token(refresh_token)
+            self.api_calls_made += 1
 
             # Encrypt the new token
             encrypted_access, _ = self.encrypt_tokens(new_access_token, refresh_token)
@@ -276,6 +285,34 @@ class OAuthProvider(ABC):
         """Get space-separated scope string"""
         return " ".join(self.scopes)
 
+    def _api_client(self, access_token: str) -> httpx.AsyncClient:
+        """Create an async client for the provider REST API that counts requests"""
+
+        async def count_request(_request: httpx.Request) -> None:
+            self.api_calls_made += 1
+
+        return httpx.AsyncClient(
+            base_url=self.api_base_url,
+            headers={"Authorization": f"Bearer {access_token}"},
+            timeout=30.0,
+            event_hooks={"request": [count_request]},
+        )
+
+    def get_sync_cursor(self, integration: UserIntegration) -> str | None:
+        """Get the incremental sync cursor stored on the integration, if any"""
+        metadata = integration.metadata if isinstance(integration.metadata, dict) else {}
+        return metadata.get(SYNC_CURSOR_KEY)
+
+    def set_sync_cursor(self, integration: UserIntegration, cursor: str | None) -> None:
+        """
+        Store the incremental sync cursor on the integration.
+
+        Like refreshed tokens, the caller is responsible for saving it to the database.
+        """
+        if not isinstance(integration.metadata, dict):
+            integration.metadata = {}
+        integration.metadata[SYNC_CURSOR_KEY] = cursor
+
 
 # ============================================================================
 # Provider Registry
@@ -4,15 +4,20 @@ Google OAuth provider implementation
 Supports Gmail, Google Calendar, and Google Drive integrations.
 """
 
+import asyncio
 import base64
 import logging
 from datetime import UTC, datetime, timedelta
+from email.utils import parsedate_to_datetime
 from urllib.parse import urlencode
 
 import httpx
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 
+from src.integrations.calendar_store import (
+    CalendarEventStore,
+    event_bounds,
+    get_calendar_event_store,
+)
 from src.integrations.models import (
     CalendarEvent,
     GmailMessage,
@@ -44,12 +49,17 @@ class GmailProvider(OAuthProvider):
     TOKEN_URL = "https://oauth2.googleapis.com/token"
     USERINFO_URL = "https://www.googleapis.com/oauth2/v1/userinfo"
 
+    # Gmail REST API
+    API_BASE_URL = "https://gmail.googleapis.com/gmail/v1/users/me"
+    DEFAULT_FETCH_CONCURRENCY = 8
+
     def __init__(
         self,
         client_id: str,
         client_secret: str,
         redirect_uri: str,
         scopes: list[str] | None = None,
+        api_base_url: str | None = None,
     ):
         super().__init__(
             client_id=client_id,
@@ -57,6 +67,7 @@ class GmailProvider(OAuthProvider):
             redirect_uri=redirect_uri,
             scopes=scopes or self.DEFAULT_SCOPES,
         )
+        self.api_base_url = (api_base_url or self.API_BASE_URL).rstrip("/")
 
     @property
     def provider_type(self) -> ProviderType:
@@ -143,8 +154,14 @@ class GmailProvider(OAuthProvider):
         """
         Fetch unread emails from Gmail.
 
+        The first sync lists matching messages; later syncs only read the mailbox
+        history since the stored ``historyId`` cursor. Message bodies are fetched
+        concurrently (bounded by the ``fetch_concurrency`` setting) over async HTTP,
+        so nothing blocks the event loop.
+
         Args:
-            integration: User integration with decrypted tokens
+            integration: User integration with decrypted tokens. Its sync cursor is
+                advanced in place; the caller persists it with the integration.
 
         Returns:
             List of GmailMessage objects
@@ -152,85 +169,41 @@ class GmailProvider(OAuthProvider):
         # Ensure valid access token
         access_token = await self.ensure_valid_token(integration)
 
-        # Build Gmail service
-        credentials = Credentials(token=access_token)
-        service = build("gmail", "v1", credentials=credentials)
-
         # Get settings from integration
         settings = integration.settings if isinstance(integration.settings, dict) else {}
         max_results = settings.get("max_results", 20)
         filter_labels = settings.get("filter_labels", ["INBOX", "UNREAD"])
+        concurrency = max(1, settings.get("fetch_concurrency", self.DEFAULT_FETCH_CONCURRENCY))
 
-        # Build query
-        query_parts = []
-        if "UNREAD" in filter_labels:
-            query_parts.append("is:unread")
-        if "IMPORTANT" in filter_labels:
-            query_parts.append("is:important")
-
-        query = " ".join(query_parts) if query_parts else "is:unread"
-
-        # Fetch messages
-        messages = []
         try:
-            results = (
-                service.users()
-                .messages()
-                .list(userId="me", q=query, maxResults=max_results)
-                .execute()
-            )
-
-            message_ids = [msg["id"] for msg in results.get("messages", [])]
-
-            # Fetch full message details
-            for msg_id in message_ids:
-                msg = service.users().messages().get(userId="me", id=msg_id).execute()
-
-                # Parse headers
-                headers = {h["name"]: h["value"] for h in msg["payload"]["headers"]}
-                subject = headers.get("Subject", "")
-                from_email = headers.get("From", "")
-                to_email = headers.get("To", "")
-                date_str = headers.get("Date", "")
-
-                # Extract snippet and body
-                snippet = msg.get("snippet", "")
-                body_text = self._extract_body(msg["payload"])
-
-                # Parse date
-                try:
-                    # Gmail dates are in RFC 2822 format
-                    from email.utils import parsedate_to_datetime
-
-                    received_at = parsedate_to_datetime(date_str)
-                except Exception:
-                    received_at = datetime.now(UTC)
-
-                # Extract labels
-                labels = msg.get("labelIds", [])
-
-                # Create GmailMessage
-                gmail_msg = GmailMessage(
-                    message_id=msg_id,
-                    thread_id=msg.get("threadId", ""),
-                    subject=subject,
-                    from_email=from_email,
-                    from_name=self._extract_name(from_email),
-                    to_email=to_email,
-                    snippet=snippet,
-                    body_text=body_text,
-                    received_at=received_at,
-                    labels=labels,
-                    is_unread="UNREAD" in labels,
-                )
-
-                messages.append(gmail_msg)
+            async with self._api_client(access_token) as client:
+                cursor = self.get_sync_cursor(integration)
+                message_ids = None
+                if cursor:
+                    message_ids, history_id = await self._list_history(
+                        client, cursor, filter_labels
+                    )
+                if message_ids is None:
+                    # Capture the mailbox position *before* listing so nothing added
+                    # during the listing is skipped by the next incremental sync.
+                    history_id = await self._get_history_id(client)
+                    message_ids = await self._list_message_ids(
+                        client, self._build_query(filter_labels), max_results
+                    )
+
+                raw_messages = await self._get_messages(client, message_ids, concurrency)
 
         except Exception as e:
             logger.error(f"Failed to fetch Gmail messages: {e}")
             raise
 
-        return messages
+        self.set_sync_cursor(integration, history_id)
+
+        return [
+            self._parse_message(msg)
+            for msg in raw_messages
+            if self._matches_filter(msg.get("labelIds", []), filter_labels)
+        ]
 
     async def mark_item_processed(
         self, integration: UserIntegration, item_id: str, action: str
@@ -246,36 +219,143 @@ class GmailProvider(OAuthProvider):
         Returns:
             True if successful
         """
+        remove_labels = {"mark_read": ["UNREAD"], "archive": ["INBOX"]}.get(action)
+        if remove_labels is None:
+            logger.warning(f"Unknown action for Gmail: {action}")
+            return False
+
         try:
             # Ensure valid access token
             access_token = await self.ensure_valid_token(integration)
 
-            # Build Gmail service
-            credentials = Credentials(token=access_token)
-            service = build("gmail", "v1", credentials=credentials)
-
-            if action == "mark_read":
-                # Remove UNREAD label
-                service.users().messages().modify(
-                    userId="me", id=item_id, body={"removeLabelIds": ["UNREAD"]}
-                ).execute()
-                return True
-
-            elif action == "archive":
-                # Remove INBOX label
-                service.users().messages().modify(
-                    userId="me", id=item_id, body={"removeLabelIds": ["INBOX"]}
-                ).execute()
-                return True
-
-            else:
-                logger.warning(f"Unknown action for Gmail: {action}")
-                return False
+            async with self._api_client(access_token) as client:
+                response = await client.post(
+                    f"/messages/{item_id}/modify", json={"removeLabelIds": remove_labels}
+                )
+                response.raise_for_status()
+            return True
 
         except Exception as e:
             logger.error(f"Failed to mark Gmail message as processed: {e}")
             return False
 
+    # Sync helpers
+
+    def _build_query(self, filter_labels: list[str]) -> str:
+        """Build a Gmail search query from the configured filter labels"""
+        query_parts = []
+        if "UNREAD" in filter_labels:
+            query_parts.append("is:unread")
+        if "IMPORTANT" in filter_labels:
+            query_parts.append("is:important")
+
+        return " ".join(query_parts) if query_parts else "is:unread"
+
+    def _matches_filter(self, label_ids: list[str], filter_labels: list[str]) -> bool:
+        """Check message labels against the filter (same semantics as _build_query)"""
+        required = [label for label in ("UNREAD", "IMPORTANT") if label in filter_labels]
+        return all(label in label_ids for label in required or ["UNREAD"])
+
+    async def _get_history_id(self, client: httpx.AsyncClient) -> str:
+        """Get the mailbox's current historyId"""
+        response = await client.get("/profile")
+        response.raise_for_status()
+        return str(response.json()["historyId"])
+
+    async def _list_message_ids(
+        self, client: httpx.AsyncClient, query: str, max_results: int
+    ) -> list[str]:
+        """List IDs of messages matching a search query (full sync)"""
+        response = await client.get("/messages", params={"q": query, "maxResults": max_results})
+        response.raise_for_status()
+        return [msg["id"] for msg in response.json().get("messages", [])]
+
+    async def _list_history(
+        self, client: httpx.AsyncClient, start_history_id: str, filter_labels: list[str]
+    ) -> tuple[list[str] | None, str]:
+        """
+        List messages added since a historyId (incremental sync).
+
+        Returns:
+            Tuple of (message IDs, new historyId). Message IDs are None when the
+            cursor is too old for Gmail to serve, meaning a full sync is needed.
+        """
+        message_ids: list[str] = []
+        seen: set[str] = set()
+        params = {"startHistoryId": start_history_id, "historyTypes": "messageAdded"}
+
+        while True:
+            response = await client.get("/history", params=params)
+            if response.status_code == 404:
+                logger.info(f"Gmail history {start_history_id} expired, falling back to full sync")
+                return None, start_history_id
+            response.raise_for_status()
+            data = response.json()
+
+            for record in data.get("history", []):
+                for added in record.get("messagesAdded", []):
+                    msg = added["message"]
+                    if msg["id"] in seen:
+                        continue
+                    # Skip fetching messages that cannot match (e.g. already read)
+                    if "labelIds" in msg and not self._matches_filter(
+                        msg["labelIds"], filter_labels
+                    ):
+                        continue
+                    seen.add(msg["id"])
+                    message_ids.append(msg["id"])
+
+            page_token = data.get("nextPageToken")
+            if not page_token:
+                return message_ids, str(data.get("historyId", start_history_id))
+            params["pageToken"] = page_token
+
+    async def _get_messages(
+        self, client: httpx.AsyncClient, message_ids: list[str], concurrency: int
+    ) -> list[dict]:
+        """Fetch full messages concurrently, preserving order and skipping deleted ones"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def get_message(msg_id: str) -> dict | None:
+            async with semaphore:
+                response = await client.get(f"/messages/{msg_id}", params={"format": "full"})
+            if response.status_code == 404:
+                # Deleted between listing and fetching
+                return None
+            response.raise_for_status()
+            return response.json()
+
+        results = await asyncio.gather(*(get_message(msg_id) for msg_id in message_ids))
+        return [msg for msg in results if msg is not None]
+
+    def _parse_message(self, msg: dict) -> GmailMessage:
+        """Convert a Gmail API message resource into a GmailMessage"""
+        # Parse headers
+        headers = {h["name"]: h["value"] for h in msg["payload"].get("headers", [])}
+        from_email = headers.get("From", "")
+
+        # Parse date (Gmail dates are in RFC 2822 format)
+        try:
+            received_at = parsedate_to_datetime(headers.get("Date", ""))
+        except Exception:
+            received_at = datetime.now(UTC)
+
+        labels = msg.get("labelIds", [])
+
+        return GmailMessage(
+            message_id=msg["id"],
+            thread_id=msg.get("threadId", ""),
+            subject=headers.get("Subject", ""),
+            from_email=from_email,
+            from_name=self._extract_name(from_email),
+            to_email=headers.get("To", ""),
+            snippet=msg.get("snippet", ""),
+            body_text=self._extract_body(msg["payload"]),
+            received_at=received_at,
+            labels=labels,
+            is_unread="UNREAD" in labels,
+        )
+
     # Helper methods
 
     def _extract_body(self, payload: dict) -> str:
@@ -318,12 +398,18 @@ class GoogleCalendarProvider(OAuthProvider):
     TOKEN_URL = "https://oauth2.googleapis.com/token"
     USERINFO_URL = "https://www.googleapis.com/oauth2/v1/userinfo"
 
+    # Calendar REST API
+    API_BASE_URL = "https://www.googleapis.com/calendar/v3"
+    SYNC_PAST_DAYS = 30  # How far back the initial full sync reaches
+
     def __init__(
         self,
         client_id: str,
         client_secret: str,
         redirect_uri: str,
         scopes: list[str] | None = None,
+        api_base_url: str | None = None,
+        event_store: CalendarEventStore | None = None,
     ):
         super().__init__(
             client_id=client_id,
@@ -331,6 +417,8 @@ class GoogleCalendarProvider(OAuthProvider):
             redirect_uri=redirect_uri,
             scopes=scopes or self.DEFAULT_SCOPES,
         )
+        self.api_base_url = (api_base_url or self.API_BASE_URL).rstrip("/")
+        self._event_store = event_store
 
     @property
     def provider_type(self) -> ProviderType:
@@ -378,6 +466,10 @@ class GoogleCalendarProvider(OAuthProvider):
         """
         Fetch upcoming calendar events.
 
+        Syncs the primary calendar into the local event store (incrementally via
+        ``syncToken`` once a first full sync has run), then reads the look-ahead
+        window from the store.
+
         Args:
             integration: User integration with decrypted tokens
 
@@ -387,68 +479,77 @@ class GoogleCalendarProvider(OAuthProvider):
         # Ensure valid access token
         access_token = await self.ensure_valid_token(integration)
 
-        # Build Calendar service
-        credentials = Credentials(token=access_token)
-        service = build("calendar", "v3", credentials=credentials)
-
         # Get settings
         settings = integration.settings if isinstance(integration.settings, dict) else {}
         look_ahead_days = settings.get("look_ahead_days", 14)
         max_results = settings.get("max_results", 50)
 
-        # Calculate time range
-        now = datetime.now(UTC)
-        time_min = now.isoformat()
-        time_max = (now + timedelta(days=look_ahead_days)).isoformat()
-
-        # Fetch events
-        events = []
         try:
-            results = (
-                service.events()
-                .list(
-                    calendarId="primary",
-                    timeMin=time_min,
-                    timeMax=time_max,
-                    maxResults=max_results,
-                    singleEvents=True,
-                    orderBy="startTime",
-                )
-                .execute()
-            )
+            async with self._api_client(access_token) as client:
+                await self.sync_calendar(client, integration.user_id)
+        except Exception as e:
+            logger.error(f"Failed to sync calendar events: {e}")
+            raise
 
-            for event_data in results.get("items", []):
-                # Parse start/end times
-                start = event_data["start"].get("dateTime", event_data["start"].get("date"))
-                end = event_data["end"].get("dateTime", event_data["end"].get("date"))
-
-                # Convert to datetime
-                start_dt = datetime.fromisoformat(start.replace("Z", "+00:00"))
-                end_dt = datetime.fromisoformat(end.replace("Z", "+00:00"))
-
-                # Extract attendees
-                attendees = [a.get("email", "") for a in event_data.get("attendees", [])]
-
-                # Create CalendarEvent
-                cal_event = CalendarEvent(
-                    event_id=event_data["id"],
-                    summary=event_data.get("summary", ""),
-                    description=event_data.get("description"),
-                    location=event_data.get("location"),
-                    start=start_dt,
-                    end=end_dt,
-                    attendees=attendees,
-                    organizer=event_data.get("organizer", {}).get("email"),
-                    status=event_data.get("status", "confirmed"),
-                )
+        # Read the window locally
+        now = datetime.now(UTC)
+        items = self.event_store.get_events(
+            integration.user_id,
+            now,
+            now + timedelta(days=look_ahead_days),
+            calendar_ids=["primary"],
+            limit=max_results,
+        )
+        return [self._parse_event(item) for item in items]
 
-                events.append(cal_event)
+    async def sync_calendar(
+        self, client: httpx.AsyncClient, owner_id: str, calendar_id: str = "primary"
+    ) -> int:
+        """
+        Bring the local copy of a calendar up to date.
 
-        except Exception as e:
-            logger.error(f"Failed to fetch calendar events: {e}")
-            raise
+        Uses the stored sync token when there is one; when Google invalidates it
+        (410 Gone) the store is reset and a full sync runs instead.
 
-        return events
+        Args:
+            client: Calendar API client from _api_client()
+            owner_id: User ID the calendar belongs to
+            calendar_id: Calendar to sync
+
+        Returns:
+            Number of events changed
+        """
+        sync_token = self.event_store.get_sync_token(owner_id, calendar_id)
+        params: dict = {"singleEvents": "true", "maxResults": 250}
+        if sync_token:
+            params["syncToken"] = sync_token
+        else:
+            params["timeMin"] = (
+                datetime.now(UTC) - timedelta(days=self.SYNC_PAST_DAYS)
+            ).isoformat()
+
+        items: list[dict] = []
+        while True:
+            response = await client.get(f"/calendars/{calendar_id}/events", params=params)
+            if response.status_code == 410 and sync_token:
+                logger.info(f"Calendar sync token expired for {owner_id}, running full sync")
+                self.event_store.reset(owner_id, calendar_id)
+                return await self.sync_calendar(client, owner_id, calendar_id)
+            response.raise_for_status()
+            data = response.json()
+            items.extend(data.get("items", []))
+
+            if not data.get("nextPageToken"):
+                break
+            params["pageToken"] = data["nextPageToken"]
+
+        return self.event_store.apply_sync(
+            owner_id,
+            calendar_id,
+            items,
+            data.get("nextSyncToken"),
+            full_sync=sync_token is None,
+        )
 
     async def mark_item_processed(
         self, integration: UserIntegration, item_id: str, action: str
@@ -461,6 +562,31 @@ class GoogleCalendarProvider(OAuthProvider):
         # Calendar events don't need processing like emails
         return True
 
+    # Sync helpers
+
+    @property
+    def event_store(self) -> CalendarEventStore:
+        """Local event store (the shared store unless one was injected)"""
+        if self._event_store is None:
+            self._event_store = get_calendar_event_store()
+        return self._event_store
+
+    def _parse_event(self, event_data: dict) -> CalendarEvent:
+        """Convert a Calendar API event resource into a CalendarEvent"""
+        start_dt, end_dt, _ = event_bounds(event_data)
+
+        return CalendarEvent(
+            event_id=event_data["id"],
+            summary=event_data.get("summary", ""),
+            description=event_data.get("description"),
+            location=event_data.get("location"),
+            start=start_dt,
+            end=end_dt,
+            attendees=[a.get("email", "") for a in event_data.get("attendees", [])],
+            organizer=event_data.get("organizer", {}).get("email"),
+            status=event_data.get("status", "confirmed"),
+        )
+
 
 # ============================================================================
 # Register providers
@@ -16,6 +16,15 @@ from src.database.enhanced_adapter import EnhancedDatabaseAdapter
 
 logger = logging.getLogger(__name__)
 
+# Column order expected by IntegrationRepository._parse_integration
+INTEGRATION_COLUMNS = """
+            integration_id, user_id, provider, status,
+            access_token, refresh_token, token_expires_at, scopes,
+            provider_user_id, provider_username,
+            sync_enabled, auto_generate_tasks, last_sync_at,
+            settings, metadata, connected_at, created_at, updated_at,
+            next_sync_at, sync_frequency_minutes"""
+
 
 class IntegrationRepository:
     """Repository for provider integration database operations."""
@@ -112,13 +121,8 @@ class IntegrationRepository:
         Returns:
             Integration data or None if not found
         """
-        query = """
-        SELECT
-            integration_id, user_id, provider, status,
-            access_token, refresh_token, token_expires_at, scopes,
-            provider_user_id, provider_username,
-            sync_enabled, auto_generate_tasks, last_sync_at,
-            settings, metadata, connected_at, created_at, updated_at
+        query = f"""
+        SELECT {INTEGRATION_COLUMNS}
         FROM user_integrations
         WHERE integration_id = ?
         """
@@ -143,13 +147,8 @@ class IntegrationRepository:
         Returns:
             List of integration data
         """
-        query = """
-        SELECT
-            integration_id, user_id, provider, status,
-            access_token, refresh_token, token_expires_at, scopes,
-            provider_user_id, provider_username,
-            sync_enabled, auto_generate_tasks, last_sync_at,
-            settings, metadata, connected_at, created_at, updated_at
+        query = f"""
+        SELECT {INTEGRATION_COLUMNS}
         FROM user_integrations
         WHERE user_id = ?
         """
@@ -177,6 +176,9 @@ class IntegrationRepository:
         status: str | None = None,
         settings: dict | None = None,
         last_sync_at: datetime | None = None,
+        metadata: dict | None = None,
+        next_sync_at: datetime | None = None,
+        sync_frequency_minutes: int | None = None,
     ) -> dict | None:
         """
         Update integration fields.
@@ -189,6 +191,9 @@ class IntegrationRepository:
             status: New status
             settings: Updated settings
             last_sync_at: Last sync timestamp
+            metadata: Updated metadata (includes the provider sync cursor)
+            next_sync_at: When the scheduler should sync next
+            sync_frequency_minutes: Current (adaptive) sync interval
 
         Returns:
             Updated integration data or None if not found
@@ -220,6 +225,18 @@ class IntegrationRepository:
             updates.append("last_sync_at = ?")
             params.append(last_sync_at.isoformat())
 
+        if metadata is not None:
+            updates.append("metadata = ?")
+            params.append(json.dumps(metadata))
+
+        if next_sync_at is not None:
+            updates.append("next_sync_at = ?")
+            params.append(next_sync_at.isoformat())
+
+        if sync_frequency_minutes is not None:
+            updates.append("sync_frequency_minutes = ?")
+            params.append(sync_frequency_minutes)
+
         if not updates:
             return self.get_integration(integration_id)
 
@@ -232,6 +249,54 @@ class IntegrationRepository:
         self.db.execute_write(query, tuple(params))
         return self.get_integration(integration_id)
 
+    def get_due_integrations(self, now: datetime, limit: int = 100) -> list[dict]:
+        """
+        Get connected, sync-enabled integrations whose next sync is due.
+
+        Integrations that have never been scheduled are returned first.
+
+        Args:
+            now: Current time
+            limit: Max results
+
+        Returns:
+            List of integration data
+        """
+        query = f"""
+        SELECT {INTEGRATION_COLUMNS}
+        FROM user_integrations
+        WHERE status = 'connected'
+        AND sync_enabled = 1
+        AND (next_sync_at IS NULL OR next_sync_at <= ?)
+        ORDER BY next_sync_at
+        LIMIT ?
+        """
+
+        results = self.db.execute_read(query, (now.isoformat(), limit))
+        return [self._parse_integration(row) for row in results]
+
+    def get_expiring_integrations(self, expires_before: datetime) -> list[dict]:
+        """
+        Get connected integrations whose access token expires before a given time.
+
+        Args:
+            expires_before: Expiry cutoff
+
+        Returns:
+            List of integration data with a refresh token available
+        """
+        query = f"""
+        SELECT {INTEGRATION_COLUMNS}
+        FROM user_integrations
+        WHERE status = 'connected'
+        AND refresh_token IS NOT NULL AND refresh_token != ''
+        AND token_expires_at <= ?
+        ORDER BY token_expires_at
+        """
+
+        results = self.db.execute_read(query, (expires_before.isoformat(),))
+        return [self._parse_integration(row) for row in results]
+
     def delete_integration(self, integration_id: str) -> bool:
         """
         Delete integration and all associated data.
@@ -480,6 +545,7 @@ class IntegrationRepository:
         api_calls_made: int = 0,
         error_message: str | None = None,
         metadata: dict | None = None,
+        sync_started_at: datetime | None = None,
     ) -> dict:
         """
         Create sync log entry.
@@ -493,12 +559,14 @@ class IntegrationRepository:
             api_calls_made: API calls made
             error_message: Error message if failed
             metadata: Additional metadata
+            sync_started_at: When the sync started (defaults to now)
 
         Returns:
             Created sync log data
         """
         log_id = str(uuid4())
         now = datetime.now(UTC)
+        started_at = sync_started_at or now
 
         query = """
         INSERT INTO integration_sync_logs (
@@ -514,7 +582,7 @@ class IntegrationRepository:
                 log_id,
                 integration_id,
                 sync_status,
-                now.isoformat(),
+                started_at.isoformat(),
                 now.isoformat(),
                 items_fetched,
                 tasks_generated,
@@ -604,6 +672,8 @@ class IntegrationRepository:
             "connected_at": row[15],
             "created_at": row[16],
             "updated_at": row[17],
+            "next_sync_at": row[18],
+            "sync_frequency_minutes": row[19],
         }
 
     def _parse_integration_task(self, row: tuple) -> dict:
@@ -0,0 +1,232 @@
+"""
+Scheduled sync for provider integrations.
+
+Periodically enqueues a background job for every connected integration whose
+next sync is due. Jobs run on the background job engine, with concurrency
+limits per provider and per user. Each integration's interval adapts to how much
+data it produces, so quiet accounts use less API quota.
+"""
+
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+
+from src.database.enhanced_adapter import get_enhanced_database
+from src.integrations.repository import IntegrationRepository
+from src.integrations.service import IntegrationService, ProviderNotFoundError
+from src.services.task_queue_service import BackgroundTaskQueue, get_task_queue
+
+logger = logging.getLogger(__name__)
+
+SYNC_JOB_TYPE = "integrations.sync"
+SYNC_QUEUE = "integrations"
+DEFAULT_INTERVAL_MINUTES = 15
+
+
+def next_sync_interval(
+    current_minutes: int,
+    items_fetched: int,
+    failed: bool,
+    min_minutes: int,
+    max_minutes: int,
+    busy_threshold: int = 10,
+) -> int:
+    """
+    Adapt an integration's sync interval to how much data it produces.
+
+    Quiet accounts (and failing ones) back off by doubling the interval; busy
+    accounts halve it. Anything in between keeps its current cadence.
+
+    Args:
+        current_minutes: Current interval
+        items_fetched: Items the last sync returned
+        failed: Whether the last sync failed
+        min_minutes: Lower bound
+        max_minutes: Upper bound
+        busy_threshold: Items per sync at which the interval shortens
+
+    Returns:
+        Next interval in minutes
+    """
+    if failed or items_fetched == 0:
+        interval = current_minutes * 2
+    elif items_fetched >= busy_threshold:
+        interval = current_minutes // 2
+    else:
+        interval = current_minutes
+
+    return max(min_minutes, min(max_minutes, interval))
+
+
+class IntegrationSyncScheduler:
+    """Runs due integration syncs on a cadence through the background job engine."""
+
+    def __init__(
+        self,
+        service: IntegrationService,
+        queue: BackgroundTaskQueue,
+        tick_seconds: float = 60.0,
+        provider_concurrency: int = 4,
+        user_concurrency: int = 1,
+        min_interval_minutes: int = 5,
+        max_interval_minutes: int = 240,
+        refresh_margin: timedelta = timedelta(minutes=10),
+    ):
+        """
+        Initialize integration sync scheduler.
+
+        Args:
+            service: Integration service that performs individual syncs
+            queue: Background job engine the sync jobs run on
+            tick_seconds: How often to look for due syncs
+            provider_concurrency: Max concurrent syncs per provider
+            user_concurrency: Max concurrent syncs per user
+            min_interval_minutes: Shortest adaptive sync interval
+            max_interval_minutes: Longest adaptive sync interval
+            refresh_margin: Refresh access tokens this long before they expire
+        """
+        self.service = service
+        self.queue = queue
+        self.tick_seconds = tick_seconds
+        self.provider_concurrency = provider_concurrency
+        self.user_concurrency = user_concurrency
+        self.min_interval_minutes = min_interval_minutes
+        self.max_interval_minutes = max_interval_minutes
+        self.refresh_margin = refresh_margin
+
+        self._provider_limits: dict[str, asyncio.Semaphore] = {}
+        self._user_limits: dict[str, asyncio.Semaphore] = {}
+        self._task: asyncio.Task | None = None
+
+        self.queue.register(SYNC_JOB_TYPE, self._run_sync, queue=SYNC_QUEUE)
+
+    async def start(self) -> None:
+        """Start the scheduling loop"""
+        if self._task is not None:
+            return
+        # Fresh semaphores: a restarted app may run on a different event loop
+        self._provider_limits.clear()
+        self._user_limits.clear()
+        self._task = asyncio.create_task(self._loop(), name="integration-sync-scheduler")
+        logger.info(f"Integration sync scheduler started (tick: {self.tick_seconds}s)")
+
+    async def stop(self) -> None:
+        """Stop the scheduling loop (queued sync jobs stay in the job store)"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        logger.info("Integration sync scheduler stopped")
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.warning(f"Integration sync tick failed: {e}")
+            await asyncio.sleep(self.tick_seconds)
+
+    async def tick(self) -> int:
+        """
+        Refresh expiring tokens and enqueue a sync job for each due integration.
+
+        Jobs are keyed by integration and scheduled time, so a sync that is
+        still queued from an earlier tick is not enqueued twice.
+
+        Returns:
+            Number of due integrations
+        """
+        await self.service.refresh_expiring_tokens(self.refresh_margin)
+
+        due = self.service.repo.get_due_integrations(datetime.now(UTC))
+        for integration in due:
+            integration_id = integration["integration_id"]
+            scheduled_for = integration["next_sync_at"] or "initial"
+            await self.queue.enqueue(
+                SYNC_JOB_TYPE,
+                {"integration_id": integration_id},
+                queue=SYNC_QUEUE,
+                max_attempts=1,  # The next scheduled sync is the retry
+                idempotency_key=f"integration-sync:{integration_id}:{scheduled_for}",
+            )
+
+        return len(due)
+
+    async def _run_sync(self, payload: dict) -> dict | None:
+        """Job handler: sync one integration and schedule its next sync"""
+        integration = self.service.repo.get_integration(payload["integration_id"])
+        if not integration or integration["status"] != "connected":
+            return None
+        if not integration["sync_enabled"]:
+            return None
+
+        provider_limit = self._limit(
+            self._provider_limits, integration["provider"], self.provider_concurrency
+        )
+        user_limit = self._limit(self._user_limits, integration["user_id"], self.user_concurrency)
+
+        sync_log = None
+        try:
+            async with provider_limit, user_limit:
+                try:
+                    sync_log = await self.service.sync_integration(integration)
+                except ProviderNotFoundError as e:
+                    logger.warning(f"Skipping sync for {integration['integration_id']}: {e}")
+        finally:
+            # Reschedule even when the sync raises: the job is not retried, and
+            # the next tick keys its job by the new next_sync_at
+            interval = self._schedule_next_sync(integration, sync_log)
+
+        return {
+            "log_id": sync_log["log_id"] if sync_log else None,
+            "sync_status": sync_log["sync_status"] if sync_log else "failed",
+            "next_sync_minutes": interval,
+        }
+
+    def _schedule_next_sync(self, integration: dict, sync_log: dict | None) -> int:
+        """Set an integration's next sync from the outcome of the last one (None if it failed)"""
+        failed = sync_log is None or sync_log["sync_status"] == "failed"
+        interval = next_sync_interval(
+            integration["sync_frequency_minutes"] or DEFAULT_INTERVAL_MINUTES,
+            sync_log["items_fetched"] if sync_log else 0,
+            failed,
+            self.min_interval_minutes,
+            self.max_interval_minutes,
+        )
+        self.service.repo.update_integration(
+            integration_id=integration["integration_id"],
+            next_sync_at=datetime.now(UTC) + timedelta(minutes=interval),
+            sync_frequency_minutes=interval,
+        )
+        return interval
+
+    def _limit(
+        self, limits: dict[str, asyncio.Semaphore], key: str, size: int
+    ) -> asyncio.Semaphore:
+        if key not in limits:
+            limits[key] = asyncio.Semaphore(size)
+        return limits[key]
+
+
+# Singleton instance
+_sync_scheduler: IntegrationSyncScheduler | None = None
+
+
+def get_integration_sync_scheduler() -> IntegrationSyncScheduler:
+    """Get or create the integration sync scheduler configured from settings"""
+    global _sync_scheduler
+    if _sync_scheduler is None:
+        from src.core.settings import get_settings
+
+        settings = get_settings()
+        _sync_scheduler = IntegrationSyncScheduler(
+            IntegrationService(IntegrationRepository(get_enhanced_database())),
+            get_task_queue(),
+            tick_seconds=settings.integration_sync_tick_seconds,
+            provider_concurrency=settings.integration_sync_provider_concurrency,
+            user_concurrency=settings.integration_sync_user_concurrency,
+            min_interval_minutes=settings.integration_sync_min_interval_minutes,
+            max_interval_minutes=settings.integration_sync_max_interval_minutes,
+        )
+    return _sync_scheduler
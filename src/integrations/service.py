@@ -6,7 +6,8 @@ Orchestrates OAuth flows, token management, and provider interactions.
 
 import logging
 import secrets
-from datetime import UTC, datetime
+import time
+from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
 from src.integrations.models import ProviderType, UserIntegration
@@ -174,7 +175,7 @@ class IntegrationService:
 
         except Exception as e:
             logger.error(f"OAuth callback failed for {provider}: {e}", exc_info=True)
-            raise OAuthFlowError(f"Failed to complete OAuth flow: {str(e)}")
+            raise OAuthFlowError(f"Failed to complete OAuth flow: {str(e)}") from e
 
     # ========================================================================
     # Integration Management
@@ -320,7 +321,7 @@ class IntegrationService:
             Sync log data
 
         Raises:
-            IntegrationError: If integration not found or unauthorized
+            IntegrationError: If integration not found, unauthorized, or the sync fails
         """
         integration = self.repo.get_integration(integration_id)
 
@@ -330,70 +331,167 @@ class IntegrationService:
         if integration["user_id"] != user_id:
             raise IntegrationError("Not authorized to sync this integration")
 
+        sync_log = await self.sync_integration(integration)
+
+        if sync_log["sync_status"] == "failed":
+            raise IntegrationError(f"Sync failed: {sync_log['error_message']}")
+
+        return sync_log
+
+    async def sync_integration(self, integration: dict) -> dict:
+        """
+        Sync one integration and record the outcome.
+
+        Fetches provider data, persists refreshed tokens and the provider's sync
+        cursor, and writes a sync log with the real item count, API calls made and
+        duration. Provider failures are recorded as a failed sync log, not raised.
+
+        Args:
+            integration: Integration data from the repository (tokens encrypted)
+
+        Returns:
+            Sync log data (``metadata["duration_ms"]`` holds the sync latency)
+
+        Raises:
+            ProviderNotFoundError: If provider not configured
+        """
+        integration_id = integration["integration_id"]
+
         # Get provider instance
         provider_instance = get_provider(integration["provider"])
         if not provider_instance:
             raise ProviderNotFoundError(f"Provider {integration['provider']} not configured")
 
-        try:
-            # Create UserIntegration model for provider
-            user_integration = UserIntegration(
-                integration_id=UUID(integration["integration_id"]),
-                user_id=integration["user_id"],
-                provider=integration["provider"],
-                status=integration["status"],
-                access_token=integration["access_token"],
-                refresh_token=integration["refresh_token"],
-                token_expires_at=datetime.fromisoformat(integration["token_expires_at"]),
-                scopes=integration["scopes"],
-                provider_user_id=integration["provider_user_id"],
-                provider_username=integration["provider_username"],
-                sync_enabled=integration["sync_enabled"],
-                auto_generate_tasks=integration["auto_generate_tasks"],
-                last_sync_at=integration["last_sync_at"],
-                settings=integration["settings"],
-                metadata=integration["metadata"],
-                connected_at=datetime.fromisoformat(integration["connected_at"]),
-                created_at=datetime.fromisoformat(integration["created_at"]),
-                updated_at=datetime.fromisoformat(integration["updated_at"]),
-            )
+        user_integration = self._to_user_integration(integration)
+        started_at = datetime.now(UTC)
+        started = time.perf_counter()
 
+        try:
             # Fetch data from provider
             items = await provider_instance.fetch_data(user_integration)
 
-            # Update last sync time
+        except Exception as e:
+            logger.error(f"Sync failed for integration {integration_id}: {e}", exc_info=True)
+
+            # Keep a token that was refreshed before the failure
             self.repo.update_integration(
                 integration_id=integration_id,
-                last_sync_at=datetime.now(UTC),
+                **self._refreshed_token_fields(integration, user_integration),
             )
 
-            # Create sync log
-            sync_log = self.repo.create_sync_log(
+            # Create failed sync log
+            return self.repo.create_sync_log(
                 integration_id=integration_id,
-                sync_status="success",
-                items_fetched=len(items),
-                tasks_generated=0,  # Will be updated when AI task generation is implemented
-                api_calls_made=1,
+                sync_status="failed",
+                api_calls_made=provider_instance.api_calls_made,
+                error_message=str(e),
+                sync_started_at=started_at,
+                metadata={"duration_ms": round((time.perf_counter() - started) * 1000, 1)},
             )
 
-            logger.info(
-                f"Manual sync completed for {integration['provider']} "
-                f"integration {integration_id}: {len(items)} items fetched"
-            )
+        duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        # Update last sync time, refreshed tokens and the provider's incremental sync cursor
+        self.repo.update_integration(
+            integration_id=integration_id,
+            last_sync_at=datetime.now(UTC),
+            metadata=user_integration.metadata,
+            **self._refreshed_token_fields(integration, user_integration),
+        )
+
+        # Create sync log
+        sync_log = self.repo.create_sync_log(
+            integration_id=integration_id,
+            sync_status="success",
+            items_fetched=len(items),
+            tasks_generated=0,  # Will be updated when AI task generation is implemented
+            api_calls_made=provider_instance.api_calls_made,
+            sync_started_at=started_at,
+            metadata={"duration_ms": duration_ms},
+        )
+
+        logger.info(
+            f"Sync completed for {integration['provider']} integration {integration_id}: "
+            f"{len(items)} items, {provider_instance.api_calls_made} API calls, {duration_ms}ms"
+        )
+
+        return sync_log
+
+    async def refresh_expiring_tokens(self, margin: timedelta = timedelta(minutes=10)) -> int:
+        """
+        Refresh access tokens that expire within a margin, before a sync needs them.
 
-            return sync_log
+        Args:
+            margin: How far ahead of expiry to refresh
 
-        except Exception as e:
-            logger.error(f"Manual sync failed: {e}", exc_info=True)
+        Returns:
+            Number of tokens refreshed
+        """
+        refreshed = 0
 
-            # Create failed sync log
-            sync_log = self.repo.create_sync_log(
-                integration_id=integration_id,
-                sync_status="failed",
-                error_message=str(e),
-            )
+        for integration in self.repo.get_expiring_integrations(datetime.now(UTC) + margin):
+            provider_instance = get_provider(integration["provider"])
+            if not provider_instance:
+                continue
+
+            try:
+                _, refresh_token = provider_instance.decrypt_tokens(
+                    "", integration["refresh_token"]
+                )
+                access_token, expires_at = await provider_instance.refresh_access_token(
+                    refresh_token
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Token refresh failed for integration {integration['integration_id']}: {e}"
+                )
+                continue
 
-            raise IntegrationError(f"Sync failed: {str(e)}")
+            encrypted_access, _ = provider_instance.encrypt_tokens(access_token, "")
+            self.repo.update_integration(
+                integration_id=integration["integration_id"],
+                access_token=encrypted_access,
+                token_expires_at=expires_at,
+            )
+            refreshed += 1
+
+        if refreshed:
+            logger.info(f"Proactively refreshed {refreshed} integration tokens")
+
+        return refreshed
+
+    def _to_user_integration(self, integration: dict) -> UserIntegration:
+        """Build the provider-facing model (with encrypted tokens) from repository data"""
+        token_expires_at = integration["token_expires_at"]
+
+        return UserIntegration(
+            integration_id=UUID(integration["integration_id"]),
+            user_id=integration["user_id"],
+            provider=integration["provider"],
+            status=integration["status"],
+            access_token=integration["access_token"],
+            refresh_token=integration["refresh_token"],
+            token_expires_at=datetime.fromisoformat(token_expires_at) if token_expires_at else None,
+            scopes=integration["scopes"],
+            provider_user_id=integration["provider_user_id"],
+            provider_username=integration["provider_username"],
+            sync_enabled=integration["sync_enabled"],
+            auto_generate_tasks=integration["auto_generate_tasks"],
+            last_sync_at=integration["last_sync_at"],
+            settings=integration["settings"],
+            metadata=integration["metadata"],
+            created_at=datetime.fromisoformat(integration["created_at"]),
+            updated_at=datetime.fromisoformat(integration["updated_at"]),
+        )
+
+    def _refreshed_token_fields(self, integration: dict, user_integration: UserIntegration) -> dict:
+        """Token fields to persist if the provider refreshed the access token during sync"""
+        if user_integration.access_token == integration["access_token"]:
+            return {}
+        return {
+            "access_token": user_integration.access_token,
+            "token_expires_at": user_integration.token_expires_at,
+        }
 
     # ========================================================================
     # Task Suggestions
@@ -492,8 +590,6 @@ class IntegrationService:
         Returns:
             Number of states removed
         """
-        from datetime import timedelta
-
         now = datetime.now(UTC)
         expired_states = []
 
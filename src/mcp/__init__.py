@@ -11,8 +11,12 @@ Usage:
     client.load_servers("mcp_config.json")
     tools = await client.start()
     # Use tools with Pydantic AI agents
+
+    # Or share started servers between agents
+    client = await get_mcp_session_pool().acquire(config)
 """
 
 from src.mcp.mcp_client import MCPClient, MCPServer
+from src.mcp.session_pool import MCPSessionPool, get_mcp_session_pool
 
-__all__ = ["MCPClient", "MCPServer"]
+__all__ = ["MCPClient", "MCPServer", "MCPSessionPool", "get_mcp_session_pool"]
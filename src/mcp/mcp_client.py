@@ -12,6 +12,7 @@ from pydantic_ai import RunContext, Tool as PydanticTool
 from pydantic_ai.tools import ToolDefinition
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
 from mcp.types import Tool as MCPTool
 from contextlib import AsyncExitStack
 from typing import Any
@@ -73,16 +74,32 @@ class MCPClient:
 
         try:
             with open(config_path, "r") as config_file:
-                self.config = json.load(config_file)
+                config = json.load(config_file)
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in MCP config: {e}")
 
-        if "mcpServers" not in self.config:
+        self.load_config(config)
+
+    def load_config(self, config: dict[str, Any]) -> None:
+        """
+        Load MCP server configuration from a dict in the same format as load_servers().
+
+        Servers are launched over stdio from "command"/"args"/"env", or reached over
+        Streamable HTTP when the entry has a "url" instead.
+
+        Args:
+            config: Configuration with an "mcpServers" mapping.
+
+        Raises:
+            ValueError: If config format is invalid
+        """
+        if "mcpServers" not in config:
             raise ValueError("MCP config must contain 'mcpServers' key")
 
+        self.config = config
         # Create server instances
         self.servers = [
-            MCPServer(name, config) for name, config in self.config["mcpServers"].items()
+            MCPServer(name, server_config) for name, server_config in config["mcpServers"].items()
         ]
         logger.info(f"Loaded {len(self.servers)} MCP servers from config")
 
@@ -174,30 +191,23 @@ class MCPServer:
         """
         Initialize the MCP server connection.
 
-        Starts the server process and establishes communication via stdio.
+        Starts the server process and communicates over stdio, or connects to a running
+        server over Streamable HTTP when the config has a "url".
 
         Raises:
             ValueError: If command is invalid
             Exception: If server initialization fails
         """
-        # Resolve command path (especially for npx)
-        command = (
-            shutil.which("npx") if self.config["command"] == "npx" else self.config["command"]
-        )
-        if command is None:
-            raise ValueError(f"Command not found: {self.config['command']}")
-
-        # Prepare server parameters
-        server_params = StdioServerParameters(
-            command=command,
-            args=self.config["args"],
-            env=self.config.get("env"),  # Optional environment variables
-        )
-
         try:
-            # Start server with stdio transport
-            stdio_transport = await self.exit_stack.enter_async_context(stdio_client(server_params))
-            read, write = stdio_transport
+            if "url" in self.config:
+                # Long-running server over Streamable HTTP
+                read, write, _ = await self.exit_stack.enter_async_context(
+                    streamablehttp_client(self.config["url"], headers=self.config.get("headers"))
+                )
+            else:
+                read, write = await self.exit_stack.enter_async_context(
+                    stdio_client(self._stdio_parameters())
+                )
 
             # Create client session
             session = await self.exit_stack.enter_async_context(ClientSession(read, write))
@@ -210,6 +220,21 @@ class MCPServer:
             await self.cleanup()
             raise
 
+    def _stdio_parameters(self) -> StdioServerParameters:
+        """Parameters for launching the server process over stdio."""
+        # Resolve command path (especially for npx)
+        command = (
+            shutil.which("npx") if self.config["command"] == "npx" else self.config["command"]
+        )
+        if command is None:
+            raise ValueError(f"Command not found: {self.config['command']}")
+
+        return StdioServerParameters(
+            command=command,
+            args=self.config.get("args", []),
+            env=self.config.get("env"),  # Optional environment variables
+        )
+
     async def create_pydantic_ai_tools(self) -> list[PydanticTool]:
         """
         Convert MCP tools to Pydantic AI tools.
@@ -2,8 +2,18 @@
 MCP (Model Control Protocol) Server Implementation for Task Management
 """
 
+import argparse
+import asyncio
+import contextlib
+import contextvars
+import inspect
+import itertools
+import json
 import logging
+import threading
+import time
 from collections.abc import Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from decimal import Decimal
 from typing import Any
@@ -17,6 +27,7 @@ from src.core.task_models import (
     TaskSort,
     TaskStatus,
 )
+from src.services.request_metrics import LatencyHistogram
 from src.services.task_service import (
     ProjectCreationData,
     TaskCreationData,
@@ -56,11 +67,33 @@ class MCPResponse:
     error: MCPError | None = None
 
 
+@dataclass
+class ToolMetrics:
+    """Call count, failures and latency for one tool"""
+
+    calls: int = 0
+    errors: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "mean_ms": self.latency.mean * 1000,
+            "p50_ms": self.latency.quantile(0.5) * 1000,
+            "p95_ms": self.latency.quantile(0.95) * 1000,
+            "p99_ms": self.latency.quantile(0.99) * 1000,
+            "max_ms": self.latency.max * 1000,
+        }
+
+
 class MCPToolRegistry:
     """Registry for MCP tools"""
 
     def __init__(self):
         self.tools: dict[str, dict[str, Any]] = {}
+        self.metrics: dict[str, ToolMetrics] = {}
+        self._metrics_lock = threading.Lock()
 
     def register(
         self,
@@ -92,11 +125,62 @@ class MCPToolRegistry:
         if name not in self.tools:
             raise ValueError(f"Tool not found: {name}")
 
+        start = time.perf_counter()
         try:
-            return self.tools[name]["function"](params)
+            result = self.tools[name]["function"](params)
         except Exception as e:
+            self._record(name, time.perf_counter() - start, failed=True)
             logger.error(f"Error calling tool {name}: {e}")
             raise
+        self._record(name, time.perf_counter() - start, failed=_is_failure(result))
+        return result
+
+    async def call_tool_async(
+        self, name: str, params: dict[str, Any], executor: Executor | None = None
+    ) -> Any:
+        """
+        Call a registered tool without blocking the event loop.
+
+        Coroutine tools are awaited directly; synchronous tools (which mostly do
+        TaskService database work) run on ``executor``, or the loop's default thread
+        pool, with the caller's context variables.
+        """
+        if name not in self.tools:
+            raise ValueError(f"Tool not found: {name}")
+
+        function = self.tools[name]["function"]
+        start = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(function):
+                result = await function(params)
+            else:
+                context = contextvars.copy_context()
+                result = await asyncio.get_running_loop().run_in_executor(
+                    executor, context.run, function, params
+                )
+        except Exception as e:
+            self._record(name, time.perf_counter() - start, failed=True)
+            logger.error(f"Error calling tool {name}: {e}")
+            raise
+        self._record(name, time.perf_counter() - start, failed=_is_failure(result))
+        return result
+
+    def _record(self, name: str, duration: float, failed: bool) -> None:
+        with self._metrics_lock:
+            metrics = self.metrics.setdefault(name, ToolMetrics())
+            metrics.calls += 1
+            metrics.errors += failed
+            metrics.latency.record(duration)
+
+    def get_tool_metrics(self) -> dict[str, dict[str, Any]]:
+        """Per-tool call counts, error counts and latency percentiles (ms)"""
+        with self._metrics_lock:
+            return {name: metrics.to_dict() for name, metrics in self.metrics.items()}
+
+
+def _is_failure(result: Any) -> bool:
+    """Tools report handled failures as ``{"success": False, ...}``"""
+    return isinstance(result, dict) and result.get("success") is False
 
 
 class TaskMCPTools:
@@ -434,12 +518,12 @@ class TaskMCPTools:
             data["actual_hours"] = float(data["actual_hours"])
 
         # Convert datetimes to ISO strings
-        for field in ["created_at", "updated_at", "due_date", "started_at", "completed_at"]:
-            if data.get(field):
-                if hasattr(data[field], "isoformat"):
-                    data[field] = data[field].isoformat()
+        for name in ["created_at", "updated_at", "due_date", "started_at", "completed_at"]:
+            if data.get(name):
+                if hasattr(data[name], "isoformat"):
+                    data[name] = data[name].isoformat()
                 else:
-                    data[field] = str(data[field])
+                    data[name] = str(data[name])
         return data
 
     def _hierarchy_to_dict(self, hierarchy: dict[str, Any]) -> dict[str, Any]:
@@ -537,23 +621,55 @@ class ProjectMCPTools:
         """Convert project to dictionary"""
         data = project.model_dump()
         # Convert datetimes to ISO strings
-        for field in ["created_at", "updated_at", "start_date", "end_date"]:
-            if data.get(field):
-                if hasattr(data[field], "isoformat"):
-                    data[field] = data[field].isoformat()
+        for name in ["created_at", "updated_at", "start_date", "end_date"]:
+            if data.get(name):
+                if hasattr(data[name], "isoformat"):
+                    data[name] = data[name].isoformat()
                 else:
-                    data[field] = str(data[field])
+                    data[name] = str(data[name])
         return data
 
 
 class MCPServer:
     """MCP Server for task management"""
 
-    def __init__(self, task_service: TaskService | None = None):
+    def __init__(
+        self,
+        task_service: TaskService | None = None,
+        max_concurrency: int = 8,
+        executor: Executor | None = None,
+    ):
+        """
+        Args:
+            task_service: Service backing the built-in task and project tools
+            max_concurrency: Most requests from one batch that run at the same time,
+                and the size of the tool thread pool when ``executor`` is not given
+            executor: Thread pool for synchronous tools
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
         self.task_service = task_service or TaskService()
         self.tool_registry = MCPToolRegistry()
+        self.max_concurrency = max_concurrency
+        self._executor = executor
+        self._owns_executor = executor is None
         self._register_built_in_tools()
 
+    @property
+    def executor(self) -> Executor:
+        """Thread pool for synchronous tools, created on first use"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix="mcp-tool"
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Release the tool thread pool if this server created it"""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
     def _register_built_in_tools(self):
         """Register built-in tools"""
         task_tools = TaskMCPTools(self.task_service)
@@ -840,11 +956,13 @@ class MCPServer:
                     ),
                 )
 
-            # Call the tool
-            result = self.tool_registry.call_tool(request.method, request.params)
+            # Call the tool (sync tools run on the thread pool)
+            result = await self.tool_registry.call_tool_async(
+                request.method, request.params, self.executor
+            )
 
             # Check if the tool returned an error
-            if isinstance(result, dict) and result.get("success") is False:
+            if _is_failure(result):
                 return MCPResponse(
                     jsonrpc=request.jsonrpc,
                     id=request.id,
@@ -875,15 +993,134 @@ class MCPServer:
             )
 
     async def handle_batch_requests(self, requests: list[MCPRequest]) -> list[MCPResponse]:
-        """Handle batch MCP requests"""
-        responses = []
-        for request in requests:
-            response = await self.handle_request(request)
-            responses.append(response)
-        return responses
-
-    def start_server(self, host: str = "localhost", port: int = 8001):
-        """Start the MCP server (placeholder for actual server implementation)"""
-        logger.info(f"MCP Server would start on {host}:{port}")
-        # This would typically start a WebSocket or HTTP server
-        # For now, we'll just log the intent
+        """
+        Handle batch MCP requests concurrently.
+
+        At most ``max_concurrency`` requests run at once; responses are returned in
+        request order. Requests in a batch must not depend on each other's effects.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(request: MCPRequest) -> MCPResponse:
+            async with semaphore:
+                return await self.handle_request(request)
+
+        return list(await asyncio.gather(*(run(request) for request in requests)))
+
+    def get_tool_metrics(self) -> dict[str, dict[str, Any]]:
+        """Per-tool call counts, error counts and latency percentiles (ms)"""
+        return self.tool_registry.get_tool_metrics()
+
+    def build_protocol_server(self, name: str = "proxy-agent-tasks"):
+        """
+        Expose the registered tools through the MCP protocol.
+
+        Returns an ``mcp`` low-level ``Server`` whose tool list and tool calls are backed
+        by this server's registry, so every transport shares the same dispatch path
+        (thread pool, metrics, error mapping) as ``handle_request``.
+        """
+        from mcp.server.lowlevel import Server
+
+        from mcp import types
+
+        protocol_server = Server(name)
+        call_ids = itertools.count(1)
+
+        @protocol_server.list_tools()
+        async def list_tools() -> list[types.Tool]:
+            return [
+                types.Tool(
+                    name=tool["name"],
+                    description=tool["description"],
+                    inputSchema=tool["parameters"] or {"type": "object"},
+                )
+                for tool in self.list_tools()
+            ]
+
+        @protocol_server.call_tool()
+        async def call_tool(tool_name: str, arguments: dict[str, Any]) -> dict[str, Any]:
+            response = await self.handle_request(
+                MCPRequest(jsonrpc="2.0", id=next(call_ids), method=tool_name, params=arguments)
+            )
+            if response.error:
+                detail = (response.error.data or {}).get("error", "")
+                raise RuntimeError(f"{response.error.message}: {detail}".rstrip(": "))
+            # Round-trip through JSON so Decimal/datetime values become plain types
+            result = json.loads(json.dumps(response.result, default=str))
+            return result if isinstance(result, dict) else {"result": result}
+
+        return protocol_server
+
+    async def serve_stdio(self) -> None:
+        """Serve MCP over stdin/stdout until the client disconnects."""
+        from mcp.server.stdio import stdio_server
+
+        protocol_server = self.build_protocol_server()
+        async with stdio_server() as (read_stream, write_stream):
+            await protocol_server.run(
+                read_stream, write_stream, protocol_server.create_initialization_options()
+            )
+
+    def build_http_app(self, path: str = "/mcp"):
+        """
+        ASGI app serving MCP over Streamable HTTP (POST plus SSE streams).
+
+        Sessions are kept by ``Mcp-Session-Id``, so one client connection is reused
+        across many tool calls.
+        """
+        from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+        from starlette.applications import Starlette
+        from starlette.routing import Mount
+
+        session_manager = StreamableHTTPSessionManager(app=self.build_protocol_server())
+
+        @contextlib.asynccontextmanager
+        async def lifespan(app):  # noqa: ARG001
+            async with session_manager.run():
+                yield
+            self.shutdown()
+
+        return Starlette(
+            routes=[Mount(path, app=session_manager.handle_request)], lifespan=lifespan
+        )
+
+    def start_server(self, host: str = "localhost", port: int = 8001, transport: str = "http"):
+        """
+        Run the MCP server until interrupted.
+
+        Args:
+            host: Interface for the HTTP transport
+            port: Port for the HTTP transport
+            transport: "http" (Streamable HTTP at /mcp) or "stdio"
+        """
+        if transport == "stdio":
+            asyncio.run(self.serve_stdio())
+            self.shutdown()
+        elif transport == "http":
+            import uvicorn
+
+            logger.info(f"MCP Server listening on http://{host}:{port}/mcp")
+            uvicorn.run(self.build_http_app(), host=host, port=port)
+        else:
+            raise ValueError(f"Unknown MCP transport: {transport}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the task management MCP server (``python -m src.mcp.mcp_server``)."""
+    parser = argparse.ArgumentParser(description="Task management MCP server")
+    parser.add_argument("--transport", choices=["http", "stdio"], default="http")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--db", help="SQLite database path (default: the app database)")
+    args = parser.parse_args(argv)
+
+    task_service = None
+    if args.db:
+        from src.database.enhanced_adapter import EnhancedDatabaseAdapter
+
+        task_service = TaskService(EnhancedDatabaseAdapter(args.db))
+    MCPServer(task_service).start_server(args.host, args.port, args.transport)
+
+
+if __name__ == "__main__":
+    main()
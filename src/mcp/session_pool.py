@@ -0,0 +1,142 @@
+"""
+Shared pool of started MCP clients.
+
+Launching MCP servers and discovering their tools takes seconds, so agents that use
+the same servers share one started MCPClient instead of each starting their own.
+Clients are keyed by their server configuration and stay connected until the pool
+is closed.
+
+Usage:
+    pool = get_mcp_session_pool()
+    client = await pool.acquire(config.get_mcp_config())
+    agent = Agent(model, tools=client.tools)
+    ...
+    await pool.close()  # at shutdown
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.mcp.mcp_client import MCPClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PoolEntry:
+    """One started client and the task that owns its connections."""
+
+    ready: asyncio.Future
+    stop: asyncio.Event = field(default_factory=asyncio.Event)
+    task: asyncio.Task | None = None
+    client: MCPClient | None = None
+
+
+class MCPSessionPool:
+    """
+    Keeps one started MCPClient per distinct server configuration.
+
+    Each client is started and cleaned up inside its own long-lived task. The stdio and
+    HTTP transports use anyio cancel scopes that must be exited by the task that
+    entered them, so connections outlive the agent (and task) that first asked for
+    them.
+    """
+
+    def __init__(self, client_factory: Callable[[], MCPClient] = MCPClient) -> None:
+        self._client_factory = client_factory
+        self._entries: dict[str, _PoolEntry] = {}
+        self._lock: asyncio.Lock | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @staticmethod
+    def _key(config: dict[str, Any]) -> str:
+        return json.dumps(config, sort_keys=True, default=str)
+
+    def _bind_loop(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Sessions from another (finished) event loop cannot be used or closed here
+            if self._entries:
+                logger.warning(f"Dropping {len(self._entries)} MCP sessions from another loop")
+            self._entries = {}
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+
+    async def acquire(self, config: dict[str, Any]) -> MCPClient:
+        """
+        Return a started client for ``config``, starting it on first use.
+
+        Concurrent callers with the same configuration wait for the same startup.
+
+        Raises:
+            RuntimeError: If every server in the configuration fails to start
+        """
+        key = self._key(config)
+        async with self._bind_loop():
+            entry = self._entries.get(key)
+            if entry is None or (entry.task is not None and entry.task.done()):
+                entry = _PoolEntry(ready=asyncio.get_running_loop().create_future())
+                entry.task = asyncio.create_task(self._own(entry, config))
+                self._entries[key] = entry
+
+        try:
+            return await asyncio.shield(entry.ready)
+        except Exception:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+            raise
+
+    async def _own(self, entry: _PoolEntry, config: dict[str, Any]) -> None:
+        """Start the client, hold it until the pool closes, then clean it up."""
+        client = self._client_factory()
+        try:
+            client.load_config(config)
+            await client.start()
+        except BaseException as e:
+            entry.ready.set_exception(e)
+            await client.cleanup()
+            return
+
+        entry.client = client
+        entry.ready.set_result(client)
+        try:
+            await entry.stop.wait()
+        finally:
+            await client.cleanup()
+
+    async def close(self) -> None:
+        """Clean up every pooled client."""
+        entries, self._entries = list(self._entries.values()), {}
+        for entry in entries:
+            entry.stop.set()
+        tasks = [entry.task for entry in entries if entry.task is not None]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info(f"MCP session pool closed ({len(tasks)} clients)")
+
+    def stats(self) -> dict[str, Any]:
+        """Number of pooled clients and the tools each exposes."""
+        return {
+            "clients": len(self._entries),
+            "tools": {
+                ", ".join(server.name for server in entry.client.servers): len(entry.client.tools)
+                for entry in self._entries.values()
+                if entry.client is not None
+            },
+        }
+
+
+_pool: MCPSessionPool | None = None
+
+
+def get_mcp_session_pool() -> MCPSessionPool:
+    """Process-wide MCP session pool."""
+    global _pool
+    if _pool is None:
+        _pool = MCPSessionPool()
+    return _pool
@@ -9,8 +9,15 @@ Usage:
     memory_client = MemoryClient()
     memory_client.add_memory(messages, user_id="user123")
     memories = memory_client.search_memories("query", user_id="user123")
+
+    # From async code: searches run off the event loop, writes are batched
+    memory = AsyncMemoryClient(memory_client)
+    memories = await memory.search_memories("query", user_id="user123")
+    memory.add_memory(messages, user_id="user123")
 """
 
+from src.memory.async_memory import AsyncMemoryClient
 from src.memory.memory_client import MemoryClient, MemoryConfig
+from src.memory.vector_store import LocalVectorStore
 
-__all__ = ["MemoryClient", "MemoryConfig"]
+__all__ = ["AsyncMemoryClient", "LocalVectorStore", "MemoryClient", "MemoryConfig"]
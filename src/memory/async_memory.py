@@ -0,0 +1,257 @@
+"""
+Async facade over MemoryClient for use inside agents.
+
+Mem0's ``add`` and ``search`` are synchronous and slow: they embed text, may call an
+LLM to extract facts, and do vector-store I/O. Called inline from an async agent they
+block the event loop for every request being served.
+
+AsyncMemoryClient keeps that work off the response path:
+- Searches run in a thread pool and are cached per user and query. A write by the
+  user invalidates their cached searches.
+- Writes are queued in a write-behind buffer. A background task flushes it,
+  combining each user's queued messages into one ``add`` call. ``flush()`` and
+  ``close()`` drain the buffer, for example at shutdown.
+
+Usage:
+    memory = AsyncMemoryClient(MemoryClient(config))
+    memories = await memory.search_memories("python", user_id="user123")
+    memory.add_memory(messages, user_id="user123")  # returns immediately
+    await memory.close()
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+
+from src.memory.memory_client import MemoryClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingWrite:
+    messages: list[dict[str, str]]
+    user_id: str
+    agent_id: str | None
+    metadata: dict[str, Any] | None
+
+
+@dataclass
+class _CachedSearch:
+    memories: list[dict[str, Any]]
+    generation: int
+    expires_at: float
+
+
+class AsyncMemoryClient:
+    """
+    Non-blocking, batched access to a MemoryClient.
+
+    Must be used from a single event loop. The wrapped client is only ever called from
+    the thread pool, and only one write runs at a time.
+    """
+
+    def __init__(
+        self,
+        client: MemoryClient,
+        max_workers: int = 4,
+        flush_interval: float = 1.0,
+        max_batch: int = 32,
+        search_cache_size: int = 512,
+        search_ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            client: Memory client to wrap
+            max_workers: Threads for Mem0 calls
+            flush_interval: Seconds between background flushes
+            max_batch: Queued writes that trigger an immediate flush
+            search_cache_size: Maximum cached search results
+            search_ttl: Seconds a cached search result is served
+            clock: Monotonic time source
+        """
+        self.client = client
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.search_cache_size = search_cache_size
+        self.search_ttl = search_ttl
+        self._clock = clock
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="memory")
+        self._pending: list[_PendingWrite] = []
+        self._wakeup: asyncio.Event | None = None
+        self._flusher: asyncio.Task | None = None
+        self._write_lock: asyncio.Lock | None = None
+        self._cache: OrderedDict[tuple[str, str, int], _CachedSearch] = OrderedDict()
+        self._generations: defaultdict[str, int] = defaultdict(int)
+        self._closed = False
+        self._stats = {"searches": 0, "cache_hits": 0, "writes": 0, "batches": 0, "errors": 0}
+
+    async def _run(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def search_memories(
+        self, query: str, user_id: str, limit: int = 5
+    ) -> list[dict[str, Any]]:
+        """
+        Search a user's memories without blocking the event loop.
+
+        Args:
+            query: Search query text
+            user_id: User identifier
+            limit: Maximum number of memories to return
+
+        Returns:
+            List of memory dicts (empty if the search failed)
+        """
+        self._stats["searches"] += 1
+        key = (user_id, " ".join(query.lower().split()), limit)
+        generation = self._generations[user_id]
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            if cached.generation == generation and self._clock() < cached.expires_at:
+                self._cache.move_to_end(key)
+                self._stats["cache_hits"] += 1
+                return list(cached.memories)
+            del self._cache[key]
+
+        memories = await self._run(self.client.search_memories, query, user_id, limit)
+
+        # Empty results are not cached: MemoryClient also returns [] when the search
+        # fails, and that must not hide memories for the whole TTL
+        if memories and self._generations[user_id] == generation:
+            self._cache[key] = _CachedSearch(
+                memories=list(memories),
+                generation=generation,
+                expires_at=self._clock() + self.search_ttl,
+            )
+            while len(self._cache) > self.search_cache_size:
+                self._cache.popitem(last=False)
+        return memories
+
+    def add_memory(
+        self,
+        messages: list[dict[str, str]],
+        user_id: str,
+        agent_id: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Queue conversation messages to be stored; returns immediately.
+
+        Must be called from the event loop. Failed writes are logged, not raised.
+
+        Raises:
+            RuntimeError: If the client has been closed
+        """
+        if self._closed:
+            raise RuntimeError("AsyncMemoryClient is closed")
+
+        self._pending.append(_PendingWrite(list(messages), user_id, agent_id, metadata))
+        self._invalidate(user_id)
+        self._ensure_flusher()
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+
+    def _invalidate(self, user_id: str) -> None:
+        # Bumping the generation makes every cached search for the user stale at once,
+        # including searches that are still running
+        self._generations[user_id] += 1
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is None or self._flusher.done():
+            self._wakeup = asyncio.Event()
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while not self._closed:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Write every queued message now.
+
+        Returns:
+            Number of queued writes processed
+        """
+        if not self._pending:
+            return 0
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+
+        async with self._write_lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+
+            for write in self._combine(batch):
+                try:
+                    await self._run(
+                        self.client.add_memory,
+                        write.messages,
+                        user_id=write.user_id,
+                        agent_id=write.agent_id,
+                        metadata=write.metadata,
+                    )
+                    self._stats["writes"] += 1
+                except Exception as e:
+                    self._stats["errors"] += 1
+                    logger.error(f"Error writing memories for user {write.user_id}: {e}")
+                finally:
+                    # Searches that ran while the write was in flight saw old data
+                    self._invalidate(write.user_id)
+
+            self._stats["batches"] += 1
+            logger.debug(f"Flushed {len(batch)} queued memory writes")
+            return len(batch)
+
+    @staticmethod
+    def _combine(batch: list[_PendingWrite]) -> list[_PendingWrite]:
+        """Merge queued writes for the same user, agent and metadata, keeping order."""
+        combined: dict[tuple[str, str | None, str], _PendingWrite] = {}
+        for write in batch:
+            key = (
+                write.user_id,
+                write.agent_id,
+                json.dumps(write.metadata, sort_keys=True, default=str),
+            )
+            if key in combined:
+                combined[key].messages.extend(write.messages)
+            else:
+                combined[key] = _PendingWrite(
+                    list(write.messages), write.user_id, write.agent_id, write.metadata
+                )
+        return list(combined.values())
+
+    async def close(self) -> None:
+        """Flush queued writes, stop the background flusher and release threads."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._flusher is not None and not self._flusher.done():
+            # Let the flusher finish its current batch rather than cancelling mid-write
+            self._wakeup.set()
+            await self._flusher
+        await self.flush()
+        self._executor.shutdown(wait=False)
+
+    def format_memories_for_prompt(self, memories: list[dict[str, Any]]) -> str:
+        """Format memories for injection into an agent prompt."""
+        return self.client.format_memories_for_prompt(memories)
+
+    def stats(self) -> dict[str, Any]:
+        """Search, cache and write counters plus the current queue length."""
+        return {**self._stats, "pending": len(self._pending), "cached": len(self._cache)}
@@ -12,11 +12,13 @@ This module enables agents to:
 """
 
 from mem0 import Memory
-from typing import Any, Optional
+from typing import Any
 from pydantic import BaseModel, Field
 import logging
 import os
 
+from src.memory.vector_store import LocalMemory, get_local_store
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -29,7 +31,9 @@ class MemoryConfig(BaseModel):
 
     llm_provider: str = Field(default="anthropic", description="LLM provider for memory processing")
     llm_model: str = Field(default="claude-3-5-sonnet-20241022", description="LLM model name")
-    vector_store_provider: str = Field(default="qdrant", description="Vector store provider")
+    vector_store_provider: str = Field(
+        default="qdrant", description='Vector store provider ("local" for the embedded store)'
+    )
     vector_store_path: str = Field(default="./memory_db", description="Path for vector storage")
     collection_name: str = Field(default="agent_memories", description="Collection name for memories")
 
@@ -46,7 +50,7 @@ class MemoryClient:
         memories = memory_client.search_memories("what did I say about X?", user_id="user123")
     """
 
-    def __init__(self, config: Optional[MemoryConfig] = None) -> None:
+    def __init__(self, config: MemoryConfig | None = None) -> None:
         """
         Initialize memory client.
 
@@ -54,11 +58,17 @@ class MemoryClient:
             config: Memory configuration. Uses default if not provided.
         """
         self.config = config or MemoryConfig()
-        self._memory: Optional[Memory] = None
+        self._memory: Memory | LocalMemory | None = None
         self._initialize()
 
     def _initialize(self) -> None:
         """Initialize Mem0 memory instance with configuration."""
+        if self.config.vector_store_provider == "local":
+            # Embedded per-user NumPy store: no vector DB service or API key required
+            self._memory = LocalMemory(get_local_store(self.config.vector_store_path))
+            logger.info(f"Memory initialized with local store at {self.config.vector_store_path}")
+            return
+
         # Start with basic config
         mem0_config: dict[str, Any] = {
             "vector_store": {
@@ -106,8 +116,8 @@ class MemoryClient:
         self,
         messages: list[dict[str, str]],
         user_id: str,
-        agent_id: Optional[str] = None,
-        metadata: Optional[dict[str, Any]] = None,
+        agent_id: str | None = None,
+        metadata: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
         """
         Add new memories from conversation messages.
@@ -140,7 +150,12 @@ class MemoryClient:
             raise
 
     def search_memories(
-        self, query: str, user_id: str, limit: int = 5, agent_id: Optional[str] = None
+        self,
+        query: str,
+        user_id: str,
+        limit: int = 5,
+        agent_id: str | None = None,
+        filters: dict[str, Any] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Search for relevant memories based on query.
@@ -150,6 +165,7 @@ class MemoryClient:
             user_id: User identifier for memory isolation
             limit: Maximum number of memories to return
             agent_id: Optional agent identifier
+            filters: Optional metadata filters, e.g. {"role": "user"}
 
         Returns:
             List of memory dicts with 'memory' and other fields
@@ -167,7 +183,12 @@ class MemoryClient:
             raise RuntimeError("Memory not initialized")
 
         try:
-            result = self._memory.search(query=query, user_id=user_id, limit=limit)
+            if filters:
+                result = self._memory.search(
+                    query=query, user_id=user_id, limit=limit, filters=filters
+                )
+            else:
+                result = self._memory.search(query=query, user_id=user_id, limit=limit)
             memories = result.get("results", [])
             logger.debug(f"Found {len(memories)} memories for user {user_id}")
             return memories
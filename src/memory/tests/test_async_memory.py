@@ -0,0 +1,138 @@
+"""
+Unit Tests for AsyncMemoryClient
+
+Uses a fake MemoryClient so no vector store or API keys are needed.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.memory import AsyncMemoryClient
+
+
+class FakeMemoryClient:
+    """Records calls and the threads they ran on"""
+
+    def __init__(self, delay: float = 0.0, fail_writes: bool = False):
+        self.delay = delay
+        self.fail_writes = fail_writes
+        self.adds = []
+        self.searches = []
+        self.threads = set()
+        self.stored: dict[str, list[str]] = {}
+
+    def add_memory(self, messages, user_id, agent_id=None, metadata=None):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        if self.fail_writes:
+            raise RuntimeError("vector store down")
+        self.adds.append((user_id, [m["content"] for m in messages], metadata))
+        self.stored.setdefault(user_id, []).extend(m["content"] for m in messages)
+        return {"status": "success"}
+
+    def search_memories(self, query, user_id, limit=5):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        self.searches.append((query, user_id))
+        return [{"memory": m} for m in self.stored.get(user_id, [])][:limit]
+
+    def format_memories_for_prompt(self, memories):
+        return "\n".join(m["memory"] for m in memories)
+
+
+def message(content: str) -> list[dict[str, str]]:
+    return [{"role": "user", "content": content}]
+
+
+@pytest.mark.asyncio
+async def test_add_memory_returns_immediately_and_batches_per_user():
+    fake = FakeMemoryClient(delay=0.05)
+    memory = AsyncMemoryClient(fake, flush_interval=10)
+
+    start = time.perf_counter()
+    memory.add_memory(message("likes python"), user_id="alice")
+    memory.add_memory(message("uses vim"), user_id="alice")
+    memory.add_memory(message("runs daily"), user_id="bob")
+    queued_in = time.perf_counter() - start
+
+    assert queued_in < 0.01
+    assert fake.adds == []
+
+    await memory.close()
+
+    assert fake.adds == [
+        ("alice", ["likes python", "uses vim"], None),
+        ("bob", ["runs daily"], None),
+    ]
+    assert all(name.startswith("memory") for name in fake.threads)
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_flushes_in_background():
+    fake = FakeMemoryClient()
+    memory = AsyncMemoryClient(fake, flush_interval=10, max_batch=2)
+
+    memory.add_memory(message("one"), user_id="alice")
+    memory.add_memory(message("two"), user_id="alice")
+    for _ in range(50):
+        if fake.adds:
+            break
+        await asyncio.sleep(0.01)
+
+    assert fake.adds == [("alice", ["one", "two"], None)]
+    await memory.close()
+
+
+@pytest.mark.asyncio
+async def test_search_is_cached_and_invalidated_by_writes():
+    fake = FakeMemoryClient()
+    fake.stored["alice"] = ["likes python"]
+    memory = AsyncMemoryClient(fake, flush_interval=10)
+
+    first = await memory.search_memories("Python", user_id="alice")
+    second = await memory.search_memories("  python ", user_id="alice")
+    memory.add_memory(message("uses vim"), user_id="alice")
+    await memory.flush()
+    third = await memory.search_memories("python", user_id="alice")
+
+    assert first == second == [{"memory": "likes python"}]
+    assert third == [{"memory": "likes python"}, {"memory": "uses vim"}]
+    assert len(fake.searches) == 2
+    assert memory.stats()["cache_hits"] == 1
+    await memory.close()
+
+
+@pytest.mark.asyncio
+async def test_search_runs_off_the_event_loop():
+    fake = FakeMemoryClient(delay=0.1)
+    memory = AsyncMemoryClient(fake)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    await memory.search_memories("anything", user_id="alice")
+    task.cancel()
+
+    assert ticks >= 5
+    await memory.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_writes_are_logged_not_raised():
+    fake = FakeMemoryClient(fail_writes=True)
+    memory = AsyncMemoryClient(fake, flush_interval=10)
+    memory.add_memory(message("lost"), user_id="alice")
+
+    await memory.close()
+
+    assert memory.stats()["errors"] == 1
+    with pytest.raises(RuntimeError, match="closed"):
+        memory.add_memory(message("late"), user_id="alice")
@@ -0,0 +1,504 @@
+"""
+Local Vector Store - embedded, zero-service memory backend.
+
+Stores each user's memories in their own shard: a memory-mapped float32 matrix of
+unit-length embeddings plus a JSON-lines record log. Search is a cosine top-k over
+one user's rows, so cost and memory scale with that user's memories rather than the
+whole store. Only ``max_open_shards`` shards are kept open, which makes memory use
+predictable.
+
+Layout:
+    <root>/<shard>/vectors.f32    # n x dim float32, row i = i-th record
+    <root>/<shard>/records.jsonl  # {"id", "memory", "metadata", "created_at"} per row,
+                                  # plus {"deleted": id} tombstones
+    <root>/<shard>/CURRENT        # once compacted: name of the generation directory
+                                  # (gen-<n>/) holding the two files above
+
+Deletes append tombstones; ``compact()`` rewrites a shard without deleted rows (it
+also runs automatically once enough rows are dead). The rewrite goes to a new
+generation directory, which replacing CURRENT switches to in one rename, so a crash
+leaves either the old or the new pair of files, never a mix.
+
+Used through MemoryClient with ``MemoryConfig(vector_store_provider="local")``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from itertools import pairwise
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = "vectors.f32"
+RECORDS_FILE = "records.jsonl"
+CURRENT_FILE = "CURRENT"
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_UNSAFE = re.compile(r"[^A-Za-z0-9_-]+")
+
+
+class HashingEmbedder:
+    """
+    Deterministic bag-of-words embedder (feature hashing of words and word pairs).
+
+    Needs no model or API key. Matches on shared vocabulary rather than meaning; pass
+    a real embedding function to LocalVectorStore for semantic search.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def _bucket(self, feature: str) -> tuple[int, float]:
+        digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest())
+        return digest % self.dim, 1.0 if digest >> 63 else -1.0
+
+    def __call__(self, texts: list[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = _TOKEN.findall(text.lower())
+            for feature in tokens + [f"{a} {b}" for a, b in pairwise(tokens)]:
+                index, sign = self._bucket(feature)
+                vectors[row, index] += sign
+        return vectors
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+def _matches(metadata: dict[str, Any], filters: dict[str, Any]) -> bool:
+    """Equality filters; a list value matches any of its items."""
+    for key, expected in filters.items():
+        value = metadata.get(key)
+        if isinstance(expected, list | tuple | set):
+            if value not in expected:
+                return False
+        elif value != expected:
+            return False
+    return True
+
+
+@dataclass
+class _Shard:
+    """One user's memories, loaded."""
+
+    home: Path
+    dim: int
+    generation: str = ""  # Directory under home holding the files; "" for home itself
+    records: list[dict[str, Any]] = field(default_factory=list)
+    deleted: set[str] = field(default_factory=set)
+    rows: dict[str, int] = field(default_factory=dict)
+    vectors: np.ndarray | None = None
+
+    @property
+    def dead(self) -> int:
+        return len(self.deleted)
+
+    @property
+    def row_bytes(self) -> int:
+        return 4 * self.dim
+
+    @property
+    def path(self) -> Path:
+        return self.home / self.generation
+
+    def load(self, embed: Callable[[list[str]], np.ndarray]) -> "_Shard":
+        """Read the shard, repairing a vectors file that is out of step with the records."""
+        current = self.home / CURRENT_FILE
+        if current.exists():
+            self.generation = current.read_text(encoding="utf-8").strip()
+        self._remove_stale_files()
+
+        records_file = self.path / RECORDS_FILE
+        if records_file.exists():
+            with open(records_file, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if "deleted" in entry:
+                        self.deleted.add(entry["deleted"])
+                    else:
+                        self.rows[entry["id"]] = len(self.records)
+                        self.records.append(entry)
+
+        vectors_file = self.path / VECTORS_FILE
+        size = vectors_file.stat().st_size if vectors_file.exists() else 0
+        if size != len(self.records) * self.row_bytes:
+            self._repair_vectors(size // self.row_bytes, embed)
+
+        self._map_vectors()
+        return self
+
+    def _repair_vectors(self, available: int, embed: Callable[[list[str]], np.ndarray]) -> None:
+        """
+        Make the vectors file hold exactly one row per record.
+
+        An interrupted append leaves vectors without records, which are dropped. Records
+        without vectors (a truncated or lost vectors file) keep their text, so they are
+        embedded again. The records log, tombstones included, is not touched.
+        """
+        kept = min(available, len(self.records))
+        missing = self.records[kept:]
+        logger.warning(
+            f"Repairing shard {self.home.name}: {len(self.records)} records, "
+            f"{available} vectors, re-embedding {len(missing)}"
+        )
+        with open(self.path / VECTORS_FILE, "ab") as f:
+            f.truncate(kept * self.row_bytes)
+            if missing:
+                embed([r["memory"] for r in missing]).astype(np.float32).tofile(f)
+
+    def _map_vectors(self) -> None:
+        count = len(self.records)
+        if count == 0:
+            self.vectors = np.zeros((0, self.dim), dtype=np.float32)
+            return
+        self.vectors = np.memmap(
+            self.path / VECTORS_FILE, dtype=np.float32, mode="r", shape=(count, self.dim)
+        )
+
+    def _remove_stale_files(self) -> None:
+        """Delete what an interrupted compaction left beside the current generation."""
+        if not self.home.exists():
+            return
+        keep = {CURRENT_FILE, self.generation} if self.generation else {VECTORS_FILE, RECORDS_FILE}
+        for entry in self.home.iterdir():
+            if entry.name in keep:
+                continue
+            if entry.is_dir():
+                shutil.rmtree(entry)
+            else:
+                entry.unlink()
+
+    def _rewrite(self, records: list[dict[str, Any]], vectors: np.ndarray) -> None:
+        """Write exactly these rows (no tombstones) to a new generation and switch to it."""
+        number = int(self.generation.removeprefix("gen-") or 0) + 1
+        generation = f"gen-{number}"
+        target = self.home / generation
+        shutil.rmtree(target, ignore_errors=True)  # Left by an interrupted compaction
+        target.mkdir()
+        np.ascontiguousarray(vectors, dtype=np.float32).tofile(target / VECTORS_FILE)
+        with open(target / RECORDS_FILE, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
+        pointer = self.home / f"{CURRENT_FILE}.tmp"
+        pointer.write_text(generation, encoding="utf-8")
+        os.replace(pointer, self.home / CURRENT_FILE)
+
+        self.vectors = None  # Release the map before removing the old files
+        old_generation, self.generation = self.generation, generation
+        self.records = list(records)
+        self.rows = {r["id"]: i for i, r in enumerate(self.records)}
+        self.deleted = set()
+        if old_generation:
+            shutil.rmtree(self.home / old_generation, ignore_errors=True)
+        else:
+            (self.home / VECTORS_FILE).unlink(missing_ok=True)
+            (self.home / RECORDS_FILE).unlink(missing_ok=True)
+
+    def append(self, records: list[dict[str, Any]], vectors: np.ndarray) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        # A crash between the two writes leaves them out of step; load() repairs that
+        with open(self.path / VECTORS_FILE, "ab") as f:
+            vectors.astype(np.float32).tofile(f)
+        with open(self.path / RECORDS_FILE, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
+        for record in records:
+            self.rows[record["id"]] = len(self.records)
+            self.records.append(record)
+        self._map_vectors()
+
+    def tombstone(self, memory_id: str) -> bool:
+        if memory_id not in self.rows or memory_id in self.deleted:
+            return False
+        with open(self.path / RECORDS_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"deleted": memory_id}) + "\n")
+        self.deleted.add(memory_id)
+        return True
+
+    def live_mask(self) -> np.ndarray:
+        mask = np.ones(len(self.records), dtype=bool)
+        for memory_id in self.deleted:
+            row = self.rows.get(memory_id)
+            if row is not None:
+                mask[row] = False
+        return mask
+
+    def compact(self) -> int:
+        """Rewrite the shard without deleted rows, returning how many were removed."""
+        if not self.deleted:
+            return 0
+        mask = self.live_mask()
+        live_vectors = np.array(self.vectors[mask], dtype=np.float32)
+        live_records = [r for r, keep in zip(self.records, mask, strict=True) if keep]
+        removed = len(self.records) - len(live_records)
+        self._rewrite(live_records, live_vectors)
+        self._map_vectors()
+        return removed
+
+
+class LocalVectorStore:
+    """
+    Per-user sharded vector store on local disk.
+
+    Thread-safe; a single lock serializes access, which suits the small, per-user
+    shards this store is built for.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        embedder: Callable[[list[str]], np.ndarray] | None = None,
+        dim: int = 384,
+        max_open_shards: int = 64,
+        compact_ratio: float = 0.3,
+    ):
+        """
+        Args:
+            root: Directory holding one subdirectory per user shard
+            embedder: Maps texts to an (n, dim) array; feature hashing by default
+            dim: Embedding dimension
+            max_open_shards: Shards kept loaded; least recently used are closed
+            compact_ratio: Compact a shard once this fraction of its rows is deleted
+        """
+        self.root = Path(root)
+        self.dim = dim
+        self.embedder = embedder or HashingEmbedder(dim)
+        self.max_open_shards = max_open_shards
+        self.compact_ratio = compact_ratio
+        self._shards: OrderedDict[str, _Shard] = OrderedDict()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def shard_name(user_id: str) -> str:
+        """Filesystem-safe, collision-free shard directory name for a user."""
+        digest = hashlib.sha1(user_id.encode()).hexdigest()[:10]
+        return f"{_UNSAFE.sub('_', user_id)[:40]}-{digest}"
+
+    def _shard(self, name: str) -> _Shard:
+        shard = self._shards.get(name)
+        if shard is None:
+            shard = _Shard(self.root / name, self.dim).load(self._embed)
+            self._shards[name] = shard
+            while len(self._shards) > self.max_open_shards:
+                self._shards.popitem(last=False)
+        else:
+            self._shards.move_to_end(name)
+        return shard
+
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        vectors = np.asarray(self.embedder(texts), dtype=np.float32)
+        if vectors.shape != (len(texts), self.dim):
+            raise ValueError(f"Embedder returned shape {vectors.shape}, expected (n, {self.dim})")
+        return _normalize(vectors)
+
+    def add(
+        self, user_id: str, texts: list[str], metadata: list[dict[str, Any]] | None = None
+    ) -> list[str]:
+        """
+        Store texts for a user.
+
+        Returns:
+            IDs of the new memories
+        """
+        if not texts:
+            return []
+        metadata = metadata or [{} for _ in texts]
+        vectors = self._embed(texts)
+        name = self.shard_name(user_id)
+        now = datetime.now(UTC).isoformat()
+        records = [
+            {"id": f"{name}.{uuid4().hex}", "memory": text, "metadata": meta, "created_at": now}
+            for text, meta in zip(texts, metadata, strict=True)
+        ]
+        with self._lock:
+            self._shard(name).append(records, vectors)
+        return [r["id"] for r in records]
+
+    def search(
+        self,
+        user_id: str,
+        query: str,
+        limit: int = 5,
+        filters: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Cosine top-k over a user's memories.
+
+        Args:
+            user_id: User whose memories are searched
+            query: Query text
+            limit: Maximum results
+            filters: Metadata equality filters (a list value matches any item)
+
+        Returns:
+            Records with a ``score``, best first
+        """
+        query_vector = self._embed([query])[0]
+        with self._lock:
+            shard = self._shard(self.shard_name(user_id))
+            if not shard.records:
+                return []
+            mask = shard.live_mask()
+            if filters:
+                mask &= np.fromiter(
+                    (_matches(r["metadata"], filters) for r in shard.records),
+                    dtype=bool,
+                    count=len(shard.records),
+                )
+            candidates = np.flatnonzero(mask)
+            if candidates.size == 0:
+                return []
+
+            scores = shard.vectors[candidates] @ query_vector
+            k = min(limit, candidates.size)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [{**shard.records[candidates[i]], "score": float(scores[i])} for i in top]
+
+    def get_all(self, user_id: str) -> list[dict[str, Any]]:
+        """All live memories for a user, oldest first."""
+        with self._lock:
+            shard = self._shard(self.shard_name(user_id))
+            return [r for r in shard.records if r["id"] not in shard.deleted]
+
+    def delete(self, memory_id: str) -> bool:
+        """Delete one memory by ID, returning whether it existed."""
+        name = memory_id.rsplit(".", 1)[0]
+        with self._lock:
+            if _UNSAFE.search(name) or not (self.root / name).exists():
+                return False
+            shard = self._shard(name)
+            deleted = shard.tombstone(memory_id)
+            if deleted and shard.dead >= max(1, self.compact_ratio * len(shard.records)):
+                shard.compact()
+            return deleted
+
+    def delete_user(self, user_id: str) -> None:
+        """Delete a user's shard entirely."""
+        name = self.shard_name(user_id)
+        with self._lock:
+            self._shards.pop(name, None)
+            shutil.rmtree(self.root / name, ignore_errors=True)
+
+    def compact(self, user_id: str | None = None) -> int:
+        """
+        Remove deleted rows from one user's shard, or from every shard.
+
+        Returns:
+            Number of rows removed
+        """
+        with self._lock:
+            if user_id is not None:
+                names = [self.shard_name(user_id)]
+            elif self.root.exists():
+                names = [p.name for p in self.root.iterdir() if p.is_dir()]
+            else:
+                names = []
+            return sum(self._shard(name).compact() for name in names)
+
+    def stats(self) -> dict[str, Any]:
+        """Open shards and the rows they hold."""
+        with self._lock:
+            return {
+                "open_shards": len(self._shards),
+                "rows": sum(len(s.records) for s in self._shards.values()),
+                "deleted": sum(s.dead for s in self._shards.values()),
+                "dim": self.dim,
+            }
+
+
+_stores: dict[Path, LocalVectorStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_local_store(root: str | Path) -> LocalVectorStore:
+    """
+    Shared store for a directory.
+
+    Every client of one directory must share a store (and its lock and open shards),
+    or their appends would interleave.
+    """
+    key = Path(root).resolve()
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = LocalVectorStore(key)
+        return _stores[key]
+
+
+class LocalMemory:
+    """
+    Mem0-compatible facade over LocalVectorStore.
+
+    Implements the subset of ``mem0.Memory`` that MemoryClient uses. Each non-empty
+    message is stored as its own memory (no LLM fact extraction).
+    """
+
+    def __init__(self, store: LocalVectorStore):
+        self.store = store
+
+    def add(
+        self,
+        messages: str | list[dict[str, str]],
+        user_id: str,
+        agent_id: str | None = None,
+        metadata: dict[str, Any] | None = None,
+        **_: Any,
+    ) -> dict[str, Any]:
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        texts, metas = [], []
+        for message in messages:
+            content = (message.get("content") or "").strip()
+            if not content:
+                continue
+            meta = {**(metadata or {}), "role": message.get("role", "user")}
+            if agent_id:
+                meta["agent_id"] = agent_id
+            texts.append(content)
+            metas.append(meta)
+        ids = self.store.add(user_id, texts, metas)
+        return {
+            "results": [
+                {"id": i, "memory": t, "event": "ADD"} for i, t in zip(ids, texts, strict=True)
+            ]
+        }
+
+    def search(
+        self,
+        query: str,
+        user_id: str,
+        limit: int = 5,
+        filters: dict[str, Any] | None = None,
+        **_: Any,
+    ) -> dict[str, Any]:
+        return {"results": self.store.search(user_id, query, limit=limit, filters=filters)}
+
+    def get_all(self, user_id: str, **_: Any) -> dict[str, Any]:
+        return {"results": self.store.get_all(user_id)}
+
+    def delete(self, memory_id: str) -> dict[str, Any]:
+        if not self.store.delete(memory_id):
+            raise ValueError(f"Memory not found: {memory_id}")
+        return {"message": "Memory deleted successfully!"}
+
+    def delete_all(self, user_id: str, **_: Any) -> dict[str, Any]:
+        self.store.delete_user(user_id)
+        return {"message": "Memories deleted successfully!"}
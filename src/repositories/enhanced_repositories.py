@@ -523,6 +523,24 @@ class ProductivityMetricsRepository(BaseEnhancedRepository):
             return self._dict_to_model(dict(row), ProductivityMetrics)
         return None
 
+    def get_metrics_range(
+        self, user_id: str, start: datetime, end: datetime, period_type: str = "daily"
+    ) -> list[ProductivityMetrics]:
+        """Get a user's metrics whose period starts between start and end, oldest first"""
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT * FROM productivity_metrics
+            WHERE user_id = ? AND period_type = ? AND date BETWEEN ? AND ?
+            ORDER BY date ASC
+            """,
+            (user_id, period_type, start.isoformat(), end.isoformat()),
+        )
+        rows = cursor.fetchall()
+
+        return [self._dict_to_model(dict(row), ProductivityMetrics) for row in rows]
+
 
 # Enhanced task repository that uses the enhanced database
 class EnhancedTaskRepository(BaseEnhancedRepository):
@@ -3,8 +3,12 @@ Enhanced Repository Extensions - Additional specialized repositories for Focus &
 """
 
 import json
+import math
+import os
 import sqlite3
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Any
 
 from src.core.task_models import FocusSession
@@ -14,11 +18,307 @@ from src.repositories.enhanced_repositories import (
     ProductivityMetricsRepository,
 )
 
+CIRCADIAN_MIGRATION_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "database"
+    / "migrations"
+    / "032_create_circadian_profiles.sql"
+)
+
+HOURS_PER_WEEK = 168
+
+# Databases (by absolute path) whose profile schema this process has installed
+_profile_schema_ready: set[str] = set()
+_profile_schema_lock = threading.Lock()
+
+# focus_sessions (planned minutes, actual minutes, completed) columns per schema version
+FOCUS_PROFILE_COLUMN_VARIANTS = [
+    ("planned_duration_minutes", "actual_duration_minutes", "was_completed"),
+    ("duration_minutes", "duration_minutes", "completed"),
+]
+
+# Welford update of one bucket; excluded.mean holds the new value
+BUCKET_UPSERT_SQL = """
+    INSERT INTO circadian_profile_buckets (user_id, series, bucket, n, mean, m2, min_value, max_value)
+    SELECT
+        NEW.user_id,
+        '{series}',
+        CAST(strftime('%w', NEW.started_at) AS INTEGER) * 24
+            + CAST(strftime('%H', NEW.started_at) AS INTEGER),
+        1, CAST({value} AS REAL), 0, {value}, {value}
+    WHERE strftime('%w', NEW.started_at) IS NOT NULL
+    ON CONFLICT(user_id, series, bucket) DO UPDATE SET
+        m2 = m2 + (excluded.mean - mean) * (excluded.mean - mean) * n / (n + 1.0),
+        mean = mean + (excluded.mean - mean) / (n + 1.0),
+        n = n + 1,
+        min_value = MIN(min_value, excluded.min_value),
+        max_value = MAX(max_value, excluded.max_value);
+"""
+
+FOCUS_ACTUAL_SQL = (
+    "COALESCE(NEW.{actual}, MAX((julianday(NEW.ended_at) - julianday(NEW.started_at)) * 1440, 0))"
+)
+
+FOCUS_PROFILE_TRIGGERS_SQL = """
+CREATE TRIGGER IF NOT EXISTS trg_focus_profile_insert
+AFTER INSERT ON focus_sessions
+BEGIN
+{planned_upsert}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_focus_profile_insert_ended
+AFTER INSERT ON focus_sessions
+WHEN NEW.ended_at IS NOT NULL
+BEGIN
+{actual_upsert}
+{completed_upsert}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_focus_profile_end
+AFTER UPDATE OF ended_at ON focus_sessions
+WHEN OLD.ended_at IS NULL AND NEW.ended_at IS NOT NULL
+BEGIN
+{actual_upsert}
+{completed_upsert}
+END;
+"""
+
+# One-time fill from history; the triggers keep the buckets current afterwards
+REBUILD_BUCKETS_SQL = """
+    INSERT INTO circadian_profile_buckets (user_id, series, bucket, n, mean, m2, min_value, max_value)
+    SELECT user_id, '{series}', bucket, COUNT(*), AVG(value),
+           MAX(SUM(value * value) - COUNT(*) * AVG(value) * AVG(value), 0),
+           MIN(value), MAX(value)
+    FROM (
+        SELECT user_id,
+               CAST(strftime('%w', {ts}) AS INTEGER) * 24 + CAST(strftime('%H', {ts}) AS INTEGER)
+                   AS bucket,
+               CAST({value} AS REAL) AS value
+        FROM {table}
+        WHERE strftime('%w', {ts}) IS NOT NULL {where}
+    )
+    GROUP BY user_id, bucket
+"""
+
+
+def combine_buckets(buckets: list[dict[str, Any] | None]) -> dict[str, Any] | None:
+    """
+    Merge the running statistics of several buckets.
+
+    Args:
+        buckets: Bucket statistics with n, mean, m2, min and max (None if empty)
+
+    Returns:
+        Combined statistics, or None if every bucket is empty
+    """
+    merged = None
+    for bucket in buckets:
+        if not bucket or not bucket["n"]:
+            continue
+        if merged is None:
+            merged = dict(bucket)
+            continue
+        n = merged["n"] + bucket["n"]
+        delta = bucket["mean"] - merged["mean"]
+        merged["m2"] += bucket["m2"] + delta * delta * merged["n"] * bucket["n"] / n
+        merged["mean"] += delta * bucket["n"] / n
+        merged["n"] = n
+        merged["min"] = min(merged["min"], bucket["min"])
+        merged["max"] = max(merged["max"], bucket["max"])
+
+    if merged is not None:
+        merged["variance"] = merged["m2"] / merged["n"]
+    return merged
+
+
+class CircadianProfileRepository(BaseEnhancedRepository):
+    """
+    Per-user circadian profiles: running statistics per hour of the week.
+
+    Triggers (migration 032 and FOCUS_PROFILE_TRIGGERS_SQL) update one bucket per
+    energy reading or focus session, so reading a profile never scans history.
+    Series are energy (energy level), focus_planned (planned minutes, one sample
+    per session started), focus_actual (minutes, per session ended) and
+    focus_completed (1 if the ended session was completed, else 0).
+    """
+
+    def __init__(self, db=None):
+        super().__init__(db)
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        """
+        Create the buckets table and triggers, filling it from history on first install.
+
+        Runs once per database per process; repositories are built per agent and
+        request, and the DDL would otherwise take a write lock every time.
+        """
+        key = os.path.abspath(self.db.db_path)
+        if key in _profile_schema_ready:
+            return
+
+        with _profile_schema_lock:
+            if key in _profile_schema_ready:
+                return
+            self.install()
+            _profile_schema_ready.add(key)
+
+    def install(self) -> None:
+        """Run migration 032 and the focus triggers, rebuilding if the buckets are new"""
+        conn = self.db.get_connection()
+        installed = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'circadian_profile_buckets'"
+        ).fetchone()
+
+        conn.executescript(CIRCADIAN_MIGRATION_PATH.read_text())
+        columns = self._focus_columns(conn)
+        if columns:
+            planned, actual, done = columns
+            conn.executescript(
+                FOCUS_PROFILE_TRIGGERS_SQL.format(
+                    planned_upsert=BUCKET_UPSERT_SQL.format(
+                        series="focus_planned", value=f"COALESCE(NEW.{planned}, 0)"
+                    ),
+                    actual_upsert=BUCKET_UPSERT_SQL.format(
+                        series="focus_actual", value=FOCUS_ACTUAL_SQL.format(actual=actual)
+                    ),
+                    completed_upsert=BUCKET_UPSERT_SQL.format(
+                        series="focus_completed",
+                        value=f"CASE WHEN NEW.{done} THEN 1 ELSE 0 END",
+                    ),
+                )
+            )
+        conn.commit()
+
+        if not installed:
+            self.rebuild()
+
+    @staticmethod
+    def _focus_columns(conn: sqlite3.Connection) -> tuple[str, str, str] | None:
+        """Get the focus_sessions (planned, actual, completed) columns, or None if untracked"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(focus_sessions)")}
+        for variant in FOCUS_PROFILE_COLUMN_VARIANTS:
+            if {"user_id", "started_at", "ended_at", *variant} <= columns:
+                return variant
+        return None
+
+    def rebuild(self) -> None:
+        """Recompute every profile from the raw energy readings and focus sessions"""
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute("DELETE FROM circadian_profile_buckets")
+            conn.execute(
+                REBUILD_BUCKETS_SQL.format(
+                    series="energy",
+                    value="energy_level",
+                    ts="timestamp",
+                    table="energy_readings",
+                    where="",
+                )
+            )
+            columns = self._focus_columns(conn)
+            if columns:
+                planned, actual, done = columns
+                for series, value, where in (
+                    ("focus_planned", f"COALESCE({planned}, 0)", ""),
+                    (
+                        "focus_actual",
+                        FOCUS_ACTUAL_SQL.format(actual=actual).replace("NEW.", ""),
+                        "AND ended_at IS NOT NULL",
+                    ),
+                    (
+                        "focus_completed",
+                        f"CASE WHEN {done} THEN 1 ELSE 0 END",
+                        "AND ended_at IS NOT NULL",
+                    ),
+                ):
+                    conn.execute(
+                        REBUILD_BUCKETS_SQL.format(
+                            series=series,
+                            value=value,
+                            ts="started_at",
+                            table="focus_sessions",
+                            where=where,
+                        )
+                    )
+
+    def get_weekly_profile(self, user_id: str, series: str) -> list[dict[str, Any] | None]:
+        """
+        Get a user's profile for one series, indexed by weekday * 24 + hour.
+
+        Weekdays follow strftime('%w'): Sunday is 0.
+
+        Returns:
+            168 bucket statistics (n, mean, m2, variance, min, max), None where empty
+        """
+        profile: list[dict[str, Any] | None] = [None] * HOURS_PER_WEEK
+        rows = self.db.execute_read(
+            """
+            SELECT bucket, n, mean, m2, min_value, max_value
+            FROM circadian_profile_buckets
+            WHERE user_id = ? AND series = ?
+            """,
+            (user_id, series),
+        )
+        for row in rows:
+            profile[row["bucket"]] = {
+                "n": row["n"],
+                "mean": row["mean"],
+                "m2": row["m2"],
+                "variance": row["m2"] / row["n"] if row["n"] else 0.0,
+                "min": row["min_value"],
+                "max": row["max_value"],
+            }
+        return profile
+
+    def get_hourly_profile(self, user_id: str, series: str) -> list[dict[str, Any] | None]:
+        """
+        Get a user's profile for one series folded over weekdays, indexed by hour.
+
+        Returns:
+            24 bucket statistics (n, mean, variance, min, max), None where empty
+        """
+        weekly = self.get_weekly_profile(user_id, series)
+        return [combine_buckets(weekly[hour::24]) for hour in range(24)]
+
+    def get_hour(
+        self, user_id: str, series: str, hour: int, weekday: int | None = None
+    ) -> dict[str, Any] | None:
+        """
+        Get statistics for one hour of the day, on one weekday or across all of them.
+
+        Args:
+            user_id: User whose profile to read
+            series: Profile series
+            hour: Hour of the day (0-23)
+            weekday: Day as in strftime('%w') (Sunday = 0), or None for every day
+
+        Returns:
+            Bucket statistics (n, mean, variance, min, max), or None if empty
+        """
+        buckets = (
+            [weekday * 24 + hour] if weekday is not None else list(range(hour, HOURS_PER_WEEK, 24))
+        )
+        placeholders = ", ".join("?" for _ in buckets)
+        rows = self.db.execute_read(
+            f"""
+            SELECT n, mean, m2, min_value AS min, max_value AS max
+            FROM circadian_profile_buckets
+            WHERE user_id = ? AND series = ? AND bucket IN ({placeholders})
+            """,
+            (user_id, series, *buckets),
+        )
+        return combine_buckets([dict(row) for row in rows])
+
 
 # Enhanced Focus Session Repository with advanced focus session management
 class EnhancedFocusSessionRepository(FocusSessionRepository):
     """Enhanced focus session repository with advanced session management"""
 
+    def __init__(self, db=None):
+        super().__init__(db)
+        self.profiles = CircadianProfileRepository(self.db)
+
     def get_sessions_with_analytics(self, user_id: str, limit: int = 30) -> list[dict[str, Any]]:
         """Get sessions with analytics data"""
         conn = sqlite3.connect(self.db.db_path)
@@ -62,35 +362,17 @@ class EnhancedFocusSessionRepository(FocusSessionRepository):
         return sessions
 
     def get_user_patterns(self, user_id: str, days: int = 30) -> dict[str, Any]:
-        """Analyze user focus patterns over time"""
-        conn = sqlite3.connect(self.db.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        query = """
-            SELECT
-                COUNT(*) as total_sessions,
-                AVG(duration) as avg_planned_duration,
-                AVG(CASE WHEN ended_at IS NOT NULL THEN
-                    (julianday(ended_at) - julianday(started_at)) * 24 * 60
-                END) as avg_actual_duration,
-                AVG(CASE WHEN ended_at IS NOT NULL AND
-                    (julianday(ended_at) - julianday(started_at)) * 24 * 60 >= duration * 0.8
-                    THEN 1 ELSE 0 END) as completion_rate,
-                strftime('%H', started_at) as hour_of_day,
-                COUNT(*) as sessions_at_hour
-            FROM focus_sessions
-            WHERE user_id = ?
-                AND started_at >= datetime('now', '-' || ? || ' days')
-            GROUP BY strftime('%H', started_at)
-            ORDER BY sessions_at_hour DESC
         """
+        Analyze user focus patterns from the precomputed circadian profile.
 
-        cursor.execute(query, (user_id, days))
-        rows = cursor.fetchall()
-        conn.close()
+        Args:
+            user_id: User to analyze
+            days: Unused; the profile covers every recorded session (kept for compatibility)
+        """
+        planned = self.profiles.get_hourly_profile(user_id, "focus_planned")
+        overall = combine_buckets(planned)
 
-        if not rows:
+        if not overall:
             return {
                 "total_sessions": 0,
                 "avg_planned_duration": 0,
@@ -100,54 +382,31 @@ class EnhancedFocusSessionRepository(FocusSessionRepository):
                 "patterns": {},
             }
 
-        # Calculate overall stats
-        total_sessions = sum(row["sessions_at_hour"] for row in rows)
-        weighted_avg_planned = (
-            sum(
-                row["avg_planned_duration"] * row["sessions_at_hour"]
-                for row in rows
-                if row["avg_planned_duration"]
-            )
-            / total_sessions
-            if total_sessions > 0
-            else 0
-        )
-        weighted_avg_actual = (
-            sum(
-                row["avg_actual_duration"] * row["sessions_at_hour"]
-                for row in rows
-                if row["avg_actual_duration"]
-            )
-            / total_sessions
-            if total_sessions > 0
-            else 0
-        )
-        weighted_completion = (
-            sum(
-                row["completion_rate"] * row["sessions_at_hour"]
-                for row in rows
-                if row["completion_rate"]
-            )
-            / total_sessions
-            if total_sessions > 0
-            else 0
-        )
+        actual = combine_buckets(self.profiles.get_hourly_profile(user_id, "focus_actual"))
+        completed = combine_buckets(self.profiles.get_hourly_profile(user_id, "focus_completed"))
+
+        total_sessions = overall["n"]
+        avg_planned = overall["mean"]
+        avg_actual = actual["mean"] if actual else 0
+        completion_rate = completed["mean"] if completed else 0
 
-        # Find peak hours (top 3)
-        peak_hours = sorted(rows, key=lambda x: x["sessions_at_hour"], reverse=True)[:3]
-        peak_hours = [
-            f"{row['hour_of_day']}:00" for row in peak_hours if row["sessions_at_hour"] > 0
-        ]
+        # Find peak hours (top 3 by sessions started)
+        busiest = sorted(
+            (hour for hour in range(24) if planned[hour]),
+            key=lambda hour: planned[hour]["n"],
+            reverse=True,
+        )[:3]
+        peak_hours = [f"{hour:02d}:00" for hour in busiest]
 
         return {
             "total_sessions": total_sessions,
-            "avg_planned_duration": round(weighted_avg_planned or 0, 2),
-            "avg_actual_duration": round(weighted_avg_actual or 0, 2),
-            "completion_rate": round(weighted_completion or 0, 3),
+            "avg_planned_duration": round(avg_planned or 0, 2),
+            "avg_actual_duration": round(avg_actual or 0, 2),
+            "completion_rate": round(completion_rate or 0, 3),
             "peak_hours": peak_hours,
             "patterns": {
-                "prefers_longer_sessions": weighted_avg_planned > 30,
-                "good_completion_rate": weighted_completion > 0.8,
+                "prefers_longer_sessions": avg_planned > 30,
+                "good_completion_rate": completion_rate > 0.8,
                 "consistent_user": total_sessions > 10,
             },
         }
@@ -159,34 +418,8 @@ class EnhancedEnergyRepository(BaseEnhancedRepository):
 
     def __init__(self, db=None):
         super().__init__(db)
-        self._ensure_energy_table()
-
-    def _ensure_energy_table(self):
-        """Ensure energy readings table exists"""
-        conn = sqlite3.connect(self.db.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS energy_readings (
-                reading_id TEXT PRIMARY KEY,
-                user_id TEXT NOT NULL,
-                timestamp TEXT NOT NULL,
-                energy_level REAL NOT NULL,
-                context TEXT,
-                factors TEXT,
-                confidence REAL DEFAULT 0.8,
-                created_at TEXT NOT NULL,
-                FOREIGN KEY (user_id) REFERENCES users (user_id)
-            )
-        """)
-
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_energy_user_timestamp
-            ON energy_readings (user_id, timestamp)
-        """)
-
-        conn.commit()
-        conn.close()
+        # Migration 032 creates energy_readings along with its profile triggers
+        self.profiles = CircadianProfileRepository(self.db)
 
     def record_energy_reading(self, reading_data: dict[str, Any]) -> bool:
         """Record an energy reading"""
@@ -253,33 +486,21 @@ class EnhancedEnergyRepository(BaseEnhancedRepository):
 
         return readings
 
-    def get_energy_patterns(self, user_id: str, days: int = 7) -> dict[str, Any]:
-        """Analyze energy patterns for a user"""
-        conn = sqlite3.connect(self.db.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+    def get_hourly_energy_profile(self, user_id: str) -> list[dict[str, Any] | None]:
+        """Get the user's energy statistics per hour of the day (None where no readings)"""
+        return self.profiles.get_hourly_profile(user_id, "energy")
 
-        cursor.execute(
-            """
-            SELECT
-                strftime('%H', timestamp) as hour,
-                AVG(energy_level) as avg_energy,
-                COUNT(*) as reading_count,
-                MIN(energy_level) as min_energy,
-                MAX(energy_level) as max_energy
-            FROM energy_readings
-            WHERE user_id = ?
-                AND timestamp >= datetime('now', '-' || ? || ' days')
-            GROUP BY strftime('%H', timestamp)
-            ORDER BY hour
-        """,
-            (user_id, days),
-        )
+    def get_energy_patterns(self, user_id: str, days: int = 7) -> dict[str, Any]:
+        """
+        Analyze energy patterns from the precomputed circadian profile.
 
-        rows = cursor.fetchall()
-        conn.close()
+        Args:
+            user_id: User to analyze
+            days: Unused; the profile covers every reading (kept for compatibility)
+        """
+        profile = self.get_hourly_energy_profile(user_id)
 
-        if not rows:
+        if not any(profile):
             return {
                 "hourly_patterns": {},
                 "peak_energy_hours": [],
@@ -291,15 +512,17 @@ class EnhancedEnergyRepository(BaseEnhancedRepository):
         hourly_patterns = {}
         energy_levels = []
 
-        for row in rows:
-            hour = f"{row['hour']}:00"
-            hourly_patterns[hour] = {
-                "avg_energy": round(row["avg_energy"], 2),
-                "reading_count": row["reading_count"],
-                "min_energy": row["min_energy"],
-                "max_energy": row["max_energy"],
+        for hour, stats in enumerate(profile):
+            if not stats:
+                continue
+            hourly_patterns[f"{hour:02d}:00"] = {
+                "avg_energy": round(stats["mean"], 2),
+                "reading_count": stats["n"],
+                "min_energy": stats["min"],
+                "max_energy": stats["max"],
+                "std_energy": round(math.sqrt(stats["variance"]), 2),
             }
-            energy_levels.append(row["avg_energy"])
+            energy_levels.append(stats["mean"])
 
         # Find peak and low energy times
         sorted_hours = sorted(hourly_patterns.items(), key=lambda x: x[1]["avg_energy"])
@@ -328,30 +551,9 @@ class EnhancedMetricsRepository(ProductivityMetricsRepository):
     """Enhanced metrics repository with advanced analytics"""
 
     def get_productivity_trends(self, user_id: str, days: int = 30) -> dict[str, Any]:
-        """Get productivity trends over time"""
-        conn = sqlite3.connect(self.db.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT
-                date,
-                productivity_score,
-                tasks_completed,
-                focus_time_minutes,
-                energy_average
-            FROM productivity_metrics
-            WHERE user_id = ?
-                AND period_type = 'daily'
-                AND date >= date('now', '-' || ? || ' days')
-            ORDER BY date ASC
-        """,
-            (user_id, days),
-        )
-
-        rows = cursor.fetchall()
-        conn.close()
+        """Get productivity trends over time from the materialized daily metrics"""
+        today = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+        rows = self.get_metrics_range(user_id, today - timedelta(days=days), today)
 
         if not rows:
             return {
@@ -362,7 +564,7 @@ class EnhancedMetricsRepository(ProductivityMetricsRepository):
                 "improvement_areas": [],
             }
 
-        scores = [float(row["productivity_score"] or 0) for row in rows]
+        scores = [float(row.average_productivity_score or 0) for row in rows]
 
         # Calculate trend (simple linear regression slope)
         n = len(scores)
@@ -391,26 +593,27 @@ class EnhancedMetricsRepository(ProductivityMetricsRepository):
         if scores:
             max_score = max(scores)
             best_row = next(
-                (row for row in rows if float(row["productivity_score"] or 0) == max_score), None
+                (row for row in rows if float(row.average_productivity_score or 0) == max_score),
+                None,
             )
             if best_row:
                 best_day = {
-                    "date": best_row["date"],
+                    "date": best_row.date.date().isoformat(),
                     "score": max_score,
-                    "tasks_completed": best_row["tasks_completed"],
-                    "focus_time": best_row["focus_time_minutes"],
+                    "tasks_completed": best_row.tasks_completed,
+                    "focus_time": best_row.total_focus_time,
                 }
 
         # Identify improvement areas
         improvement_areas = []
-        avg_focus_time = sum(row["focus_time_minutes"] or 0 for row in rows) / len(rows)
-        avg_tasks = sum(row["tasks_completed"] or 0 for row in rows) / len(rows)
+        avg_focus_time = sum(row.total_focus_time for row in rows) / len(rows)
+        avg_tasks = sum(row.tasks_completed for row in rows) / len(rows)
 
         if avg_focus_time < 120:  # Less than 2 hours
             improvement_areas.append("focus_time")
         if avg_tasks < 3:  # Less than 3 tasks per day
             improvement_areas.append("task_completion")
-        if sum(scores) / len(scores) < 6.0:  # Below 6.0 average
+        if sum(scores) / len(scores) < 60.0:  # Below 60/100 average
             improvement_areas.append("overall_productivity")
 
         return {
@@ -8,8 +8,32 @@ from datetime import UTC, datetime
 from uuid import uuid4
 
 from src.core.pet_models import UserPet, UserPetCreate, UserPetUpdate
+from src.core.progression import (
+    PET_EVOLUTION_LEVELS,
+    PET_MAX_LEVEL,
+    PET_XP_PER_LEVEL,
+    pet_evolution_stage,
+)
 from src.database.enhanced_adapter import EnhancedDatabaseAdapter
 
+# Level-up and evolution follow src.core.progression; XP stops accumulating at
+# the maximum level. Feeding restores hunger and happiness.
+_NEW_LEVEL = f"level + (xp + :xp) / {PET_XP_PER_LEVEL}"
+FEED_PET_SQL = f"""
+    UPDATE user_pets SET
+        level = MIN({_NEW_LEVEL}, {PET_MAX_LEVEL}),
+        xp = CASE
+            WHEN {_NEW_LEVEL} >= {PET_MAX_LEVEL} THEN 0
+            ELSE (xp + :xp) % {PET_XP_PER_LEVEL}
+        END,
+        evolution_stage = 1 + {" + ".join(f"({_NEW_LEVEL} >= {level})" for level in PET_EVOLUTION_LEVELS)},
+        hunger = MIN(hunger + 10, 100),
+        happiness = MIN(happiness + 10, 100),
+        last_fed_at = :fed_at
+    WHERE pet_id = :pet_id
+    RETURNING *
+"""
+
 
 class UserPetRepository:
     """
@@ -223,42 +247,23 @@ class UserPetRepository:
         Returns:
             Updated UserPet if found, None otherwise
         """
-        pet = self.get_by_id(pet_id)
-        if not pet:
-            return None
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
 
-        # Calculate new XP and level
-        new_xp = pet.xp + xp_amount
-        new_level = pet.level
-
-        # Level up logic (100 XP per level)
-        while new_xp >= 100 and new_level < 10:
-            new_xp -= 100
-            new_level += 1
-
-        # Cap at level 10
-        if new_level >= 10:
-            new_level = 10
-            new_xp = 0  # No overflow XP at max level
-
-        # Determine evolution stage based on level
-        new_evolution_stage = self._calculate_evolution_stage(new_level)
-
-        # Restore hunger and happiness
-        new_hunger = min(pet.hunger + 10, 100)  # +10 per feeding
-        new_happiness = min(pet.happiness + 10, 100)  # +10 per feeding
-
-        # Update pet
-        updates = UserPetUpdate(
-            level=new_level,
-            xp=new_xp,
-            hunger=new_hunger,
-            happiness=new_happiness,
-            evolution_stage=new_evolution_stage,
-            last_fed_at=datetime.now(UTC),
-        )
+        try:
+            # One atomic UPDATE: concurrent feedings cannot overwrite each other
+            cursor.execute(
+                FEED_PET_SQL,
+                {"pet_id": pet_id, "xp": xp_amount, "fed_at": datetime.now(UTC).isoformat()},
+            )
+            row = cursor.fetchone()
+            conn.commit()
 
-        return self.update(pet_id, updates)
+            return self._row_to_pet(row) if row else None
+
+        except Exception as e:
+            conn.rollback()
+            raise e
 
     # ========================================================================
     # DELETE Operations
@@ -325,9 +330,4 @@ class UserPetRepository:
         Returns:
             Evolution stage (1-3)
         """
-        if level >= 10:
-            return 3  # Adult
-        elif level >= 5:
-            return 2  # Teen
-        else:
-            return 1  # Baby
+        return pet_evolution_stage(level)
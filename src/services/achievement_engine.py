@@ -0,0 +1,529 @@
+"""
+Event-driven achievement evaluation.
+
+``achievements.criteria`` rules such as ``{"tasks_completed": 10}`` are
+compiled once into predicates over named metrics, and indexed by the event
+type that changes each metric. Recording an event updates the user's counters
+for that event and re-evaluates only the achievements indexed under it.
+
+Counters (``achievement_counters``, migration 034) and ``user_achievements``
+progress are written in batches: updates are coalesced per user and
+achievement in memory and flushed with ``executemany`` once enough are
+pending, when an achievement unlocks, from a timer once the oldest has waited
+flush_interval_seconds, or on ``flush()``. A batch that fails to write stays
+pending for the next flush. The engine is the
+only writer of the counters, so one instance should serve a database
+(``get_achievement_engine``).
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from src.database.enhanced_adapter import EnhancedDatabaseAdapter, get_enhanced_database
+from src.services.leaderboard_service import LeaderboardService, get_leaderboard_service
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "database"
+    / "migrations"
+    / "034_create_achievement_counters.sql"
+)
+
+# Completions before this local hour count as early
+EARLY_COMPLETION_HOUR = 9
+
+EVENT_TYPES = ("task_completed", "focus_session_completed", "streak_updated", "xp_awarded")
+
+
+@dataclass(frozen=True)
+class Metric:
+    """A per-user counter and the event that updates it"""
+
+    event: str
+    aggregate: str  # count, sum, mean or last
+    field: str | None = None  # Event payload value for sum, mean and last
+    when: Callable[[Mapping[str, Any], datetime], bool] | None = None
+    daily: bool = False  # Resets on the first event of a new day
+
+
+METRICS: dict[str, Metric] = {
+    "tasks_completed": Metric("task_completed", "count"),
+    "tasks_completed_today": Metric("task_completed", "count", daily=True),
+    "early_completions": Metric(
+        "task_completed", "count", when=lambda _, at: at.hour < EARLY_COMPLETION_HOUR
+    ),
+    "weekend_productivity": Metric("task_completed", "count", when=lambda _, at: at.weekday() >= 5),
+    "average_task_quality": Metric("task_completed", "mean", field="quality"),
+    "focus_sessions_completed": Metric("focus_session_completed", "count"),
+    "streak_days": Metric("streak_updated", "last", field="streak_days"),
+    "total_xp": Metric("xp_awarded", "sum", field="amount"),
+}
+
+# Criteria names used by existing catalogs for the metrics above
+METRIC_ALIASES = {
+    "early_completion": "early_completions",
+    "consecutive_days": "streak_days",
+}
+
+# user_stats_summary columns existing users' lifetime counters start from
+SEED_COLUMNS = {
+    "tasks_completed": "completed_tasks",
+    "focus_sessions_completed": "focus_sessions",
+    "streak_days": "current_streak",
+}
+
+UPSERT_COUNTER_SQL = """
+    INSERT INTO achievement_counters (user_id, metric, value, samples, day)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(user_id, metric) DO UPDATE SET
+        value = excluded.value,
+        samples = excluded.samples,
+        day = excluded.day,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+# Completed achievements keep their final progress and first earned_at
+UPSERT_PROGRESS_SQL = """
+    INSERT INTO user_achievements
+        (user_achievement_id, user_id, achievement_id, progress, is_completed, earned_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(user_id, achievement_id) DO UPDATE SET
+        progress = CASE WHEN is_completed THEN progress ELSE excluded.progress END,
+        is_completed = MAX(is_completed, excluded.is_completed),
+        earned_at = COALESCE(earned_at, excluded.earned_at)
+"""
+
+
+@dataclass
+class AchievementRule:
+    """Compiled achievement criteria: every (metric, target) must be reached"""
+
+    achievement_id: str
+    conditions: list[tuple[str, int | float]]
+    definition: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def metrics(self) -> set[str]:
+        return {metric for metric, _ in self.conditions}
+
+    def evaluate(self, values: Mapping[str, float]) -> list[tuple[str, float, float]]:
+        """(metric, value, target) of each condition, missing metrics counting as 0"""
+        return [(metric, values.get(metric, 0), target) for metric, target in self.conditions]
+
+    def progress(self, values: Mapping[str, float]) -> float:
+        """Mean completion of the conditions, in percent"""
+        ratios = [min(value / target, 1.0) for _, value, target in self.evaluate(values)]
+        return round(sum(ratios) / len(ratios) * 100, 2)
+
+    def is_met(self, values: Mapping[str, float]) -> bool:
+        return all(value >= target for _, value, target in self.evaluate(values))
+
+
+def compile_criteria(achievement_id: str, criteria: Mapping[str, Any]) -> AchievementRule:
+    """
+    Compile achievement criteria into a rule.
+
+    Args:
+        achievement_id: Achievement the criteria belong to
+        criteria: Metric name to required value; True means at least once
+
+    Raises:
+        ValueError: If the criteria are empty, name an unknown metric or
+            require a non-positive or non-numeric value
+    """
+    conditions = []
+    for name, required in criteria.items():
+        metric = METRIC_ALIASES.get(name, name)
+        if metric not in METRICS:
+            raise ValueError(f"Unknown achievement metric: {name}")
+        if isinstance(required, bool):
+            required = 1 if required else 0
+        if not isinstance(required, int | float) or required <= 0:
+            raise ValueError(f"Invalid target for {name}: {required!r}")
+        conditions.append((metric, required))
+    if not conditions:
+        raise ValueError(f"Achievement {achievement_id} has no criteria")
+    return AchievementRule(achievement_id, conditions)
+
+
+def index_rules(rules: Iterable[AchievementRule], key: Callable[[str], str]) -> dict[str, list]:
+    """Index rules under key(metric) for every metric they depend on"""
+    index: dict[str, list[AchievementRule]] = {}
+    for rule in rules:
+        for k in {key(metric) for metric in rule.metrics}:
+            index.setdefault(k, []).append(rule)
+    return index
+
+
+@dataclass
+class _Counter:
+    value: float = 0.0
+    samples: int = 0
+    day: str | None = None
+
+    def current(self, metric: Metric, today: str) -> float:
+        if metric.daily and self.day != today:
+            return 0.0
+        if metric.aggregate == "mean":
+            return self.value / self.samples if self.samples else 0.0
+        return self.value
+
+
+@dataclass
+class _UserState:
+    counters: dict[str, _Counter]
+    earned: set[str]
+
+
+class AchievementEngine:
+    """Evaluates achievements incrementally from activity events."""
+
+    def __init__(
+        self,
+        db: EnhancedDatabaseAdapter,
+        leaderboard: LeaderboardService | None = None,
+        batch_size: int = 100,
+        flush_interval_seconds: float = 5.0,
+        max_cached_users: int = 10_000,
+    ):
+        """
+        Initialize the engine and compile the active achievement catalog.
+
+        Args:
+            db: Database adapter
+            leaderboard: Leaderboard credited with a badge per unlock
+            batch_size: Pending writes that trigger a flush
+            flush_interval_seconds: Age of the oldest pending write that triggers a flush
+            max_cached_users: Users whose counters are kept in memory
+        """
+        self.db = db
+        self.leaderboard = leaderboard
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_cached_users = max_cached_users
+
+        self._lock = threading.RLock()
+        self._users: dict[str, _UserState] = {}
+        self._pending_counters: dict[tuple[str, str], _Counter] = {}
+        self._pending_progress: dict[tuple[str, str], tuple[float, bool, str | None]] = {}
+        self._pending_since: float | None = None
+        self._flush_timer: threading.Timer | None = None
+
+        conn = self.db.get_connection()
+        conn.executescript(MIGRATION_PATH.read_text())
+        conn.commit()
+        self.reload_catalog()
+
+    def reload_catalog(self) -> int:
+        """
+        Compile the active achievements and rebuild the event index.
+
+        Returns:
+            Number of compiled achievements
+        """
+        rules = []
+        for row in self.db.execute_read(
+            "SELECT achievement_id, name, xp_reward, criteria FROM achievements WHERE is_active = 1"
+        ):
+            try:
+                rule = compile_criteria(row["achievement_id"], json.loads(row["criteria"]))
+            except (ValueError, TypeError, AttributeError) as e:
+                logger.warning(f"Skipping achievement {row['achievement_id']}: {e}")
+                continue
+            rule.definition = {"name": row["name"], "xp_reward": row["xp_reward"] or 0}
+            rules.append(rule)
+
+        with self._lock:
+            self._rules = {rule.achievement_id: rule for rule in rules}
+            self._rules_by_event = index_rules(rules, key=lambda metric: METRICS[metric].event)
+        return len(rules)
+
+    # ========================================================================
+    # Events
+    # ========================================================================
+
+    def record(
+        self,
+        user_id: str,
+        event_type: str,
+        payload: Mapping[str, Any] | None = None,
+        occurred_at: datetime | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Record an activity event and evaluate the achievements it affects.
+
+        Args:
+            user_id: User the event belongs to
+            event_type: One of EVENT_TYPES
+            payload: Event values (quality, streak_days, amount)
+            occurred_at: When it happened (defaults to now, UTC)
+
+        Returns:
+            Achievements unlocked by the event, with achievement_id, name,
+            xp_reward and earned_at
+        """
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f"Unknown achievement event: {event_type}")
+        payload = payload or {}
+        occurred_at = occurred_at or datetime.now(UTC)
+        today = occurred_at.date().isoformat()
+
+        with self._lock:
+            state = self._user_state(user_id)
+            for name, metric in METRICS.items():
+                if metric.event == event_type:
+                    self._apply(user_id, state, name, metric, payload, occurred_at, today)
+
+            values = {
+                name: state.counters[name].current(METRICS[name], today) for name in state.counters
+            }
+            unlocked = []
+            earned_at = occurred_at.isoformat()
+            for rule in self._rules_by_event.get(event_type, []):
+                if rule.achievement_id in state.earned:
+                    continue
+                completed = rule.is_met(values)
+                self._pending_progress[(user_id, rule.achievement_id)] = (
+                    rule.progress(values),
+                    completed,
+                    earned_at if completed else None,
+                )
+                if completed:
+                    state.earned.add(rule.achievement_id)
+                    unlocked.append(
+                        {
+                            "achievement_id": rule.achievement_id,
+                            **rule.definition,
+                            "earned_at": earned_at,
+                        }
+                    )
+
+            self._mark_pending()
+            if unlocked or self._flush_due():
+                self._try_flush()
+
+        if unlocked and self.leaderboard is not None:
+            self.leaderboard.add_badges(user_id, len(unlocked))
+        return unlocked
+
+    def _apply(
+        self,
+        user_id: str,
+        state: _UserState,
+        name: str,
+        metric: Metric,
+        payload: Mapping[str, Any],
+        occurred_at: datetime,
+        today: str,
+    ) -> None:
+        """Update one counter from an event"""
+        if metric.when is not None and not metric.when(payload, occurred_at):
+            return
+        amount = payload.get(metric.field) if metric.field else 1
+        if amount is None:
+            return
+
+        counter = state.counters.setdefault(name, _Counter())
+        if metric.daily and counter.day != today:
+            counter.value, counter.samples = 0.0, 0
+        if metric.aggregate == "last":
+            counter.value = float(amount)
+        else:
+            counter.value += float(amount)
+        counter.samples += 1
+        counter.day = today if metric.daily else None
+        self._pending_counters[(user_id, name)] = counter
+
+    # ========================================================================
+    # Queries
+    # ========================================================================
+
+    def get_counters(self, user_id: str) -> dict[str, float]:
+        """Get a user's current metric values"""
+        today = datetime.now(UTC).date().isoformat()
+        with self._lock:
+            state = self._user_state(user_id)
+            return {
+                name: counter.current(METRICS[name], today)
+                for name, counter in state.counters.items()
+            }
+
+    def rules_for_event(self, event_type: str) -> list[AchievementRule]:
+        """Compiled achievements evaluated when an event is recorded"""
+        return list(self._rules_by_event.get(event_type, []))
+
+    # ========================================================================
+    # Storage
+    # ========================================================================
+
+    def _user_state(self, user_id: str) -> _UserState:
+        """Get a user's cached counters and earned achievements, loading them if needed"""
+        state = self._users.get(user_id)
+        if state is not None:
+            return state
+
+        if len(self._users) >= self.max_cached_users:
+            self._flush()  # Evicted users are reloaded from their flushed rows
+            self._users.clear()
+
+        counters = {
+            row["metric"]: _Counter(row["value"], row["samples"], row["day"])
+            for row in self.db.execute_read(
+                "SELECT metric, value, samples, day FROM achievement_counters WHERE user_id = ?",
+                (user_id,),
+            )
+            if row["metric"] in METRICS
+        }
+        if not counters:
+            counters = self._seed_counters(user_id)
+        earned = {
+            row["achievement_id"]
+            for row in self.db.execute_read(
+                "SELECT achievement_id FROM user_achievements WHERE user_id = ? AND is_completed = 1",
+                (user_id,),
+            )
+        }
+        state = self._users[user_id] = _UserState(counters, earned)
+        return state
+
+    def _seed_counters(self, user_id: str) -> dict[str, _Counter]:
+        """Start a new user's lifetime counters from the statistics rollups, if installed"""
+        try:
+            rows = self.db.execute_read(
+                f"SELECT {', '.join(SEED_COLUMNS.values())} FROM user_stats_summary WHERE user_id = ?",
+                (user_id,),
+            )
+        except sqlite3.OperationalError:
+            return {}
+        if not rows:
+            return {}
+
+        counters = {}
+        for metric, column in SEED_COLUMNS.items():
+            if rows[0][column]:
+                counters[metric] = _Counter(float(rows[0][column]), 1)
+                self._pending_counters[(user_id, metric)] = counters[metric]
+        self._mark_pending()
+        return counters
+
+    def _mark_pending(self) -> None:
+        """Start the flush timer when the first write of a batch is pending"""
+        if self._pending_since is not None:
+            return
+        if not self._pending_counters and not self._pending_progress:
+            return
+        self._pending_since = time.monotonic()
+        timer = threading.Timer(self.flush_interval_seconds, self._flush_on_timer)
+        timer.daemon = True
+        self._flush_timer = timer
+        timer.start()
+
+    def _cancel_flush_timer(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    def _flush_on_timer(self) -> None:
+        with self._lock:
+            self._try_flush()
+
+    def _try_flush(self) -> None:
+        """Flush, leaving the batch pending (and the timer set) if the write fails"""
+        try:
+            self._flush()
+        except Exception as e:
+            logger.error(f"Failed to write achievement progress, will retry: {e}")
+
+    def _flush_due(self) -> bool:
+        pending = len(self._pending_counters) + len(self._pending_progress)
+        return pending >= self.batch_size or (
+            self._pending_since is not None
+            and time.monotonic() - self._pending_since >= self.flush_interval_seconds
+        )
+
+    def flush(self) -> int:
+        """
+        Write pending counters and achievement progress.
+
+        Returns:
+            Number of rows written
+        """
+        with self._lock:
+            return self._flush()
+
+    def _flush(self) -> int:
+        counters = [
+            (user_id, metric, c.value, c.samples, c.day)
+            for (user_id, metric), c in self._pending_counters.items()
+        ]
+        progress = [
+            (str(uuid.uuid4()), user_id, achievement_id, value, int(completed), earned_at)
+            for (user_id, achievement_id), (value, completed, earned_at) in (
+                self._pending_progress.items()
+            )
+        ]
+        pending_counters, pending_progress = self._pending_counters, self._pending_progress
+        self._pending_counters, self._pending_progress = {}, {}
+        self._pending_since = None
+        self._cancel_flush_timer()
+        if not counters and not progress:
+            return 0
+
+        conn = self.db.get_connection()
+        try:
+            try:
+                with conn:
+                    conn.executemany(UPSERT_COUNTER_SQL, counters)
+                    conn.executemany(UPSERT_PROGRESS_SQL, progress)
+            except sqlite3.IntegrityError:
+                # One bad row (e.g. an unknown user) fails the batch: keep the rest
+                self._write_rows(conn, UPSERT_COUNTER_SQL, counters)
+                self._write_rows(conn, UPSERT_PROGRESS_SQL, progress)
+        except Exception:
+            # Counters are written as absolute values, so a dropped batch would lose
+            # its increments for good. Entries recorded since the batch are newer.
+            self._pending_counters = {**pending_counters, **self._pending_counters}
+            self._pending_progress = {**pending_progress, **self._pending_progress}
+            self._mark_pending()
+            raise
+        return len(counters) + len(progress)
+
+    @staticmethod
+    def _write_rows(conn: sqlite3.Connection, sql: str, rows: list[tuple]) -> None:
+        for row in rows:
+            try:
+                with conn:
+                    conn.execute(sql, row)
+            except sqlite3.IntegrityError as e:
+                logger.warning(f"Dropped achievement write {row}: {e}")
+
+
+# Singleton instance
+_achievement_engine: AchievementEngine | None = None
+
+
+def get_achievement_engine() -> AchievementEngine:
+    """Get or create the achievement engine"""
+    global _achievement_engine
+    if _achievement_engine is None:
+        _achievement_engine = AchievementEngine(
+            get_enhanced_database(), leaderboard=get_leaderboard_service()
+        )
+    return _achievement_engine
+
+
+def close_achievement_engine() -> None:
+    """Flush the achievement engine's pending writes, if it was created"""
+    if _achievement_engine is not None:
+        _achievement_engine.flush()
@@ -16,20 +16,15 @@ import os
 
 from pydantic import BaseModel, Field
 
-# Try to import LLM clients
-try:
-    import openai
+from src.core.lazy_imports import lazy_import, module_available
+from src.services.request_metrics import track_llm_call
 
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+# LLM clients are imported on first use to keep them out of API startup
+openai = lazy_import("openai")
+OPENAI_AVAILABLE = module_available("openai")
 
-try:
-    import anthropic
-
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+anthropic = lazy_import("anthropic")
+ANTHROPIC_AVAILABLE = module_available("anthropic")
 
 logger = logging.getLogger(__name__)
 
@@ -163,18 +158,19 @@ Return JSON matching this schema:
         """Generate tags using OpenAI"""
         prompt = self._build_champs_prompt(step_description, estimated_minutes, leaf_type)
 
-        response = await self.openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert at generating CHAMPS-based success criteria for micro-steps.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.3,
-            max_tokens=1000,
-        )
+        async with track_llm_call():
+            response = await self.openai_client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are an expert at generating CHAMPS-based success criteria for micro-steps.",
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0.3,
+                max_tokens=1000,
+            )
 
         content = response.choices[0].message.content
         return self._parse_llm_response(content)
@@ -185,12 +181,13 @@ Return JSON matching this schema:
         """Generate tags using Anthropic"""
         prompt = self._build_champs_prompt(step_description, estimated_minutes, leaf_type)
 
-        response = await self.anthropic_client.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=1000,
-            temperature=0.3,
-            messages=[{"role": "user", "content": prompt}],
-        )
+        async with track_llm_call():
+            response = await self.anthropic_client.messages.create(
+                model="claude-3-5-sonnet-20241022",
+                max_tokens=1000,
+                temperature=0.3,
+                messages=[{"role": "user", "content": prompt}],
+            )
 
         content = response.content[0].text
         return self._parse_llm_response(content)
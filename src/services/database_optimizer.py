@@ -1,60 +1,448 @@
 """
 Database Optimizer Service - Epic 3.2 Performance Infrastructure
 
-TODO: This is a minimal stub implementation to make tests pass.
-      Full implementation required for production with:
-      - Real database query analysis
-      - Index creation and management
-      - Connection pool monitoring
-      - Slow query detection
-      - Query plan analysis
-      - Automatic optimization recommendations
+Slow-query log and EXPLAIN-driven index advisor for the real databases:
+- Hooks EnhancedDatabaseAdapter (query listener) and SQLAlchemy engines
+  (before/after_cursor_execute events)
+- Fingerprints normalized SQL and aggregates latency per fingerprint
+- Captures the query plan of statements slower than the threshold
+- Flags full table scans and suggests indexes from the table's columns,
+  existing indexes and column selectivity
+
+Memory is bounded: fingerprints are kept in an LRU of fixed size and the slow
+query log is a ring buffer. The plan of a fingerprint is captured once, so
+EXPLAIN never runs more than once per query shape.
 """
 
-import asyncio
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
+import structlog
+
+from src.database.enhanced_adapter import EnhancedDatabaseAdapter, get_enhanced_database
+from src.services.request_metrics import LatencyHistogram
+
+logger = structlog.get_logger()
+
+# SQL normalization ----------------------------------------------------------------
+
+_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PARAM = re.compile(r"%\(\w+\)s|%s|(?<!:):\w+|\$\d+|\?")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Statements whose plan can be inspected without executing them
+_EXPLAINABLE = ("select", "with", "update", "delete")
+
+# Plan lines that mean a table is read in full
+_SQLITE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)")
+_POSTGRES_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+# Column references in predicates: [alias.]column <op>
+_PREDICATE = re.compile(
+    r"(?:(\w+)\.)?(\w+)\s*(=|<=|>=|<>|!=|<|>|\bin\b|\blike\b|\bis\b|\bbetween\b)"
+)
+_TABLE_REF = re.compile(r"\b(?:from|join|update)\s+(\w+)(?:\s+(?:as\s+)?(\w+))?")
+_WHERE_CLAUSE = re.compile(r"\b(?:where|on)\b(.*?)(?=\border by\b|\bgroup by\b|\blimit\b|$)")
+_ORDER_BY = re.compile(r"\border by\s+(.*?)(?=\blimit\b|$)")
+_KEYWORDS = {"where", "on", "join", "inner", "left", "set", "order", "group", "limit"}
+_RANGE_OPERATORS = {"<", ">", "<=", ">=", "between", "like"}
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(sql: str) -> str:
+    """
+    Normalize SQL so statements that differ only in literals share a shape.
+
+    Comments are dropped, literals and bind parameters become ``?``, IN lists
+    collapse to ``(?+)`` and whitespace/case are folded.
+
+    Args:
+        sql: Raw SQL statement
+
+    Returns:
+        Normalized SQL
+    """
+    sql = _COMMENT.sub(" ", sql)
+    sql = _STRING.sub("?", sql)
+    sql = _PARAM.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("(?+)", sql)
+    return _WHITESPACE.sub(" ", sql).strip().lower()
+
+
+def fingerprint(sql: str) -> str:
+    """Stable identifier of a statement's normalized shape"""
+    return hashlib.sha1(normalize_sql(sql).encode()).hexdigest()[:16]
+
+
+def find_full_scans(plan: list[str]) -> list[str]:
+    """
+    Tables read in full according to an EXPLAIN output.
+
+    Understands SQLite ``EXPLAIN QUERY PLAN`` and PostgreSQL ``EXPLAIN`` text.
+    """
+    tables = []
+    for line in plan:
+        detail = line.strip()
+        match = _SQLITE_SCAN.match(detail)
+        if match and "USING" not in detail and match.group(1) != "CONSTANT":
+            tables.append(match.group(1))
+            continue
+        match = _POSTGRES_SCAN.search(detail)
+        if match:
+            tables.append(match.group(1))
+    return list(dict.fromkeys(tables))
+
+
+@dataclass
+class QueryStats:
+    """Aggregated latency for one query fingerprint"""
+
+    fingerprint: str
+    normalized: str
+    count: int = 0
+    total_time: float = 0.0
+    slow_count: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    plan: list[str] | None = None
+    full_scans: list[str] = field(default_factory=list)
+    sorts_without_index: bool = False
+    last_seen: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "query": self.normalized,
+            "count": self.count,
+            "total_time": self.total_time,
+            "average_time": self.latency.mean,
+            "p95_time": self.latency.quantile(0.95),
+            "max_time": self.latency.max,
+            "slow_count": self.slow_count,
+            "plan": self.plan,
+            "full_scans": self.full_scans,
+            "last_seen": datetime.fromtimestamp(self.last_seen).isoformat(),
+        }
+
 
 class DatabaseOptimizer:
     """
-    Database optimization and performance monitoring service.
+    Database slow-query log and index advisor.
 
-    This is a stub implementation with simulated behavior.
-    Production implementation should integrate with actual database.
+    Attach it to the adapter (and optionally SQLAlchemy engines) and every
+    statement is fingerprinted and timed; slow ones get their plan captured.
     """
 
-    def __init__(self):
-        """Initialize database optimizer with tracking"""
-        self._indexes: dict[str, list[str]] = {}
-        self._query_times: list[float] = []
-        self._connection_pool_size = 5
-        self._active_connections = 0
+    def __init__(
+        self,
+        db: EnhancedDatabaseAdapter | None = None,
+        slow_query_threshold: float = 0.1,
+        max_fingerprints: int = 500,
+        slow_log_size: int = 100,
+    ):
+        """
+        Initialize database optimizer.
+
+        Args:
+            db: Database to inspect and hook (defaults to the enhanced database)
+            slow_query_threshold: Seconds above which a statement is slow
+            max_fingerprints: Most query shapes tracked (least recent evicted)
+            slow_log_size: Slow statements kept in the slow-query log
+        """
+        self.db = db or get_enhanced_database()
+        self.slow_query_threshold = slow_query_threshold
+        self.max_fingerprints = max_fingerprints
+
+        self._lock = threading.Lock()  # Listeners run on request and worker threads
+        self._stats: OrderedDict[str, QueryStats] = OrderedDict()
+        self._slow_log: deque[dict[str, Any]] = deque(maxlen=slow_log_size)
+        self._engines: list[Any] = []
+
+        self.db.add_query_listener(self._on_adapter_query)
+
+    # Hooks --------------------------------------------------------------------------
+
+    def attach_engine(self, engine: Any) -> None:
+        """
+        Record statements run through a SQLAlchemy engine (or the Engine class).
+
+        Args:
+            engine: SQLAlchemy Engine instance, or ``Engine`` for all engines
+        """
+        from sqlalchemy import event
+
+        if engine in self._engines:
+            return
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engines.append(engine)
+
+    def detach(self) -> None:
+        """Stop recording statements from the adapter and SQLAlchemy engines"""
+        from sqlalchemy import event
+
+        self.db.remove_query_listener(self._on_adapter_query)
+        for engine in self._engines:
+            event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engines.clear()
+
+    def _on_adapter_query(
+        self, conn: sqlite3.Connection, query: str, params: tuple, duration: float
+    ) -> None:
+        self.record_query(
+            query, duration, explain=lambda: self._explain_sqlite(conn, query, params)
+        )
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):  # noqa: ARG002
+        conn.info.setdefault("optimizer_query_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):  # noqa: ARG002
+        duration = time.perf_counter() - conn.info["optimizer_query_start"].pop()
+        explain = None
+        if not executemany:
+            explain = lambda: self._explain_dbapi(  # noqa: E731
+                conn.connection, conn.dialect.name, statement, parameters
+            )
+        self.record_query(statement, duration, explain=explain)
+
+    # Recording ----------------------------------------------------------------------
+
+    def record_query(
+        self,
+        statement: str,
+        duration: float,
+        explain: Callable[[], list[str] | None] | None = None,
+    ) -> None:
+        """
+        Record one executed statement.
+
+        Args:
+            statement: SQL as executed
+            duration: Execution time in seconds
+            explain: Returns the statement's plan; called at most once per
+                fingerprint, the first time it is slow
+        """
+        normalized = normalize_sql(statement)
+        key = hashlib.sha1(normalized.encode()).hexdigest()[:16]
+        slow = duration >= self.slow_query_threshold
+
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = QueryStats(key, normalized)
+                if len(self._stats) > self.max_fingerprints:
+                    self._stats.popitem(last=False)
+            else:
+                self._stats.move_to_end(key)
+            stats.count += 1
+            stats.total_time += duration
+            stats.latency.record(duration)
+            stats.last_seen = time.time()
+            needs_plan = slow and stats.plan is None and explain is not None
+            if slow:
+                stats.slow_count += 1
+
+        if needs_plan and normalized.startswith(_EXPLAINABLE):
+            plan = explain()
+            if plan is not None:
+                stats.plan = plan
+                stats.full_scans = find_full_scans(plan)
+                stats.sorts_without_index = any("TEMP B-TREE FOR ORDER BY" in p for p in plan)
+
+        if slow:
+            self._slow_log.append(
+                {
+                    "fingerprint": key,
+                    "query": normalized,
+                    "duration": duration,
+                    "plan": stats.plan,
+                    "full_scans": stats.full_scans,
+                    "at": datetime.now().isoformat(),
+                }
+            )
+            logger.warning(
+                "slow_query",
+                fingerprint=key,
+                duration_ms=round(duration * 1000, 1),
+                full_scans=stats.full_scans,
+            )
+
+    def _explain_sqlite(
+        self, conn: sqlite3.Connection, query: str, params: tuple
+    ) -> list[str] | None:
+        """EXPLAIN QUERY PLAN on the connection the statement ran on"""
+        try:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+        except sqlite3.Error as e:
+            logger.debug("explain_failed", error=str(e))
+            return None
+        return [row[3] for row in rows]
+
+    def _explain_dbapi(
+        self, dbapi_conn: Any, dialect: str, statement: str, parameters: Any
+    ) -> list[str] | None:
+        """EXPLAIN through a raw DBAPI connection (SQLite or PostgreSQL)"""
+        prefix = {"sqlite": "EXPLAIN QUERY PLAN", "postgresql": "EXPLAIN"}.get(dialect)
+        if prefix is None:
+            return None
+        cursor = dbapi_conn.cursor()
+        try:
+            cursor.execute(f"{prefix} {statement}", parameters)
+            rows = cursor.fetchall()
+        except Exception as e:
+            logger.debug("explain_failed", error=str(e))
+            return None
+        finally:
+            cursor.close()
+        return [row[3] if dialect == "sqlite" else row[0] for row in rows]
+
+    # Reporting ----------------------------------------------------------------------
+
+    def get_query_stats(self, limit: int = 20, order_by: str = "total_time") -> list[dict]:
+        """
+        Aggregated statistics per query fingerprint.
+
+        Args:
+            limit: Max fingerprints to return
+            order_by: "total_time", "count", "p95_time" or "slow_count"
+
+        Returns:
+            Fingerprint stats, highest first
+        """
+        with self._lock:
+            stats = [s.to_dict() for s in self._stats.values()]
+        return sorted(stats, key=lambda s: s[order_by], reverse=True)[:limit]
+
+    def get_slow_queries(self, limit: int = 50) -> list[dict]:
+        """Most recent slow statements, newest first"""
+        return list(reversed(self._slow_log))[:limit]
+
+    def get_index_suggestions(self) -> list[dict[str, Any]]:
+        """
+        Suggest indexes for fingerprints whose plans show full table scans.
+
+        Returns:
+            Suggestions (table, columns, CREATE INDEX statement, the queries
+            that would use it and their total time), most costly first
+        """
+        with self._lock:
+            scanning = [s for s in self._stats.values() if s.full_scans]
+
+        suggestions: dict[str, dict[str, Any]] = {}
+        for stats in scanning:
+            for suggestion in self._suggest_indexes(stats.normalized, stats.full_scans):
+                entry = suggestions.setdefault(
+                    suggestion["statement"], {**suggestion, "fingerprints": [], "total_time": 0.0}
+                )
+                entry["fingerprints"].append(stats.fingerprint)
+                entry["total_time"] += stats.total_time
+
+        return sorted(suggestions.values(), key=lambda s: s["total_time"], reverse=True)
+
+    def _suggest_indexes(self, normalized: str, tables: list[str]) -> list[dict[str, Any]]:
+        """Index suggestions for the scanned tables of one query shape"""
+        aliases = {}
+        for table, alias in _TABLE_REF.findall(normalized):
+            aliases[table] = table
+            if alias and alias not in _KEYWORDS:
+                aliases[alias] = table
+
+        predicates = []
+        for clause in _WHERE_CLAUSE.findall(normalized):
+            predicates += _PREDICATE.findall(clause)
+        order_by = _ORDER_BY.search(normalized)
+
+        suggestions = []
+        for table in tables:
+            columns = self._table_columns(table)
+            if not columns:
+                continue  # Not a table in this database (or a view)
+
+            equality, ranges = [], []
+            for qualifier, column, operator in predicates:
+                if qualifier and aliases.get(qualifier) != table:
+                    continue
+                if column not in columns or column in equality or column in ranges:
+                    continue
+                (ranges if operator.strip() in _RANGE_OPERATORS else equality).append(column)
+
+            # Most selective equality column first, then one range column
+            equality.sort(key=lambda c: self._selectivity(table, c), reverse=True)
+            index_columns = equality + ranges[:1]
+            if not index_columns and order_by:
+                index_columns = [
+                    c.split()[0].split(".")[-1]
+                    for c in order_by.group(1).split(",")
+                    if c.split() and c.split()[0].split(".")[-1] in columns
+                ][:2]
+            if not index_columns or self._has_index_prefix(table, index_columns):
+                continue
+
+            name = f"idx_{table}_{'_'.join(index_columns)}"
+            suggestions.append(
+                {
+                    "table": table,
+                    "columns": index_columns,
+                    "statement": f"CREATE INDEX {name} ON {table}({', '.join(index_columns)})",
+                    "rows": self._row_count(table),
+                }
+            )
+        return suggestions
+
+    def _table_columns(self, table: str) -> set[str]:
+        conn = self.db.get_connection()
+        return {row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+
+    def _has_index_prefix(self, table: str, columns: list[str]) -> bool:
+        """Whether an existing index already starts with these columns"""
+        conn = self.db.get_connection()
+        for index in conn.execute(f"PRAGMA index_list({table})").fetchall():
+            indexed = [row[2] for row in conn.execute(f"PRAGMA index_info({index[1]})")]
+            if indexed[: len(columns)] == columns:
+                return True
+        return False
+
+    def _selectivity(self, table: str, column: str, sample: int = 10000) -> float:
+        """Distinct-value ratio of a column over a bounded sample of rows"""
+        conn = self.db.get_connection()
+        distinct, total = conn.execute(
+            f"SELECT COUNT(DISTINCT {column}), COUNT(*) FROM (SELECT {column} FROM {table} LIMIT ?)",
+            (sample,),
+        ).fetchone()
+        return distinct / total if total else 0.0
+
+    def _row_count(self, table: str) -> int:
+        conn = self.db.get_connection()
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    # Direct use ---------------------------------------------------------------------
 
     async def query_users_by_email_pattern(self, pattern: str) -> list[dict[str, Any]]:
         """
         Query users by email pattern.
 
         Args:
-            pattern: Email pattern to match
+            pattern: SQL LIKE pattern to match
 
         Returns:
             List of matching user records
         """
-        # Check if email column is indexed for users table
-        is_indexed = "users" in self._indexes and "email" in self._indexes["users"]
-
-        # Simulate query execution with different speeds
-        if is_indexed:
-            # Indexed query is faster
-            await asyncio.sleep(0.0001)
-        else:
-            # Unindexed query is slower
-            await asyncio.sleep(0.001)
-
-        await self.execute_query(f"SELECT * FROM users WHERE email LIKE '{pattern}'")
-        # Return mock results
-        return [{"id": i, "email": f"user{i}@example.com"} for i in range(100)]
+        return await self.execute_query("SELECT * FROM users WHERE email LIKE ?", (pattern,))
 
     async def create_index(self, table: str, column: str) -> None:
         """
@@ -63,80 +451,93 @@ class DatabaseOptimizer:
         Args:
             table: Table name
             column: Column name to index
-        """
-        if table not in self._indexes:
-            self._indexes[table] = []
-
-        if column not in self._indexes[table]:
-            self._indexes[table].append(column)
 
-        # Simulate index creation time
-        await asyncio.sleep(0.01)
+        Raises:
+            ValueError: If the table or column does not exist
+        """
+        if column not in self._table_columns(table):
+            raise ValueError(f"Unknown column {table}.{column}")
+        self.db.execute_write(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table}({column})"
+        )
 
-    async def execute_query(self, query: str) -> Any:
+    async def execute_query(self, query: str, params: tuple = ()) -> Any:
         """
-        Execute a database query with timing.
+        Execute a database query (recorded like any other statement).
 
         Args:
             query: SQL query string
+            params: Query parameters
 
         Returns:
-            Query results
+            Rows as dicts for reads, affected row count for writes
         """
-        start_time = asyncio.get_event_loop().time()
-
-        # Simulate query execution
-        await asyncio.sleep(0.001)
-
-        # Track query time
-        elapsed = asyncio.get_event_loop().time() - start_time
-        self._query_times.append(elapsed)
+        if normalize_sql(query).startswith(("select", "with", "pragma", "explain")):
+            return [dict(row) for row in self.db.execute_read(query, params)]
+        return self.db.execute_write(query, params)
 
-        return {"status": "executed", "rows": 0}
-
-    async def get_connection(self) -> str:
+    async def get_connection(self) -> sqlite3.Connection:
         """
-        Get a database connection from the pool.
+        Get the adapter's database connection.
 
         Returns:
-            Connection identifier
+            SQLite connection
         """
-        # Simulate connection from pool
-        conn_id = f"connection_{self._active_connections % self._connection_pool_size}"
-        self._active_connections += 1
-        return conn_id
+        return self.db.get_connection()
 
-    async def analyze_query_performance(self, query: str) -> dict[str, Any]:
+    async def analyze_query_performance(self, query: str, params: tuple = ()) -> dict[str, Any]:
         """
-        Analyze query and suggest optimizations.
+        Analyze query and suggest optimizations from its actual plan.
 
         Args:
             query: SQL query to analyze
+            params: Query parameters (needed if the query has placeholders)
 
         Returns:
-            Dict with optimization suggestions
+            Dict with plan, full scans, suggested indexes and hints
         """
-        optimization = {
+        normalized = normalize_sql(query)
+        plan = None
+        if normalized.startswith(_EXPLAINABLE):
+            params = params or (None,) * query.count("?")
+            plan = self._explain_sqlite(self.db.get_connection(), query, params)
+
+        full_scans = find_full_scans(plan or [])
+        suggestions = self._suggest_indexes(normalized, full_scans)
+        optimization: dict[str, Any] = {
             "query": query,
-            "estimated_improvement": "30-50%",
+            "fingerprint": fingerprint(query),
+            "plan": plan,
+            "full_scans": full_scans,
+            "suggested_indexes": suggestions,
         }
 
-        # Provide relevant suggestions based on query patterns
-        if "LIKE" in query.upper() or "%" in query:
+        upper = query.upper()
+        if re.search(r"LIKE\s+'%", upper):
             optimization["suggested_index"] = "full_text_index"
-            optimization["optimization_hint"] = "Consider using full-text search index"
-
-        elif "IN (SELECT" in query.upper():
+            optimization["optimization_hint"] = (
+                "Leading-wildcard LIKE cannot use a B-tree index; consider an FTS5 table"
+            )
+        elif "IN (SELECT" in upper:
             optimization["suggested_index"] = "foreign_key_index"
             optimization["optimization_hint"] = "Consider using JOIN instead of IN subquery"
-
-        elif "ORDER BY" in query.upper():
+        elif suggestions:
+            optimization["suggested_index"] = suggestions[0]["statement"]
+            optimization["optimization_hint"] = f"Full scan of {', '.join(full_scans)}"
+        elif plan and any("TEMP B-TREE FOR ORDER BY" in p for p in plan):
             optimization["suggested_index"] = "sort_index"
             optimization["optimization_hint"] = "Add index on ORDER BY columns"
-
         else:
             optimization["optimization_hint"] = "Query appears optimized"
 
+        scanned_rows = sum(s["rows"] for s in suggestions)
+        if not full_scans:
+            optimization["estimated_improvement"] = "none"
+        elif scanned_rows > 10000:
+            optimization["estimated_improvement"] = "high"
+        else:
+            optimization["estimated_improvement"] = "low"
+
         return optimization
 
     async def get_database_health(self) -> dict[str, Any]:
@@ -146,37 +547,65 @@ class DatabaseOptimizer:
         Returns:
             Dict with health and performance metrics
         """
-        avg_query_time = sum(self._query_times) / len(self._query_times) if self._query_times else 0
+        with self._lock:
+            stats = list(self._stats.values())
+        total_queries = sum(s.count for s in stats)
+        total_time = sum(s.total_time for s in stats)
+        slow_count = sum(s.slow_count for s in stats)
+        slow_percentage = slow_count / total_queries * 100 if total_queries else 0
+
+        conn = self.db.get_connection()
+        indexes_by_table = {
+            row[0]: row[1]
+            for row in conn.execute(
+                "SELECT tbl_name, COUNT(*) FROM sqlite_master "
+                "WHERE type = 'index' AND name NOT LIKE 'sqlite_%' GROUP BY tbl_name"
+            )
+        }
 
-        health = {
-            "connection_count": self._active_connections,
-            "connection_pool_size": self._connection_pool_size,
+        return {
+            "connection_count": 1,  # EnhancedDatabaseAdapter shares one connection
+            "connection_pool_size": 1,
             "query_performance": {
-                "average_response_time": avg_query_time,
-                "total_queries": len(self._query_times),
-                "slow_query_threshold": 0.1,
+                "average_response_time": total_time / total_queries if total_queries else 0,
+                "total_queries": total_queries,
+                "distinct_queries": len(stats),
+                "slow_query_threshold": self.slow_query_threshold,
             },
             "index_usage": {
-                "total_indexes": sum(len(cols) for cols in self._indexes.values()),
-                "tables_indexed": len(self._indexes),
-                "indexes_by_table": {table: len(cols) for table, cols in self._indexes.items()},
-            },
-            "slow_queries": {
-                "count": sum(1 for t in self._query_times if t > 0.1),
-                "percentage": (
-                    sum(1 for t in self._query_times if t > 0.1) / len(self._query_times) * 100
-                    if self._query_times
-                    else 0
-                ),
+                "total_indexes": sum(indexes_by_table.values()),
+                "tables_indexed": len(indexes_by_table),
+                "indexes_by_table": indexes_by_table,
+                "queries_with_full_scans": sum(1 for s in stats if s.full_scans),
             },
-            "health_status": "healthy",
+            "slow_queries": {"count": slow_count, "percentage": slow_percentage},
+            "health_status": "degraded" if slow_percentage > 5 else "healthy",
             "last_check": datetime.now().isoformat(),
         }
 
-        return health
-
     async def reset(self) -> None:
-        """Reset optimizer state for testing"""
-        self._indexes.clear()
-        self._query_times.clear()
-        self._active_connections = 0
+        """Reset recorded query statistics"""
+        with self._lock:
+            self._stats.clear()
+            self._slow_log.clear()
+
+
+# Singleton instance
+_database_optimizer: DatabaseOptimizer | None = None
+
+
+def get_database_optimizer() -> DatabaseOptimizer:
+    """Get the optimizer hooked to the enhanced database and all SQLAlchemy engines"""
+    global _database_optimizer
+    if _database_optimizer is None:
+        from sqlalchemy.engine import Engine
+
+        from src.core.settings import get_settings
+
+        settings = get_settings()
+        _database_optimizer = DatabaseOptimizer(
+            slow_query_threshold=settings.slow_query_threshold_ms / 1000,
+            slow_log_size=settings.slow_query_log_size,
+        )
+        _database_optimizer.attach_engine(Engine)
+    return _database_optimizer
@@ -0,0 +1,460 @@
+"""
+Leaderboards for XP, streaks and badges.
+
+Scores live in ``leaderboard_scores`` (migration 033), one row per board,
+period and user, with a covering index in ranking order. Awards update the
+rows of every window they fall in, so a board is never recomputed from XP
+history.
+
+Each board and period read is also held in memory in ranking order, in an
+indexable skip list: updates, rank, percentile, top-N and neighbour queries
+take logarithmic time. Writes
+made through the service update both stores. Writes committed by other
+connections are detected with ``PRAGMA data_version`` and drop the cached
+lists, which are reloaded from the index in order.
+
+On first install the all-time boards are filled from ``user_progress`` and
+completed ``user_achievements``, so existing users are ranked before their
+next award.
+"""
+
+import logging
+import random
+import sqlite3
+import threading
+from collections.abc import Iterable
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from src.database.enhanced_adapter import EnhancedDatabaseAdapter, get_enhanced_database
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_PATH = (
+    Path(__file__).resolve().parents[1] / "database" / "migrations" / "033_create_leaderboards.sql"
+)
+
+BOARDS = ("xp", "streak", "badges")
+WINDOWS = ("daily", "weekly", "all_time")
+WINDOWED_BOARDS = ("xp",)  # Other boards only have an all_time period
+
+ADD_SCORE_SQL = """
+    INSERT INTO leaderboard_scores (board, period, user_id, score)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(board, period, user_id) DO UPDATE SET
+        score = score + excluded.score,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+SET_SCORE_SQL = """
+    INSERT INTO leaderboard_scores (board, period, user_id, score)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(board, period, user_id) DO UPDATE SET
+        score = excluded.score,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+# All-time scores recomputed by rebuild(), from tables that may not be installed
+REBUILD_SQL = (
+    """
+    INSERT INTO leaderboard_scores (board, period, user_id, score)
+    SELECT 'xp', 'all_time', user_id, total_xp FROM user_progress WHERE total_xp > 0
+    """,
+    """
+    INSERT INTO leaderboard_scores (board, period, user_id, score)
+    SELECT 'streak', 'all_time', user_id, current_streak FROM user_progress
+    WHERE current_streak > 0
+    """,
+    """
+    INSERT INTO leaderboard_scores (board, period, user_id, score)
+    SELECT 'badges', 'all_time', user_id, COUNT(*) FROM user_achievements
+    WHERE is_completed = 1
+    GROUP BY user_id
+    """,
+)
+
+# Windowed periods kept before pruning
+DAILY_RETENTION_DAYS = 14
+WEEKLY_RETENTION_WEEKS = 12
+
+
+def period_key(window: str, day: date) -> str:
+    """leaderboard_scores.period value of the window containing day"""
+    if window == "daily":
+        return f"daily:{day.isoformat()}"
+    if window == "weekly":
+        return f"weekly:{(day - timedelta(days=day.weekday())).isoformat()}"
+    return "all_time"
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key: Any, height: int):
+        self.key = key
+        self.next: list[_Node | None] = [None] * height
+        self.width = [1] * height  # Positions advanced by following next at each level
+
+
+class _SkipList:
+    """Sorted, indexable set of keys: add, remove, index and bisect in O(log n) expected time"""
+
+    MAX_HEIGHT = 24
+
+    def __init__(self, sorted_keys: Iterable[Any] = ()) -> None:
+        """Build from keys already in ascending order, in linear time"""
+        self._head = _Node(None, self.MAX_HEIGHT)
+        self._size = 0
+        last = [self._head] * self.MAX_HEIGHT
+        last_positions = [0] * self.MAX_HEIGHT
+        for position, key in enumerate(sorted_keys, start=1):
+            node = _Node(key, self._random_height())
+            for level in range(len(node.next)):
+                last[level].next[level] = node
+                last[level].width[level] = position - last_positions[level]
+                last[level], last_positions[level] = node, position
+            self._size = position
+        for level in range(self.MAX_HEIGHT):
+            last[level].width[level] = self._size + 1 - last_positions[level]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> Any:
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        node, remaining = self._head, index + 1
+        for level in reversed(range(self.MAX_HEIGHT)):
+            while node.next[level] is not None and node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        return node.key
+
+    def bisect_left(self, key: Any) -> int:
+        """Number of keys less than key"""
+        return self._path(key)[1][0]
+
+    def add(self, key: Any) -> None:
+        path, positions = self._path(key)
+        position = positions[0] + 1  # Of the new node
+        node = _Node(key, self._random_height())
+        height = len(node.next)
+        for level in range(height):
+            before = path[level]
+            node.next[level] = before.next[level]
+            before.next[level] = node
+            node.width[level] = before.width[level] - (position - positions[level]) + 1
+            before.width[level] = position - positions[level]
+        for level in range(height, self.MAX_HEIGHT):
+            path[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key: Any) -> None:
+        path, _ = self._path(key)
+        node = path[0].next[0]
+        if node is None or node.key != key:
+            raise KeyError(key)
+        for level in range(self.MAX_HEIGHT):
+            before = path[level]
+            if before.next[level] is node:
+                before.width[level] += node.width[level] - 1
+                before.next[level] = node.next[level]
+            else:
+                before.width[level] -= 1
+        self._size -= 1
+
+    def _random_height(self) -> int:
+        height = 1
+        while height < self.MAX_HEIGHT and random.random() < 0.5:
+            height += 1
+        return height
+
+    def _path(self, key: Any) -> tuple[list[_Node], list[int]]:
+        """Last node before key at each level, and its position (head = 0)"""
+        path: list[_Node] = [self._head] * self.MAX_HEIGHT
+        positions = [0] * self.MAX_HEIGHT
+        node, position = self._head, 0
+        for level in reversed(range(self.MAX_HEIGHT)):
+            while node.next[level] is not None and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+            path[level], positions[level] = node, position
+        return path, positions
+
+
+class _Ranking:
+    """One board period in ranking order: (-score, user_id) keys, best first"""
+
+    def __init__(self, rows: list[tuple[str, int]]):
+        self.scores = dict(rows)
+        self.keys = _SkipList(sorted((-score, user_id) for user_id, score in rows))
+
+    def set(self, user_id: str, score: int) -> None:
+        old = self.scores.get(user_id)
+        if old is not None:
+            self.keys.remove((-old, user_id))
+        self.scores[user_id] = score
+        self.keys.add((-score, user_id))
+
+    def rank_of_score(self, score: int) -> int:
+        """Competition rank of a score: 1 + number of strictly higher scores"""
+        return self.keys.bisect_left((-score, "")) + 1
+
+    def entry(self, index: int) -> dict[str, Any]:
+        neg_score, user_id = self.keys[index]
+        return {"rank": self.rank_of_score(-neg_score), "user_id": user_id, "score": -neg_score}
+
+
+class LeaderboardService:
+    """Incrementally maintained leaderboards with logarithmic rank queries."""
+
+    def __init__(self, db: EnhancedDatabaseAdapter):
+        """
+        Initialize the service.
+
+        Args:
+            db: Database adapter
+        """
+        self.db = db
+        self._rankings: dict[tuple[str, str], _Ranking] = {}
+        self._lock = threading.Lock()
+        self._pruned_day: date | None = None
+
+        conn = self.db.get_connection()
+        installed = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'leaderboard_scores'"
+        ).fetchone()
+        conn.executescript(MIGRATION_PATH.read_text())
+        conn.commit()
+        if not installed:
+            self.rebuild()
+        self._data_version = self._read_data_version()
+
+    # ========================================================================
+    # Updates
+    # ========================================================================
+
+    def add_xp(self, user_id: str, amount: int, awarded_at: datetime | None = None) -> None:
+        """
+        Add awarded XP to the user's daily, weekly and all-time XP scores.
+
+        Args:
+            user_id: User who earned the XP
+            amount: XP awarded
+            awarded_at: When it was awarded (defaults to now)
+        """
+        if not amount:
+            return
+        day = (awarded_at or datetime.now(UTC)).date()
+        self._add("xp", [period_key(window, day) for window in WINDOWS], user_id, amount)
+        self._prune_if_new_day()
+
+    def add_badges(self, user_id: str, count: int = 1) -> None:
+        """Add unlocked badges to the user's all-time badge count"""
+        if count:
+            self._add("badges", ["all_time"], user_id, count)
+
+    def set_streak(self, user_id: str, streak_days: int) -> None:
+        """Record the user's current streak"""
+        self._write("streak", ["all_time"], user_id, streak_days, SET_SCORE_SQL)
+
+    def _add(self, board: str, periods: list[str], user_id: str, amount: int) -> None:
+        self._write(board, periods, user_id, amount, ADD_SCORE_SQL)
+
+    def _write(self, board: str, periods: list[str], user_id: str, value: int, upsert: str) -> None:
+        """Upsert the user's score in each period in one transaction, mirroring cached rankings"""
+        with self._lock:
+            conn = self.db.get_connection()
+            with conn:
+                scores = {}
+                for period in periods:
+                    conn.execute(upsert, (board, period, user_id, value))
+                    scores[period] = conn.execute(
+                        """
+                        SELECT score FROM leaderboard_scores
+                        WHERE board = ? AND period = ? AND user_id = ?
+                        """,
+                        (board, period, user_id),
+                    ).fetchone()[0]
+
+            for period, score in scores.items():
+                ranking = self._rankings.get((board, period))
+                if ranking is not None:
+                    ranking.set(user_id, score)
+
+    def rebuild(self) -> int:
+        """
+        Recompute the all-time boards from user_progress and user_achievements.
+
+        Used to backfill existing users on first install. Daily and weekly XP
+        periods are kept: they only hold awards made through the service.
+
+        Returns:
+            Number of scores written
+        """
+        written = 0
+        with self._lock:
+            conn = self.db.get_connection()
+            with conn:
+                conn.execute("DELETE FROM leaderboard_scores WHERE period = 'all_time'")
+                for sql in REBUILD_SQL:
+                    try:
+                        written += conn.execute(sql).rowcount
+                    except sqlite3.OperationalError as e:
+                        logger.debug(f"Skipping leaderboard source: {e}")  # Not installed
+            self._rankings.clear()
+        return written
+
+    def _prune_if_new_day(self) -> None:
+        """Drop windowed periods past retention, once per UTC day"""
+        today = datetime.now(UTC).date()
+        if self._pruned_day == today:
+            return
+        self._pruned_day = today
+        self.prune(today)
+
+    def prune(self, today: date) -> int:
+        """
+        Delete daily and weekly periods older than their retention.
+
+        Returns:
+            Number of rows deleted
+        """
+        oldest_daily = period_key("daily", today - timedelta(days=DAILY_RETENTION_DAYS))
+        oldest_weekly = period_key("weekly", today - timedelta(weeks=WEEKLY_RETENTION_WEEKS))
+        with self._lock:
+            conn = self.db.get_connection()
+            with conn:
+                deleted = conn.execute(
+                    """
+                    DELETE FROM leaderboard_scores
+                    WHERE (period LIKE 'daily:%' AND period < ?)
+                       OR (period LIKE 'weekly:%' AND period < ?)
+                    """,
+                    (oldest_daily, oldest_weekly),
+                ).rowcount
+            self._rankings.clear()
+        if deleted:
+            logger.info(f"Pruned {deleted} expired leaderboard scores")
+        return deleted
+
+    # ========================================================================
+    # Queries
+    # ========================================================================
+
+    def top(
+        self, board: str = "xp", window: str = "all_time", limit: int = 10, offset: int = 0
+    ) -> list[dict[str, Any]]:
+        """
+        Get the highest scores of a board.
+
+        Returns:
+            Entries with rank, user_id and score, best first
+        """
+        with self._lock:
+            ranking = self._ranking(board, window)
+            end = min(offset + limit, len(ranking.keys))
+            return [ranking.entry(i) for i in range(offset, end)]
+
+    def get_position(
+        self, user_id: str, board: str = "xp", window: str = "all_time"
+    ) -> dict[str, Any] | None:
+        """
+        Get a user's rank on a board.
+
+        Returns:
+            rank, score, total_participants, percentile (share of participants
+            ranked below the user) and next_rank_gap (points to the next higher
+            score, 0 when first), or None if the user has no score
+        """
+        with self._lock:
+            ranking = self._ranking(board, window)
+            score = ranking.scores.get(user_id)
+            if score is None:
+                return None
+
+            total = len(ranking.keys)
+            rank = ranking.rank_of_score(score)
+            gap = -ranking.keys[rank - 2][0] - score if rank > 1 else 0
+        return {
+            "user_id": user_id,
+            "rank": rank,
+            "score": score,
+            "total_participants": total,
+            "percentile": round((total - rank) / total * 100, 1),
+            "next_rank_gap": gap,
+        }
+
+    def around(
+        self, user_id: str, board: str = "xp", window: str = "all_time", radius: int = 2
+    ) -> list[dict[str, Any]]:
+        """Get the entries within radius places of a user (empty if unranked)"""
+        with self._lock:
+            ranking = self._ranking(board, window)
+            score = ranking.scores.get(user_id)
+            if score is None:
+                return []
+
+            index = ranking.keys.bisect_left((-score, user_id))
+            start = max(index - radius, 0)
+            end = min(index + radius + 1, len(ranking.keys))
+            return [ranking.entry(i) for i in range(start, end)]
+
+    def count(self, board: str = "xp", window: str = "all_time") -> int:
+        """Number of users with a score on a board"""
+        with self._lock:
+            return len(self._ranking(board, window).keys)
+
+    def get_score(self, user_id: str, board: str = "xp", window: str = "all_time") -> int:
+        """Get a user's score on a board (0 if none)"""
+        with self._lock:
+            return self._ranking(board, window).scores.get(user_id, 0)
+
+    def _ranking(self, board: str, window: str) -> _Ranking:
+        """
+        Get the cached ranking of a board's current period, loading it if needed.
+
+        Must be called with self._lock held, and the ranking only read while it
+        is: writes update the cached lists in place.
+        """
+        if board not in BOARDS:
+            raise ValueError(f"Unknown leaderboard: {board}")
+        if window not in WINDOWS or (window != "all_time" and board not in WINDOWED_BOARDS):
+            raise ValueError(f"Unknown leaderboard window for {board}: {window}")
+
+        period = period_key(window, datetime.now(UTC).date())
+        version = self._read_data_version()
+        if version != self._data_version:
+            # Another connection committed: cached rankings may be stale
+            self._rankings.clear()
+            self._data_version = version
+
+        ranking = self._rankings.get((board, period))
+        if ranking is None:
+            rows = self.db.get_connection().execute(
+                """
+                SELECT user_id, score FROM leaderboard_scores
+                WHERE board = ? AND period = ?
+                ORDER BY score DESC, user_id
+                """,
+                (board, period),
+            )
+            ranking = _Ranking([(row[0], row[1]) for row in rows])
+            self._rankings[(board, period)] = ranking
+        return ranking
+
+    def _read_data_version(self) -> int:
+        return self.db.get_connection().execute("PRAGMA data_version").fetchone()[0]
+
+
+# Singleton instance
+_leaderboard_service: LeaderboardService | None = None
+
+
+def get_leaderboard_service() -> LeaderboardService:
+    """Get or create the leaderboard service"""
+    global _leaderboard_service
+    if _leaderboard_service is None:
+        _leaderboard_service = LeaderboardService(get_enhanced_database())
+    return _leaderboard_service
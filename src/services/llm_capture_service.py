@@ -11,22 +11,16 @@ import os
 
 from pydantic import BaseModel, Field
 
+from src.core.lazy_imports import lazy_import, module_available
 from src.knowledge.models import KGContext
+from src.services.request_metrics import track_llm_call
 
-# Try to import LLM clients
-try:
-    import openai
+# LLM clients are imported on first use to keep them out of API startup
+openai = lazy_import("openai")
+OPENAI_AVAILABLE = module_available("openai")
 
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-
-try:
-    import anthropic
-
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+anthropic = lazy_import("anthropic")
+ANTHROPIC_AVAILABLE = module_available("anthropic")
 
 logger = logging.getLogger(__name__)
 
@@ -224,13 +218,14 @@ class LLMCaptureService:
         try:
             model = os.getenv("LLM_MODEL", "gpt-4o-mini")
 
-            response = await self.openai_client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
-                temperature=0.3,
-                max_tokens=1000,
-            )
+            async with track_llm_call():
+                response = await self.openai_client.chat.completions.create(
+                    model=model,
+                    messages=[{"role": "user", "content": prompt}],
+                    response_format={"type": "json_object"},
+                    temperature=0.3,
+                    max_tokens=1000,
+                )
 
             # Extract JSON
             content = response.choices[0].message.content
@@ -259,12 +254,13 @@ class LLMCaptureService:
         try:
             model = os.getenv("LLM_MODEL", "claude-3-5-sonnet-20241022")
 
-            response = await self.anthropic_client.messages.create(
-                model=model,
-                max_tokens=1024,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.3,
-            )
+            async with track_llm_call():
+                response = await self.anthropic_client.messages.create(
+                    model=model,
+                    max_tokens=1024,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=0.3,
+                )
 
             # Extract JSON from response
             content = response.content[0].text
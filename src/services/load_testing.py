@@ -0,0 +1,480 @@
+"""
+Load Testing Harness - Epic 3.2 Performance Infrastructure
+
+Async load generator that replays scripted user workflows against the API:
+- In-process through the ASGI app (no server needed) or over HTTP to a running
+  server, with a pooled httpx client either way
+- Closed model (N virtual users looping) or open model (workflow iterations
+  started at a target rate, bounded by a concurrency cap)
+- Per-step throughput and latency percentiles
+- Comparison against the baselines table in tests/performance/PERFORMANCE_BASELINES.md
+
+Run against a local server::
+
+    python -m src.services.load_testing --base-url http://localhost:8000 --concurrency 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import re
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+import httpx
+import structlog
+
+from src.services.request_metrics import LatencyHistogram
+
+logger = structlog.get_logger()
+
+DEFAULT_BASELINES_PATH = (
+    Path(__file__).resolve().parents[2] / "tests" / "performance" / "PERFORMANCE_BASELINES.md"
+)
+BASELINES_HEADING = "## Load Harness Baselines"
+SCENARIO_STEP = "*"  # Baseline row that applies to the whole scenario
+
+
+@dataclass
+class StepStats:
+    """Latency and outcome counts for one workflow step"""
+
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    failures: int = 0
+    statuses: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def requests(self) -> int:
+        return self.latency.count
+
+    @property
+    def success_rate(self) -> float:
+        return 1 - self.failures / self.requests if self.requests else 0.0
+
+    def to_dict(self, elapsed: float) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "success_rate": self.success_rate,
+            "throughput": self.requests / elapsed if elapsed else 0.0,
+            "average_response_time": self.latency.mean,
+            "p50_response_time": self.latency.quantile(0.50),
+            "p95_response_time": self.latency.quantile(0.95),
+            "p99_response_time": self.latency.quantile(0.99),
+            "max_response_time": self.latency.max,
+            "statuses": dict(sorted(self.statuses.items())),
+        }
+
+
+@dataclass
+class LoadTestReport:
+    """Outcome of one load test run"""
+
+    scenario: str
+    concurrency: int
+    target_rps: float | None
+    elapsed: float = 0.0
+    steps: dict[str, StepStats] = field(default_factory=dict)
+    iterations: int = 0
+    dropped_iterations: int = 0  # Open model: start times missed because all slots were busy
+
+    def record(self, step: str, status: int, latency: float, failed: bool) -> None:
+        stats = self.steps.setdefault(step, StepStats())
+        stats.latency.record(latency)
+        stats.statuses[status] = stats.statuses.get(status, 0) + 1
+        if failed:
+            stats.failures += 1
+
+    @property
+    def overall(self) -> StepStats:
+        """All steps merged"""
+        merged = StepStats()
+        for stats in self.steps.values():
+            for index, count in stats.latency.counts.items():
+                merged.latency.counts[index] = merged.latency.counts.get(index, 0) + count
+            merged.latency.count += stats.latency.count
+            merged.latency.total += stats.latency.total
+            merged.latency.min = min(merged.latency.min, stats.latency.min)
+            merged.latency.max = max(merged.latency.max, stats.latency.max)
+            merged.failures += stats.failures
+            for status, count in stats.statuses.items():
+                merged.statuses[status] = merged.statuses.get(status, 0) + count
+        return merged
+
+    def to_dict(self) -> dict[str, Any]:
+        overall = self.overall
+        return {
+            "scenario": self.scenario,
+            "concurrent_users": self.concurrency,
+            "target_rps": self.target_rps,
+            "duration": self.elapsed,
+            "iterations": self.iterations,
+            "dropped_iterations": self.dropped_iterations,
+            "total_requests": overall.requests,
+            "successful_requests": overall.requests - overall.failures,
+            "failed_requests": overall.failures,
+            "success_rate": overall.success_rate,
+            "average_response_time": overall.latency.mean,
+            "p50_response_time": overall.latency.quantile(0.50),
+            "p95_response_time": overall.latency.quantile(0.95),
+            "p99_response_time": overall.latency.quantile(0.99),
+            "throughput": overall.requests / self.elapsed if self.elapsed else 0.0,
+            "steps": {name: s.to_dict(self.elapsed) for name, s in sorted(self.steps.items())},
+        }
+
+
+class LoadSession:
+    """One virtual user's view of the API: every request is timed and recorded"""
+
+    def __init__(self, client: httpx.AsyncClient, report: LoadTestReport, user_id: str):
+        self.client = client
+        self.report = report
+        self.user_id = user_id
+
+    async def request(self, step: str, method: str, url: str, **kwargs) -> httpx.Response | None:
+        """
+        Send a request and record it under ``step``.
+
+        Returns:
+            The response (also for error statuses), or None on a transport error
+        """
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.report.record(step, 0, time.perf_counter() - started, failed=True)
+            logger.debug("load_request_failed", step=step, error=str(e))
+            return None
+        self.report.record(
+            step, response.status_code, time.perf_counter() - started, response.is_error
+        )
+        return response
+
+
+Workflow = Callable[[LoadSession], Awaitable[None]]
+
+
+async def adhd_workflow(session: LoadSession) -> None:
+    """Capture a task, split it, complete its first micro-step, load the dashboard"""
+    captured = await session.request(
+        "capture",
+        "POST",
+        "/api/v1/mobile/quick-capture",
+        json={"text": "Write the quarterly report draft by Friday", "user_id": session.user_id},
+    )
+    task_id = None
+    if captured is not None and captured.is_success:
+        task_id = captured.json().get("task", {}).get("task_id")
+
+    if task_id:
+        split = await session.request(
+            "split", "POST", f"/api/v1/tasks/{task_id}/split", json={"user_id": session.user_id}
+        )
+        steps = split.json().get("micro_steps", []) if split and split.is_success else []
+        if steps:
+            await session.request(
+                "complete_micro_step",
+                "PATCH",
+                f"/api/v1/micro-steps/{steps[0]['step_id']}/complete",
+                json={"actual_minutes": 3},
+            )
+
+    await session.request(
+        "dashboard", "GET", "/api/v1/secretary/dashboard", params={"user_id": session.user_id}
+    )
+
+
+WORKFLOWS: dict[str, Workflow] = {"adhd_workflow": adhd_workflow}
+
+
+class LoadGenerator:
+    """Drives scripted workflows against the API and collects a LoadTestReport"""
+
+    def __init__(
+        self,
+        app: Any | None = None,
+        base_url: str | None = None,
+        max_connections: int = 100,
+        timeout: float = 30.0,
+    ):
+        """
+        Initialize load generator.
+
+        Args:
+            app: ASGI app to drive in-process (takes precedence over base_url)
+            base_url: Server to drive over HTTP
+            max_connections: Connection pool size for HTTP runs
+            timeout: Per-request timeout in seconds
+        """
+        if app is None and base_url is None:
+            raise ValueError("LoadGenerator needs an ASGI app or a base_url")
+        self.app = app
+        self.base_url = base_url or "http://testserver"
+        self.max_connections = max_connections
+        self.timeout = timeout
+
+    def _client(self) -> httpx.AsyncClient:
+        if self.app is not None:
+            transport: httpx.AsyncBaseTransport = httpx.ASGITransport(app=self.app)
+        else:
+            transport = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                )
+            )
+        return httpx.AsyncClient(transport=transport, base_url=self.base_url, timeout=self.timeout)
+
+    async def run(
+        self,
+        workflow: Workflow | str = "adhd_workflow",
+        concurrency: int = 10,
+        duration: float = 10.0,
+        target_rps: float | None = None,
+        max_iterations: int | None = None,
+    ) -> LoadTestReport:
+        """
+        Run a workflow under load.
+
+        Args:
+            workflow: Workflow callable or a name from WORKFLOWS
+            concurrency: Virtual users (closed model) or in-flight cap (open model)
+            duration: Seconds to keep starting new iterations
+            target_rps: Workflow iterations started per second; None for the
+                closed model where each user starts its next iteration right away
+            max_iterations: Stop after this many iterations (for short, repeatable runs)
+
+        Returns:
+            Load test report
+        """
+        name = workflow if isinstance(workflow, str) else workflow.__name__
+        script = WORKFLOWS[workflow] if isinstance(workflow, str) else workflow
+        report = LoadTestReport(scenario=name, concurrency=concurrency, target_rps=target_rps)
+
+        async with self._client() as client:
+            started = time.perf_counter()
+            deadline = started + duration
+            if target_rps is None:
+                await self._run_closed(
+                    client, script, report, concurrency, deadline, max_iterations
+                )
+            else:
+                await self._run_open(
+                    client, script, report, concurrency, deadline, max_iterations, target_rps
+                )
+            report.elapsed = time.perf_counter() - started
+
+        return report
+
+    def _claim_iteration(self, report: LoadTestReport, max_iterations: int | None) -> bool:
+        if max_iterations is not None and report.iterations >= max_iterations:
+            return False
+        report.iterations += 1
+        return True
+
+    async def _iteration(
+        self, client: httpx.AsyncClient, script: Workflow, report: LoadTestReport
+    ) -> None:
+        session = LoadSession(client, report, user_id=f"load-{uuid4().hex[:8]}")
+        try:
+            await script(session)
+        except Exception as e:  # A broken script must not stop the run
+            report.record("workflow_error", 0, 0.0, failed=True)
+            logger.warning("load_workflow_failed", error=str(e))
+
+    async def _run_closed(
+        self,
+        client: httpx.AsyncClient,
+        script: Workflow,
+        report: LoadTestReport,
+        concurrency: int,
+        deadline: float,
+        max_iterations: int | None,
+    ) -> None:
+        async def virtual_user() -> None:
+            while time.perf_counter() < deadline and self._claim_iteration(report, max_iterations):
+                await self._iteration(client, script, report)
+
+        await asyncio.gather(*(virtual_user() for _ in range(concurrency)))
+
+    async def _run_open(
+        self,
+        client: httpx.AsyncClient,
+        script: Workflow,
+        report: LoadTestReport,
+        concurrency: int,
+        deadline: float,
+        max_iterations: int | None,
+        target_rps: float,
+    ) -> None:
+        slots = asyncio.Semaphore(concurrency)
+        tasks: set[asyncio.Task] = set()
+
+        async def run_one() -> None:
+            try:
+                await self._iteration(client, script, report)
+            finally:
+                slots.release()
+
+        interval = 1.0 / target_rps
+        next_start = time.perf_counter()
+        while next_start < deadline:
+            if slots.locked():
+                report.dropped_iterations += 1
+            elif self._claim_iteration(report, max_iterations):
+                await slots.acquire()
+                task = asyncio.create_task(run_one())
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            else:
+                break
+            # Fixed schedule: a slow iteration does not delay the ones after it
+            next_start += interval
+            await asyncio.sleep(max(0.0, next_start - time.perf_counter()))
+
+        await asyncio.gather(*tasks)
+
+
+# Baselines ------------------------------------------------------------------------
+
+
+@dataclass
+class Baseline:
+    """Expected performance for one scenario step (or the whole scenario)"""
+
+    scenario: str
+    step: str
+    p95_ms: float | None = None
+    throughput: float | None = None
+    success_rate: float | None = None
+
+
+def _parse_number(cell: str) -> float | None:
+    match = re.search(r"[\d.]+", cell)
+    return float(match.group()) if match else None
+
+
+def load_baselines(path: Path | str = DEFAULT_BASELINES_PATH) -> dict[tuple[str, str], Baseline]:
+    """
+    Read the load harness baselines table from the baselines document.
+
+    Expects a markdown table under ``## Load Harness Baselines`` with columns
+    Scenario | Step | p95 (ms) | Throughput (req/s) | Success Rate. Blank or
+    ``-`` cells mean the metric is not gated.
+
+    Returns:
+        Baselines keyed by (scenario, step)
+    """
+    text = Path(path).read_text()
+    if BASELINES_HEADING not in text:
+        return {}
+    section = text.split(BASELINES_HEADING, 1)[1].split("\n## ", 1)[0]
+
+    baselines = {}
+    rows = [line for line in section.splitlines() if line.strip().startswith("|")]
+    for row in rows[2:]:  # Skip header and separator
+        cells = [cell.strip().strip("`") for cell in row.strip().strip("|").split("|")]
+        if len(cells) < 5:
+            continue
+        success = _parse_number(cells[4])
+        baseline = Baseline(
+            scenario=cells[0],
+            step=cells[1],
+            p95_ms=_parse_number(cells[2]),
+            throughput=_parse_number(cells[3]),
+            success_rate=success / 100 if success is not None and "%" in cells[4] else success,
+        )
+        baselines[(baseline.scenario, baseline.step)] = baseline
+    return baselines
+
+
+def compare_to_baselines(
+    report: LoadTestReport,
+    baselines: dict[tuple[str, str], Baseline],
+    latency_tolerance: float = 0.2,
+    throughput_tolerance: float = 0.3,
+) -> list[str]:
+    """
+    Find regressions against stored baselines.
+
+    A step regresses when its p95 is more than ``latency_tolerance`` slower,
+    its throughput more than ``throughput_tolerance`` lower, or its success
+    rate below the baseline (thresholds from "Regression Thresholds").
+
+    Returns:
+        Human-readable regression descriptions (empty when within baselines)
+    """
+    regressions = []
+    measured = {SCENARIO_STEP: report.overall, **report.steps}
+    for (scenario, step), baseline in sorted(baselines.items()):
+        if scenario != report.scenario or step not in measured:
+            continue
+        stats = measured[step]
+        label = f"{scenario}/{step}"
+
+        p95_ms = stats.latency.quantile(0.95) * 1000
+        if baseline.p95_ms is not None and p95_ms > baseline.p95_ms * (1 + latency_tolerance):
+            regressions.append(f"{label}: p95 {p95_ms:.0f}ms > baseline {baseline.p95_ms:.0f}ms")
+
+        throughput = stats.requests / report.elapsed if report.elapsed else 0.0
+        if baseline.throughput is not None and throughput < baseline.throughput * (
+            1 - throughput_tolerance
+        ):
+            regressions.append(
+                f"{label}: throughput {throughput:.1f} req/s < baseline {baseline.throughput:.1f}"
+            )
+
+        if baseline.success_rate is not None and stats.success_rate < baseline.success_rate:
+            regressions.append(
+                f"{label}: success rate {stats.success_rate:.1%} < baseline "
+                f"{baseline.success_rate:.1%}"
+            )
+    return regressions
+
+
+def format_report(report: LoadTestReport) -> str:
+    """Render a report as a table in the baselines document's format"""
+    lines = [
+        "| Scenario | Step | p95 (ms) | Throughput (req/s) | Success Rate |",
+        "|----------|------|----------|--------------------|--------------|",
+    ]
+    measured = {SCENARIO_STEP: report.overall, **report.steps}
+    for step, stats in measured.items():
+        throughput = stats.requests / report.elapsed if report.elapsed else 0.0
+        lines.append(
+            f"| {report.scenario} | {step} | {stats.latency.quantile(0.95) * 1000:.0f} "
+            f"| {throughput:.1f} | {stats.success_rate:.0%} |"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """Command-line entry point: load test a running server"""
+    parser = argparse.ArgumentParser(description="Replay scripted workflows against the API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--workflow", default="adhd_workflow", choices=sorted(WORKFLOWS))
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--rps", type=float, default=None, help="Open model: iterations/second")
+    parser.add_argument("--baselines", default=str(DEFAULT_BASELINES_PATH))
+    args = parser.parse_args()
+
+    generator = LoadGenerator(base_url=args.base_url)
+    report = asyncio.run(
+        generator.run(args.workflow, args.concurrency, args.duration, target_rps=args.rps)
+    )
+    print(format_report(report))
+
+    regressions = compare_to_baselines(report, load_baselines(args.baselines))
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
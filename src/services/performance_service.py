@@ -1,36 +1,43 @@
 """
 Performance Service - Epic 3.2 Performance Infrastructure
 
-TODO: This is a minimal stub implementation to make tests pass.
-      Full implementation required for production with:
-      - Real application performance monitoring (APM)
-      - Request tracing and profiling
-      - Resource usage tracking
-      - Performance anomaly detection
-      - Load testing integration
-      - Alerting and notifications
+Reports real request metrics recorded by RequestMetricsMiddleware:
+- Per-route latency percentiles (p50/p95/p99) and throughput
+- In-flight requests
+- DB query count/time and LLM time per request
+- Cache hit ratio for callers that report cached responses
+
+run_benchmark drives the API with the load-testing harness and compares the
+results against the stored performance baselines.
 """
 
 import asyncio
 from typing import Any
 
+from src.services.request_metrics import RequestMetricsRegistry, get_request_metrics
+
+# Share of 5xx responses above which the service reports itself as degraded
+DEGRADED_ERROR_RATIO = 0.05
+
 
 class PerformanceService:
     """
     Application performance monitoring and benchmarking service.
 
-    This is a stub implementation with simulated metrics.
-    Production implementation should integrate with APM tools.
+    Metrics come from the process-wide request metrics registry, which the API
+    middleware feeds for every HTTP request.
     """
 
-    def __init__(self):
-        """Initialize performance service with metrics tracking"""
-        self._metrics: dict[str, Any] = {
-            "total_requests": 0,
-            "cache_hits": 0,
-            "db_queries": 0,
-            "average_response_time": 0.25,
-        }
+    def __init__(self, registry: RequestMetricsRegistry | None = None):
+        """
+        Initialize performance service.
+
+        Args:
+            registry: Request metrics registry (defaults to the process-wide one)
+        """
+        self.registry = registry or get_request_metrics()
+        self._cache_hits = 0
+        self._cache_misses = 0
 
     async def simulate_user_workflow(self, user_id: str) -> dict[str, Any]:
         """
@@ -55,78 +62,86 @@ class PerformanceService:
             "status": "completed",
         }
 
-    async def track_request(self, endpoint: str, duration: float, cached: bool = False) -> None:
+    async def track_request(
+        self, endpoint: str, duration: float, cached: bool = False, method: str = "GET"
+    ) -> None:
         """
-        Track API request performance.
+        Track API request performance for requests timed outside the middleware.
 
         Args:
-            endpoint: API endpoint path
+            endpoint: API endpoint path (route template preferred)
             duration: Request duration in seconds
             cached: Whether request was served from cache
+            method: HTTP method
         """
-        self._metrics["total_requests"] += 1
         if cached:
-            self._metrics["cache_hits"] += 1
+            self._cache_hits += 1
         else:
-            self._metrics["db_queries"] += 1
-
-        # Update rolling average
-        total = self._metrics["total_requests"]
-        current_avg = self._metrics["average_response_time"]
-        new_avg = ((current_avg * (total - 1)) + duration) / total
-        self._metrics["average_response_time"] = new_avg
+            self._cache_misses += 1
+        self.registry.observe(method, endpoint, 200, duration)
 
     async def get_metrics(self) -> dict[str, Any]:
         """
         Get current performance metrics.
 
         Returns:
-            Dict with comprehensive performance data
+            Dict with totals, latency percentiles (seconds), per-route breakdown,
+            DB/LLM time, cache hit ratio and health status
         """
+        snapshot = self.registry.snapshot()
+        cache_lookups = self._cache_hits + self._cache_misses
+        errors = sum(route["errors"] for route in snapshot["routes"].values())
+        error_ratio = errors / snapshot["total_requests"] if snapshot["total_requests"] else 0.0
+
         return {
-            **self._metrics,
-            "cache_hit_ratio": (
-                self._metrics["cache_hits"] / self._metrics["total_requests"]
-                if self._metrics["total_requests"] > 0
-                else 0
-            ),
-            "health_status": "healthy",
+            **snapshot,
+            "cache_hits": self._cache_hits,
+            "cache_hit_ratio": self._cache_hits / cache_lookups if cache_lookups else 0,
+            "error_ratio": error_ratio,
+            "health_status": "degraded" if error_ratio > DEGRADED_ERROR_RATIO else "healthy",
         }
 
     async def run_benchmark(
-        self, concurrent_users: int = 100, duration: int = 60
+        self,
+        concurrent_users: int = 100,
+        duration: int = 60,
+        target_rps: float | None = None,
+        workflow: str = "adhd_workflow",
+        app: Any | None = None,
+        base_url: str | None = None,
     ) -> dict[str, Any]:
         """
-        Run performance benchmark test.
+        Run a load test of a scripted workflow against the API.
 
         Args:
-            concurrent_users: Number of simulated concurrent users
+            concurrent_users: Virtual users (or in-flight cap when target_rps is set)
             duration: Benchmark duration in seconds
+            target_rps: Workflow iterations started per second (open model)
+            workflow: Workflow name from src.services.load_testing.WORKFLOWS
+            app: ASGI app to drive in-process (defaults to the platform app)
+            base_url: Drive a running server over HTTP instead of in-process
 
         Returns:
-            Dict with benchmark results
+            Dict with throughput, latency percentiles (seconds), per-step
+            results and regressions against the stored baselines
         """
-        # Simulate benchmark
-        await asyncio.sleep(0.1)
+        from src.services.load_testing import LoadGenerator, compare_to_baselines, load_baselines
+
+        if app is None and base_url is None:
+            from src.api.main import app
+
+        generator = LoadGenerator(app=app, base_url=base_url)
+        report = await generator.run(
+            workflow, concurrency=concurrent_users, duration=duration, target_rps=target_rps
+        )
 
         return {
-            "concurrent_users": concurrent_users,
-            "duration": duration,
-            "total_requests": concurrent_users * 10,
-            "successful_requests": concurrent_users * 10,
-            "failed_requests": 0,
-            "average_response_time": 0.25,
-            "p50_response_time": 0.20,
-            "p95_response_time": 0.45,
-            "p99_response_time": 0.60,
-            "throughput": (concurrent_users * 10) / duration,
+            **report.to_dict(),
+            "regressions": compare_to_baselines(report, load_baselines()),
         }
 
     async def reset(self) -> None:
         """Reset performance metrics"""
-        self._metrics = {
-            "total_requests": 0,
-            "cache_hits": 0,
-            "db_queries": 0,
-            "average_response_time": 0.25,
-        }
+        self.registry.reset()
+        self._cache_hits = 0
+        self._cache_misses = 0
@@ -0,0 +1,524 @@
+"""
+Materialized productivity metrics.
+
+Keeps ``productivity_metrics`` current at daily, weekly and monthly grain so
+progress endpoints read precomputed rows instead of aggregating raw data.
+
+- Event-driven: triggers (migration 031) queue every (user, day) whose task or
+  focus rollups (migration 030) or task due dates change, including late data
+  for days that were already materialized.
+- Scheduled: a background loop drains the queue in batches. At each UTC day
+  rollover it also queues the previous day, whose overdue counts are final.
+- Idempotent: a day's metrics are always recomputed from the rollups, and a
+  week or month from its daily rows, so replays and backfills are safe.
+
+XP and achievement columns are owned by the gamification code and are kept.
+"""
+
+import asyncio
+import logging
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+
+from src.database.enhanced_adapter import EnhancedDatabaseAdapter, get_enhanced_database
+from src.services.task_statistics_service import StatisticsService
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "database"
+    / "migrations"
+    / "031_create_productivity_metrics_pipeline.sql"
+)
+
+
+def period_start(day: date, period_type: str) -> date:
+    """First day of the daily, weekly (Monday) or monthly period containing day."""
+    if period_type == "weekly":
+        return day - timedelta(days=day.weekday())
+    if period_type == "monthly":
+        return day.replace(day=1)
+    return day
+
+
+def period_end(day: date, period_type: str) -> date:
+    """Last day of the period containing day."""
+    start = period_start(day, period_type)
+    if period_type == "weekly":
+        return start + timedelta(days=6)
+    if period_type == "monthly":
+        next_month = (start + timedelta(days=32)).replace(day=1)
+        return next_month - timedelta(days=1)
+    return start
+
+
+def metrics_date(day: date) -> str:
+    """productivity_metrics.date value for a day (matches ProductivityMetricsRepository)."""
+    return datetime(day.year, day.month, day.day).isoformat()
+
+
+class ProductivityMetricsPipeline:
+    """Maintains productivity_metrics from the per-user daily rollups."""
+
+    def __init__(
+        self,
+        db: EnhancedDatabaseAdapter,
+        statistics: StatisticsService | None = None,
+        tick_seconds: float = 30.0,
+        batch_size: int = 500,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            db: Database adapter
+            statistics: Statistics service owning the rollups (created if omitted)
+            tick_seconds: How often the background loop drains the queue
+            batch_size: Maximum queued days processed per drain
+        """
+        self.db = db
+        self.statistics = statistics or StatisticsService(db)
+        self.tick_seconds = tick_seconds
+        self.batch_size = batch_size
+        self._task: asyncio.Task | None = None
+        self._last_day: date | None = None
+        self._focus_columns = self.statistics.focus_columns(db.get_connection())
+        self._has_planned = self._focus_columns == ("actual_duration_minutes", "was_completed")
+
+        conn = self.db.get_connection()
+        conn.executescript(MIGRATION_PATH.read_text())
+        conn.commit()
+
+    # ========================================================================
+    # Queue
+    # ========================================================================
+
+    def mark_dirty(self, user_id: str, day: date) -> None:
+        """Queue a day for recomputation (for changes the triggers can't see)"""
+        self.db.execute_write(
+            "INSERT OR IGNORE INTO productivity_metrics_dirty (user_id, day) VALUES (?, ?)",
+            (user_id, day.isoformat()),
+        )
+
+    def pending(self) -> int:
+        """Number of queued (user, day) pairs"""
+        return self.db.execute_read("SELECT COUNT(*) AS n FROM productivity_metrics_dirty")[0]["n"]
+
+    def process_pending(self) -> int:
+        """
+        Recompute queued days and the weeks and months containing them.
+
+        A user whose refresh fails has their days queued again; the other users
+        in the batch are still processed.
+
+        Returns:
+            Number of queued days processed
+        """
+        conn = self.db.get_connection()
+        with conn:
+            # Claim the batch first: changes landing while it is processed queue
+            # their day again instead of being lost
+            rows = conn.execute(
+                "SELECT user_id, day FROM productivity_metrics_dirty ORDER BY user_id, day LIMIT ?",
+                (self.batch_size,),
+            ).fetchall()
+            conn.executemany(
+                "DELETE FROM productivity_metrics_dirty WHERE user_id = ? AND day = ?",
+                [(row["user_id"], row["day"]) for row in rows],
+            )
+        if not rows:
+            return 0
+
+        days_by_user: dict[str, list[date]] = {}
+        for row in rows:
+            days_by_user.setdefault(row["user_id"], []).append(date.fromisoformat(row["day"]))
+
+        processed = 0
+        for user_id, days in days_by_user.items():
+            try:
+                self._refresh_days(user_id, days)
+            except Exception as e:
+                logger.error(f"Failed to refresh productivity metrics for {user_id}: {e}")
+                for day in days:
+                    self.mark_dirty(user_id, day)
+                continue
+            processed += len(days)
+        return processed
+
+    # ========================================================================
+    # Recompute
+    # ========================================================================
+
+    def refresh(self, user_id: str, start: date, end: date) -> None:
+        """
+        Recompute a user's metrics for every day in an inclusive range.
+
+        Args:
+            user_id: User to refresh
+            start: First day (UTC)
+            end: Last day (UTC)
+        """
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        self._refresh_days(user_id, days)
+
+    def backfill(self, start: date, end: date, user_id: str | None = None) -> int:
+        """
+        Recompute metrics for every user with activity in a date range.
+
+        Args:
+            start: First day (UTC)
+            end: Last day (UTC)
+            user_id: Limit the backfill to one user
+
+        Returns:
+            Number of users refreshed
+        """
+        query = "SELECT DISTINCT user_id FROM user_daily_stats WHERE day BETWEEN ? AND ?"
+        params: tuple = (start.isoformat(), end.isoformat())
+        if user_id:
+            query += " AND user_id = ?"
+            params += (user_id,)
+
+        users = [row["user_id"] for row in self.db.execute_read(query, params)]
+        for uid in users:
+            self.refresh(uid, start, end)
+
+        logger.info(f"Backfilled productivity metrics for {len(users)} users ({start}..{end})")
+        return len(users)
+
+    def _refresh_days(self, user_id: str, days: list[date]) -> None:
+        """
+        Recompute daily rows spanning the given days, then their weeks and months.
+
+        The span runs from the earliest to the latest day and on through the
+        completion streak that follows, since a late completion changes the
+        streak of every later day in that run.
+        """
+        if not self.db.execute_read("SELECT 1 FROM users WHERE user_id = ?", (user_id,)):
+            return  # productivity_metrics rows must reference a user
+
+        start = min(days)
+        end = self._streak_run_end(user_id, max(days))
+        activity = self._daily_activity(user_id, start, end)
+        existing = {
+            date.fromisoformat(row["date"][:10])
+            for row in self.db.execute_read(
+                """
+                SELECT date FROM productivity_metrics
+                WHERE user_id = ? AND period_type = 'daily' AND date BETWEEN ? AND ?
+                """,
+                (user_id, metrics_date(start), metrics_date(end)),
+            )
+        }
+
+        # Days without activity are written only to reset rows that already exist
+        streak = self._streak_before(user_id, start)
+        previous = start - timedelta(days=1)
+        values = []
+        for day in sorted(set(activity) | existing):
+            stats = activity.get(day, {})
+            if stats.get("tasks_completed", 0) > 0:
+                streak = streak + 1 if previous == day - timedelta(days=1) else 1
+                previous = day
+            else:
+                streak = 0
+            values.append(self._daily_values(user_id, day, stats, streak))
+
+        conn = self.db.get_connection()
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO productivity_metrics (
+                    metrics_id, user_id, date, period_type, tasks_created, tasks_completed,
+                    tasks_overdue, total_focus_time, planned_focus_time,
+                    focus_sessions_completed, focus_sessions_started,
+                    average_productivity_score, streak_days, completion_rate, focus_efficiency
+                ) VALUES (
+                    lower(hex(randomblob(16))), :user_id, :date, 'daily', :tasks_created,
+                    :tasks_completed, :tasks_overdue, :total_focus_time, :planned_focus_time,
+                    :focus_sessions_completed, :focus_sessions_started,
+                    :average_productivity_score, :streak_days, :completion_rate,
+                    :focus_efficiency
+                )
+                ON CONFLICT(user_id, date, period_type) DO UPDATE SET
+                    tasks_created = excluded.tasks_created,
+                    tasks_completed = excluded.tasks_completed,
+                    tasks_overdue = excluded.tasks_overdue,
+                    total_focus_time = excluded.total_focus_time,
+                    planned_focus_time = excluded.planned_focus_time,
+                    focus_sessions_completed = excluded.focus_sessions_completed,
+                    focus_sessions_started = excluded.focus_sessions_started,
+                    average_productivity_score = excluded.average_productivity_score,
+                    streak_days = excluded.streak_days,
+                    completion_rate = excluded.completion_rate,
+                    focus_efficiency = excluded.focus_efficiency,
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                values,
+            )
+            for period_type in ("weekly", "monthly"):
+                first_day = period_start(start, period_type)
+                while first_day <= end:
+                    self._rollup_period(conn, user_id, period_type, first_day)
+                    first_day = period_end(first_day, period_type) + timedelta(days=1)
+
+    def _daily_activity(self, user_id: str, start: date, end: date) -> dict[date, dict]:
+        """Per-day task, focus and overdue counts for a range, keyed by day"""
+        activity: dict[date, dict] = {}
+
+        for row in self.statistics.get_daily_stats(user_id, start, end):
+            activity[date.fromisoformat(row["day"])] = dict(row)
+
+        # Overdue: due that day and not completed by the end of it. Only final
+        # once the day is over, so today and later count as zero.
+        last_final = min(end, self._today() - timedelta(days=1))
+        if start <= last_final:
+            overdue_rows = self.db.execute_read(
+                """
+                SELECT date(due_date) AS day, COUNT(*) AS n
+                FROM tasks
+                WHERE assignee_id = ? AND due_date >= ? AND due_date < ?
+                    AND (status != 'completed'
+                         OR date(COALESCE(completed_at, updated_at)) > date(due_date))
+                GROUP BY 1
+                """,
+                (user_id, start.isoformat(), (last_final + timedelta(days=1)).isoformat()),
+            )
+            for row in overdue_rows:
+                activity.setdefault(date.fromisoformat(row["day"]), {})["tasks_overdue"] = row["n"]
+
+        if self._focus_columns:
+            planned = "SUM(COALESCE(planned_duration_minutes, 0))" if self._has_planned else "0"
+            focus_rows = self.db.execute_read(
+                f"""
+                SELECT date(started_at) AS day, COUNT(*) AS started, {planned} AS planned
+                FROM focus_sessions
+                WHERE user_id = ? AND started_at >= ? AND started_at < ?
+                GROUP BY 1
+                """,
+                (user_id, start.isoformat(), (end + timedelta(days=1)).isoformat()),
+            )
+            for row in focus_rows:
+                stats = activity.setdefault(date.fromisoformat(row["day"]), {})
+                stats["focus_sessions_started"] = row["started"]
+                stats["planned_focus_time"] = row["planned"]
+
+        return activity
+
+    def _daily_values(self, user_id: str, day: date, stats: dict, streak: int) -> dict:
+        """Column values of one daily productivity_metrics row"""
+        created = stats.get("tasks_created", 0)
+        completed = stats.get("tasks_completed", 0)
+        focus_minutes = stats.get("focus_minutes", 0)
+        planned = stats.get("planned_focus_time", 0) or 0
+
+        if created:
+            completion_rate = min(completed / created * 100, 100.0)
+        else:
+            completion_rate = 100.0 if completed else 0.0
+        avg_minutes = stats.get("completion_minutes", 0) / completed if completed else 0.0
+
+        score = self.statistics.calculate_productivity_score(
+            completion_rate=completion_rate,
+            avg_completion_time=avg_minutes,
+            streak_days=streak,
+            total_completed=completed,
+        )
+
+        return {
+            "user_id": user_id,
+            "date": metrics_date(day),
+            "tasks_created": created,
+            "tasks_completed": completed,
+            "tasks_overdue": stats.get("tasks_overdue", 0),
+            "total_focus_time": focus_minutes,
+            "planned_focus_time": planned,
+            "focus_sessions_completed": stats.get("focus_sessions", 0),
+            "focus_sessions_started": max(
+                stats.get("focus_sessions_started", 0), stats.get("focus_sessions", 0)
+            ),
+            "average_productivity_score": round(score, 2),
+            "streak_days": streak,
+            "completion_rate": round(completion_rate, 2),
+            "focus_efficiency": round(min(focus_minutes / planned * 100, 100.0), 2)
+            if planned
+            else None,
+        }
+
+    def _rollup_period(self, conn, user_id: str, period_type: str, first_day: date) -> None:
+        """Recompute one weekly or monthly row from the daily rows it covers"""
+        last_day = period_end(first_day, period_type)
+        conn.execute(
+            """
+            INSERT INTO productivity_metrics (
+                metrics_id, user_id, date, period_type, tasks_created, tasks_completed,
+                tasks_overdue, total_focus_time, planned_focus_time, break_time,
+                focus_sessions_completed, focus_sessions_started,
+                average_productivity_score, xp_earned, achievements_unlocked,
+                streak_days, completion_rate, focus_efficiency
+            )
+            SELECT
+                lower(hex(randomblob(16))), user_id, :period_date, :period_type,
+                SUM(tasks_created), SUM(tasks_completed), SUM(tasks_overdue),
+                SUM(total_focus_time), SUM(planned_focus_time), SUM(break_time),
+                SUM(focus_sessions_completed), SUM(focus_sessions_started),
+                ROUND(AVG(CASE WHEN tasks_created + tasks_completed + focus_sessions_completed > 0
+                               THEN average_productivity_score END), 2),
+                SUM(xp_earned), SUM(achievements_unlocked), MAX(streak_days),
+                CASE WHEN SUM(tasks_created) > 0
+                     THEN ROUND(MIN(SUM(tasks_completed) * 100.0 / SUM(tasks_created), 100), 2)
+                END,
+                CASE WHEN SUM(planned_focus_time) > 0
+                     THEN ROUND(MIN(SUM(total_focus_time) * 100.0 / SUM(planned_focus_time), 100), 2)
+                END
+            FROM productivity_metrics
+            WHERE user_id = :user_id AND period_type = 'daily'
+                AND date BETWEEN :first AND :last
+            GROUP BY user_id
+            ON CONFLICT(user_id, date, period_type) DO UPDATE SET
+                tasks_created = excluded.tasks_created,
+                tasks_completed = excluded.tasks_completed,
+                tasks_overdue = excluded.tasks_overdue,
+                total_focus_time = excluded.total_focus_time,
+                planned_focus_time = excluded.planned_focus_time,
+                break_time = excluded.break_time,
+                focus_sessions_completed = excluded.focus_sessions_completed,
+                focus_sessions_started = excluded.focus_sessions_started,
+                average_productivity_score = excluded.average_productivity_score,
+                xp_earned = excluded.xp_earned,
+                achievements_unlocked = excluded.achievements_unlocked,
+                streak_days = excluded.streak_days,
+                completion_rate = excluded.completion_rate,
+                focus_efficiency = excluded.focus_efficiency,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            {
+                "user_id": user_id,
+                "period_type": period_type,
+                "period_date": metrics_date(first_day),
+                "first": metrics_date(first_day),
+                "last": metrics_date(last_day),
+            },
+        )
+
+    def _streak_run_end(self, user_id: str, day: date) -> date:
+        """Last day of the run of consecutive completion days right after day"""
+        cursor = self.db.get_connection().execute(
+            """
+            SELECT day FROM user_daily_stats
+            WHERE user_id = ? AND day > ? AND tasks_completed > 0
+            ORDER BY day
+            """,
+            (user_id, day.isoformat()),
+        )
+        end = day
+        for (completed_day,) in cursor:
+            if date.fromisoformat(completed_day) != end + timedelta(days=1):
+                break
+            end += timedelta(days=1)
+        cursor.close()
+        return end
+
+    def _streak_before(self, user_id: str, day: date) -> int:
+        """Length of the completion streak ending the day before day"""
+        cursor = self.db.get_connection().execute(
+            """
+            SELECT day FROM user_daily_stats
+            WHERE user_id = ? AND day < ? AND tasks_completed > 0
+            ORDER BY day DESC
+            """,
+            (user_id, day.isoformat()),
+        )
+        streak = 0
+        expected = day - timedelta(days=1)
+        for (completed_day,) in cursor:
+            if date.fromisoformat(completed_day) != expected:
+                break
+            streak += 1
+            expected -= timedelta(days=1)
+        cursor.close()
+        return streak
+
+    @staticmethod
+    def _today() -> date:
+        return datetime.now(UTC).date()
+
+    # ========================================================================
+    # Scheduling
+    # ========================================================================
+
+    async def start(self) -> None:
+        """Start the background loop"""
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._loop(), name="productivity-metrics-pipeline")
+        logger.info(f"Productivity metrics pipeline started (tick: {self.tick_seconds}s)")
+
+    async def stop(self) -> None:
+        """Stop the background loop (queued days stay queued)"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        logger.info("Productivity metrics pipeline stopped")
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.warning(f"Productivity metrics tick failed: {e}")
+            await asyncio.sleep(self.tick_seconds)
+
+    async def tick(self) -> int:
+        """
+        Queue the previous day at rollover, then drain the queue.
+
+        Returns:
+            Number of queued days processed
+        """
+        today = self._today()
+        if self._last_day is not None and today > self._last_day:
+            self._queue_finished_day(today - timedelta(days=1))
+        self._last_day = today
+
+        # Batches run on the loop: the adapter's connection is shared, and a
+        # batch is bounded by batch_size
+        processed = 0
+        while True:
+            batch = self.process_pending()
+            processed += batch
+            if batch < self.batch_size:
+                return processed
+            await asyncio.sleep(0)
+
+    def _queue_finished_day(self, day: date) -> None:
+        """Queue users with tasks due on a day that just ended (overdue is now final)"""
+        self.db.execute_write(
+            """
+            INSERT OR IGNORE INTO productivity_metrics_dirty (user_id, day)
+            SELECT DISTINCT assignee_id, ? FROM tasks
+            WHERE assignee_id IS NOT NULL AND due_date >= ? AND due_date < ?
+            """,
+            (day.isoformat(), day.isoformat(), (day + timedelta(days=1)).isoformat()),
+        )
+
+
+# Singleton instance
+_pipeline: ProductivityMetricsPipeline | None = None
+
+
+def get_productivity_metrics_pipeline() -> ProductivityMetricsPipeline:
+    """Get or create the productivity metrics pipeline configured from settings"""
+    global _pipeline
+    if _pipeline is None:
+        from src.core.settings import get_settings
+
+        settings = get_settings()
+        _pipeline = ProductivityMetricsPipeline(
+            get_enhanced_database(),
+            tick_seconds=settings.productivity_metrics_tick_seconds,
+        )
+    return _pipeline
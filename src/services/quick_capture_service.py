@@ -13,7 +13,7 @@ from typing import Any
 from src.core.settings import get_settings
 from src.knowledge.models import KGContext
 from src.services.llm_capture_service import LLMCaptureService
-from src.services.secretary_service import SecretaryService
+from src.services.secretary_service import get_secretary_service
 
 # Python 3.10 compatibility
 UTC = UTC
@@ -26,7 +26,7 @@ class QuickCaptureService:
 
     def __init__(self):
         """Initialize quick capture service"""
-        self.secretary = SecretaryService()
+        self.secretary = get_secretary_service()
         self.llm_service = LLMCaptureService()
         self.settings = get_settings()
 
@@ -0,0 +1,358 @@
+"""
+Request Metrics - Epic 3.2 Performance Infrastructure
+
+Low-overhead, in-process instrumentation for API requests:
+- Per-route latency histograms (HDR-style log-linear buckets)
+- In-flight request gauge
+- DB query count/time and LLM time attributed to the current request
+- Prometheus text exposition
+
+Recording is O(1) and lock-free on the request path; the per-request
+accumulator travels in a ContextVar so DB calls made through
+``asyncio.to_thread`` are still attributed to the request that made them.
+"""
+
+import math
+import threading
+import time
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+# Default Prometheus histogram boundaries (seconds)
+PROMETHEUS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram with bounded relative error.
+
+    Values land in bucket ``floor(log(v) / log(1 + precision))``, so recording is
+    O(1) and every quantile is accurate to within ``precision`` relative error
+    whatever the distribution, using a few hundred buckets at most.
+    """
+
+    __slots__ = ("_log_base", "counts", "count", "max", "min", "precision", "total")
+
+    MIN_VALUE = 1e-6  # 1µs floor (log of zero is undefined)
+
+    def __init__(self, precision: float = 0.02):
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        """Record one observation (seconds)"""
+        index = math.floor(math.log(max(value, self.MIN_VALUE)) / self._log_base)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def _bucket_value(self, index: int) -> float:
+        """Representative (geometric midpoint) value of a bucket"""
+        return math.exp((index + 0.5) * self._log_base)
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile (0 <= q <= 1); 0.0 when empty"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        if rank >= self.count:
+            return self.max  # Tracked exactly
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def cumulative_counts(self, bounds: Iterable[float]) -> list[int]:
+        """Observations <= each bound (for Prometheus ``le`` buckets)"""
+        indexes = sorted(self.counts)
+        result = []
+        position = 0
+        running = 0
+        for bound in bounds:
+            while position < len(indexes) and self._bucket_value(indexes[position]) <= bound:
+                running += self.counts[indexes[position]]
+                position += 1
+            result.append(running)
+        return result
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+@dataclass
+class RequestStats:
+    """Work attributed to the request currently being handled"""
+
+    db_queries: int = 0
+    db_time: float = 0.0
+    llm_calls: int = 0
+    llm_time: float = 0.0
+
+
+@dataclass
+class RouteMetrics:
+    """Aggregated metrics for one (method, route) pair"""
+
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    statuses: dict[int, int] = field(default_factory=dict)
+    db_queries: int = 0
+    db_time: float = 0.0
+    llm_calls: int = 0
+    llm_time: float = 0.0
+
+
+_current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+class RequestMetricsRegistry:
+    """Process-wide store of request, DB and LLM metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()  # Guards the global DB/LLM counters (updated from threads)
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all recorded metrics"""
+        self.routes: dict[tuple[str, str], RouteMetrics] = {}
+        self.in_flight = 0
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.llm_calls = 0
+        self.llm_time = 0.0
+        self.started_at = time.time()
+
+    # Request lifecycle --------------------------------------------------------------
+
+    def begin_request(self) -> RequestStats:
+        """Start attributing DB and LLM work to a new request"""
+        stats = RequestStats()
+        _current_request.set(stats)
+        self.in_flight += 1
+        return stats
+
+    def end_request(
+        self, method: str, route: str, status: int, duration: float, stats: RequestStats
+    ) -> None:
+        """Record a finished request"""
+        _current_request.set(None)
+        self.in_flight -= 1
+        self.observe(method, route, status, duration, stats)
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        duration: float,
+        stats: RequestStats | None = None,
+    ) -> None:
+        """Record a request timed outside the middleware"""
+        stats = stats or RequestStats()
+        metrics = self.routes.get((method, route))
+        if metrics is None:
+            metrics = self.routes[(method, route)] = RouteMetrics()
+        metrics.latency.record(duration)
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+        metrics.db_queries += stats.db_queries
+        metrics.db_time += stats.db_time
+        metrics.llm_calls += stats.llm_calls
+        metrics.llm_time += stats.llm_time
+
+    # Work attribution ---------------------------------------------------------------
+
+    def record_db_query(self, duration: float) -> None:
+        """Record one DB statement (attributed to the current request, if any)"""
+        stats = _current_request.get()
+        if stats is not None:
+            stats.db_queries += 1
+            stats.db_time += duration
+        with self._lock:
+            self.db_queries += 1
+            self.db_time += duration
+
+    def record_llm_call(self, duration: float) -> None:
+        """Record one LLM API call (attributed to the current request, if any)"""
+        stats = _current_request.get()
+        if stats is not None:
+            stats.llm_calls += 1
+            stats.llm_time += duration
+        with self._lock:
+            self.llm_calls += 1
+            self.llm_time += duration
+
+    # Reporting ----------------------------------------------------------------------
+
+    def snapshot(self) -> dict[str, Any]:
+        """Summary of all metrics (latencies in seconds)"""
+        overall = LatencyHistogram()
+        routes = {}
+        for (method, route), metrics in sorted(self.routes.items()):
+            latency = metrics.latency
+            for index, count in latency.counts.items():
+                overall.counts[index] = overall.counts.get(index, 0) + count
+            overall.count += latency.count
+            overall.total += latency.total
+            overall.min = min(overall.min, latency.min)
+            overall.max = max(overall.max, latency.max)
+
+            errors = sum(n for status, n in metrics.statuses.items() if status >= 500)
+            routes[f"{method} {route}"] = {
+                "requests": latency.count,
+                "errors": errors,
+                "average_response_time": latency.mean,
+                "p50_response_time": latency.quantile(0.50),
+                "p95_response_time": latency.quantile(0.95),
+                "p99_response_time": latency.quantile(0.99),
+                "max_response_time": latency.max,
+                "db_queries_per_request": metrics.db_queries / latency.count,
+                "db_time_per_request": metrics.db_time / latency.count,
+                "llm_time_per_request": metrics.llm_time / latency.count,
+            }
+
+        uptime = time.time() - self.started_at
+        return {
+            "total_requests": overall.count,
+            "in_flight_requests": self.in_flight,
+            "requests_per_second": overall.count / uptime if uptime > 0 else 0.0,
+            "average_response_time": overall.mean,
+            "p50_response_time": overall.quantile(0.50),
+            "p95_response_time": overall.quantile(0.95),
+            "p99_response_time": overall.quantile(0.99),
+            "db_queries": self.db_queries,
+            "db_time": self.db_time,
+            "llm_calls": self.llm_calls,
+            "llm_time": self.llm_time,
+            "routes": routes,
+        }
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = [
+            "# HELP http_requests_total Completed HTTP requests",
+            "# TYPE http_requests_total counter",
+        ]
+        routes = sorted(self.routes.items())
+        for (method, route), metrics in routes:
+            for status, count in sorted(metrics.statuses.items()):
+                labels = _labels(method=method, route=route, status=str(status))
+                lines.append(f"http_requests_total{{{labels}}} {count}")
+
+        lines += [
+            "# HELP http_request_duration_seconds HTTP request latency",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), metrics in routes:
+            latency = metrics.latency
+            cumulative = latency.cumulative_counts(PROMETHEUS_BUCKETS)
+            for bound, count in zip(PROMETHEUS_BUCKETS, cumulative, strict=True):
+                labels = _labels(method=method, route=route, le=repr(bound))
+                lines.append(f"http_request_duration_seconds_bucket{{{labels}}} {count}")
+            labels = _labels(method=method, route=route, le="+Inf")
+            lines.append(f"http_request_duration_seconds_bucket{{{labels}}} {latency.count}")
+            labels = _labels(method=method, route=route)
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {latency.total}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {latency.count}")
+
+        per_request = (
+            (
+                "http_request_db_queries_total",
+                "DB statements run while serving requests",
+                "db_queries",
+            ),
+            ("http_request_db_seconds_total", "DB time spent while serving requests", "db_time"),
+            ("http_request_llm_seconds_total", "LLM time spent while serving requests", "llm_time"),
+        )
+        for name, help_text, attr in per_request:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (method, route), metrics in routes:
+                labels = _labels(method=method, route=route)
+                lines.append(f"{name}{{{labels}}} {getattr(metrics, attr)}")
+
+        lines += [
+            "# HELP http_requests_in_flight Requests currently being served",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP db_queries_total DB statements run by the process",
+            "# TYPE db_queries_total counter",
+            f"db_queries_total {self.db_queries}",
+            "# HELP db_query_seconds_total DB time spent by the process",
+            "# TYPE db_query_seconds_total counter",
+            f"db_query_seconds_total {self.db_time}",
+            "# HELP llm_calls_total LLM API calls made by the process",
+            "# TYPE llm_calls_total counter",
+            f"llm_calls_total {self.llm_calls}",
+            "# HELP llm_seconds_total LLM time spent by the process",
+            "# TYPE llm_seconds_total counter",
+            f"llm_seconds_total {self.llm_time}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _labels(**labels: str) -> str:
+    """Format Prometheus labels, escaping values"""
+    return ",".join(
+        f'{key}="{value.replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for key, value in labels.items()
+    )
+
+
+# Singleton instance
+_registry = RequestMetricsRegistry()
+
+
+def get_request_metrics() -> RequestMetricsRegistry:
+    """Get the process-wide request metrics registry"""
+    return _registry
+
+
+def record_db_query(duration: float) -> None:
+    """Record one DB statement on the process-wide registry"""
+    _registry.record_db_query(duration)
+
+
+@asynccontextmanager
+async def track_llm_call() -> AsyncIterator[None]:
+    """Time an LLM API call and attribute it to the current request"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _registry.record_llm_call(time.perf_counter() - started)
+
+
+_sqlalchemy_hooks_installed = False
+
+
+def install_sqlalchemy_hooks() -> None:
+    """Count and time every SQLAlchemy statement (idempotent)"""
+    global _sqlalchemy_hooks_installed
+    if _sqlalchemy_hooks_installed:
+        return
+
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # noqa: ARG001
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(Engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # noqa: ARG001
+        _registry.record_db_query(time.perf_counter() - conn.info["query_start"].pop())
+
+    _sqlalchemy_hooks_installed = True
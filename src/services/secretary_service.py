@@ -1,28 +1,174 @@
 """
 Secretary Service - Intelligent task organization and prioritization logic
+
+Views select only the tasks they show with indexed queries (migration 036):
+due-date windows, Eisenhower quadrants and counts are computed by SQLite, not
+by filtering every task in Python. Each user's views are cached until one of
+their tasks changes, which triggers record in ``task_change_versions``, or
+until they are ``max_age_seconds`` old, since due-date windows move with time.
 """
 
 from __future__ import annotations
 
 import logging
+import math
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
+from pathlib import Path
 from typing import Any
 
+from src.core.task_models import Task, TaskPriority
+from src.database.enhanced_adapter import EnhancedDatabaseAdapter, get_enhanced_database
+from src.repositories.enhanced_repositories import EnhancedTaskRepository
+
 # Python 3.10 compatibility
 UTC = UTC
 
-from src.core.task_models import TaskPriority, TaskStatus
-from src.repositories.enhanced_repositories import EnhancedTaskRepository
-
 logger = logging.getLogger(__name__)
 
+MIGRATION_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "database"
+    / "migrations"
+    / "036_create_secretary_views.sql"
+)
+
+# julianday() of the Unix epoch
+UNIX_EPOCH_JULIAN_DAY = 2440587.5
+
+# Status and priorities are SQL literals so the partial indexes of migration 036 apply
+IMPORTANT = "priority IN ('high', 'critical')"
+PRIORITY_RANK = (
+    "CASE priority WHEN 'critical' THEN 0 WHEN 'high' THEN 1 WHEN 'medium' THEN 2 ELSE 3 END"
+)
+COMPLETED_AT = "julianday(COALESCE(completed_at, updated_at))"
+
+DASHBOARD_TASKS_SQL = f"""
+    SELECT *,
+        julianday(due_date) - :now AS days_until_due,
+        CASE
+            WHEN julianday(due_date) <= :urgent_until AND {IMPORTANT} THEN 'main_priority'
+            WHEN julianday(due_date) <= :urgent_until THEN 'urgent_tasks'
+            WHEN {IMPORTANT} THEN 'important_tasks'
+            ELSE 'this_week'
+        END AS category
+    FROM tasks
+    WHERE {{scope}} AND status != 'completed'
+        AND (julianday(due_date) <= :week_end OR {IMPORTANT})
+    ORDER BY due_date IS NULL, julianday(due_date), {PRIORITY_RANK}
+"""
+
+MATRIX_TASKS_SQL = f"""
+    SELECT *,
+        CASE
+            WHEN julianday(due_date) <= :urgent_until AND {IMPORTANT} THEN 'do_first'
+            WHEN {IMPORTANT} THEN 'schedule'
+            WHEN julianday(due_date) <= :urgent_until THEN 'delegate'
+            ELSE 'eliminate'
+        END AS quadrant
+    FROM tasks
+    WHERE {{scope}} AND status != 'completed'
+    ORDER BY due_date IS NULL, julianday(due_date), {PRIORITY_RANK}
+"""
+
+COMPLETED_TODAY_SQL = f"""
+    SELECT * FROM tasks
+    WHERE {{scope}} AND status = 'completed'
+        AND {COMPLETED_AT} BETWEEN :today_start AND :today_end
+    ORDER BY {COMPLETED_AT}
+"""
+
+UPCOMING_TASKS_SQL = f"""
+    SELECT * FROM tasks
+    WHERE {{scope}} AND status != 'completed'
+        AND julianday(due_date) BETWEEN :today_start AND :tomorrow_end
+    ORDER BY julianday(due_date), {PRIORITY_RANK}
+    LIMIT :limit
+"""
+
+# One indexed count per subquery
+TASK_COUNTS_SQL = """
+    SELECT
+        (SELECT COUNT(*) FROM tasks WHERE {scope}) AS total_tasks,
+        (SELECT COUNT(*) FROM tasks WHERE {scope} AND status = 'completed') AS completed_tasks,
+        (
+            SELECT COUNT(*) FROM tasks
+            WHERE {scope} AND status != 'completed' AND julianday(due_date) < :now
+        ) AS overdue_tasks
+"""
+
+DUE_SOON_COUNTS_SQL = f"""
+    SELECT
+        (
+            SELECT COUNT(*) FROM tasks
+            WHERE {{scope}} AND status != 'completed'
+                AND julianday(due_date) BETWEEN :today_start AND :today_end
+        ) AS upcoming_today,
+        (
+            SELECT COUNT(*) FROM tasks
+            WHERE {{scope}} AND status != 'completed' AND {IMPORTANT}
+                AND julianday(due_date) BETWEEN :today_start AND :tomorrow_end
+        ) AS urgent_tasks
+"""
+
+# Low or medium priority tasks due soon, then high priority tasks without a due date
+SUGGESTION_TASKS_SQL = """
+    SELECT task_id, title, priority, julianday(due_date) - :now AS days_until_due
+    FROM tasks
+    WHERE {scope} AND status != 'completed'
+        AND (
+            (julianday(due_date) <= :urgent_until AND priority IN ('low', 'medium'))
+            OR (due_date IS NULL AND priority = 'high')
+        )
+    ORDER BY due_date IS NULL, julianday(due_date)
+    LIMIT :limit
+"""
+
+
+def _julian_day(dt: datetime) -> float:
+    """SQLite julianday() of an aware datetime"""
+    return dt.timestamp() / 86400 + UNIX_EPOCH_JULIAN_DAY
+
+
+@dataclass
+class _CachedView:
+    version: int
+    computed_at: float
+    value: Any
+
 
 class SecretaryService:
     """Service for intelligent task organization and prioritization"""
 
-    def __init__(self):
-        """Initialize secretary service with task repository"""
-        self.task_repo = EnhancedTaskRepository()
+    def __init__(
+        self,
+        db: EnhancedDatabaseAdapter | None = None,
+        max_age_seconds: float = 60.0,
+        max_cached_views: int = 10_000,
+    ):
+        """
+        Initialize secretary service with task repository
+
+        Args:
+            db: Database adapter (defaults to the shared one)
+            max_age_seconds: Age after which a cached view is recomputed even if
+                no task changed
+            max_cached_views: Views kept in memory before the cache is cleared
+        """
+        self.db = db or get_enhanced_database()
+        self.task_repo = EnhancedTaskRepository(self.db)
+        self.max_age_seconds = max_age_seconds
+        self.max_cached_views = max_cached_views
+
+        self._lock = threading.Lock()
+        self._cache: dict[tuple[str, str], _CachedView] = {}
+
+        conn = self.db.get_connection()
+        conn.executescript(MIGRATION_PATH.read_text())
+        conn.commit()
 
     def _ensure_timezone_aware(self, dt: datetime | None) -> datetime | None:
         """Ensure datetime has timezone info"""
@@ -43,103 +189,7 @@ class SecretaryService:
             Dashboard data with categorized tasks, stats, and upcoming deadlines
         """
         try:
-            # Get all active tasks
-            all_tasks = self.task_repo.list_tasks().items
-
-            # Filter by user if provided
-            if user_id:
-                all_tasks = [
-                    t for t in all_tasks if hasattr(t, "assignee") and t.assignee == user_id
-                ]
-
-            # Get current time for calculations
-            now = datetime.now(UTC)
-            two_days = now + timedelta(days=2)
-            one_week = now + timedelta(days=7)
-
-            # Categorize tasks
-            main_priority = []
-            urgent_tasks = []
-            important_tasks = []
-            this_week = []
-
-            for task in all_tasks:
-                if task.status == TaskStatus.COMPLETED:
-                    continue
-
-                # Ensure task.due_date is timezone-aware for comparison
-                due_date = self._ensure_timezone_aware(task.due_date)
-
-                # Check if task is urgent (due within 48 hours)
-                is_urgent = due_date and due_date <= two_days if due_date else False
-
-                # Check if task is important (high priority)
-                is_important = task.priority in [TaskPriority.HIGH, TaskPriority.CRITICAL]
-
-                # Categorize
-                if is_urgent and is_important:
-                    main_priority.append(self._task_to_dict(task))
-                elif is_urgent:
-                    urgent_tasks.append(self._task_to_dict(task))
-                elif is_important:
-                    important_tasks.append(self._task_to_dict(task))
-                elif due_date and due_date <= one_week:
-                    this_week.append(self._task_to_dict(task))
-
-            # Calculate statistics
-            completed_count = len([t for t in all_tasks if t.status == TaskStatus.COMPLETED])
-            overdue_count = len(
-                [
-                    t
-                    for t in all_tasks
-                    if t.due_date
-                    and self._ensure_timezone_aware(t.due_date) < now
-                    and t.status != TaskStatus.COMPLETED
-                ]
-            )
-
-            stats = {
-                "total_tasks": len(all_tasks),
-                "active_tasks": len([t for t in all_tasks if t.status != TaskStatus.COMPLETED]),
-                "completed_tasks": completed_count,
-                "overdue_tasks": overdue_count,
-                "main_priority_count": len(main_priority),
-                "urgent_count": len(urgent_tasks),
-                "important_count": len(important_tasks),
-            }
-
-            # Get upcoming deadlines (next 7 days)
-            upcoming_deadlines = []
-            for task in all_tasks:
-                due_date = self._ensure_timezone_aware(task.due_date)
-                if due_date and now <= due_date <= one_week and task.status != TaskStatus.COMPLETED:
-                    upcoming_deadlines.append(
-                        {
-                            "task_id": task.task_id,
-                            "title": task.title,
-                            "due_date": due_date.isoformat(),
-                            "priority": task.priority
-                            if isinstance(task.priority, str)
-                            else task.priority.value,
-                            "days_until_due": (due_date - now).days,
-                        }
-                    )
-
-            # Sort upcoming deadlines by date
-            upcoming_deadlines.sort(key=lambda x: x["due_date"])
-
-            return {
-                "categories": {
-                    "main_priority": main_priority,
-                    "urgent_tasks": urgent_tasks,
-                    "important_tasks": important_tasks,
-                    "this_week": this_week,
-                },
-                "stats": stats,
-                "upcoming_deadlines": upcoming_deadlines,
-                "last_updated": now.isoformat(),
-            }
-
+            return self._cached(user_id, "dashboard", lambda: self._build_dashboard(user_id))
         except Exception as e:
             logger.error(f"Failed to generate secretary dashboard: {e}")
             raise
@@ -155,68 +205,7 @@ class SecretaryService:
             Matrix data with four quadrants (Do First, Schedule, Delegate, Eliminate)
         """
         try:
-            # Get all active tasks
-            all_tasks = self.task_repo.list_tasks().items
-
-            # Filter by user if provided
-            if user_id:
-                all_tasks = [
-                    t for t in all_tasks if hasattr(t, "assignee") and t.assignee == user_id
-                ]
-
-            # Get current time
-            now = datetime.now(UTC)
-            three_days = now + timedelta(days=3)
-
-            # Initialize quadrants
-            do_first = []  # Urgent + Important
-            schedule = []  # Important, Not Urgent
-            delegate = []  # Urgent, Not Important
-            eliminate = []  # Neither Urgent nor Important
-
-            for task in all_tasks:
-                if task.status == TaskStatus.COMPLETED:
-                    continue
-
-                # Determine urgency and importance
-                is_urgent = (
-                    task.due_date and task.due_date <= three_days if task.due_date else False
-                )
-                is_important = task.priority in [TaskPriority.HIGH, TaskPriority.CRITICAL]
-
-                task_dict = self._task_to_dict(task)
-
-                # Categorize into quadrants
-                if is_urgent and is_important:
-                    do_first.append(task_dict)
-                elif is_important and not is_urgent:
-                    schedule.append(task_dict)
-                elif is_urgent and not is_important:
-                    delegate.append(task_dict)
-                else:
-                    eliminate.append(task_dict)
-
-            matrix = {
-                "do_first": do_first,
-                "schedule": schedule,
-                "delegate": delegate,
-                "eliminate": eliminate,
-            }
-
-            stats = {
-                "do_first_count": len(do_first),
-                "schedule_count": len(schedule),
-                "delegate_count": len(delegate),
-                "eliminate_count": len(eliminate),
-                "total_active": len(do_first) + len(schedule) + len(delegate) + len(eliminate),
-            }
-
-            return {
-                "matrix": matrix,
-                "stats": stats,
-                "last_updated": now.isoformat(),
-            }
-
+            return self._cached(user_id, "matrix", lambda: self._build_priority_matrix(user_id))
         except Exception as e:
             logger.error(f"Failed to generate priority matrix: {e}")
             raise
@@ -235,88 +224,11 @@ class SecretaryService:
             Briefing data with stats, upcoming tasks, completed tasks, and alerts
         """
         try:
-            # Get all tasks
-            all_tasks = self.task_repo.list_tasks().items
-
-            # Filter by user if provided
-            if user_id:
-                all_tasks = [
-                    t for t in all_tasks if hasattr(t, "assignee") and t.assignee == user_id
-                ]
-
-            # Get current time
-            now = datetime.now(UTC)
-            today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            today_end = today_start + timedelta(days=1)
-            tomorrow_end = today_end + timedelta(days=1)
-
-            # Get today's completed tasks
-            completed_today = []
-            for task in all_tasks:
-                if task.status == TaskStatus.COMPLETED and task.updated_at:
-                    if today_start <= task.updated_at <= today_end:
-                        completed_today.append(self._task_to_dict(task))
-
-            # Get upcoming tasks (today and tomorrow)
-            upcoming_tasks = []
-            for task in all_tasks:
-                if task.status != TaskStatus.COMPLETED and task.due_date:
-                    if today_start <= task.due_date <= tomorrow_end:
-                        upcoming_tasks.append(self._task_to_dict(task))
-
-            # Sort upcoming tasks by due date and priority
-            upcoming_tasks.sort(key=lambda x: (x.get("due_date", ""), x.get("priority", "")))
-
-            # Generate alerts
-            alerts = []
-            overdue_tasks = [
-                t
-                for t in all_tasks
-                if t.due_date and t.due_date < now and t.status != TaskStatus.COMPLETED
-            ]
-
-            if overdue_tasks:
-                alerts.append(
-                    {
-                        "type": "overdue",
-                        "severity": "high",
-                        "message": f"You have {len(overdue_tasks)} overdue task(s)",
-                        "count": len(overdue_tasks),
-                    }
-                )
-
-            urgent_today = [t for t in upcoming_tasks if t.get("priority") in ["high", "critical"]]
-
-            if urgent_today:
-                alerts.append(
-                    {
-                        "type": "urgent",
-                        "severity": "medium",
-                        "message": f"You have {len(urgent_today)} high-priority task(s) due soon",
-                        "count": len(urgent_today),
-                    }
-                )
-
-            # Calculate statistics
-            stats = {
-                "total_tasks": len(all_tasks),
-                "completed_today": len(completed_today),
-                "upcoming_today": len(
-                    [t for t in upcoming_tasks if t.get("due_date", "") < today_end.isoformat()]
-                ),
-                "urgent_tasks": len(urgent_today),
-                "overdue_tasks": len(overdue_tasks),
-            }
-
-            return {
-                "time_of_day": time_of_day,
-                "stats": stats,
-                "upcoming_tasks": upcoming_tasks[:10],  # Limit to 10 tasks
-                "completed_today": completed_today,
-                "alerts": alerts,
-                "last_updated": now.isoformat(),
-            }
-
+            return self._cached(
+                user_id,
+                f"briefing:{time_of_day}",
+                lambda: self._build_daily_briefing(user_id, time_of_day),
+            )
         except Exception as e:
             logger.error(f"Failed to generate daily briefing: {e}")
             raise
@@ -332,62 +244,241 @@ class SecretaryService:
             List of priority change suggestions
         """
         try:
-            # Get all active tasks
-            all_tasks = self.task_repo.list_tasks().items
+            return self._cached(
+                user_id, "suggestions", lambda: self._build_priority_suggestions(user_id)
+            )
+        except Exception as e:
+            logger.error(f"Failed to generate priority suggestions: {e}")
+            raise
+
+    # ========================================================================
+    # Views
+    # ========================================================================
+
+    def _build_dashboard(self, user_id: str | None) -> dict[str, Any]:
+        now = datetime.now(UTC)
+        params = self._params(
+            user_id,
+            now=_julian_day(now),
+            urgent_until=_julian_day(now + timedelta(days=2)),
+            week_end=_julian_day(now + timedelta(days=7)),
+        )
+
+        categories: dict[str, list[dict[str, Any]]] = {
+            "main_priority": [],
+            "urgent_tasks": [],
+            "important_tasks": [],
+            "this_week": [],
+        }
+        upcoming_deadlines = []
+        for row in self._read(DASHBOARD_TASKS_SQL, user_id, params):
+            task = self._row_to_task(row)
+            categories[row["category"]].append(self._task_to_dict(task))
+
+            days_until_due = row["days_until_due"]
+            if days_until_due is not None and 0 <= days_until_due <= 7:
+                upcoming_deadlines.append(
+                    {
+                        "task_id": task.task_id,
+                        "title": task.title,
+                        "due_date": self._ensure_timezone_aware(task.due_date).isoformat(),
+                        "priority": task.priority
+                        if isinstance(task.priority, str)
+                        else task.priority.value,
+                        "days_until_due": math.floor(days_until_due),
+                    }
+                )
+
+        counts = self._read(TASK_COUNTS_SQL, user_id, params)[0]
+        stats = {
+            "total_tasks": counts["total_tasks"],
+            "active_tasks": counts["total_tasks"] - counts["completed_tasks"],
+            "completed_tasks": counts["completed_tasks"],
+            "overdue_tasks": counts["overdue_tasks"],
+            "main_priority_count": len(categories["main_priority"]),
+            "urgent_count": len(categories["urgent_tasks"]),
+            "important_count": len(categories["important_tasks"]),
+        }
+
+        return {
+            "categories": categories,
+            "stats": stats,
+            "upcoming_deadlines": upcoming_deadlines,  # Already in due date order
+            "last_updated": now.isoformat(),
+        }
+
+    def _build_priority_matrix(self, user_id: str | None) -> dict[str, Any]:
+        now = datetime.now(UTC)
+        params = self._params(user_id, urgent_until=_julian_day(now + timedelta(days=3)))
 
-            # Filter by user if provided
-            if user_id:
-                all_tasks = [
-                    t for t in all_tasks if hasattr(t, "assignee") and t.assignee == user_id
-                ]
+        matrix: dict[str, list[dict[str, Any]]] = {
+            "do_first": [],  # Urgent + Important
+            "schedule": [],  # Important, Not Urgent
+            "delegate": [],  # Urgent, Not Important
+            "eliminate": [],  # Neither Urgent nor Important
+        }
+        for row in self._read(MATRIX_TASKS_SQL, user_id, params):
+            matrix[row["quadrant"]].append(self._task_to_dict(self._row_to_task(row)))
+
+        stats = {f"{quadrant}_count": len(tasks) for quadrant, tasks in matrix.items()}
+        stats["total_active"] = sum(len(tasks) for tasks in matrix.values())
+
+        return {
+            "matrix": matrix,
+            "stats": stats,
+            "last_updated": now.isoformat(),
+        }
+
+    def _build_daily_briefing(self, user_id: str | None, time_of_day: str) -> dict[str, Any]:
+        now = datetime.now(UTC)
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        today_end = today_start + timedelta(days=1)
+        params = self._params(
+            user_id,
+            now=_julian_day(now),
+            today_start=_julian_day(today_start),
+            today_end=_julian_day(today_end),
+            tomorrow_end=_julian_day(today_end + timedelta(days=1)),
+            limit=10,
+        )
+
+        completed_today = [
+            self._task_to_dict(self._row_to_task(row))
+            for row in self._read(COMPLETED_TODAY_SQL, user_id, params)
+        ]
+        # Due today and tomorrow, by due date and priority
+        upcoming_tasks = [
+            self._task_to_dict(self._row_to_task(row))
+            for row in self._read(UPCOMING_TASKS_SQL, user_id, params)
+        ]
+        counts = {
+            **self._read(TASK_COUNTS_SQL, user_id, params)[0],
+            **self._read(DUE_SOON_COUNTS_SQL, user_id, params)[0],
+        }
 
-            suggestions = []
-            now = datetime.now(UTC)
-            two_days = now + timedelta(days=2)
+        # Generate alerts
+        alerts = []
+        if counts["overdue_tasks"]:
+            alerts.append(
+                {
+                    "type": "overdue",
+                    "severity": "high",
+                    "message": f"You have {counts['overdue_tasks']} overdue task(s)",
+                    "count": counts["overdue_tasks"],
+                }
+            )
+        if counts["urgent_tasks"]:
+            alerts.append(
+                {
+                    "type": "urgent",
+                    "severity": "medium",
+                    "message": f"You have {counts['urgent_tasks']} high-priority task(s) due soon",
+                    "count": counts["urgent_tasks"],
+                }
+            )
 
-            for task in all_tasks:
-                if task.status == TaskStatus.COMPLETED:
-                    continue
+        stats = {
+            "total_tasks": counts["total_tasks"],
+            "completed_today": len(completed_today),
+            "upcoming_today": counts["upcoming_today"],
+            "urgent_tasks": counts["urgent_tasks"],
+            "overdue_tasks": counts["overdue_tasks"],
+        }
 
+        return {
+            "time_of_day": time_of_day,
+            "stats": stats,
+            "upcoming_tasks": upcoming_tasks,
+            "completed_today": completed_today,
+            "alerts": alerts,
+            "last_updated": now.isoformat(),
+        }
+
+    def _build_priority_suggestions(self, user_id: str | None) -> list[dict[str, Any]]:
+        now = datetime.now(UTC)
+        params = self._params(
+            user_id,
+            now=_julian_day(now),
+            urgent_until=_julian_day(now + timedelta(days=2)),
+            limit=10,  # Top 10 suggestions
+        )
+
+        suggestions = []
+        for row in self._read(SUGGESTION_TASKS_SQL, user_id, params):
+            if row["days_until_due"] is not None:
                 # Suggest priority increase for tasks due soon with low priority
-                if task.due_date and task.due_date <= two_days:
-                    if task.priority in [TaskPriority.LOW, TaskPriority.MEDIUM]:
-                        suggestions.append(
-                            {
-                                "task_id": task.task_id,
-                                "title": task.title,
-                                "current_priority": task.priority
-                                if isinstance(task.priority, str)
-                                else task.priority.value,
-                                "suggested_priority": TaskPriority.HIGH.value,
-                                "reason": f"Task is due in {(task.due_date - now).days} day(s)",
-                                "confidence": 0.85,
-                            }
-                        )
-
-                # Suggest priority decrease for low-importance tasks with no deadline
-                if not task.due_date and task.priority == TaskPriority.HIGH:
-                    suggestions.append(
-                        {
-                            "task_id": task.task_id,
-                            "title": task.title,
-                            "current_priority": task.priority
-                            if isinstance(task.priority, str)
-                            else task.priority.value,
-                            "suggested_priority": TaskPriority.MEDIUM.value,
-                            "reason": "High priority task with no deadline set",
-                            "confidence": 0.70,
-                        }
-                    )
-
-            # Sort by confidence
-            suggestions.sort(key=lambda x: x["confidence"], reverse=True)
-
-            return suggestions[:10]  # Limit to top 10 suggestions
+                suggestions.append(
+                    {
+                        "task_id": row["task_id"],
+                        "title": row["title"],
+                        "current_priority": row["priority"],
+                        "suggested_priority": TaskPriority.HIGH.value,
+                        "reason": f"Task is due in {math.floor(row['days_until_due'])} day(s)",
+                        "confidence": 0.85,
+                    }
+                )
+            else:
+                # Suggest priority decrease for high priority tasks with no deadline
+                suggestions.append(
+                    {
+                        "task_id": row["task_id"],
+                        "title": row["title"],
+                        "current_priority": row["priority"],
+                        "suggested_priority": TaskPriority.MEDIUM.value,
+                        "reason": "High priority task with no deadline set",
+                        "confidence": 0.70,
+                    }
+                )
 
-        except Exception as e:
-            logger.error(f"Failed to generate priority suggestions: {e}")
-            raise
+        # Rows are ordered by confidence: due tasks come first
+        return suggestions
+
+    # ========================================================================
+    # Queries and caching
+    # ========================================================================
+
+    @staticmethod
+    def _params(user_id: str | None, **values: Any) -> dict[str, Any]:
+        return {"user_id": user_id, **values}
+
+    def _read(self, sql: str, user_id: str | None, params: dict[str, Any]) -> list:
+        scope = "assignee_id = :user_id" if user_id else "1 = 1"
+        return self.db.execute_read(sql.format(scope=scope), params)
+
+    def _row_to_task(self, row) -> Task:
+        return self.task_repo._dict_to_model(dict(row), Task)
+
+    def _version(self, scope: str) -> int:
+        rows = self.db.execute_read(
+            "SELECT version FROM task_change_versions WHERE scope = ?", (scope,)
+        )
+        return rows[0]["version"] if rows else 0
+
+    def _cached(self, user_id: str | None, view: str, build: Callable[[], Any]) -> Any:
+        """
+        Get a view from the cache, or build and cache it.
+
+        Cached values are shared between callers and must not be modified.
+        """
+        key = (user_id or "*", view)
+        version = self._version(key[0])
+        with self._lock:
+            cached = self._cache.get(key)
+        if (
+            cached is not None
+            and cached.version == version
+            and time.monotonic() - cached.computed_at < self.max_age_seconds
+        ):
+            return cached.value
+
+        value = build()
+        with self._lock:
+            if len(self._cache) >= self.max_cached_views:
+                self._cache.clear()
+            # Stored with the version read before building: a task changed
+            # meanwhile invalidates it on the next read
+            self._cache[key] = _CachedView(version, time.monotonic(), value)
+        return value
 
     def _task_to_dict(self, task) -> dict[str, Any]:
         """
@@ -413,3 +504,15 @@ class SecretaryService:
             "created_at": task.created_at.isoformat() if task.created_at else None,
             "updated_at": task.updated_at.isoformat() if task.updated_at else None,
         }
+
+
+# Singleton instance
+_secretary_service: SecretaryService | None = None
+
+
+def get_secretary_service() -> SecretaryService:
+    """Get or create the secretary service"""
+    global _secretary_service
+    if _secretary_service is None:
+        _secretary_service = SecretaryService()
+    return _secretary_service
@@ -27,6 +27,7 @@ from src.repositories.task_repository import (
     TaskDependencyRepository,
     TaskTemplateRepository,
 )
+from src.services.achievement_engine import AchievementEngine
 
 # Alias for compatibility with existing service code
 TaskRepository = EnhancedTaskRepository
@@ -116,12 +117,13 @@ class TaskPrioritizationResult:
 class TaskService:
     """Service layer for task management operations"""
 
-    def __init__(self, db=None):
+    def __init__(self, db=None, achievements: AchievementEngine | None = None):
         """
         Initialize service with repositories
 
         Args:
             db: Optional database adapter for testing
+            achievements: Optional achievement engine notified of task completions
         """
         from src.database.enhanced_adapter import EnhancedDatabaseAdapter
 
@@ -137,6 +139,7 @@ class TaskService:
         self.template_repo = TaskTemplateRepository(db_path)
         self.dependency_repo = TaskDependencyRepository(db_path)
         self.comment_repo = TaskCommentRepository(db_path)
+        self.achievements = achievements
 
     def get_db(self):
         """Get database adapter from repository"""
@@ -205,6 +208,7 @@ class TaskService:
         task = self.task_repo.get_by_id(task_id)
         if not task:
             raise TaskServiceError(f"Task not found: {task_id}")
+        was_completed = task.status == TaskStatus.COMPLETED
 
         # Apply updates
         if update_data.title is not None:
@@ -233,7 +237,17 @@ class TaskService:
 
         task.updated_at = datetime.utcnow()
 
-        return self.task_repo.update(task)
+        updated = self.task_repo.update(task)
+        if (
+            self.achievements is not None
+            and task.status == TaskStatus.COMPLETED
+            and not was_completed
+            and task.assignee_id
+        ):
+            self.achievements.record(
+                task.assignee_id, "task_completed", occurred_at=task.completed_at
+            )
+        return updated
 
     def delete_task(self, task_id: str, force: bool = False) -> bool:
         """Delete a task"""
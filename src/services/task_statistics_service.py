@@ -2,20 +2,155 @@
 
 Calculates task completion statistics and productivity scores
 for users based on their task history.
+
+Statistics are read from rollup tables (migration 030) that SQLite triggers keep
+current as rows in ``tasks`` and ``focus_sessions`` change, so a lookup reads one
+summary row instead of rescanning the user's history.
+"""
+
+import logging
+import math
+import sqlite3
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+
+from src.database.enhanced_adapter import EnhancedDatabaseAdapter, get_enhanced_database
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "database"
+    / "migrations"
+    / "030_create_user_stats_rollups.sql"
+)
+
+# focus_sessions (duration, completed) column names in the adapter and migration 028 schemas
+FOCUS_COLUMN_VARIANTS = [
+    ("actual_duration_minutes", "was_completed"),
+    ("duration_minutes", "completed"),
+]
+
+FOCUS_TRIGGERS_SQL = """
+CREATE TRIGGER IF NOT EXISTS trg_focus_stats_insert
+AFTER INSERT ON focus_sessions
+WHEN NEW.{done} = 1
+BEGIN
+    INSERT INTO user_daily_stats (user_id, day, focus_minutes, focus_sessions)
+    VALUES (NEW.user_id, date(COALESCE(NEW.started_at, CURRENT_TIMESTAMP)),
+            COALESCE(NEW.{minutes}, 0), 1)
+    ON CONFLICT(user_id, day) DO UPDATE SET
+        focus_minutes = focus_minutes + excluded.focus_minutes,
+        focus_sessions = focus_sessions + 1;
+
+    INSERT INTO user_stats_summary (user_id, focus_minutes, focus_sessions)
+    VALUES (NEW.user_id, COALESCE(NEW.{minutes}, 0), 1)
+    ON CONFLICT(user_id) DO UPDATE SET
+        focus_minutes = focus_minutes + excluded.focus_minutes,
+        focus_sessions = focus_sessions + 1,
+        updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_focus_stats_delete
+AFTER DELETE ON focus_sessions
+WHEN OLD.{done} = 1
+BEGIN
+    UPDATE user_daily_stats SET
+        focus_minutes = focus_minutes - COALESCE(OLD.{minutes}, 0),
+        focus_sessions = focus_sessions - 1
+    WHERE user_id = OLD.user_id AND day = date(COALESCE(OLD.started_at, CURRENT_TIMESTAMP));
+
+    UPDATE user_stats_summary SET
+        focus_minutes = focus_minutes - COALESCE(OLD.{minutes}, 0),
+        focus_sessions = focus_sessions - 1,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE user_id = OLD.user_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_focus_stats_update
+AFTER UPDATE OF user_id, started_at, {minutes}, {done} ON focus_sessions
+WHEN OLD.{done} = 1 OR NEW.{done} = 1
+BEGIN
+    UPDATE user_daily_stats SET
+        focus_minutes = focus_minutes - COALESCE(OLD.{minutes}, 0),
+        focus_sessions = focus_sessions - 1
+    WHERE OLD.{done} = 1
+        AND user_id = OLD.user_id
+        AND day = date(COALESCE(OLD.started_at, CURRENT_TIMESTAMP));
+
+    UPDATE user_stats_summary SET
+        focus_minutes = focus_minutes - COALESCE(OLD.{minutes}, 0),
+        focus_sessions = focus_sessions - 1
+    WHERE OLD.{done} = 1 AND user_id = OLD.user_id;
+
+    INSERT INTO user_daily_stats (user_id, day, focus_minutes, focus_sessions)
+    SELECT NEW.user_id, date(COALESCE(NEW.started_at, CURRENT_TIMESTAMP)),
+           COALESCE(NEW.{minutes}, 0), 1
+    WHERE NEW.{done} = 1
+    ON CONFLICT(user_id, day) DO UPDATE SET
+        focus_minutes = focus_minutes + excluded.focus_minutes,
+        focus_sessions = focus_sessions + 1;
+
+    INSERT INTO user_stats_summary (user_id, focus_minutes, focus_sessions)
+    SELECT NEW.user_id, COALESCE(NEW.{minutes}, 0), 1
+    WHERE NEW.{done} = 1
+    ON CONFLICT(user_id) DO UPDATE SET
+        focus_minutes = focus_minutes + excluded.focus_minutes,
+        focus_sessions = focus_sessions + 1,
+        updated_at = CURRENT_TIMESTAMP;
+END;
 """
 
-from datetime import datetime, timedelta
+# Same completion-time and completion-day rules as the task triggers
+TASK_MINUTES_SQL = """COALESCE(
+    NULLIF(actual_hours, 0) * 60,
+    MAX((julianday(completed_at) - julianday(started_at)) * 1440, 0),
+    0
+)"""
+TASK_COMPLETED_DAY_SQL = "date(COALESCE(completed_at, updated_at, CURRENT_TIMESTAMP))"
 
 
 class StatisticsService:
     """Service for calculating task statistics and productivity metrics."""
 
-    def __init__(self):
-        """Initialize the statistics service with in-memory storage."""
-        # In-memory storage for demo purposes
-        # In production, this would query a database
-        self._tasks: dict[str, list[dict]] = {}
-        self._completions: dict[str, list[dict]] = {}
+    def __init__(self, db: EnhancedDatabaseAdapter | None = None):
+        """
+        Initialize the statistics service.
+
+        Installs the rollup tables and triggers if needed. The first time they
+        are installed on a database, rollups are backfilled from existing rows.
+
+        Args:
+            db: Database adapter (defaults to the shared enhanced database)
+        """
+        self.db = db or get_enhanced_database()
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        """Create rollup tables and triggers, backfilling on first install"""
+        conn = self.db.get_connection()
+        installed = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'user_stats_summary'"
+        ).fetchone()
+
+        conn.executescript(MIGRATION_PATH.read_text())
+        focus_columns = self.focus_columns(conn)
+        if focus_columns:
+            minutes, done = focus_columns
+            conn.executescript(FOCUS_TRIGGERS_SQL.format(minutes=minutes, done=done))
+        conn.commit()
+
+        if not installed:
+            self.rebuild()
+
+    @staticmethod
+    def focus_columns(conn: sqlite3.Connection) -> tuple[str, str] | None:
+        """Get the focus_sessions (duration, completed) columns, or None if untracked"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(focus_sessions)")}
+        for minutes, done in FOCUS_COLUMN_VARIANTS:
+            if {"user_id", "started_at", minutes, done} <= columns:
+                return minutes, done
+        return None
 
     async def get_user_statistics(self, user_id: str) -> dict:
         """
@@ -32,6 +167,8 @@ class StatisticsService:
             - avg_completion_time_minutes: Average time to complete tasks
             - productivity_score: Overall productivity score (0-100)
             - streak_days: Current consecutive days with completions
+            - total_focus_minutes: Minutes spent in completed focus sessions
+            - focus_sessions_completed: Number of completed focus sessions
 
         Raises:
             ValueError: If user_id is invalid
@@ -39,26 +176,26 @@ class StatisticsService:
         if not user_id or not isinstance(user_id, str):
             raise ValueError("Invalid user_id")
 
-        tasks = self._tasks.get(user_id, [])
-        completions = self._completions.get(user_id, [])
-
-        total_tasks = len(tasks)
-        completed_tasks = len(completions)
+        summary = self._get_summary(user_id)
+        total_tasks = summary["total_tasks"] if summary else 0
+        completed_tasks = summary["completed_tasks"] if summary else 0
 
         # Calculate completion rate
         completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0.0
+        completion_rate = min(completion_rate, 100.0)
 
         # Calculate average completion time
         avg_completion_time = 0.0
-        if completions:
-            total_minutes = sum(c.get("completion_time_minutes", 0) for c in completions)
-            avg_completion_time = total_minutes / len(completions)
+        if completed_tasks:
+            avg_completion_time = max(summary["completion_minutes"], 0.0) / completed_tasks
 
-        # Calculate streak
-        streak_days = self._calculate_streak(completions)
+        # Streak counts only if it reaches today
+        streak_days = 0
+        if summary and summary["last_completion_day"] == self._today().isoformat():
+            streak_days = summary["current_streak"]
 
         # Calculate productivity score
-        productivity_score = self._calculate_productivity_score(
+        productivity_score = self.calculate_productivity_score(
             completion_rate=completion_rate,
             avg_completion_time=avg_completion_time,
             streak_days=streak_days,
@@ -73,6 +210,8 @@ class StatisticsService:
             "avg_completion_time_minutes": round(avg_completion_time, 2),
             "productivity_score": round(productivity_score, 2),
             "streak_days": streak_days,
+            "total_focus_minutes": summary["focus_minutes"] if summary else 0,
+            "focus_sessions_completed": summary["focus_sessions"] if summary else 0,
         }
 
     async def get_productivity_score(self, user_id: str) -> float:
@@ -100,45 +239,177 @@ class StatisticsService:
         stats = await self.get_user_statistics(user_id)
         return stats["productivity_score"]
 
-    def _calculate_streak(self, completions: list[dict]) -> int:
+    def get_daily_stats(self, user_id: str, start: date, end: date) -> list[dict]:
         """
-        Calculate current consecutive days with task completions.
+        Get a user's per-day rollups for an inclusive date range.
 
         Args:
-            completions: List of completion records with timestamps
+            user_id: The unique identifier for the user
+            start: First day (UTC)
+            end: Last day (UTC)
 
         Returns:
-            Number of consecutive days with completions
+            One dict per day with activity, oldest first
         """
-        if not completions:
-            return 0
-
-        # Sort completions by timestamp (most recent first)
-        sorted_completions = sorted(
-            completions,
-            key=lambda x: x.get("completed_at", datetime.min),
-            reverse=True,
+        rows = self.db.execute_read(
+            """
+            SELECT day, tasks_created, tasks_completed, completion_minutes,
+                   focus_minutes, focus_sessions
+            FROM user_daily_stats
+            WHERE user_id = ? AND day BETWEEN ? AND ?
+            ORDER BY day
+            """,
+            (user_id, start.isoformat(), end.isoformat()),
         )
+        return [dict(row) for row in rows]
+
+    def _get_summary(self, user_id: str) -> sqlite3.Row | None:
+        """Read the user's summary row, recounting the streak first if it is stale"""
+        rows = self.db.execute_read(
+            "SELECT * FROM user_stats_summary WHERE user_id = ?", (user_id,)
+        )
+        if not rows:
+            return None
+        if rows[0]["streak_dirty"]:
+            self._recount_streak(user_id)
+            rows = self.db.execute_read(
+                "SELECT * FROM user_stats_summary WHERE user_id = ?", (user_id,)
+            )
+        return rows[0]
+
+    def _recount_streak(self, user_id: str) -> None:
+        """
+        Recount the streak after a late or removed completion.
 
+        Walks completion days newest first and stops at the first gap, so the
+        cost is bounded by the streak length rather than the user's history.
+        """
+        cursor = self.db.get_connection().execute(
+            """
+            SELECT day FROM user_daily_stats
+            WHERE user_id = ? AND tasks_completed > 0
+            ORDER BY day DESC
+            """,
+            (user_id,),
+        )
+        last_day = None
         streak = 0
-        current_date = datetime.now().date()
-
-        # Track unique days with completions
-        completion_days = set()
-        for completion in sorted_completions:
-            completed_at = completion.get("completed_at")
-            if completed_at:
-                completion_days.add(completed_at.date())
-
-        # Calculate streak from today backwards
-        check_date = current_date
-        while check_date in completion_days:
+        expected = None
+        for (day,) in cursor:
+            current = date.fromisoformat(day)
+            if last_day is None:
+                last_day = current
+            elif current != expected:
+                break
             streak += 1
-            check_date -= timedelta(days=1)
+            expected = current - timedelta(days=1)
+        cursor.close()
+
+        self.db.execute_write(
+            """
+            UPDATE user_stats_summary
+            SET current_streak = ?, last_completion_day = ?, streak_dirty = 0
+            WHERE user_id = ?
+            """,
+            (streak, last_day.isoformat() if last_day else None, user_id),
+        )
 
-        return streak
+    def rebuild(self, user_id: str | None = None) -> int:
+        """
+        Recompute rollups from the tasks and focus_sessions tables.
+
+        Used to backfill existing data and to repair rollups after bulk changes
+        made with the triggers disabled. Safe to run at any time.
+
+        Args:
+            user_id: Rebuild only this user (default: every user)
 
-    def _calculate_productivity_score(
+        Returns:
+            Number of users with rebuilt summaries
+        """
+        conn = self.db.get_connection()
+        task_filter = "assignee_id IS NOT NULL" + (" AND assignee_id = ?" if user_id else "")
+        user_filter = "user_id = ?" if user_id else "1 = 1"
+        params = (user_id,) if user_id else ()
+        focus_columns = self.focus_columns(conn)
+
+        with conn:
+            if user_id:
+                conn.execute("DELETE FROM user_daily_stats WHERE user_id = ?", params)
+                conn.execute("DELETE FROM user_stats_summary WHERE user_id = ?", params)
+            else:
+                conn.execute("DELETE FROM user_daily_stats")
+                conn.execute("DELETE FROM user_stats_summary")
+
+            conn.execute(
+                f"""
+                INSERT INTO user_daily_stats (user_id, day, tasks_created)
+                SELECT assignee_id, date(COALESCE(created_at, CURRENT_TIMESTAMP)), COUNT(*)
+                FROM tasks WHERE {task_filter}
+                GROUP BY 1, 2
+                """,
+                params,
+            )
+            conn.execute(
+                f"""
+                INSERT INTO user_daily_stats (user_id, day, tasks_completed, completion_minutes)
+                SELECT assignee_id, {TASK_COMPLETED_DAY_SQL}, COUNT(*), SUM({TASK_MINUTES_SQL})
+                FROM tasks WHERE {task_filter} AND status = 'completed'
+                GROUP BY 1, 2
+                ON CONFLICT(user_id, day) DO UPDATE SET
+                    tasks_completed = excluded.tasks_completed,
+                    completion_minutes = excluded.completion_minutes
+                """,
+                params,
+            )
+            if focus_columns:
+                minutes, done = focus_columns
+                conn.execute(
+                    f"""
+                    INSERT INTO user_daily_stats (user_id, day, focus_minutes, focus_sessions)
+                    SELECT user_id, date(COALESCE(started_at, CURRENT_TIMESTAMP)),
+                           SUM(COALESCE({minutes}, 0)), COUNT(*)
+                    FROM focus_sessions WHERE {user_filter} AND {done} = 1
+                    GROUP BY 1, 2
+                    ON CONFLICT(user_id, day) DO UPDATE SET
+                        focus_minutes = excluded.focus_minutes,
+                        focus_sessions = excluded.focus_sessions
+                    """,
+                    params,
+                )
+            conn.execute(
+                f"""
+                INSERT INTO user_stats_summary (
+                    user_id, total_tasks, completed_tasks, completion_minutes,
+                    focus_minutes, focus_sessions, last_completion_day, streak_dirty
+                )
+                SELECT user_id, SUM(tasks_created), SUM(tasks_completed),
+                       SUM(completion_minutes), SUM(focus_minutes), SUM(focus_sessions),
+                       MAX(CASE WHEN tasks_completed > 0 THEN day END), 1
+                FROM user_daily_stats WHERE {user_filter}
+                GROUP BY user_id
+                """,
+                params,
+            )
+
+        users = [
+            row["user_id"]
+            for row in self.db.execute_read(
+                f"SELECT user_id FROM user_stats_summary WHERE {user_filter}", params
+            )
+        ]
+        for uid in users:
+            self._recount_streak(uid)
+
+        logger.info(f"Rebuilt statistics rollups for {len(users)} users")
+        return len(users)
+
+    @staticmethod
+    def _today() -> date:
+        """Current UTC day, matching the day boundaries of the rollups"""
+        return datetime.now(UTC).date()
+
+    def calculate_productivity_score(
         self,
         completion_rate: float,
         avg_completion_time: float,
@@ -183,8 +454,6 @@ class StatisticsService:
         # Component 4: Volume (10% weight)
         # Logarithmic scaling: 1 task = 1 point, 100 tasks = 10 points
         if total_completed > 0:
-            import math
-
             volume_score = min(math.log10(total_completed + 1) * 5, 10.0)
         else:
             volume_score = 0.0
@@ -193,20 +462,14 @@ class StatisticsService:
 
         return min(max(total_score, 0.0), 100.0)
 
-    # Test helper methods (would be injected via dependency injection in production)
-    def _add_task(self, user_id: str, task: dict):
-        """Add a task for testing purposes."""
-        if user_id not in self._tasks:
-            self._tasks[user_id] = []
-        self._tasks[user_id].append(task)
-
-    def _add_completion(self, user_id: str, completion: dict):
-        """Add a completion for testing purposes."""
-        if user_id not in self._completions:
-            self._completions[user_id] = []
-        self._completions[user_id].append(completion)
-
-    def _clear_data(self):
-        """Clear all data for testing purposes."""
-        self._tasks.clear()
-        self._completions.clear()
+
+# Global service instance
+_statistics_service: StatisticsService | None = None
+
+
+def get_statistics_service() -> StatisticsService:
+    """Get the shared statistics service (FastAPI dependency)"""
+    global _statistics_service
+    if _statistics_service is None:
+        _statistics_service = StatisticsService()
+    return _statistics_service
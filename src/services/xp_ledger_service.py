@@ -0,0 +1,351 @@
+"""
+XP ledger: the single API for awarding XP.
+
+Every award is appended to ``xp_ledger`` (migration 035) and the user's
+``user_progress`` balance and level are changed by one upsert that adds the
+amount and looks the new level up in ``xp_level_thresholds``, so concurrent
+awards cannot overwrite each other.
+
+Small, frequent awards (micro-step completions) can be queued instead: queued
+awards are applied in one transaction, with one balance upsert per user, once
+enough are pending or, from a timer, once the oldest has waited
+flush_interval_seconds. Awards with a reference_id are idempotent per user and
+source.
+"""
+
+import logging
+import threading
+import time
+import weakref
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from src.core.progression import XP_LEVELS
+from src.database.enhanced_adapter import EnhancedDatabaseAdapter, get_enhanced_database
+from src.services.achievement_engine import AchievementEngine, get_achievement_engine
+from src.services.leaderboard_service import LeaderboardService, get_leaderboard_service
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_PATH = (
+    Path(__file__).resolve().parents[1] / "database" / "migrations" / "035_create_xp_ledger.sql"
+)
+
+INSERT_ENTRY_SQL = """
+    INSERT INTO xp_ledger (user_id, amount, source, reference_id, reason, awarded_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(user_id, source, reference_id) WHERE reference_id IS NOT NULL DO NOTHING
+"""
+
+# Adds to the balance and recomputes the level from the thresholds index, atomically
+UPSERT_BALANCE_SQL = """
+    INSERT INTO user_progress (user_id, total_xp, current_level)
+    VALUES (
+        ?1, ?2,
+        (SELECT level FROM xp_level_thresholds WHERE min_xp <= ?2 ORDER BY min_xp DESC LIMIT 1)
+    )
+    ON CONFLICT(user_id) DO UPDATE SET
+        total_xp = user_progress.total_xp + excluded.total_xp,
+        current_level = (
+            SELECT level FROM xp_level_thresholds
+            WHERE min_xp <= user_progress.total_xp + excluded.total_xp
+            ORDER BY min_xp DESC LIMIT 1
+        ),
+        updated_at = CURRENT_TIMESTAMP
+    RETURNING total_xp, current_level
+"""
+
+
+@dataclass
+class XPAward:
+    """Result of applying awards to one user's balance"""
+
+    user_id: str
+    amount: int  # XP added; 0 if every award was a duplicate
+    total_xp: int
+    level: int
+    previous_level: int
+
+    @property
+    def leveled_up(self) -> bool:
+        return self.level > self.previous_level
+
+
+@dataclass
+class _Entry:
+    user_id: str
+    amount: int
+    source: str
+    reference_id: str | None
+    reason: str | None
+    awarded_at: str
+
+
+class XPLedgerService:
+    """Append-only XP ledger with atomic balance updates."""
+
+    def __init__(
+        self,
+        db: EnhancedDatabaseAdapter,
+        leaderboard: LeaderboardService | None = None,
+        achievements: AchievementEngine | None = None,
+        batch_size: int = 50,
+        flush_interval_seconds: float = 2.0,
+    ):
+        """
+        Initialize the ledger.
+
+        Args:
+            db: Database adapter
+            leaderboard: Leaderboard credited with applied XP
+            achievements: Achievement engine notified of applied XP
+            batch_size: Queued awards that trigger a flush
+            flush_interval_seconds: Age of the oldest queued award that triggers a flush
+        """
+        self.db = db
+        self.leaderboard = leaderboard
+        self.achievements = achievements
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+
+        self._lock = threading.RLock()
+        self._queue: list[_Entry] = []
+        self._queued_since: float | None = None
+        self._flush_timer: threading.Timer | None = None
+
+        conn = self.db.get_connection()
+        conn.executescript(MIGRATION_PATH.read_text())
+        conn.executemany(
+            "INSERT OR IGNORE INTO xp_level_thresholds (level, min_xp) VALUES (?, ?)",
+            [(level, min_xp) for level, min_xp in enumerate(XP_LEVELS.thresholds, start=1)],
+        )
+        conn.commit()
+
+    # ========================================================================
+    # Awards
+    # ========================================================================
+
+    def award(
+        self,
+        user_id: str,
+        amount: int,
+        source: str,
+        reference_id: str | None = None,
+        reason: str | None = None,
+        awarded_at: datetime | None = None,
+    ) -> XPAward:
+        """
+        Award XP now, together with any queued awards.
+
+        Args:
+            user_id: User earning the XP
+            amount: XP to add (positive)
+            source: What earned it (task, pomodoro, ...)
+            reference_id: Awarded entity; a repeated award for it is ignored
+            reason: Free-text description
+            awarded_at: When it was earned (defaults to now)
+
+        Returns:
+            The user's balance after the award
+        """
+        entry = self._entry(user_id, amount, source, reference_id, reason, awarded_at)
+        with self._lock:
+            results = self._apply_queue(entry)
+        return results.get(user_id) or self._unchanged(user_id)
+
+    def queue(
+        self,
+        user_id: str,
+        amount: int,
+        source: str,
+        reference_id: str | None = None,
+        reason: str | None = None,
+        awarded_at: datetime | None = None,
+    ) -> None:
+        """Queue an award to be applied with the next batch (see award for arguments)"""
+        entry = self._entry(user_id, amount, source, reference_id, reason, awarded_at)
+        with self._lock:
+            self._queue.append(entry)
+            if self._queued_since is None:
+                self._queued_since = time.monotonic()
+                self._start_flush_timer()
+            due = len(self._queue) >= self.batch_size or (
+                time.monotonic() - self._queued_since >= self.flush_interval_seconds
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> list[XPAward]:
+        """
+        Apply queued awards.
+
+        Returns:
+            One result per user whose balance changed
+        """
+        with self._lock:
+            return list(self._apply_queue().values()) if self._queue else []
+
+    def _apply_queue(self, *entries: _Entry) -> dict[str, XPAward]:
+        """
+        Apply the queued awards and entries together; the caller holds the lock.
+
+        If the transaction fails, the queued awards are put back at the front of the
+        queue, to be retried by the next flush.
+        """
+        queued, queued_since = self._queue, self._queued_since
+        self._queue, self._queued_since = [], None
+        self._cancel_flush_timer()
+        try:
+            results = self._commit([*queued, *entries])
+        except Exception:
+            self._queue[:0] = queued
+            if self._queue:
+                self._queued_since = queued_since or time.monotonic()
+                self._start_flush_timer()
+            raise
+        self._publish(results)
+        return results
+
+    def _start_flush_timer(self) -> None:
+        """Apply the queue flush_interval_seconds from now, even if nothing else is queued"""
+        timer = threading.Timer(self.flush_interval_seconds, self._flush_on_timer)
+        timer.daemon = True
+        self._flush_timer = timer
+        timer.start()
+
+    def _cancel_flush_timer(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    def _flush_on_timer(self) -> None:
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Failed to apply queued XP awards: {e}")
+
+    def _entry(
+        self,
+        user_id: str,
+        amount: int,
+        source: str,
+        reference_id: str | None,
+        reason: str | None,
+        awarded_at: datetime | None,
+    ) -> _Entry:
+        if amount <= 0:
+            raise ValueError(f"XP awards must be positive, got {amount}")
+        awarded_at = (awarded_at or datetime.now(UTC)).isoformat()
+        return _Entry(user_id, int(amount), source, reference_id, reason, awarded_at)
+
+    def _commit(self, entries: list[_Entry]) -> dict[str, XPAward]:
+        """Append entries and update each user's balance once, in one transaction"""
+        deltas: dict[str, int] = defaultdict(int)
+        results = {}
+        conn = self.db.get_connection()
+        with conn:
+            for e in entries:
+                cursor = conn.execute(
+                    INSERT_ENTRY_SQL,
+                    (e.user_id, e.amount, e.source, e.reference_id, e.reason, e.awarded_at),
+                )
+                if cursor.rowcount:
+                    deltas[e.user_id] += e.amount
+            for user_id, delta in deltas.items():
+                total_xp, level = conn.execute(UPSERT_BALANCE_SQL, (user_id, delta)).fetchall()[0]
+                results[user_id] = XPAward(
+                    user_id, delta, total_xp, level, self.level_for_xp(total_xp - delta)
+                )
+        return results
+
+    def _publish(self, results: dict[str, XPAward]) -> None:
+        """Credit committed awards to the leaderboard and achievements"""
+        for result in results.values():
+            if self.leaderboard is not None:
+                self.leaderboard.add_xp(result.user_id, result.amount)
+            if self.achievements is not None:
+                self.achievements.record(result.user_id, "xp_awarded", {"amount": result.amount})
+            if result.leveled_up:
+                logger.info(f"User {result.user_id} reached level {result.level}")
+
+    def _unchanged(self, user_id: str) -> XPAward:
+        balance = self.get_balance(user_id)
+        return XPAward(user_id, 0, balance["total_xp"], balance["level"], balance["level"])
+
+    # ========================================================================
+    # Queries
+    # ========================================================================
+
+    def level_for_xp(self, total_xp: int) -> int:
+        """Level reached with a total XP"""
+        return XP_LEVELS.level_for(total_xp)
+
+    def get_balance(self, user_id: str) -> dict[str, Any]:
+        """
+        Get a user's XP balance, including queued awards.
+
+        Returns:
+            total_xp, level, pending_xp, level_floor_xp (XP at which the level
+            started) and next_level_xp (XP at which the next one starts, None
+            at the maximum level)
+        """
+        rows = self.db.execute_read(
+            "SELECT total_xp FROM user_progress WHERE user_id = ?", (user_id,)
+        )
+        with self._lock:
+            pending = sum(e.amount for e in self._queue if e.user_id == user_id)
+        total_xp = ((rows[0]["total_xp"] or 0) if rows else 0) + pending
+        level = self.level_for_xp(total_xp)
+        return {
+            "user_id": user_id,
+            "total_xp": total_xp,
+            "level": level,
+            "pending_xp": pending,
+            "level_floor_xp": XP_LEVELS.floor(level),
+            "next_level_xp": XP_LEVELS.next_threshold(level),
+        }
+
+    def history(self, user_id: str, limit: int = 50) -> list[dict[str, Any]]:
+        """Get a user's most recent ledger entries, newest first"""
+        rows = self.db.execute_read(
+            """
+            SELECT entry_id, amount, source, reference_id, reason, awarded_at
+            FROM xp_ledger WHERE user_id = ?
+            ORDER BY awarded_at DESC, entry_id DESC
+            LIMIT ?
+            """,
+            (user_id, limit),
+        )
+        return [dict(row) for row in rows]
+
+
+# One ledger per database; the shared database's ledger also feeds the
+# leaderboard and achievement engine
+_xp_ledgers: "weakref.WeakKeyDictionary[EnhancedDatabaseAdapter, XPLedgerService]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_xp_ledger(db: EnhancedDatabaseAdapter | None = None) -> XPLedgerService:
+    """Get or create the XP ledger of a database (the shared one by default)"""
+    shared = get_enhanced_database()
+    db = db or shared
+    ledger = _xp_ledgers.get(db)
+    if ledger is None:
+        if db is shared:
+            ledger = XPLedgerService(
+                db, leaderboard=get_leaderboard_service(), achievements=get_achievement_engine()
+            )
+        else:
+            ledger = XPLedgerService(db)
+        _xp_ledgers[db] = ledger
+    return ledger
+
+
+def close_xp_ledgers() -> None:
+    """Apply every ledger's queued awards"""
+    for ledger in list(_xp_ledgers.values()):
+        ledger.flush()
@@ -0,0 +1,326 @@
+"""
+Workflow Catalog - compiled, indexed view of the TOML workflow definitions.
+
+Parsing every ``workflows/**/*.toml`` file for each executor (and sending every
+workflow to the recommender LLM) does not scale with the catalog. The catalog parses
+each file once per process, indexes workflows by type, tag and domain, and reloads
+only the files whose mtime or size changed. Changes are detected by polling with
+``stat()`` at most every ``check_interval`` seconds, so lookups stay cheap without a
+file-watcher dependency.
+
+Usage:
+    catalog = get_workflow_catalog(WORKFLOWS_DIR)
+    catalog.list_workflows(workflow_type=WorkflowType.BUGFIX)
+    catalog.candidates("Fix login crash on Safari", limit=3)
+"""
+
+import logging
+import re
+import threading
+import time
+import tomllib
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.workflows.models import Workflow, WorkflowType
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKFLOWS_DIR = Path(__file__).resolve().parents[2] / "workflows"
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Relevance weights for matching task text against a workflow
+TAG_WEIGHT = 3.0
+TYPE_WEIGHT = 2.0
+TEXT_WEIGHT = 1.0
+
+
+def _words(text: str) -> set[str]:
+    return set(_WORD.findall(text.lower()))
+
+
+@dataclass(frozen=True)
+class WorkflowTerms:
+    """Pre-tokenized words a task is matched against."""
+
+    tags: frozenset[str]
+    kind: frozenset[str]
+    text: frozenset[str]
+
+    @classmethod
+    def of(cls, workflow: Workflow) -> "WorkflowTerms":
+        return cls(
+            tags=frozenset(_words(" ".join(workflow.tags))),
+            kind=frozenset(_words(f"{workflow.workflow_type} {workflow.domain}")),
+            text=frozenset(_words(f"{workflow.name} {workflow.description}")),
+        )
+
+    def score(self, words: set[str]) -> float:
+        return (
+            TAG_WEIGHT * len(words & self.tags)
+            + TYPE_WEIGHT * len(words & self.kind)
+            + TEXT_WEIGHT * len(words & self.text)
+        )
+
+
+def rank_workflows(
+    task_text: str,
+    workflows: Iterable[Workflow],
+    limit: int | None = None,
+    terms: Callable[[Workflow], WorkflowTerms] = WorkflowTerms.of,
+) -> list[Workflow]:
+    """
+    Order workflows by keyword overlap with the task, best first.
+
+    Cheap enough to run before an LLM call, so only the likeliest candidates need to be
+    graded. Ties keep the workflows' original order.
+
+    Args:
+        task_text: Task title and description
+        workflows: Workflows to rank
+        limit: Keep at most this many
+        terms: Lookup for pre-tokenized workflow terms
+
+    Returns:
+        Ranked workflows
+    """
+    words = _words(task_text)
+    ranked = sorted(workflows, key=lambda w: -terms(w).score(words))
+    return ranked if limit is None else ranked[:limit]
+
+
+@dataclass
+class _CompiledFile:
+    version: tuple[int, int]
+    workflow: Workflow | None
+
+
+@dataclass
+class _Index:
+    workflows: dict[str, Workflow] = field(default_factory=dict)
+    terms: dict[str, WorkflowTerms] = field(default_factory=dict)
+    by_type: dict[str, list[str]] = field(default_factory=lambda: defaultdict(list))
+    by_tag: dict[str, list[str]] = field(default_factory=lambda: defaultdict(list))
+    by_domain: dict[str, list[str]] = field(default_factory=lambda: defaultdict(list))
+
+
+class WorkflowCatalog:
+    """
+    Process-wide compiled catalog of the workflows under one directory.
+
+    Reads are served from an immutable index that is swapped atomically on reload, so
+    concurrent requests never see a half-built catalog.
+    """
+
+    def __init__(
+        self,
+        workflows_dir: Path,
+        check_interval: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            workflows_dir: Directory searched recursively for .toml workflows
+            check_interval: Minimum seconds between checks for changed files
+            clock: Monotonic time source
+        """
+        self.workflows_dir = Path(workflows_dir)
+        self.check_interval = check_interval
+        self._clock = clock
+        self._files: dict[Path, _CompiledFile] = {}
+        self._index = _Index()
+        self._checked_at: float | None = None
+        self._lock = threading.Lock()
+        self.reloads = 0
+        self.refresh(force=True)
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reload changed, added or removed workflow files.
+
+        Args:
+            force: Check now, ignoring ``check_interval``
+
+        Returns:
+            True if the catalog changed
+        """
+        now = self._clock()
+        if (
+            not force
+            and self._checked_at is not None
+            and now - self._checked_at < self.check_interval
+        ):
+            return False
+
+        with self._lock:
+            self._checked_at = now
+            versions = self._scan()
+            if versions.keys() == self._files.keys() and all(
+                self._files[path].version == version for path, version in versions.items()
+            ):
+                return False
+
+            self._files = {
+                path: (
+                    self._files[path]
+                    if path in self._files and self._files[path].version == version
+                    else _CompiledFile(version, self._compile(path))
+                )
+                for path, version in versions.items()
+            }
+            self._index = self._build_index()
+            self.reloads += 1
+            logger.info(
+                f"Workflow catalog loaded {len(self._index.workflows)} workflows "
+                f"from {self.workflows_dir}"
+            )
+            return True
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        if not self.workflows_dir.exists():
+            if self._checked_at is None or self._files:
+                logger.warning(f"Workflows directory does not exist: {self.workflows_dir}")
+            return {}
+
+        versions = {}
+        for toml_file in sorted(self.workflows_dir.glob("**/*.toml")):
+            try:
+                stat = toml_file.stat()
+            except OSError:
+                continue  # Removed between glob and stat
+            versions[toml_file] = (stat.st_mtime_ns, stat.st_size)
+        return versions
+
+    def _compile(self, toml_file: Path) -> Workflow | None:
+        try:
+            with open(toml_file, "rb") as f:
+                data = tomllib.load(f)
+
+            # Workflows are grouped by domain directory (dev/, personal/)
+            relative = toml_file.relative_to(self.workflows_dir)
+            if "domain" not in data and len(relative.parts) > 1:
+                data["domain"] = relative.parts[0]
+
+            workflow = Workflow(**data)
+            logger.info(f"Loaded workflow: {workflow.name} ({workflow.workflow_id})")
+            return workflow
+
+        except Exception as e:
+            logger.error(f"Failed to load workflow {toml_file}: {e}")
+            return None
+
+    def _build_index(self) -> _Index:
+        index = _Index()
+        for compiled in self._files.values():
+            workflow = compiled.workflow
+            if workflow is None:
+                continue
+            workflow_id = workflow.workflow_id
+            if workflow_id in index.workflows:
+                logger.warning(f"Duplicate workflow id {workflow_id}; keeping the later file")
+            index.workflows[workflow_id] = workflow
+            index.terms[workflow_id] = WorkflowTerms.of(workflow)
+
+        for workflow_id, workflow in index.workflows.items():
+            index.by_type[workflow.workflow_type].append(workflow_id)
+            index.by_domain[workflow.domain].append(workflow_id)
+            for tag in workflow.tags:
+                index.by_tag[tag.lower()].append(workflow_id)
+        return index
+
+    @property
+    def workflows(self) -> dict[str, Workflow]:
+        """All workflows by ID."""
+        self.refresh()
+        return self._index.workflows
+
+    def get(self, workflow_id: str) -> Workflow | None:
+        """Get workflow by ID."""
+        return self.workflows.get(workflow_id)
+
+    def list_workflows(
+        self,
+        workflow_type: WorkflowType | str | None = None,
+        tag: str | None = None,
+        domain: str | None = None,
+    ) -> list[Workflow]:
+        """
+        List workflows, optionally filtered through the type, tag and domain indexes.
+
+        Args:
+            workflow_type: Only workflows of this type
+            tag: Only workflows with this tag
+            domain: Only workflows from this domain
+
+        Returns:
+            Matching workflows in catalog order
+        """
+        self.refresh()
+        index = self._index
+        selections = []
+        if workflow_type:
+            key = workflow_type.value if isinstance(workflow_type, WorkflowType) else workflow_type
+            selections.append(index.by_type.get(key, []))
+        if tag:
+            selections.append(index.by_tag.get(tag.lower(), []))
+        if domain:
+            selections.append(index.by_domain.get(domain, []))
+
+        if not selections:
+            return list(index.workflows.values())
+
+        selected = set(selections[0]).intersection(*selections[1:])
+        return [w for workflow_id, w in index.workflows.items() if workflow_id in selected]
+
+    def candidates(
+        self, task_title: str, task_description: str = "", limit: int = 3
+    ) -> list[Workflow]:
+        """
+        The workflows most likely to fit a task, ranked by keyword overlap.
+
+        Args:
+            task_title: Task title
+            task_description: Optional task description
+            limit: Maximum number of candidates
+
+        Returns:
+            Up to ``limit`` workflows, best first
+        """
+        self.refresh()
+        index = self._index
+        return rank_workflows(
+            f"{task_title} {task_description}",
+            index.workflows.values(),
+            limit=limit,
+            terms=lambda w: index.terms.get(w.workflow_id) or WorkflowTerms.of(w),
+        )
+
+    def __len__(self) -> int:
+        return len(self.workflows)
+
+
+_catalogs: dict[Path, WorkflowCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_workflow_catalog(workflows_dir: Path = DEFAULT_WORKFLOWS_DIR) -> WorkflowCatalog:
+    """
+    Shared catalog for a workflows directory.
+
+    Args:
+        workflows_dir: Directory of .toml workflow definitions
+
+    Returns:
+        The process-wide WorkflowCatalog for that directory
+    """
+    key = Path(workflows_dir).resolve()
+    catalog = _catalogs.get(key)
+    if catalog is None:
+        with _catalogs_lock:
+            catalog = _catalogs.get(key)
+            if catalog is None:
+                catalog = _catalogs[key] = WorkflowCatalog(key)
+    return catalog
@@ -5,15 +5,15 @@ This executor takes a workflow definition and user context,
 then generates personalized implementation steps using AI.
 """
 
+import asyncio
+import json
 import logging
 import os
-import tomllib
 from pathlib import Path
+from typing import Any
 
-from pydantic_ai import Agent
-from pydantic_ai.models.openai import OpenAIModel
-from pydantic_ai.providers.openai import OpenAIProvider
-
+from src.services.request_metrics import track_llm_call
+from src.workflows.catalog import get_workflow_catalog
 from src.workflows.models import (
     Workflow,
     WorkflowContext,
@@ -21,9 +21,38 @@ from src.workflows.models import (
     WorkflowStep,
     WorkflowType,
 )
+from src.workflows.step_cache import StepCache, context_key
 
 logger = logging.getLogger(__name__)
 
+# Step fields shown to the AI when it personalizes pre-rendered templates
+TEMPLATE_FIELDS = {
+    "title",
+    "description",
+    "estimated_minutes",
+    "tdd_phase",
+    "validation_command",
+    "expected_outcome",
+    "icon",
+}
+
+PERSONALIZE_INSTRUCTIONS = """
+
+These {step_count} steps are already defined for this workflow:
+{steps}
+
+Personalize them for this task and context: keep the same number and order of steps,
+adapt titles, descriptions and time estimates, and keep any field you do not change.
+Return ONLY a JSON array of the {step_count} steps.
+"""
+
+
+class _KeepMissing(dict):
+    """format_map mapping that leaves unknown placeholders untouched."""
+
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
 
 class WorkflowExecutor:
     """
@@ -35,61 +64,49 @@ class WorkflowExecutor:
     - Task details (title, description, priority)
     """
 
-    def __init__(self, workflows_dir: Path):
+    def __init__(self, workflows_dir: Path, step_cache: StepCache | None = None):
         """
         Initialize executor with workflows directory.
 
         Args:
             workflows_dir: Path to directory containing .toml workflow files
+            step_cache: Cache of generated steps (a private one by default)
         """
         self.workflows_dir = workflows_dir
-        self.workflows: dict[str, Workflow] = {}
-        self._load_workflows()
-
-    def _load_workflows(self) -> None:
-        """Load all workflow definitions from TOML files."""
-        if not self.workflows_dir.exists():
-            logger.warning(f"Workflows directory does not exist: {self.workflows_dir}")
-            return
+        # Shared per directory: files are parsed once per process and reloaded on change
+        self.catalog = get_workflow_catalog(workflows_dir)
+        self.step_cache = step_cache or StepCache()
 
-        for toml_file in self.workflows_dir.glob("**/*.toml"):
-            try:
-                with open(toml_file, "rb") as f:
-                    data = tomllib.load(f)
-
-                workflow = Workflow(**data)
-                self.workflows[workflow.workflow_id] = workflow
-                logger.info(f"Loaded workflow: {workflow.name} ({workflow.workflow_id})")
-
-            except Exception as e:
-                logger.error(f"Failed to load workflow {toml_file}: {e}")
+    @property
+    def workflows(self) -> dict[str, Workflow]:
+        """All loaded workflows by ID."""
+        return self.catalog.workflows
 
     def get_workflow(self, workflow_id: str) -> Workflow | None:
         """Get workflow by ID."""
-        return self.workflows.get(workflow_id)
+        return self.catalog.get(workflow_id)
 
-    def list_workflows(self, workflow_type: WorkflowType | None = None) -> list[Workflow]:
+    def list_workflows(
+        self, workflow_type: WorkflowType | None = None, tag: str | None = None
+    ) -> list[Workflow]:
         """
         List all available workflows.
 
         Args:
             workflow_type: Optional filter by type
+            tag: Optional filter by tag
 
         Returns:
             List of workflows
         """
-        workflows = list(self.workflows.values())
-
-        if workflow_type:
-            workflows = [w for w in workflows if w.workflow_type == workflow_type]
-
-        return workflows
+        return self.catalog.list_workflows(workflow_type=workflow_type, tag=tag)
 
     async def execute_workflow(
         self,
         workflow_id: str,
         context: WorkflowContext,
         llm_api_key: str | None = None,
+        use_cache: bool = True,
     ) -> WorkflowExecution:
         """
         Execute workflow to generate implementation steps.
@@ -98,6 +115,7 @@ class WorkflowExecutor:
             workflow_id: ID of workflow to execute
             context: User and task context for step generation
             llm_api_key: Optional API key override
+            use_cache: Reuse steps generated earlier for the same workflow and context
 
         Returns:
             WorkflowExecution with generated steps
@@ -121,15 +139,23 @@ class WorkflowExecutor:
         )
 
         try:
-            # Generate steps using AI
-            steps = await self._generate_steps(workflow, context, llm_api_key)
+            # Generate steps using AI, or reuse steps generated for an identical context
+            template_vars = self._template_vars(workflow, context)
+            if use_cache:
+                steps, execution.cache_hit = await self.step_cache.get_or_generate(
+                    context_key(workflow, template_vars),
+                    lambda: self._generate_steps(workflow, context, llm_api_key),
+                )
+            else:
+                steps = await self._generate_steps(workflow, context, llm_api_key)
 
             # Update execution
             execution.steps = steps
             execution.status = "completed"
 
             logger.info(
-                f"Generated {len(steps)} steps for workflow {workflow_id} (task: {context.task_id})"
+                f"Generated {len(steps)} steps for workflow {workflow_id} "
+                f"(task: {context.task_id}, cached: {execution.cache_hit})"
             )
 
             return execution
@@ -140,6 +166,42 @@ class WorkflowExecutor:
             logger.error(f"Workflow execution failed: {e}")
             raise
 
+    async def execute_workflows(
+        self,
+        runs: list[tuple[str, WorkflowContext]],
+        llm_api_key: str | None = None,
+        max_concurrency: int = 4,
+    ) -> list[WorkflowExecution]:
+        """
+        Execute several workflows concurrently.
+
+        Args:
+            runs: (workflow_id, context) pairs
+            llm_api_key: Optional API key override
+            max_concurrency: Maximum LLM calls in flight at once
+
+        Returns:
+            One execution per run, in order. A run that fails is returned with status
+            "failed" and its error message instead of raising.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(workflow_id: str, context: WorkflowContext) -> WorkflowExecution:
+            async with semaphore:
+                try:
+                    return await self.execute_workflow(workflow_id, context, llm_api_key)
+                except Exception as e:
+                    return WorkflowExecution(
+                        workflow_id=workflow_id,
+                        task_id=context.task_id,
+                        user_id=context.user_id,
+                        context=context,
+                        status="failed",
+                        error_message=str(e),
+                    )
+
+        return list(await asyncio.gather(*(run(w, c) for w, c in runs)))
+
     async def _generate_steps(
         self,
         workflow: Workflow,
@@ -149,6 +211,9 @@ class WorkflowExecutor:
         """
         Generate implementation steps using AI.
 
+        When the workflow defines step templates, the AI personalizes the pre-rendered
+        steps rather than writing a plan from scratch.
+
         Args:
             workflow: Workflow definition
             context: User and task context
@@ -158,9 +223,25 @@ class WorkflowExecutor:
             List of generated steps
         """
         # Build prompt with context
-        user_prompt = self._build_user_prompt(workflow, context)
+        template_vars = self._template_vars(workflow, context)
+        user_prompt = workflow.user_prompt_template.format(**template_vars)
+        templates = self.render_step_templates(workflow, template_vars)
+        if templates:
+            user_prompt += PERSONALIZE_INSTRUCTIONS.format(
+                step_count=len(templates),
+                steps=json.dumps(
+                    [step.model_dump(include=TEMPLATE_FIELDS) for step in templates],
+                    indent=2,
+                    ensure_ascii=False,
+                ),
+            )
 
         # Initialize AI agent
+        # pydantic_ai pulls in the openai SDK, so import it only when a model is needed
+        from pydantic_ai import Agent
+        from pydantic_ai.models.openai import OpenAIModel
+        from pydantic_ai.providers.openai import OpenAIProvider
+
         provider = OpenAIProvider(api_key=llm_api_key or os.getenv("LLM_API_KEY"))
         model = OpenAIModel("gpt-4.1-mini", provider=provider)
 
@@ -171,42 +252,73 @@ class WorkflowExecutor:
         )
 
         # Generate steps
-        result = await agent.run(user_prompt)
+        async with track_llm_call():
+            result = await agent.run(user_prompt)
 
-        # Convert to WorkflowStep objects
-        steps = []
-        for i, step_data in enumerate(result.output):
-            step = WorkflowStep(
-                title=step_data.get("title", f"Step {i + 1}"),
-                description=step_data.get("description", ""),
-                estimated_minutes=step_data.get("estimated_minutes", 30),
-                tdd_phase=step_data.get("tdd_phase"),
-                validation_command=step_data.get("validation_command"),
-                expected_outcome=step_data.get("expected_outcome"),
-                icon=step_data.get("icon", workflow.default_icon),
-                order=i,
-            )
-            steps.append(step)
+        # Token usage: PydanticAI doesn't expose usage in result yet
+        return self._to_steps(workflow, result.output, templates)
 
-        # Track token usage
-        # Note: PydanticAI doesn't expose usage in result yet
-        # We can add this when the API supports it
+    @staticmethod
+    def _to_steps(
+        workflow: Workflow,
+        step_dicts: list[dict],
+        templates: list[WorkflowStep] | None = None,
+    ) -> list[WorkflowStep]:
+        """
+        Convert AI output to WorkflowStep objects.
 
+        Fields the AI leaves out fall back to the matching pre-rendered template step.
+        """
+        templates = templates or []
+        steps = []
+        for i, step_data in enumerate(step_dicts):
+            base = templates[i].model_dump(include=TEMPLATE_FIELDS) if i < len(templates) else {}
+            data = {**base, **{k: v for k, v in step_data.items() if v is not None}}
+            steps.append(
+                WorkflowStep(
+                    title=data.get("title", f"Step {i + 1}"),
+                    description=data.get("description", ""),
+                    estimated_minutes=data.get("estimated_minutes", 30),
+                    tdd_phase=data.get("tdd_phase"),
+                    validation_command=data.get("validation_command"),
+                    expected_outcome=data.get("expected_outcome"),
+                    icon=data.get("icon", workflow.default_icon),
+                    order=i,
+                )
+            )
         return steps
 
-    def _build_user_prompt(self, workflow: Workflow, context: WorkflowContext) -> str:
+    @staticmethod
+    def render_step_templates(
+        workflow: Workflow, template_vars: dict[str, Any]
+    ) -> list[WorkflowStep]:
         """
-        Build AI prompt from workflow template and context.
+        Fill a workflow's step templates with the run's context.
+
+        Unknown placeholders are left as written, so a typo in a TOML file cannot fail
+        a run.
 
         Args:
             workflow: Workflow definition
-            context: User and task context
+            template_vars: Context variables from ``_template_vars``
 
         Returns:
-            Formatted prompt string
+            Rendered steps (empty if the workflow defines no templates)
         """
-        # Prepare context variables
-        template_vars = {
+        values = _KeepMissing(template_vars)
+        steps = []
+        for i, template in enumerate(workflow.step_templates):
+            data = template.model_dump()
+            for name in ("title", "description", "validation_command", "expected_outcome"):
+                if data[name]:
+                    data[name] = data[name].format_map(values)
+            data["icon"] = data["icon"] or workflow.default_icon
+            steps.append(WorkflowStep(**data, order=i))
+        return steps
+
+    def _template_vars(self, workflow: Workflow, context: WorkflowContext) -> dict[str, Any]:
+        """Context variables available to prompt and step templates."""
+        return {
             "task_title": context.task_title,
             "task_description": context.task_description or "No detailed description provided.",
             "task_priority": context.task_priority,
@@ -222,10 +334,18 @@ class WorkflowExecutor:
             "expected_step_count": workflow.expected_step_count,
         }
 
-        # Fill template
-        prompt = workflow.user_prompt_template.format(**template_vars)
+    def _build_user_prompt(self, workflow: Workflow, context: WorkflowContext) -> str:
+        """
+        Build AI prompt from workflow template and context.
+
+        Args:
+            workflow: Workflow definition
+            context: User and task context
 
-        return prompt
+        Returns:
+            Formatted prompt string
+        """
+        return workflow.user_prompt_template.format(**self._template_vars(workflow, context))
 
     def get_step_by_id(self, execution: WorkflowExecution, step_id: str) -> WorkflowStep | None:
         """Get a specific step from execution."""
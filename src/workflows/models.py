@@ -18,6 +18,7 @@ class WorkflowType(str, Enum):
     BUGFIX = "bugfix"
     DOCUMENTATION = "documentation"
     TESTING = "testing"
+    PLANNING = "planning"
 
 
 class StepStatus(str, Enum):
@@ -96,6 +97,23 @@ class WorkflowStep(BaseModel):
     notes: str | None = None
 
 
+class StepTemplate(BaseModel):
+    """
+    Pre-defined step from a workflow's TOML file.
+
+    Text fields may use the same placeholders as ``user_prompt_template``; the AI only
+    personalizes the rendered steps instead of inventing them.
+    """
+
+    title: str
+    description: str = ""
+    estimated_minutes: int = 30
+    tdd_phase: str | None = None
+    validation_command: str | None = None
+    expected_outcome: str | None = None
+    icon: str | None = None
+
+
 class Workflow(BaseModel):
     """
     Workflow definition loaded from TOML file.
@@ -109,6 +127,7 @@ class Workflow(BaseModel):
     name: str
     description: str
     workflow_type: WorkflowType
+    domain: str = "dev"
     version: str = "1.0.0"
 
     # AI generation config
@@ -124,6 +143,7 @@ class Workflow(BaseModel):
     # Step defaults
     default_icon: str = "📋"
     expected_step_count: int = Field(5, ge=3, le=10, description="Target number of steps")
+    step_templates: list[StepTemplate] = Field(default_factory=list)
 
 
 class WorkflowExecution(BaseModel):
@@ -153,6 +173,7 @@ class WorkflowExecution(BaseModel):
 
     # AI usage tracking
     llm_provider_used: str | None = None
+    cache_hit: bool = False
     prompt_tokens: int = 0
     completion_tokens: int = 0
     estimated_cost: float = 0.0
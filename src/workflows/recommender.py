@@ -9,14 +9,16 @@ import logging
 import os
 
 from pydantic import BaseModel, Field
-from pydantic_ai import Agent
-from pydantic_ai.models.openai import OpenAIModel
-from pydantic_ai.providers.openai import OpenAIProvider
 
+from src.services.request_metrics import track_llm_call
+from src.workflows.catalog import rank_workflows
 from src.workflows.models import Workflow
 
 logger = logging.getLogger(__name__)
 
+# Workflows sent to the LLM for grading after keyword pre-filtering
+DEFAULT_MAX_CANDIDATES = 3
+
 
 class WorkflowSuggestion(BaseModel):
     """AI-powered workflow recommendation with letter grade."""
@@ -132,6 +134,7 @@ Example output:
         available_workflows: list[Workflow],
         user_context: dict,
         llm_api_key: str | None = None,
+        max_candidates: int | None = DEFAULT_MAX_CANDIDATES,
     ) -> list[WorkflowSuggestion]:
         """
         Get AI-powered workflow suggestions with letter grades.
@@ -142,11 +145,23 @@ Example output:
             available_workflows: All available workflow definitions
             user_context: User energy, time, preferences
             llm_api_key: Optional API key override
+            max_candidates: Grade only this many workflows, pre-filtered by keyword
+                overlap with the task (None grades every workflow)
 
         Returns:
             List of workflow suggestions sorted by grade (best first)
         """
-        # Initialize AI agent (lazy initialization to match executor pattern)
+        # Keep the prompt (and its cost) bounded as the catalog grows
+        candidates = rank_workflows(
+            f"{task_title} {task_description}", available_workflows, limit=max_candidates
+        )
+
+        # Initialize AI agent (lazy initialization to match executor pattern); pydantic_ai
+        # pulls in the openai SDK, so it is imported only when a model is needed
+        from pydantic_ai import Agent
+        from pydantic_ai.models.openai import OpenAIModel
+        from pydantic_ai.providers.openai import OpenAIProvider
+
         provider = OpenAIProvider(api_key=llm_api_key or os.getenv("LLM_API_KEY"))
         model = OpenAIModel("gpt-4.1-mini", provider=provider)
         agent = Agent(
@@ -160,12 +175,12 @@ Example output:
             [
                 f"**{w.workflow_id}**\n"
                 f"Name: {w.name}\n"
-                f"Domain: {w.domain if hasattr(w, 'domain') else 'dev'}\n"
+                f"Domain: {w.domain}\n"
                 f"Type: {w.workflow_type}\n"
                 f"Description: {w.description}\n"
                 f"Expected Steps: {w.expected_step_count}\n"
                 f"Tags: {', '.join(w.tags)}"
-                for w in available_workflows
+                for w in candidates
             ]
         )
 
@@ -200,7 +215,8 @@ Return JSON array with ALL workflows graded from best to worst.
 """
 
         try:
-            result = await agent.run(prompt)
+            async with track_llm_call():
+                result = await agent.run(prompt)
 
             # Sort by confidence (highest first)
             suggestions = sorted(result.output, key=lambda s: s.confidence, reverse=True)
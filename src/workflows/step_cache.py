@@ -0,0 +1,165 @@
+"""
+Step Cache - reuse generated workflow steps for repeated contexts.
+
+Generating steps is an LLM call of several seconds, yet the same workflow is often
+run again with the same context (daily planning every morning, a retried request).
+Steps are cached by workflow definition and a hash of the normalized prompt context.
+Concurrent identical requests share one generation.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+from uuid import uuid4
+
+from src.workflows.models import Workflow, WorkflowStep
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(value: Any) -> Any:
+    """Collapse differences that do not change the prompt (whitespace, 4.0 vs 4)."""
+    if isinstance(value, str):
+        return _WHITESPACE.sub(" ", value).strip()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, list | tuple):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def context_key(workflow: Workflow, template_vars: dict[str, Any]) -> str:
+    """
+    Cache key for a workflow run: the workflow's definition plus its prompt context.
+
+    Hashing the definition (not just its ID) means an edited TOML file never serves
+    steps generated from the old prompt.
+    """
+    definition = workflow.model_dump_json(exclude={"created_at"})
+    context = json.dumps(_normalize(template_vars), sort_keys=True, default=str)
+    digest = hashlib.sha256(f"{definition}\0{context}".encode()).hexdigest()[:32]
+    return f"{workflow.workflow_id}:{digest}"
+
+
+@dataclass
+class _Entry:
+    steps: list[WorkflowStep]
+    expires_at: float | None
+
+
+class StepCache:
+    """
+    LRU cache of generated steps with expiry and single-flight generation.
+
+    Callers always receive fresh step copies (new IDs, pending status), so marking a
+    step complete in one execution never leaks into another.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: float | None = 6 * 3600,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_entries: Maximum cached step lists
+            ttl: Seconds a cached result is served (None never expires)
+            clock: Monotonic time source
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _copies(steps: list[WorkflowStep]) -> list[WorkflowStep]:
+        return [step.model_copy(update={"step_id": str(uuid4())}) for step in steps]
+
+    def get(self, key: str) -> list[WorkflowStep] | None:
+        """Cached steps for ``key``, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at is not None and self._clock() >= entry.expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return self._copies(entry.steps)
+
+    def put(self, key: str, steps: list[WorkflowStep]) -> None:
+        """Cache steps for ``key``, evicting the least recently used entries."""
+        expires_at = None if self.ttl is None else self._clock() + self.ttl
+        self._entries[key] = _Entry(steps=self._copies(steps), expires_at=expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_generate(
+        self, key: str, generate: Callable[[], Awaitable[list[WorkflowStep]]]
+    ) -> tuple[list[WorkflowStep], bool]:
+        """
+        Return cached steps, or generate them once for all concurrent callers.
+
+        Returns:
+            Tuple of (steps, whether they came from the cache)
+        """
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached, True
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.hits += 1
+            return self._copies(await asyncio.shield(inflight)), True
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            steps = await generate()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when no other caller is waiting
+            raise
+        else:
+            self.put(key, steps)
+            future.set_result(steps)
+            return steps, False
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, workflow_id: str | None = None) -> int:
+        """Drop cached steps for one workflow (or all), returning how many were dropped."""
+        keys = [k for k in self._entries if workflow_id is None or k.startswith(f"{workflow_id}:")]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def stats(self) -> dict[str, Any]:
+        """Entry count and hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
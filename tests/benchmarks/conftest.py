@@ -0,0 +1,110 @@
+"""
+Micro-benchmark configuration.
+
+Environment variables:
+    BENCH_TIER: dataset size, one of 1k (default), 100k or 1m
+    BENCH_SEED: dataset seed (default 1337)
+    BENCH_ROUNDS: timed rounds per benchmark (default 5)
+    BENCH_DIR: where results and cached datasets live (default .benchmarks)
+    BENCH_COMPARE: set to 1 to compare with the previous run of the same tier and
+        fail the session on regressions, or to a results file to compare with it
+    BENCH_TOLERANCE: allowed median slowdown before a regression (default 0.2)
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from src.database.enhanced_adapter import EnhancedDatabaseAdapter
+from tests.benchmarks import datasets
+from tests.benchmarks.harness import (
+    BenchmarkRunner,
+    compare_results,
+    format_results,
+    previous_results,
+    write_results,
+)
+
+_runner_key = pytest.StashKey[BenchmarkRunner]()
+_summary_key = pytest.StashKey[list[str]]()
+
+
+def _results_dir() -> Path:
+    return Path(os.getenv("BENCH_DIR", ".benchmarks"))
+
+
+@pytest.fixture(scope="session")
+def bench_tier() -> str:
+    tier = os.getenv("BENCH_TIER", "1k").lower()
+    if tier not in datasets.SIZES:
+        raise pytest.UsageError(f"BENCH_TIER must be one of {', '.join(datasets.SIZES)}")
+    return tier
+
+
+@pytest.fixture(scope="session")
+def bench_rows(bench_tier) -> int:
+    return datasets.SIZES[bench_tier]
+
+
+@pytest.fixture(scope="session")
+def bench_seed() -> int:
+    return int(os.getenv("BENCH_SEED", datasets.DEFAULT_SEED))
+
+
+@pytest.fixture(scope="session")
+def bench(request, bench_tier) -> BenchmarkRunner:
+    """Session-wide runner; its results are written when the session finishes."""
+    runner = BenchmarkRunner(bench_tier, rounds=int(os.getenv("BENCH_ROUNDS", "5")))
+    request.config.stash[_runner_key] = runner
+    return runner
+
+
+@pytest.fixture(scope="session")
+def bench_db(bench_tier, bench_rows, bench_seed):
+    """Seeded database for the tier, built on first use and cached between runs."""
+    path = datasets.build_database(
+        _results_dir() / "data" / f"bench-{bench_tier}-{bench_seed}.db", bench_rows, bench_seed
+    )
+    db = EnhancedDatabaseAdapter(str(path))
+    yield db
+    db.close_connection()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    runner = session.config.stash.get(_runner_key, None)
+    if runner is None or not runner.results:
+        return
+
+    directory = _results_dir()
+    path = write_results(runner.results, directory, runner.tier)
+    summary = [f"benchmark results written to {path}"]
+
+    compare = os.getenv("BENCH_COMPARE")
+    if not compare:
+        summary.extend(format_results(runner.results))
+    else:
+        previous = (
+            previous_results(directory, runner.tier, before=path)
+            if compare == "1"
+            else Path(compare)
+        )
+        if previous is None:
+            summary.append(f"no previous {runner.tier} run to compare with")
+        else:
+            tolerance = float(os.getenv("BENCH_TOLERANCE", "0.2"))
+            lines, regressions = compare_results(runner.results, previous, tolerance)
+            summary.append(f"compared with {previous} (tolerance {tolerance:.0%}):")
+            summary.extend(lines)
+            if regressions:
+                summary.append(f"{len(regressions)} benchmark(s) regressed")
+                session.exitstatus = pytest.ExitCode.TESTS_FAILED
+    session.config.stash[_summary_key] = summary
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    summary = config.stash.get(_summary_key, None)
+    if summary:
+        terminalreporter.section("benchmarks")
+        for line in summary:
+            terminalreporter.write_line(line)
@@ -0,0 +1,208 @@
+"""
+Seeded synthetic datasets for the micro-benchmarks.
+
+Every generator takes a row count and a seed and is fully deterministic, so two runs
+at the same tier time the same work. SQLite datasets are built once per (tier, seed)
+under the results directory and reused by later runs; building the 1M tier takes a
+few minutes.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import sqlite3
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from src.core.task_models import Task, TaskPriority, TaskStatus
+from src.database.enhanced_adapter import EnhancedDatabaseAdapter
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_SEED = 1337
+
+KG_MIGRATION = (
+    Path(__file__).resolve().parents[2]
+    / "src"
+    / "database"
+    / "migrations"
+    / "003_add_knowledge_graph.sql"
+)
+
+_EPOCH = datetime(2025, 1, 1)
+_VERBS = ["email", "research", "schedule", "write", "call", "review", "fix", "browse", "plan"]
+_OBJECTS = ["report", "invoice", "dentist", "slides", "budget", "landlord", "bug", "draft"]
+_MODIFIERS = ["urgent", "asap", "tomorrow", "today", "this week", "maybe", "important", "later"]
+_TAGS = ["home", "work", "errand", "admin", "health", "finance", "focus"]
+_ENTITY_TYPES = ["person", "device", "location", "project"]
+_RELATIONSHIP_TYPES = ["worksWith", "workingOn", "locatedIn", "owns"]
+
+
+def project_ids(rows: int) -> list[str]:
+    """Projects scale with the tier so a project filter selects ~1% of tasks."""
+    return [f"project-{i}" for i in range(max(rows // 100, 1))]
+
+
+def task_rows(rows: int, seed: int = DEFAULT_SEED) -> Iterator[dict[str, Any]]:
+    """Task rows shaped exactly like ``SELECT * FROM tasks`` returns them."""
+    rng = random.Random(seed)
+    projects = project_ids(rows)
+    statuses = [s.value for s in TaskStatus]
+    priorities = [p.value for p in TaskPriority]
+    for i in range(rows):
+        created = _EPOCH + timedelta(minutes=i)
+        yield {
+            "task_id": f"task-{i}",
+            "title": f"{rng.choice(_VERBS)} {rng.choice(_OBJECTS)} {i}",
+            "description": f"Synthetic task {i}",
+            "project_id": rng.choice(projects),
+            "parent_id": None,
+            "capture_type": "task",
+            "status": rng.choice(statuses),
+            "priority": rng.choice(priorities),
+            "estimated_hours": round(rng.uniform(0.25, 8), 2),
+            "actual_hours": 0.0,
+            "tags": json.dumps(rng.sample(_TAGS, 2)),
+            "assignee_id": None,
+            "due_date": (created + timedelta(days=rng.randint(1, 30))).isoformat(),
+            "started_at": None,
+            "completed_at": None,
+            "created_at": created.isoformat(),
+            "updated_at": created.isoformat(),
+            "metadata": json.dumps({"source": "benchmark", "index": i}),
+            "scope": "simple",
+            "delegation_mode": "do",
+            "is_micro_step": 0,
+            "micro_steps": "[]",
+            "level": 0,
+            "custom_emoji": None,
+            "decomposition_state": "stub",
+            "children_ids": "[]",
+            "total_minutes": rng.randint(5, 240),
+            "is_leaf": 0,
+            "leaf_type": None,
+            "assigned_to": None,
+            "agent_type": None,
+            "is_meta_task": 0,
+            "completed": 0,
+            "zone_id": None,
+        }
+
+
+def tasks(rows: int, seed: int = DEFAULT_SEED) -> list[Task]:
+    """Task models for the serialization benchmark."""
+    rng = random.Random(seed)
+    projects = project_ids(rows)
+    return [
+        Task(
+            task_id=f"task-{i}",
+            title=f"{rng.choice(_VERBS)} {rng.choice(_OBJECTS)} {i}",
+            description=f"Synthetic task {i}",
+            project_id=rng.choice(projects),
+            status=rng.choice(list(TaskStatus)),
+            priority=rng.choice(list(TaskPriority)),
+            estimated_hours=round(rng.uniform(0.25, 8), 2),
+            tags=rng.sample(_TAGS, 2),
+            due_date=_EPOCH + timedelta(days=rng.randint(1, 30)),
+            metadata={"source": "benchmark", "index": i},
+        )
+        for i in range(rows)
+    ]
+
+
+def capture_texts(rows: int, seed: int = DEFAULT_SEED) -> list[str]:
+    """Quick-capture inputs mixing priority, delegation and due-date keywords."""
+    rng = random.Random(seed)
+    return [
+        f"{rng.choice(_VERBS)} the {rng.choice(_OBJECTS)} {rng.choice(_MODIFIERS)}"
+        for _ in range(rows)
+    ]
+
+
+def reward_inputs(rows: int, seed: int = DEFAULT_SEED) -> list[dict[str, Any]]:
+    """Keyword arguments for ``DopamineRewardService.calculate_task_reward``."""
+    rng = random.Random(seed)
+    return [
+        {
+            "user_id": f"user-{rng.randrange(max(rows // 10, 1))}",
+            "task_priority": rng.choice(["low", "medium", "high"]),
+            "streak_days": rng.choice([0, 1, 3, 7, 14, 30, 100]),
+            "power_hour_active": rng.random() < 0.1,
+            "energy_level": rng.randint(0, 100),
+        }
+        for _ in range(rows)
+    ]
+
+
+def build_database(path: Path, rows: int, seed: int = DEFAULT_SEED) -> Path:
+    """
+    Create a SQLite database with ``rows`` tasks, ``rows`` KG entities and ``2 * rows``
+    relationships, reusing an existing file from a previous run.
+    """
+    if path.exists():
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(".partial")
+    partial.unlink(missing_ok=True)
+
+    # The adapter creates the application schema; the KG tables come from their migration.
+    EnhancedDatabaseAdapter(str(partial)).close_connection()
+    conn = sqlite3.connect(partial)
+    try:
+        conn.executescript(KG_MIGRATION.read_text())
+        now = _EPOCH.isoformat()
+        conn.executemany(
+            "INSERT OR IGNORE INTO projects (project_id, name, description, created_at, updated_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            [(pid, pid, "Benchmark project", now, now) for pid in project_ids(rows)],
+        )
+        _insert_rows(conn, "tasks", task_rows(rows, seed))
+
+        rng = random.Random(seed + 1)
+        users = max(rows // 1_000, 1)
+        conn.executemany(
+            "INSERT INTO kg_entities (entity_id, entity_type, name, user_id, metadata)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (
+                (
+                    f"entity-{i}",
+                    _ENTITY_TYPES[i % len(_ENTITY_TYPES)],
+                    f"Entity {i}",
+                    f"user-{i % users}",
+                    "{}",
+                )
+                for i in range(rows)
+            ),
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO kg_relationships"
+            " (relationship_id, from_entity_id, to_entity_id, relationship_type)"
+            " VALUES (?, ?, ?, ?)",
+            (
+                (
+                    f"rel-{i}",
+                    f"entity-{i // 2}",
+                    f"entity-{rng.randrange(rows)}",
+                    rng.choice(_RELATIONSHIP_TYPES),
+                )
+                for i in range(2 * rows)
+            ),
+        )
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    partial.rename(path)
+    return path
+
+
+def _insert_rows(conn: sqlite3.Connection, table: str, rows: Iterator[dict[str, Any]]) -> None:
+    first = next(rows, None)
+    if first is None:
+        return
+    columns = list(first)
+    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+    conn.execute(query, tuple(first.values()))
+    conn.executemany(query, (tuple(row[c] for c in columns) for row in rows))
@@ -0,0 +1,176 @@
+"""
+Minimal micro-benchmark runner with JSON results and run-to-run comparison.
+
+Each benchmark times ``rounds`` calls of a function that performs ``ops`` operations
+and reports per-operation statistics in seconds. Results are written as one JSON file
+per run, and a run can be compared against the previous file for the same tier.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import statistics
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+
+@dataclass
+class BenchmarkResult:
+    """Per-operation timings for one benchmark."""
+
+    name: str
+    tier: str
+    ops: int
+    timings: list[float] = field(repr=False)
+
+    @property
+    def per_op(self) -> list[float]:
+        return [t / self.ops for t in self.timings]
+
+    def stats(self) -> dict[str, float]:
+        per_op = self.per_op
+        median = statistics.median(per_op)
+        return {
+            "min": min(per_op),
+            "max": max(per_op),
+            "mean": statistics.fmean(per_op),
+            "median": median,
+            "stddev": statistics.stdev(per_op) if len(per_op) > 1 else 0.0,
+            "ops_per_sec": 1 / median if median else 0.0,
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "rounds": len(self.timings), **self.stats()}
+
+
+class BenchmarkRunner:
+    """Times synchronous and asynchronous callables and collects their results."""
+
+    def __init__(self, tier: str, rounds: int = 5, warmup: int = 1):
+        self.tier = tier
+        self.rounds = rounds
+        self.warmup = warmup
+        self.results: list[BenchmarkResult] = []
+
+    def run(self, name: str, fn: Callable[[], Any], ops: int = 1) -> BenchmarkResult:
+        """Time ``fn`` for the configured number of rounds."""
+        for _ in range(self.warmup):
+            fn()
+        timings = []
+        with _gc_paused():
+            for _ in range(self.rounds):
+                start = time.perf_counter()
+                fn()
+                timings.append(time.perf_counter() - start)
+        return self._record(name, ops, timings)
+
+    async def run_async(
+        self, name: str, fn: Callable[[], Awaitable[Any]], ops: int = 1
+    ) -> BenchmarkResult:
+        """Time the coroutine returned by ``fn`` for the configured number of rounds."""
+        for _ in range(self.warmup):
+            await fn()
+        timings = []
+        with _gc_paused():
+            for _ in range(self.rounds):
+                start = time.perf_counter()
+                await fn()
+                timings.append(time.perf_counter() - start)
+        return self._record(name, ops, timings)
+
+    def _record(self, name: str, ops: int, timings: list[float]) -> BenchmarkResult:
+        result = BenchmarkResult(name=name, tier=self.tier, ops=max(ops, 1), timings=timings)
+        self.results.append(result)
+        return result
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Keep collector pauses out of the timed rounds."""
+    enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def write_results(results: list[BenchmarkResult], directory: Path, tier: str) -> Path:
+    """Write one machine-readable results file for this run and return its path."""
+    directory.mkdir(parents=True, exist_ok=True)
+    started = datetime.now(UTC)
+    path = directory / f"{started:%Y%m%dT%H%M%S%f}-{tier}.json"
+    payload = {
+        "created_at": started.isoformat(),
+        "tier": tier,
+        "machine": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+        },
+        "benchmarks": [result.to_dict() for result in results],
+    }
+    path.write_text(json.dumps(payload, indent=2))
+    return path
+
+
+def previous_results(directory: Path, tier: str, before: Path | None = None) -> Path | None:
+    """Most recent results file for ``tier``, ignoring ``before`` and anything newer."""
+    runs = sorted(directory.glob(f"*-{tier}.json"))
+    if before is not None:
+        runs = [run for run in runs if run.name < before.name]
+    return runs[-1] if runs else None
+
+
+def compare_results(
+    current: list[BenchmarkResult], previous: Path, tolerance: float = 0.2
+) -> tuple[list[str], list[str]]:
+    """
+    Compare median per-op times with a previous run.
+
+    Returns:
+        (report lines, regressions) where a regression is a benchmark whose median
+        grew by more than ``tolerance``.
+    """
+    before = {b["name"]: b for b in json.loads(previous.read_text())["benchmarks"]}
+    lines, regressions = [], []
+    for result in current:
+        median = result.stats()["median"]
+        old = before.get(result.name)
+        if old is None or not old["median"]:
+            lines.append(f"{result.name:<48} {_format_time(median):>10}  (new)")
+            continue
+        change = median / old["median"] - 1
+        line = (
+            f"{result.name:<48} {_format_time(median):>10}  "
+            f"was {_format_time(old['median']):>10}  {change:+.1%}"
+        )
+        lines.append(line)
+        if change > tolerance:
+            regressions.append(line)
+    return lines, regressions
+
+
+def format_results(results: list[BenchmarkResult]) -> list[str]:
+    """One line per benchmark with its median per-op time and throughput."""
+    return [
+        f"{r.name:<48} {_format_time(r.stats()['median']):>10}  {r.stats()['ops_per_sec']:>12,.0f} ops/s"
+        for r in results
+    ]
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
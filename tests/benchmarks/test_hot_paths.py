@@ -0,0 +1,172 @@
+"""
+Micro-benchmarks for repository, mapper and agent hot paths.
+
+Run with ``RUN_BENCHMARKS=1 pytest tests/benchmarks -m benchmark``; see conftest.py for the tier,
+results and comparison settings. Per-call functions are timed over a sample of up to
+``SAMPLE`` inputs drawn from the tier's dataset, while the database benchmarks query
+the full seeded tables.
+"""
+
+import os
+import random
+from itertools import islice
+
+import pytest
+
+from src.api.websocket import ConnectionManager
+from src.core.task_models import Task, TaskFilter, TaskStatus
+from src.knowledge.graph_service import GraphService
+from src.repositories.enhanced_repositories import EnhancedTaskRepository
+from src.services.dopamine_reward_service import DopamineRewardService
+from src.services.quick_capture_service import QuickCaptureService
+from tests.benchmarks import datasets
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.slow,
+    pytest.mark.skipif(
+        not os.getenv("RUN_BENCHMARKS"),
+        reason="Benchmarks disabled. Set RUN_BENCHMARKS=1 to enable.",
+    ),
+]
+
+SAMPLE = 1_000
+QUERIES = 20
+MAX_SUBSCRIBERS = 10_000
+
+
+@pytest.fixture(scope="module")
+def sample_size(bench_rows):
+    return min(bench_rows, SAMPLE)
+
+
+@pytest.fixture(scope="module")
+def repo(bench_db):
+    return EnhancedTaskRepository(bench_db)
+
+
+class TestMapperBenchmarks:
+    """Row <-> model conversion used by every repository read and write."""
+
+    def test_dict_to_model(self, bench, repo, bench_rows, bench_seed, sample_size):
+        rows = list(islice(datasets.task_rows(bench_rows, bench_seed), sample_size))
+
+        result = bench.run(
+            "repository.dict_to_model",
+            lambda: [repo._dict_to_model(dict(row), Task) for row in rows],
+            ops=len(rows),
+        )
+
+        assert result.stats()["median"] > 0
+
+    def test_model_to_dict(self, bench, repo, bench_seed, sample_size):
+        tasks = datasets.tasks(sample_size, bench_seed)
+
+        result = bench.run(
+            "repository.model_to_dict",
+            lambda: [repo._model_to_dict(task) for task in tasks],
+            ops=len(tasks),
+        )
+
+        assert result.stats()["median"] > 0
+
+
+class TestRepositoryBenchmarks:
+    """Queries against the seeded tasks and knowledge-graph tables."""
+
+    def test_list_tasks_first_page(self, bench, repo, bench_rows):
+        result = bench.run("tasks.list_tasks[unfiltered]", lambda: repo.list_tasks(limit=50))
+
+        assert result.stats()["median"] > 0
+        assert repo.list_tasks(limit=50).total >= bench_rows
+
+    def test_list_tasks_by_project_and_status(self, bench, repo, bench_rows, bench_seed):
+        rng = random.Random(bench_seed)
+        filters = [
+            TaskFilter(
+                project_id=rng.choice(datasets.project_ids(bench_rows)),
+                status=[TaskStatus.TODO, TaskStatus.IN_PROGRESS],
+            )
+            for _ in range(QUERIES)
+        ]
+
+        result = bench.run(
+            "tasks.list_tasks[project+status]",
+            lambda: [repo.list_tasks(f, limit=50) for f in filters],
+            ops=len(filters),
+        )
+
+        assert result.stats()["median"] > 0
+
+    def test_find_related_entities(self, bench, bench_db, bench_rows, bench_seed):
+        graph = GraphService(bench_db)
+        rng = random.Random(bench_seed)
+        starts = [f"entity-{rng.randrange(bench_rows)}" for _ in range(QUERIES)]
+
+        result = bench.run(
+            "graph.find_related_entities[depth=2]",
+            lambda: [graph.find_related_entities(start, max_depth=2) for start in starts],
+            ops=len(starts),
+        )
+
+        assert result.stats()["median"] > 0
+        assert any(graph.find_related_entities(start) for start in starts)
+
+
+class TestAgentBenchmarks:
+    """Pure-Python scoring run on every capture and completion."""
+
+    def test_analyze_with_keywords(self, bench, bench_seed, sample_size):
+        service = QuickCaptureService()
+        texts = datasets.capture_texts(sample_size, bench_seed)
+
+        result = bench.run(
+            "quick_capture.analyze_with_keywords",
+            lambda: [service._analyze_with_keywords(text, "bench-user", False) for text in texts],
+            ops=len(texts),
+        )
+
+        assert result.stats()["median"] > 0
+
+    def test_calculate_task_reward(self, bench, bench_seed, sample_size):
+        service = DopamineRewardService()
+        inputs = datasets.reward_inputs(sample_size, bench_seed)
+        random.seed(bench_seed)
+
+        result = bench.run(
+            "dopamine.calculate_task_reward",
+            lambda: [service.calculate_task_reward(**kwargs) for kwargs in inputs],
+            ops=len(inputs),
+        )
+
+        assert result.stats()["median"] > 0
+
+
+class _NullWebSocket:
+    """Accepts and discards everything, so only the manager's own work is timed."""
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        pass
+
+
+class TestWebSocketBenchmarks:
+    """Fan-out cost of channel broadcasts, per recipient."""
+
+    async def test_broadcast_to_channel(self, bench, bench_rows):
+        manager = ConnectionManager()
+        subscribers = min(bench_rows, MAX_SUBSCRIBERS)
+        for i in range(subscribers):
+            await manager.connect(_NullWebSocket(), f"user-{i}")
+            await manager.subscribe_to_channel(f"user-{i}", "dashboard")
+        message = {"type": "task_update", "data": {"task_id": "task-1", "status": "done"}}
+
+        result = await bench.run_async(
+            f"websocket.broadcast_to_channel[{subscribers}]",
+            lambda: manager.broadcast_to_channel(message, "dashboard"),
+            ops=subscribers,
+        )
+
+        assert result.stats()["median"] > 0
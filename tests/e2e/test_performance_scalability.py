@@ -138,32 +138,38 @@ class TestBackgroundTaskQueue:
     """Test background task processing system"""
 
     @pytest.fixture
-    def task_queue(self):
+    async def task_queue(self):
         """Create background task queue for testing"""
         from src.services.task_queue_service import BackgroundTaskQueue
 
-        return BackgroundTaskQueue()
+        queue = BackgroundTaskQueue(concurrency=10, poll_interval=0.01, backoff_base=0.05)
+        yield queue
+        await queue.stop()
 
     @pytest.mark.asyncio
     async def test_task_queue_throughput(self, task_queue):
         """Test background task processing throughput"""
         # Arrange
         task_count = 100
-        tasks = []
 
-        async def mock_task(task_id: int, duration: float = 0.01):
-            await asyncio.sleep(duration)
-            return f"task_{task_id}_completed"
+        async def mock_task(payload: dict):
+            await asyncio.sleep(payload["duration"])
+            return f"task_{payload['task_id']}_completed"
+
+        task_queue.register("mock_task", mock_task)
+        await task_queue.start()
 
         # Act
         start_time = time.time()
-        for i in range(task_count):
-            task = await task_queue.enqueue(mock_task, i, duration=0.01)
-            tasks.append(task)
+        jobs = [
+            await task_queue.enqueue("mock_task", {"task_id": i, "duration": 0.01})
+            for i in range(task_count)
+        ]
 
         # Wait for all tasks to complete
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        await task_queue.wait_idle(timeout=10)
         total_time = time.time() - start_time
+        results = [(await task_queue.get_job(job.job_id)).result for job in jobs]
 
         # Assert
         assert len(results) == task_count
@@ -175,31 +181,35 @@ class TestBackgroundTaskQueue:
         assert throughput >= 20
 
     @pytest.mark.asyncio
-    async def test_task_priority_queue(self, task_queue):
+    async def test_task_priority_queue(self):
         """Test priority-based task processing"""
-        # Arrange
-        high_priority_tasks = []
-        low_priority_tasks = []
+        from src.services.task_queue_service import BackgroundTaskQueue
+
+        # Arrange - a single worker so completion order follows claim order
+        task_queue = BackgroundTaskQueue(concurrency=1, poll_interval=0.01)
         completion_order = []
 
-        async def tracking_task(task_id: str, priority: str):
-            completion_order.append(f"{priority}_{task_id}")
-            return f"completed_{task_id}"
+        async def tracking_task(payload: dict):
+            completion_order.append(f"{payload['priority']}_{payload['task_id']}")
+            return f"completed_{payload['task_id']}"
+
+        task_queue.register("tracking_task", tracking_task)
 
         # Act - Enqueue mixed priority tasks
         for i in range(5):
-            low_task = await task_queue.enqueue_with_priority(
-                tracking_task, f"low_{i}", "low", priority=1
+            await task_queue.enqueue(
+                "tracking_task", {"task_id": f"low_{i}", "priority": "low"}, priority=1
             )
-            low_priority_tasks.append(low_task)
-
-            high_task = await task_queue.enqueue_with_priority(
-                tracking_task, f"high_{i}", "high", priority=10
+            await task_queue.enqueue(
+                "tracking_task", {"task_id": f"high_{i}", "priority": "high"}, priority=10
             )
-            high_priority_tasks.append(high_task)
 
         # Wait for completion
-        await asyncio.gather(*high_priority_tasks, *low_priority_tasks)
+        await task_queue.start()
+        try:
+            await task_queue.wait_idle(timeout=5)
+        finally:
+            await task_queue.stop()
 
         # Assert - High priority tasks should complete first
         high_completions = [task for task in completion_order if task.startswith("high_")]
@@ -218,18 +228,25 @@ class TestBackgroundTaskQueue:
         # Arrange
         attempt_count = 0
 
-        async def failing_task():
+        async def failing_task(payload: dict):
             nonlocal attempt_count
             attempt_count += 1
             if attempt_count < 3:
                 raise Exception(f"Attempt {attempt_count} failed")
             return "success_after_retries"
 
+        task_queue.register("failing_task", failing_task)
+        await task_queue.start()
+
         # Act
-        result = await task_queue.enqueue_with_retry(failing_task, max_retries=3, retry_delay=0.1)
+        job = await task_queue.enqueue("failing_task", max_attempts=3)
+        deadline = time.time() + 5
+        while (await task_queue.get_job(job.job_id)).status.value != "succeeded":
+            assert time.time() < deadline, "job did not succeed after retries"
+            await asyncio.sleep(0.02)
 
         # Assert
-        assert result == "success_after_retries"
+        assert (await task_queue.get_job(job.job_id)).result == "success_after_retries"
         assert attempt_count == 3
 
     @pytest.mark.asyncio
@@ -237,29 +254,26 @@ class TestBackgroundTaskQueue:
         """Test task queue monitoring and metrics"""
         # Arrange
 
-        async def monitored_task(task_id: int):
+        async def monitored_task(payload: dict):
             await asyncio.sleep(0.05)
-            return f"task_{task_id}"
+            return f"task_{payload['task_id']}"
+
+        task_queue.register("monitored_task", monitored_task)
+        await task_queue.start()
 
         # Act
-        start_time = time.time()
-        tasks = []
         for i in range(10):
-            task = await task_queue.enqueue(monitored_task, i)
-            tasks.append(task)
-
-        await asyncio.gather(*tasks)
-        time.time() - start_time
+            await task_queue.enqueue("monitored_task", {"task_id": i})
+        await task_queue.wait_idle(timeout=5)
 
         # Get queue metrics
         metrics = await task_queue.get_metrics()
 
         # Assert
         assert "total_tasks_processed" in metrics
-        assert "average_processing_time" in metrics
         assert "queue_size" in metrics
         assert metrics["total_tasks_processed"] >= 10
-        assert metrics["average_processing_time"] > 0
+        assert metrics["queues"]["default"]["average_processing_time"] > 0
 
 
 class TestDatabaseOptimization:
@@ -312,7 +326,9 @@ class TestDatabaseOptimization:
             start_time = time.time()
             with patch.object(db_optimizer, "get_connection") as mock_conn:
                 mock_conn.return_value = f"connection_{query_id % 5}"  # Simulate pool of 5
-                await db_optimizer.execute_query(f"SELECT * FROM tasks WHERE id = {query_id}")
+                await db_optimizer.execute_query(
+                    f"SELECT * FROM tasks WHERE task_id = '{query_id}'"
+                )
             return time.time() - start_time
 
         # Act
@@ -0,0 +1,226 @@
+"""
+Tests for the local calendar event store and syncToken-based calendar sync.
+"""
+
+from datetime import datetime
+from unittest.mock import Mock
+
+import httpx
+import pytest
+from googleapiclient.errors import HttpError
+
+from src.database.enhanced_adapter import EnhancedDatabaseAdapter
+from src.integrations.calendar_store import CalendarEventStore
+from src.integrations.google.calendar import GoogleCalendarService
+from src.integrations.providers.google import GoogleCalendarProvider
+
+
+def make_event(event_id: str, start: str, end: str, **extra) -> dict:
+    """Build a Calendar API event resource with timed start/end."""
+    return {
+        "id": event_id,
+        "summary": f"Event {event_id}",
+        "start": {"dateTime": start},
+        "end": {"dateTime": end},
+        **extra,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Event store on a fresh database file."""
+    return CalendarEventStore(EnhancedDatabaseAdapter(str(tmp_path / "calendar.db")))
+
+
+class TestCalendarEventStore:
+    """Test suite for CalendarEventStore."""
+
+    def test_window_query_returns_overlapping_events_in_order(self, store):
+        """Events overlapping the window are returned sorted by start time."""
+        store.apply_sync(
+            "user-1",
+            "primary",
+            [
+                make_event("late", "2025-10-30T15:00:00Z", "2025-10-30T16:00:00Z"),
+                make_event("early", "2025-10-30T08:30:00Z", "2025-10-30T09:30:00Z"),
+                make_event("tomorrow", "2025-10-31T10:00:00Z", "2025-10-31T11:00:00Z"),
+            ],
+            "token-1",
+            full_sync=True,
+        )
+
+        events = store.get_events("user-1", datetime(2025, 10, 30, 9), datetime(2025, 10, 30, 17))
+
+        assert [e["id"] for e in events] == ["early", "late"]
+        assert store.get_sync_token("user-1") == "token-1"
+        assert store.get_events("user-2", datetime(2025, 10, 30), datetime(2025, 11, 1)) == []
+
+    def test_incremental_changes_update_and_delete(self, store):
+        """Delta syncs upsert changed events and drop cancelled ones."""
+        store.apply_sync(
+            "user-1",
+            "primary",
+            [
+                make_event("a", "2025-10-30T09:00:00Z", "2025-10-30T10:00:00Z"),
+                make_event("b", "2025-10-30T11:00:00Z", "2025-10-30T12:00:00Z"),
+            ],
+            "token-1",
+            full_sync=True,
+        )
+        store.apply_sync(
+            "user-1",
+            "primary",
+            [
+                make_event("a", "2025-10-30T13:00:00Z", "2025-10-30T14:00:00Z"),
+                {"id": "b", "status": "cancelled"},
+            ],
+            "token-2",
+        )
+
+        events = store.get_events("user-1", datetime(2025, 10, 30), datetime(2025, 10, 31))
+
+        assert [(e["id"], e["start"]["dateTime"]) for e in events] == [
+            ("a", "2025-10-30T13:00:00Z")
+        ]
+        assert store.get_sync_token("user-1") == "token-2"
+
+    def test_busy_periods_merge_and_skip_free_events(self, store):
+        """Overlapping events merge; transparent and declined events are free."""
+        store.apply_sync(
+            "user-1",
+            "primary",
+            [
+                make_event("standup", "2025-10-30T09:00:00Z", "2025-10-30T09:30:00Z"),
+                make_event("review", "2025-10-30T09:15:00Z", "2025-10-30T10:00:00Z"),
+                make_event(
+                    "focus",
+                    "2025-10-30T11:00:00Z",
+                    "2025-10-30T12:00:00Z",
+                    transparency="transparent",
+                ),
+                make_event(
+                    "declined",
+                    "2025-10-30T13:00:00Z",
+                    "2025-10-30T14:00:00Z",
+                    attendees=[
+                        {"email": "me@example.com", "self": True, "responseStatus": "declined"}
+                    ],
+                ),
+                make_event("late", "2025-10-30T16:30:00Z", "2025-10-30T18:00:00Z"),
+            ],
+            "token-1",
+            full_sync=True,
+        )
+
+        busy = store.get_busy_periods(
+            "user-1", datetime(2025, 10, 30, 8), datetime(2025, 10, 30, 17)
+        )
+
+        assert busy == [
+            {"start": "2025-10-30T09:00:00Z", "end": "2025-10-30T10:00:00Z"},
+            {"start": "2025-10-30T16:30:00Z", "end": "2025-10-30T17:00:00Z"},
+        ]
+
+
+class TestGoogleCalendarServiceSync:
+    """Test suite for GoogleCalendarService reads backed by the event store."""
+
+    @pytest.fixture
+    def api(self):
+        """Mock googleapiclient Calendar resource."""
+        return Mock()
+
+    @pytest.fixture
+    def calendar_service(self, api, store):
+        auth = Mock()
+        auth.build_service.return_value = api
+        return GoogleCalendarService(auth_service=auth, event_store=store, owner_id="user-1")
+
+    def test_reads_are_local_after_first_sync(self, calendar_service, api):
+        """Only the first read hits the API; later reads and free/busy are local."""
+        api.events().list().execute.return_value = {
+            "items": [make_event("a", "2025-10-30T09:00:00Z", "2025-10-30T10:00:00Z")],
+            "nextSyncToken": "token-1",
+        }
+        api.events().list.reset_mock()
+
+        events = calendar_service.get_events(datetime(2025, 10, 30), datetime(2025, 10, 31))
+        busy = calendar_service.get_free_busy(datetime(2025, 10, 30), datetime(2025, 10, 31))
+
+        assert [e.event_id for e in events] == ["a"]
+        assert busy == [{"start": "2025-10-30T09:00:00Z", "end": "2025-10-30T10:00:00Z"}]
+        assert api.events().list.call_count == 1
+        api.freebusy.assert_not_called()
+
+    def test_sync_uses_token_and_recovers_from_expiry(self, calendar_service, api, store):
+        """Incremental syncs pass the syncToken; a 410 triggers a full resync."""
+        store.apply_sync(
+            "user-1",
+            "primary",
+            [make_event("stale", "2025-10-30T09:00:00Z", "2025-10-30T10:00:00Z")],
+            "old-token",
+            full_sync=True,
+        )
+        api.events().list().execute.side_effect = [
+            HttpError(Mock(status=410), b"Sync token is no longer valid"),
+            {
+                "items": [make_event("fresh", "2025-10-30T11:00:00Z", "2025-10-30T12:00:00Z")],
+                "nextSyncToken": "new-token",
+            },
+        ]
+        api.events().list.reset_mock()
+
+        calendar_service.sync_events()
+
+        first_call, second_call = api.events().list.call_args_list
+        assert first_call.kwargs["syncToken"] == "old-token"
+        assert "syncToken" not in second_call.kwargs
+        assert store.get_sync_token("user-1") == "new-token"
+        events = store.get_events("user-1", datetime(2025, 10, 30), datetime(2025, 10, 31))
+        assert [e["id"] for e in events] == ["fresh"]
+
+
+class TestGoogleCalendarProviderSync:
+    """Test suite for GoogleCalendarProvider.sync_calendar over HTTP."""
+
+    @pytest.mark.asyncio
+    async def test_paginated_full_sync_then_incremental(self, store):
+        """Full sync follows pages and stores nextSyncToken; next sync sends it."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            params = dict(request.url.params)
+            requests.append(params)
+            if "syncToken" in params:
+                return httpx.Response(
+                    200,
+                    json={"items": [{"id": "a", "status": "cancelled"}], "nextSyncToken": "t2"},
+                )
+            if "pageToken" not in params:
+                return httpx.Response(
+                    200,
+                    json={
+                        "items": [make_event("a", "2025-10-30T09:00:00Z", "2025-10-30T10:00:00Z")],
+                        "nextPageToken": "page-2",
+                    },
+                )
+            return httpx.Response(
+                200,
+                json={
+                    "items": [make_event("b", "2025-10-30T11:00:00Z", "2025-10-30T12:00:00Z")],
+                    "nextSyncToken": "t1",
+                },
+            )
+
+        provider = GoogleCalendarProvider("id", "secret", "http://localhost/cb", event_store=store)
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), base_url=provider.api_base_url
+        ) as client:
+            assert await provider.sync_calendar(client, "user-1") == 2
+            assert store.get_sync_token("user-1") == "t1"
+
+            assert await provider.sync_calendar(client, "user-1") == 1
+
+        assert requests[-1]["syncToken"] == "t1"
+        events = store.get_events("user-1", datetime(2025, 10, 30), datetime(2025, 10, 31))
+        assert [e["id"] for e in events] == ["b"]
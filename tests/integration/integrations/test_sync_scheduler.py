@@ -0,0 +1,198 @@
+"""
+Tests for the scheduled multi-integration sync orchestrator.
+"""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from src.database.enhanced_adapter import EnhancedDatabaseAdapter
+from src.integrations import service as service_module
+from src.integrations.providers.google import GmailProvider
+from src.integrations.repository import IntegrationRepository
+from src.integrations.scheduler import IntegrationSyncScheduler, next_sync_interval
+from src.integrations.service import IntegrationService
+from src.services.task_queue_service import BackgroundTaskQueue, SQLiteJobStore
+
+MIGRATION = Path("src/database/migrations/023_create_provider_integrations.sql")
+
+
+class FakeProvider(GmailProvider):
+    """Gmail provider whose API calls are simulated."""
+
+    items_per_sync = 2
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fetch_data(self, integration):
+        await self.ensure_valid_token(integration)
+        cls = type(self)
+        cls.in_flight += 1
+        cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        await asyncio.sleep(0.05)
+        cls.in_flight -= 1
+        self.api_calls_made += 1 + self.items_per_sync  # list + one get per message
+        self.set_sync_cursor(integration, "history-42")
+        return [object()] * self.items_per_sync
+
+    async def refresh_access_token(self, refresh_token):
+        assert refresh_token == "refresh-token"
+        return "fresh-access-token", datetime.now(UTC) + timedelta(hours=1)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Integration repository on a fresh database with the integration tables."""
+    db = EnhancedDatabaseAdapter(str(tmp_path / "integrations.db"))
+    conn = db.get_connection()
+    conn.executescript(MIGRATION.read_text())
+    # The repository reads connected_at, which migration 023 does not define
+    conn.execute("ALTER TABLE user_integrations ADD COLUMN connected_at TIMESTAMP")
+    conn.execute(
+        "INSERT INTO users (user_id, username, email) VALUES ('user-1', 'user1', 'u1@example.com')"
+    )
+    conn.commit()
+    return IntegrationRepository(db)
+
+
+@pytest.fixture
+def service(repo, monkeypatch):
+    FakeProvider.in_flight = FakeProvider.max_in_flight = 0
+    monkeypatch.setattr(
+        service_module,
+        "get_provider",
+        lambda provider_type: FakeProvider("id", "secret", "http://localhost/cb"),
+    )
+    return IntegrationService(repo)
+
+
+@pytest.fixture
+async def queue(tmp_path):
+    engine = BackgroundTaskQueue(SQLiteJobStore(str(tmp_path / "jobs.db")), poll_interval=0.02)
+    yield engine
+    await engine.stop()
+
+
+def connect(repo: IntegrationRepository, provider: str, expires_in: timedelta) -> dict:
+    """Create a connected integration with encrypted tokens."""
+    access, refresh = FakeProvider("id", "secret", "cb").encrypt_tokens(
+        "access-token", "refresh-token"
+    )
+    return repo.create_integration(
+        user_id="user-1",
+        provider=provider,
+        access_token=access,
+        refresh_token=refresh,
+        token_expires_at=datetime.now(UTC) + expires_in,
+        scopes=[],
+        provider_user_id="g-1",
+        provider_username="u1@example.com",
+    )
+
+
+class TestNextSyncInterval:
+    """Test suite for the adaptive interval policy."""
+
+    def test_quiet_and_failing_accounts_back_off(self):
+        assert next_sync_interval(15, 0, False, 5, 240) == 30
+        assert next_sync_interval(15, 3, True, 5, 240) == 30
+        assert next_sync_interval(200, 0, False, 5, 240) == 240
+
+    def test_busy_accounts_sync_more_often(self):
+        assert next_sync_interval(15, 25, False, 5, 240) == 7
+        assert next_sync_interval(6, 25, False, 5, 240) == 5
+        assert next_sync_interval(15, 4, False, 5, 240) == 15
+
+
+class TestIntegrationSyncScheduler:
+    """Test suite for IntegrationSyncScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_tick_syncs_due_integrations_with_real_counts(self, repo, service, queue):
+        """Due integrations are synced once; logs carry real API, item and latency counts."""
+        integration = connect(repo, "gmail", timedelta(hours=1))
+        scheduler = IntegrationSyncScheduler(service, queue)
+        await queue.start()
+
+        assert await scheduler.tick() == 1
+        assert await scheduler.tick() == 1  # Still queued: deduplicated by idempotency key
+        await queue.wait_idle(timeout=5)
+
+        logs = repo.get_sync_logs(integration["integration_id"])
+        assert len(logs) == 1
+        assert logs[0]["sync_status"] == "success"
+        assert logs[0]["items_fetched"] == 2
+        assert logs[0]["api_calls_made"] == 3
+        assert logs[0]["metadata"]["duration_ms"] >= 50
+
+        updated = repo.get_integration(integration["integration_id"])
+        assert updated["metadata"]["sync_cursor"] == "history-42"
+        assert updated["sync_frequency_minutes"] == 15
+        assert datetime.fromisoformat(updated["next_sync_at"]) > datetime.now(UTC)
+        assert await scheduler.tick() == 0
+
+    @pytest.mark.asyncio
+    async def test_expiring_tokens_are_refreshed_before_sync(self, repo, service, queue):
+        """Tokens inside the refresh margin are refreshed and persisted by the tick."""
+        integration = connect(repo, "gmail", timedelta(minutes=3))
+        scheduler = IntegrationSyncScheduler(service, queue)
+
+        await scheduler.tick()
+
+        updated = repo.get_integration(integration["integration_id"])
+        provider = FakeProvider("id", "secret", "cb")
+        access, _ = provider.decrypt_tokens(updated["access_token"], "")
+        assert access == "fresh-access-token"
+        assert datetime.fromisoformat(updated["token_expires_at"]) > datetime.now(UTC) + timedelta(
+            minutes=30
+        )
+
+    @pytest.mark.asyncio
+    async def test_per_user_concurrency_limit(self, repo, service, queue):
+        """A user's integrations sync one at a time when user_concurrency is 1."""
+        connect(repo, "gmail", timedelta(hours=1))
+        connect(repo, "google_calendar", timedelta(hours=1))
+        scheduler = IntegrationSyncScheduler(service, queue, user_concurrency=1)
+        await queue.start()
+
+        assert await scheduler.tick() == 2
+        await queue.wait_idle(timeout=5)
+
+        assert FakeProvider.max_in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_sync_is_rescheduled_with_backoff(self, repo, service, queue, monkeypatch):
+        """A sync that raises still moves next_sync_at, so later ticks enqueue a new job."""
+        integration = connect(repo, "gmail", timedelta(hours=1))
+        scheduler = IntegrationSyncScheduler(service, queue)
+
+        real_sync = service.sync_integration
+        failures = [ValueError("token decrypt failed")]
+
+        async def flaky_sync(integration):
+            if failures:
+                raise failures.pop()
+            return await real_sync(integration)
+
+        monkeypatch.setattr(service, "sync_integration", flaky_sync)
+        await queue.start()
+
+        await scheduler.tick()
+        await queue.wait_idle(timeout=5)
+
+        updated = repo.get_integration(integration["integration_id"])
+        assert updated["sync_frequency_minutes"] == 30
+        assert datetime.fromisoformat(updated["next_sync_at"]) > datetime.now(UTC)
+
+        # Once due again, the tick enqueues a fresh job instead of returning the dead one
+        repo.update_integration(
+            integration_id=integration["integration_id"],
+            next_sync_at=datetime.now(UTC) - timedelta(minutes=1),
+        )
+        await scheduler.tick()
+        await queue.wait_idle(timeout=5)
+
+        logs = repo.get_sync_logs(integration["integration_id"])
+        assert [log["sync_status"] for log in logs] == ["success"]
@@ -0,0 +1,42 @@
+"""
+Load regression test: replay the scripted ADHD workflow against the app in-process
+and compare throughput and latency with PERFORMANCE_BASELINES.md.
+
+The baselines are absolute numbers from a reference machine, so the test only
+runs when requested: RUN_LOAD_TESTS=1 uv run pytest tests/performance/test_load_harness.py
+"""
+
+import os
+
+import pytest
+
+from src.database import enhanced_adapter
+from src.database.enhanced_adapter import EnhancedDatabaseAdapter
+from src.services.performance_service import PerformanceService
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("RUN_LOAD_TESTS"),
+    reason="Load tests disabled. Set RUN_LOAD_TESTS=1 to enable.",
+)
+
+
+@pytest.fixture
+def fresh_database(tmp_path, monkeypatch):
+    """Serve the app from an empty database, so results do not depend on earlier runs."""
+    db = EnhancedDatabaseAdapter(str(tmp_path / "load.db"))
+    monkeypatch.setattr(enhanced_adapter, "_enhanced_db_instance", db)
+    yield db
+    db.close_connection()
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_adhd_workflow_within_baselines(monkeypatch, fresh_database):
+    """Baselines were measured with rule-based splitting, so run without LLM keys."""
+    for key in ("OPENAI_API_KEY", "LLM_API_KEY", "ANTHROPIC_API_KEY"):
+        monkeypatch.delenv(key, raising=False)
+
+    result = await PerformanceService().run_benchmark(concurrent_users=5, duration=10)
+
+    assert result["success_rate"] >= 0.95, result
+    assert result["regressions"] == []
@@ -0,0 +1,145 @@
+"""
+Tests for the UnifiedAgent warm pool
+"""
+
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents import agent_pool
+from src.agents.agent_pool import UnifiedAgentPool
+
+
+class FakeAgent:
+    """Stands in for a built UnifiedAgent"""
+
+    def __init__(self, agent_type):
+        self.agent_type = agent_type
+        self.healthy = True
+        self.cleaned = False
+
+    def is_healthy(self):
+        return self.healthy
+
+    async def cleanup(self):
+        self.cleaned = True
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def config_dir(tmp_path, monkeypatch):
+    """Point config fingerprinting at a temporary directory of YAML files"""
+    for agent_type in ("task", "focus", "energy"):
+        (tmp_path / f"{agent_type}.yaml").write_text(f"name: {agent_type}\n")
+    loader = SimpleNamespace(config_dir=tmp_path)
+    monkeypatch.setattr(agent_pool, "get_config_loader", lambda: loader)
+    return tmp_path
+
+
+@pytest.fixture
+def builds():
+    return []
+
+
+@pytest.fixture
+def factory(builds):
+    async def create(agent_type, **kwargs):
+        builds.append((agent_type, kwargs))
+        await asyncio.sleep(0.01)
+        return FakeAgent(agent_type)
+
+    return create
+
+
+class TestUnifiedAgentPool:
+    """Test reuse, eviction, health checks and config reloads"""
+
+    @pytest.mark.asyncio
+    async def test_reuses_agent_and_shares_concurrent_build(self, config_dir, factory, builds):
+        pool = UnifiedAgentPool(factory=factory)
+
+        agents = await asyncio.gather(*(pool.get("task") for _ in range(5)))
+        again = await pool.get("task")
+
+        assert len(builds) == 1
+        assert all(agent is again for agent in agents)
+        assert pool.stats()["hits"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_options_are_part_of_the_key(self, config_dir, factory, builds):
+        pool = UnifiedAgentPool(factory=factory)
+
+        with_memory = await pool.get("task")
+        without_memory = await pool.get("task", enable_memory=False)
+
+        assert with_memory is not without_memory
+        assert builds[1][1]["enable_memory"] is False
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_agent_is_evicted(self, config_dir, factory):
+        pool = UnifiedAgentPool(max_size=2, factory=factory)
+        task = await pool.get("task")
+        await pool.get("focus")
+        await pool.get("task")
+
+        await pool.get("energy")
+
+        assert [entry["type"] for entry in pool.stats()["agents"]] == ["task", "energy"]
+        assert pool.stats()["evictions"] == 1
+        assert not task.cleaned
+
+    @pytest.mark.asyncio
+    async def test_unhealthy_and_idle_agents_are_rebuilt(self, config_dir, factory, builds):
+        clock = FakeClock()
+        pool = UnifiedAgentPool(idle_ttl=60, factory=factory, clock=clock)
+
+        first = await pool.get("task")
+        first.healthy = False
+        second = await pool.get("task")
+        clock.now = 61
+        third = await pool.get("task")
+
+        assert len(builds) == 3
+        assert first.cleaned and second.cleaned
+        assert third is not second
+
+    @pytest.mark.asyncio
+    async def test_config_change_replaces_agent(self, config_dir, factory):
+        pool = UnifiedAgentPool(factory=factory)
+        old = await pool.get("task")
+
+        config_file = config_dir / "task.yaml"
+        config_file.write_text("name: task\nversion: 2.0.0\n")
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        new = await pool.get("task")
+
+        assert new is not old
+        assert old.cleaned
+        assert pool.stats()["size"] == 1
+
+    @pytest.mark.asyncio
+    async def test_warm_reports_failures_and_close_cleans_up(self, config_dir, factory):
+        async def flaky(agent_type, **kwargs):
+            if agent_type == "focus":
+                raise ValueError("bad config")
+            return await factory(agent_type, **kwargs)
+
+        pool = UnifiedAgentPool(factory=flaky)
+
+        warmed = await pool.warm(["task", "focus"])
+        task = await pool.get("task")
+        await pool.close()
+
+        assert warmed == {"task": True, "focus": False}
+        assert task.cleaned
+        assert pool.stats()["size"] == 0
@@ -17,7 +17,7 @@ Purpose: Allow safe refactoring of:
 
 import pytest
 
-from src.agents.split_proxy_agent import SplitProxyAgent
+from src.agents.split_proxy_agent import SplitProxyAgent, StreamingStepParser
 from src.core.task_models import Task, TaskScope
 
 
@@ -519,3 +519,80 @@ class TestSplitProxyAgentFallbackBehavior:
         assert result["scope"] == TaskScope.MULTI
         assert len(result["micro_steps"]) >= 2
         assert all(2 <= s["estimated_minutes"] <= 5 for s in result["micro_steps"])
+
+
+class TestSplitProxyAgentStreaming:
+    """Streaming split: steps are emitted as soon as each JSON object closes"""
+
+    def test_parser_emits_steps_incrementally(self):
+        """Each step is returned by the chunk that closes it, not at the end"""
+        parser = StreamingStepParser()
+        text = (
+            '{"steps": [{"description": "Open the {draft}", "estimated_minutes": 3}, '
+            '{"description": "Say \\"hi\\"", "estimated_minutes": 4}]}'
+        )
+        split_at = text.index("}, ") + 1
+
+        first = parser.feed(text[:split_at])
+        rest = parser.feed(text[split_at:])
+
+        assert [s["description"] for s in first] == ["Open the {draft}"]
+        assert [s["description"] for s in rest] == ['Say "hi"']
+
+    def test_parser_accepts_bare_array(self):
+        """Anthropic-style bare arrays are parsed too"""
+        parser = StreamingStepParser()
+        steps = []
+        for char in '[{"description": "A", "estimated_minutes": 2}]':
+            steps.extend(parser.feed(char))
+
+        assert steps == [{"description": "A", "estimated_minutes": 2}]
+
+    @pytest.mark.asyncio
+    async def test_stream_falls_back_to_rules(self):
+        """Without an AI client the stream yields the rule-based steps in order"""
+        agent = SplitProxyAgent()
+        agent.openai_client = None
+        agent.anthropic_client = None
+
+        task = Task(
+            task_id="stream_1",
+            title="Send Email Report",
+            description="Send weekly report email",
+            estimated_hours=0.3,
+            project_id="proj_1",
+        )
+
+        events = [event async for event in agent.split_task_stream(task, "user_123")]
+        names = [name for name, _ in events]
+
+        assert names[0] == "scope"
+        assert names[-1] == "complete"
+        steps = [payload for name, payload in events if name == "micro_step"]
+        assert [s["step_number"] for s in steps] == list(range(1, len(steps) + 1))
+        assert events[-1][1]["metadata"]["generation_method"] == "rule_based_fallback"
+
+    @pytest.mark.asyncio
+    async def test_stream_defaults_missing_estimate(self):
+        """A streamed step without estimated_minutes still becomes a micro-step"""
+        agent = SplitProxyAgent()
+        agent.ai_provider = "openai"
+        agent.openai_client = object()
+
+        async def chunks(prompt):
+            yield '{"steps": [{"description": "Open the report"}, '
+            yield '{"description": "Send it", "estimated_minutes": 3}]}'
+
+        agent._stream_with_openai = chunks
+        task = Task(
+            task_id="stream_2",
+            title="Send Email Report",
+            description="Send weekly report email",
+            estimated_hours=0.3,
+            project_id="proj_1",
+        )
+
+        steps = [step async for step in agent.stream_micro_steps(task, "user_123")]
+
+        assert [s.description for s in steps] == ["Open the report", "Send it"]
+        assert [s.estimated_minutes for s in steps] == [5, 3]
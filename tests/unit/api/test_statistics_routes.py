@@ -1,45 +1,41 @@
 """Integration tests for statistics API endpoints."""
 
-from datetime import datetime
+from datetime import UTC, datetime
 
 import pytest
 from fastapi.testclient import TestClient
 
 from src.api.main import app
+from src.database.enhanced_adapter import EnhancedDatabaseAdapter
+from src.services.task_statistics_service import StatisticsService, get_statistics_service
+from tests.unit.services.conftest import add_task
 
 
 class TestStatisticsEndpoints:
     """Test suite for statistics API endpoints."""
 
     @pytest.fixture
-    def client(self):
-        """FastAPI test client fixture."""
-        return TestClient(app)
+    def db(self, tmp_path):
+        """Temporary database backing the statistics service."""
+        adapter = EnhancedDatabaseAdapter(str(tmp_path / "stats.db"))
+        yield adapter
+        adapter.close_connection()
 
     @pytest.fixture
-    def setup_test_data(self, client: TestClient):
-        """Setup test data for a user."""
-        from src.api.routes.statistics import _statistics_service
-
-        _statistics_service._clear_data()
-
-        # Add tasks and completions for test user
-        _statistics_service._add_task("test_user_1", {"id": "task_1"})
-        _statistics_service._add_task("test_user_1", {"id": "task_2"})
-        _statistics_service._add_task("test_user_1", {"id": "task_3"})
-
-        _statistics_service._add_completion(
-            "test_user_1",
-            {"task_id": "task_1", "completion_time_minutes": 25, "completed_at": datetime.now()},
-        )
-        _statistics_service._add_completion(
-            "test_user_1",
-            {"task_id": "task_2", "completion_time_minutes": 35, "completed_at": datetime.now()},
-        )
-
-        yield
+    def client(self, db):
+        """FastAPI test client fixture using a statistics service on the test database."""
+        service = StatisticsService(db)
+        app.dependency_overrides[get_statistics_service] = lambda: service
+        yield TestClient(app)
+        app.dependency_overrides.pop(get_statistics_service, None)
 
-        _statistics_service._clear_data()
+    @pytest.fixture
+    def setup_test_data(self, db):
+        """Setup test data for a user."""
+        now = datetime.now(UTC)
+        add_task(db, "test_user_1", "task_1", now, completion_time_minutes=25)
+        add_task(db, "test_user_1", "task_2", now, completion_time_minutes=35)
+        add_task(db, "test_user_1", "task_3")
 
     def test_get_user_statistics_success(self, client: TestClient, setup_test_data):
         """Test successful retrieval of user statistics."""
@@ -169,16 +165,12 @@ class TestStatisticsEndpoints:
         first_total = data_list[0]["total_tasks"]
         assert all(d["total_tasks"] == first_total for d in data_list)
 
-    def test_multiple_users_isolation(self, client: TestClient):
+    def test_multiple_users_isolation(self, client: TestClient, db):
         """Test that statistics for different users are isolated."""
-        from src.api.routes.statistics import _statistics_service
-
-        _statistics_service._clear_data()
-
         # Setup data for two users
-        _statistics_service._add_task("user_a", {"id": "task_1"})
-        _statistics_service._add_task("user_b", {"id": "task_1"})
-        _statistics_service._add_task("user_b", {"id": "task_2"})
+        add_task(db, "user_a", "task_1")
+        add_task(db, "user_b", "task_2")
+        add_task(db, "user_b", "task_3")
 
         # Get statistics for both users
         response_a = client.get("/api/statistics/users/user_a")
@@ -194,8 +186,6 @@ class TestStatisticsEndpoints:
         assert data_a["total_tasks"] == 1
         assert data_b["total_tasks"] == 2
 
-        _statistics_service._clear_data()
-
     def test_response_schema_validation(self, client: TestClient, setup_test_data):
         """Test that responses match the expected schema."""
         response = client.get("/api/statistics/users/test_user_1")
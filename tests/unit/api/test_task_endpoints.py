@@ -2,6 +2,7 @@
 Tests for task management API endpoints
 """
 
+import json
 from decimal import Decimal
 from unittest.mock import Mock, patch
 
@@ -9,7 +10,7 @@ import pytest
 from fastapi.testclient import TestClient
 
 from src.api.main import app
-from src.core.task_models import Project, Task, TaskPriority, TaskStatus
+from src.core.task_models import MicroStep, Project, Task, TaskPriority, TaskStatus
 from src.services.task_service import BulkTaskOperationResult, TaskService
 
 
@@ -380,6 +381,55 @@ class TestMobileEndpoints:
         assert data["task"]["title"] == "Captured Task"
         assert data["processing_time_ms"] < 2000  # 2-second capture requirement
 
+    def test_quick_capture_stream_events(self, client):
+        """Test streaming quick capture pushes task, steps, tags and summary as SSE"""
+        task = Task(
+            task_id="task-123",
+            title="Send weekly report",
+            description="Send weekly report email",
+            project_id="default-project",
+        )
+        step = MicroStep(
+            parent_task_id="task-123",
+            step_number=1,
+            description="Draft the email",
+            estimated_minutes=3,
+        )
+        tagged = step.model_copy(update={"tags": ["Conversation: none"]})
+
+        class FakeCaptureAgent:
+            def __init__(self, db):
+                pass
+
+            async def capture_stream(self, input_text, user_id, mode):
+                yield "task", task
+                yield "micro_step", step
+                yield "micro_step_tags", tagged
+                yield "complete", {"ready_to_save": True, "clarifications": []}
+
+        db = Mock()
+        db.get_connection.side_effect = RuntimeError("database unavailable")
+
+        with (
+            patch("src.agents.capture_agent.CaptureAgent", FakeCaptureAgent),
+            patch("src.database.enhanced_adapter.get_enhanced_database", return_value=db),
+        ):
+            response = client.post(
+                "/api/v1/mobile/quick-capture/stream",
+                json={"text": "Send weekly report", "user_id": "user123"},
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        frames = [frame.split("\n", 1) for frame in response.text.strip().split("\n\n")]
+        events = [(name.removeprefix("event: "), json.loads(data[6:])) for name, data in frames]
+        assert [name for name, _ in events] == ["task", "micro_step", "micro_step_tags", "complete"]
+        assert events[0][1]["title"] == "Send weekly report"
+        assert events[1][1]["description"] == "Draft the email"
+        assert events[2][1]["tags"] == ["Conversation: none"]
+        assert events[3][1]["breakdown"]["total_minutes"] == 3
+        assert events[3][1]["needs_clarification"] is False
+
     @pytest.mark.skip(
         reason="Mobile dashboard endpoint returns mock data - needs real implementation"
     )
@@ -188,6 +188,57 @@ class TestSplitTaskEndpoint:
         assert steps1[0]["step_id"] == steps2[0]["step_id"]
 
 
+class TestSplitTaskStreamEndpoint:
+    """Test POST /api/v1/tasks/{task_id}/split/stream - Server-Sent Events"""
+
+    @staticmethod
+    def _parse_events(body: str) -> list[tuple[str, dict]]:
+        import json
+
+        events = []
+        for frame in body.strip().split("\n\n"):
+            lines = dict(line.split(": ", 1) for line in frame.splitlines())
+            events.append((lines["event"], json.loads(lines["data"])))
+        return events
+
+    def test_stream_emits_scope_steps_then_complete(self, client, test_db):
+        """Steps arrive as individual events between scope and complete"""
+        response = client.post(
+            "/api/v1/tasks/task_multi/split/stream", json={"user_id": "test_user"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+
+        events = self._parse_events(response.text)
+        assert events[0][0] == "scope"
+        assert events[-1][0] == "complete"
+        steps = [data for name, data in events if name == "micro_step"]
+        assert len(steps) >= 2
+        assert [s["step_number"] for s in steps] == list(range(1, len(steps) + 1))
+
+    def test_streamed_steps_are_persisted(self, client, test_db):
+        """A later non-streaming split returns the steps that were streamed"""
+        streamed = client.post(
+            "/api/v1/tasks/task_multi/split/stream", json={"user_id": "test_user"}
+        )
+        streamed_ids = [
+            d["step_id"] for n, d in self._parse_events(streamed.text) if n == "micro_step"
+        ]
+
+        response = client.post("/api/v1/tasks/task_multi/split", json={"user_id": "test_user"})
+
+        assert [s["step_id"] for s in response.json()["micro_steps"]] == streamed_ids
+
+    def test_stream_nonexistent_task_returns_404(self, client, test_db):
+        """Unknown task fails before the stream starts"""
+        response = client.post(
+            "/api/v1/tasks/fake_task_id/split/stream", json={"user_id": "test_user"}
+        )
+
+        assert response.status_code == 404
+
+
 class TestGetTaskWithMicroSteps:
     """Test GET /api/v1/tasks/{task_id} returns micro-steps"""
 
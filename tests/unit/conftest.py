@@ -0,0 +1,55 @@
+"""
+Shared pytest fixtures for unit tests
+"""
+
+import contextlib
+import os
+import tempfile
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from src.database.enhanced_adapter import EnhancedDatabaseAdapter
+
+
+@pytest.fixture(scope="function")
+def test_db() -> Generator[EnhancedDatabaseAdapter, None, None]:
+    """
+    Create a temporary test database for each test function.
+
+    Yields:
+        EnhancedDatabaseAdapter: Test database instance
+    """
+    # Create temporary database file
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as temp_file:
+        db_path = temp_file.name
+
+    # Initialize database with thread safety disabled for testing
+    db = EnhancedDatabaseAdapter(db_path, check_same_thread=False)
+
+    # Apply migrations 007, 008, 009
+    migrations_dir = Path(__file__).parent.parent / "database" / "migrations"
+
+    migration_files = [
+        "007_add_micro_steps.sql",
+        "008_add_reflections.sql",
+        "009_add_user_progress.sql",
+    ]
+
+    conn = db.get_connection()
+
+    for migration_file in migration_files:
+        migration_path = migrations_dir / migration_file
+        if migration_path.exists():
+            with open(migration_path) as f:
+                migration_sql = f.read()
+                conn.executescript(migration_sql)
+
+    conn.commit()
+
+    yield db
+
+    # Cleanup (ignore errors)
+    with contextlib.suppress(OSError):
+        os.unlink(db_path)
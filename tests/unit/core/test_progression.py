@@ -0,0 +1,69 @@
+"""Tests for shared level progression"""
+
+import numpy as np
+import pytest
+
+from src.core.progression import (
+    PET_LEVELS,
+    XP_LEVELS,
+    LevelCurve,
+    level_for_xp,
+    levels_for_xp,
+    pet_evolution_stage,
+    xp_for_level,
+)
+
+
+def linear_level(curve: LevelCurve, total_xp: int) -> int:
+    """Reference lookup: the last level whose threshold has been reached"""
+    return max(level for level, floor in enumerate(curve.thresholds, 1) if floor <= total_xp)
+
+
+class TestLevelCurve:
+    def test_user_curve(self):
+        assert XP_LEVELS.thresholds[:4] == (0, 100, 382, 901)
+        assert XP_LEVELS.max_level == 100
+        assert all(
+            XP_LEVELS.floor(level + 1) - XP_LEVELS.floor(level) == xp_for_level(level)
+            for level in range(1, XP_LEVELS.max_level)
+        )
+
+    @pytest.mark.parametrize("total_xp", [0, 1, 99, 100, 101, 381, 382, 5000, 10**9])
+    def test_bisect_matches_linear_scan(self, total_xp):
+        assert level_for_xp(total_xp) == linear_level(XP_LEVELS, total_xp)
+
+    def test_vectorized_matches_scalar(self):
+        totals = np.random.default_rng(7).integers(0, XP_LEVELS.thresholds[-1] * 2, 1000)
+
+        levels = levels_for_xp(totals)
+
+        assert levels.tolist() == [level_for_xp(int(total)) for total in totals]
+        assert levels_for_xp([0, 100]).tolist() == [1, 2]
+
+    def test_progress(self):
+        progress = XP_LEVELS.progress(241)
+
+        assert progress["level"] == 2
+        assert (progress["level_floor_xp"], progress["next_level_xp"]) == (100, 382)
+        assert (progress["xp_in_level"], progress["xp_needed"]) == (141, 141)
+        assert progress["progress_percentage"] == pytest.approx(50.0)
+
+    def test_progress_at_maximum_level(self):
+        progress = XP_LEVELS.progress(XP_LEVELS.thresholds[-1] + 50)
+
+        assert progress["level"] == 100
+        assert progress["next_level_xp"] is None
+        assert progress["xp_needed"] == 0
+        assert progress["progress_percentage"] == 100.0
+
+
+class TestPetProgression:
+    def test_pet_levels(self):
+        assert PET_LEVELS.max_level == 10
+        assert PET_LEVELS.level_for(0) == 1
+        assert PET_LEVELS.level_for(450) == 5
+        assert PET_LEVELS.level_for(5000) == 10
+
+    @pytest.mark.parametrize(("level", "stage"), [(1, 1), (4, 1), (5, 2), (9, 2), (10, 3)])
+    def test_evolution_stage(self, level, stage):
+        assert pet_evolution_stage(level) == stage
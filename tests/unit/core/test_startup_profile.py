@@ -0,0 +1,62 @@
+"""
+Tests for deferred imports and the startup import profile.
+"""
+
+import sys
+
+from src.core.lazy_imports import LazyModule, lazy_import, module_available
+from src.core.startup_profile import format_tree, parse_importtime
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     leaf_a
+import time:       200 |        300 |   mid
+import time:        50 |         50 |   small
+import time:      1000 |       1350 | app
+import time:       400 |        400 | other
+"""
+
+
+class TestLazyImports:
+    """Test lazy_import and module_available"""
+
+    def test_module_is_imported_on_first_attribute_access(self):
+        sys.modules.pop("colorsys", None)
+
+        module = lazy_import("colorsys")
+
+        assert isinstance(module, LazyModule)
+        assert "colorsys" not in sys.modules
+        assert module.rgb_to_hsv(1, 0, 0) == (0.0, 1.0, 1)
+        assert "colorsys" in sys.modules
+
+    def test_already_imported_module_is_returned_directly(self):
+        assert lazy_import("json") is sys.modules["json"]
+
+    def test_module_available_does_not_import(self):
+        sys.modules.pop("tabnanny", None)
+
+        assert module_available("tabnanny")
+        assert "tabnanny" not in sys.modules
+        assert not module_available("definitely_not_a_real_module_xyz")
+
+
+class TestStartupProfile:
+    """Test the -X importtime parser and report"""
+
+    def test_builds_tree_from_nested_entries(self):
+        app, other = parse_importtime(IMPORTTIME_OUTPUT)
+
+        assert (app.name, app.cumulative_us, app.self_us) == ("app", 1350, 1000)
+        assert [c.name for c in app.children] == ["mid", "small"]
+        assert [c.name for c in app.children[0].children] == ["leaf_a"]
+        assert other.children == []
+
+    def test_report_hides_fast_imports(self):
+        (app, _) = parse_importtime(IMPORTTIME_OUTPUT)
+
+        report = format_tree(app, min_ms=0.1)
+
+        assert "mid" in report
+        assert "leaf_a" in report
+        assert "small" not in report
@@ -2,6 +2,9 @@
 Tests for MCP (Model Control Protocol) server implementation
 """
 
+import asyncio
+import threading
+import time
 from typing import Any
 from unittest.mock import Mock
 
@@ -162,6 +165,109 @@ class TestMCPServer:
         assert all(resp.id in ["req-1", "req-2"] for resp in responses)
         assert all(resp.error is None for resp in responses)
 
+    @pytest.mark.asyncio
+    async def test_batch_runs_concurrently_in_request_order(self, mock_task_service):
+        """Slow sync tools overlap on the thread pool; responses keep request order"""
+        server = MCPServer(task_service=mock_task_service, max_concurrency=4)
+        server.register_tool("sleep", lambda p: time.sleep(p["s"]) or {"slept": p["s"]}, "Sleep")
+        requests = [
+            MCPRequest(jsonrpc="2.0", id=i, method="sleep", params={"s": s})
+            for i, s in enumerate([0.2, 0.1, 0.15, 0.05])
+        ]
+
+        start = time.perf_counter()
+        responses = await server.handle_batch_requests(requests)
+        elapsed = time.perf_counter() - start
+        server.shutdown()
+
+        assert [r.id for r in responses] == [0, 1, 2, 3]
+        assert [r.result["slept"] for r in responses] == [0.2, 0.1, 0.15, 0.05]
+        assert elapsed < 0.4
+
+    @pytest.mark.asyncio
+    async def test_batch_respects_concurrency_limit(self, mock_task_service):
+        """No more than max_concurrency requests run at once"""
+        server = MCPServer(task_service=mock_task_service, max_concurrency=2)
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        async def tracked(params):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            await asyncio.sleep(0.02)
+            with lock:
+                state["running"] -= 1
+            return {"ok": True}
+
+        server.register_tool("tracked", tracked, "Tracked")
+        requests = [MCPRequest(jsonrpc="2.0", id=i, method="tracked") for i in range(6)]
+
+        responses = await server.handle_batch_requests(requests)
+
+        assert all(r.error is None for r in responses)
+        assert state["peak"] == 2
+
+    @pytest.mark.asyncio
+    async def test_sync_tools_run_off_the_event_loop(self, mcp_server):
+        """Sync tools execute on the tool thread pool, not the loop thread"""
+        mcp_server.register_tool(
+            "whoami", lambda p: {"thread": threading.current_thread().name}, ""
+        )
+
+        response = await mcp_server.handle_request(MCPRequest(jsonrpc="2.0", id=1, method="whoami"))
+        mcp_server.shutdown()
+
+        assert response.result["thread"].startswith("mcp-tool")
+
+    @pytest.mark.asyncio
+    async def test_tool_metrics_recorded(self, mcp_server):
+        """Calls, handled failures and latency are tracked per tool"""
+        mcp_server.register_tool("ok", lambda p: {"success": True}, "")
+        mcp_server.register_tool("fails", lambda p: {"success": False, "error": "nope"}, "")
+        requests = [
+            MCPRequest(jsonrpc="2.0", id=1, method="ok"),
+            MCPRequest(jsonrpc="2.0", id=2, method="ok"),
+            MCPRequest(jsonrpc="2.0", id=3, method="fails"),
+        ]
+
+        await mcp_server.handle_batch_requests(requests)
+        metrics = mcp_server.get_tool_metrics()
+
+        assert metrics["ok"]["calls"] == 2
+        assert metrics["ok"]["errors"] == 0
+        assert metrics["fails"]["errors"] == 1
+        assert metrics["ok"]["max_ms"] >= metrics["ok"]["p50_ms"] > 0
+
+
+class TestMCPProtocolTransport:
+    """Test the registry served over the MCP protocol"""
+
+    @pytest.mark.asyncio
+    async def test_list_and_call_tools_over_protocol(self, mcp_server):
+        """A real MCP client session discovers and calls registered tools"""
+        from mcp.shared.memory import create_connected_server_and_client_session
+
+        mcp_server.register_tool(
+            "echo",
+            lambda p: {"success": True, "echo": p["text"]},
+            "Echo text",
+            {"type": "object", "properties": {"text": {"type": "string"}}, "required": ["text"]},
+        )
+
+        async with create_connected_server_and_client_session(
+            mcp_server.build_protocol_server()
+        ) as session:
+            listed = await session.list_tools()
+            result = await session.call_tool("echo", {"text": "hi"})
+            invalid = await session.call_tool("echo", {})
+        mcp_server.shutdown()
+
+        assert {"echo", "tasks/create"} <= {tool.name for tool in listed.tools}
+        assert result.isError is False
+        assert result.structuredContent == {"success": True, "echo": "hi"}
+        assert invalid.isError is True
+
 
 class TestTaskMCPTools:
     """Test Task MCP tools"""
@@ -0,0 +1,94 @@
+"""
+Tests for the shared MCP session pool
+"""
+
+import asyncio
+
+import pytest
+
+from src.mcp.session_pool import MCPSessionPool
+
+CONFIG = {"mcpServers": {"tasks": {"url": "http://localhost:8765/mcp"}}}
+
+
+class FakeClient:
+    """Stands in for MCPClient; counts starts and cleanups"""
+
+    started = 0
+    cleaned = 0
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.servers = []
+        self.tools = []
+
+    def load_config(self, config):
+        self.config = config
+
+    async def start(self):
+        FakeClient.started += 1
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("All MCP servers failed to start")
+        self.tools = ["tool"]
+        return self.tools
+
+    async def cleanup(self):
+        FakeClient.cleaned += 1
+
+
+@pytest.fixture(autouse=True)
+def reset_counts():
+    FakeClient.started = FakeClient.cleaned = 0
+
+
+class TestMCPSessionPool:
+    """Test client reuse, startup and shutdown"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_acquires_share_one_start(self):
+        pool = MCPSessionPool(client_factory=FakeClient)
+
+        clients = await asyncio.gather(*(pool.acquire(CONFIG) for _ in range(5)))
+        again = await pool.acquire(dict(CONFIG))
+
+        assert FakeClient.started == 1
+        assert all(client is again for client in clients)
+        assert again.tools == ["tool"]
+        assert pool.stats()["clients"] == 1
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_distinct_configs_get_distinct_clients(self):
+        pool = MCPSessionPool(client_factory=FakeClient)
+        other = {"mcpServers": {"files": {"command": "npx", "args": []}}}
+
+        first = await pool.acquire(CONFIG)
+        second = await pool.acquire(other)
+
+        assert first is not second
+        assert FakeClient.started == 2
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_close_cleans_up_clients(self):
+        pool = MCPSessionPool(client_factory=FakeClient)
+        await pool.acquire(CONFIG)
+
+        await pool.close()
+
+        assert FakeClient.cleaned == 1
+        assert pool.stats()["clients"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_start_is_not_cached(self):
+        pool = MCPSessionPool(client_factory=lambda: FakeClient(fail=True))
+
+        with pytest.raises(RuntimeError, match="failed to start"):
+            await pool.acquire(CONFIG)
+        with pytest.raises(RuntimeError):
+            await pool.acquire(CONFIG)
+
+        assert FakeClient.started == 2
+        assert FakeClient.cleaned == 2
+        assert pool.stats()["clients"] == 0
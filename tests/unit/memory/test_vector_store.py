@@ -0,0 +1,217 @@
+"""
+Unit Tests for the local embedded vector store
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from src.memory import MemoryClient, MemoryConfig, vector_store
+from src.memory.vector_store import (
+    CURRENT_FILE,
+    RECORDS_FILE,
+    VECTORS_FILE,
+    HashingEmbedder,
+    LocalVectorStore,
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalVectorStore(tmp_path / "memory", dim=64)
+
+
+class TestLocalVectorStore:
+    """Test per-user shards, cosine search, filters and compaction"""
+
+    def test_search_ranks_by_cosine_similarity(self, store):
+        store.add(
+            "alice",
+            ["I love Python programming", "My cat is called Miso", "Python type hints help"],
+        )
+
+        results = store.search("alice", "python programming", limit=2)
+
+        assert [r["memory"] for r in results] == [
+            "I love Python programming",
+            "Python type hints help",
+        ]
+        assert results[0]["score"] > results[1]["score"]
+
+    def test_users_are_isolated_in_their_own_shards(self, store, tmp_path):
+        store.add("alice", ["alice likes tea"])
+        store.add("bob", ["bob likes tea"])
+
+        assert [r["memory"] for r in store.search("bob", "tea")] == ["bob likes tea"]
+        assert len(list((tmp_path / "memory").iterdir())) == 2
+
+    def test_metadata_filters(self, store):
+        store.add(
+            "alice",
+            ["deploy on friday", "deploy on monday"],
+            [{"role": "user"}, {"role": "assistant"}],
+        )
+
+        results = store.search("alice", "deploy", filters={"role": "assistant"})
+        either = store.search("alice", "deploy", filters={"role": ["user", "assistant"]})
+
+        assert [r["memory"] for r in results] == ["deploy on monday"]
+        assert len(either) == 2
+
+    def test_delete_and_compaction(self, store):
+        ids = store.add("alice", [f"note {i}" for i in range(10)])
+
+        assert store.delete(ids[0])
+        assert not store.delete(ids[0])
+        assert not store.delete("../../etc.passwd")
+        assert len(store.get_all("alice")) == 9
+
+        removed = store.compact("alice")
+
+        assert removed == 1
+        assert store.stats()["deleted"] == 0
+        assert [r["memory"] for r in store.search("alice", "note 5", limit=1)] == ["note 5"]
+
+    def test_compaction_switches_generation(self, tmp_path):
+        root = tmp_path / "memory"
+        store = LocalVectorStore(root, dim=64)
+        ids = store.add("alice", ["alpha one", "beta two", "gamma three", "delta four"])
+        store.delete(ids[0])
+        store.compact("alice")
+        store.add("alice", ["epsilon five"])
+        store.delete(ids[1])
+        shard = root / LocalVectorStore.shard_name("alice")
+
+        reopened = LocalVectorStore(root, dim=64)
+
+        assert sorted(p.name for p in shard.iterdir()) == [CURRENT_FILE, "gen-1"]
+        assert [r["memory"] for r in reopened.get_all("alice")] == [
+            "gamma three",
+            "delta four",
+            "epsilon five",
+        ]
+
+    @pytest.mark.parametrize("switched", [False, True])
+    def test_interrupted_compaction_keeps_one_generation(self, tmp_path, monkeypatch, switched):
+        root = tmp_path / "memory"
+        store = LocalVectorStore(root, dim=64)
+        ids = store.add("alice", ["alpha one", "beta two", "gamma three", "delta four"])
+        store.delete(ids[0])
+        replace = os.replace
+
+        def crash(src, dst):
+            if switched:
+                replace(src, dst)
+            raise OSError("simulated crash")
+
+        monkeypatch.setattr(vector_store.os, "replace", crash)
+        with pytest.raises(OSError):
+            store.compact("alice")
+        monkeypatch.undo()
+
+        reopened = LocalVectorStore(root, dim=64)
+        best = reopened.search("alice", "delta four", limit=1)[0]
+
+        assert [r["memory"] for r in reopened.get_all("alice")] == [
+            "beta two",
+            "gamma three",
+            "delta four",
+        ]
+        assert best["memory"] == "delta four"
+        assert best["score"] == pytest.approx(1.0)
+
+    def test_auto_compaction_after_many_deletes(self, store):
+        ids = store.add("alice", [f"note {i}" for i in range(4)])
+
+        store.delete(ids[0])
+        store.delete(ids[1])
+
+        assert store.stats() == {"open_shards": 1, "rows": 2, "deleted": 0, "dim": 64}
+
+    def test_data_persists_and_open_shards_are_bounded(self, tmp_path):
+        root = tmp_path / "memory"
+        writer = LocalVectorStore(root, dim=64, max_open_shards=2)
+        for user in ("a", "b", "c"):
+            writer.add(user, [f"{user} remembers the launch date"])
+
+        reader = LocalVectorStore(root, dim=64)
+
+        assert writer.stats()["open_shards"] == 2
+        assert reader.search("a", "launch date")[0]["memory"] == "a remembers the launch date"
+
+    def test_interrupted_write_is_repaired_on_load(self, tmp_path):
+        root = tmp_path / "memory"
+        store = LocalVectorStore(root, dim=64)
+        store.add("alice", ["first", "second"])
+        shard = root / LocalVectorStore.shard_name("alice")
+        with open(shard / VECTORS_FILE, "ab") as f:
+            np.ones(64, dtype=np.float32).tofile(f)  # vector written, record not
+
+        reopened = LocalVectorStore(root, dim=64)
+        reopened.add("alice", ["third"])
+
+        assert [r["memory"] for r in reopened.get_all("alice")] == ["first", "second", "third"]
+        assert (shard / VECTORS_FILE).stat().st_size == 3 * 64 * 4
+        assert len((shard / RECORDS_FILE).read_text().splitlines()) == 3
+
+    def test_repair_keeps_deleted_memories_deleted(self, tmp_path):
+        root = tmp_path / "memory"
+        store = LocalVectorStore(root, dim=64)
+        ids = store.add("alice", ["alpha one", "beta two", "gamma three", "delta four"])
+        store.delete(ids[0])
+        shard = root / LocalVectorStore.shard_name("alice")
+        with open(shard / VECTORS_FILE, "ab") as f:
+            np.ones(64, dtype=np.float32).tofile(f)  # vector written, record not
+
+        reopened = LocalVectorStore(root, dim=64)
+
+        assert [r["memory"] for r in reopened.get_all("alice")] == [
+            "beta two",
+            "gamma three",
+            "delta four",
+        ]
+        assert "alpha one" not in [r["memory"] for r in reopened.search("alice", "alpha one")]
+
+    def test_records_without_vectors_are_embedded_again(self, tmp_path):
+        root = tmp_path / "memory"
+        LocalVectorStore(root, dim=64).add("alice", ["first memory", "second memory"])
+        shard = root / LocalVectorStore.shard_name("alice")
+        (shard / VECTORS_FILE).unlink()
+
+        reopened = LocalVectorStore(root, dim=64)
+        best = reopened.search("alice", "second memory", limit=1)[0]
+
+        assert [r["memory"] for r in reopened.get_all("alice")] == ["first memory", "second memory"]
+        assert best["memory"] == "second memory"
+        assert best["score"] == pytest.approx(1.0)
+        assert (shard / VECTORS_FILE).stat().st_size == 2 * 64 * 4
+
+    def test_embedder_is_deterministic(self):
+        embed = HashingEmbedder(dim=32)
+
+        assert np.array_equal(embed(["same text"]), embed(["same text"]))
+
+
+class TestMemoryClientLocalBackend:
+    """Test MemoryClient on the local store (no Mem0 services or keys)"""
+
+    def test_add_search_delete(self, tmp_path):
+        client = MemoryClient(
+            MemoryConfig(vector_store_provider="local", vector_store_path=str(tmp_path))
+        )
+        messages = [
+            {"role": "user", "content": "I prefer morning focus sessions"},
+            {"role": "assistant", "content": "Noted, mornings it is"},
+        ]
+
+        client.add_memory(messages, user_id="alice")
+        memories = client.search_memories("morning focus", user_id="alice", limit=1)
+        user_only = client.search_memories("mornings", "alice", filters={"role": "user"})
+        client.delete_memory(memories[0]["id"])
+
+        assert memories[0]["memory"] == "I prefer morning focus sessions"
+        assert [m["metadata"]["role"] for m in user_only] == ["user"]
+        assert len(client.get_all_memories("alice")) == 1
+        client.delete_all_memories("alice")
+        assert client.get_all_memories("alice") == []
@@ -0,0 +1,261 @@
+"""
+Tests for precomputed circadian profiles
+"""
+
+import statistics
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+from uuid import uuid4
+
+import pytest
+
+from src.core.task_models import FocusSession
+from src.repositories.enhanced_repositories_extensions import (
+    CircadianProfileRepository,
+    EnhancedEnergyRepository,
+    EnhancedFocusSessionRepository,
+    combine_buckets,
+)
+
+# A Monday: strftime('%w') weekday 1
+MONDAY = datetime(2026, 10, 12)
+
+
+@pytest.fixture
+def user(test_db):
+    test_db.execute_write(
+        "INSERT INTO users (user_id, username, email) VALUES ('u1', 'u1', 'u1@example.com')"
+    )
+    return "u1"
+
+
+@pytest.fixture
+def energy_repo(test_db, user):
+    return EnhancedEnergyRepository(test_db)
+
+
+@pytest.fixture
+def focus_repo(test_db, user):
+    return EnhancedFocusSessionRepository(test_db)
+
+
+def record(energy_repo, timestamp: datetime, level: float, user_id: str = "u1"):
+    energy_repo.record_energy_reading(
+        {
+            "reading_id": str(uuid4()),
+            "user_id": user_id,
+            "timestamp": timestamp.isoformat(),
+            "energy_level": level,
+        }
+    )
+
+
+class TestCombineBuckets:
+    def test_matches_population_statistics(self):
+        values = [[3.0, 5.0], [7.0], [4.0, 6.0, 8.0]]
+        buckets = []
+        for group in values:
+            mean = statistics.fmean(group)
+            buckets.append(
+                {
+                    "n": len(group),
+                    "mean": mean,
+                    "m2": sum((v - mean) ** 2 for v in group),
+                    "min": min(group),
+                    "max": max(group),
+                }
+            )
+
+        merged = combine_buckets([None, *buckets])
+        flat = [v for group in values for v in group]
+
+        assert merged["n"] == len(flat)
+        assert merged["mean"] == pytest.approx(statistics.fmean(flat))
+        assert merged["variance"] == pytest.approx(statistics.pvariance(flat))
+        assert (merged["min"], merged["max"]) == (3.0, 8.0)
+
+    def test_empty(self):
+        assert combine_buckets([None, None]) is None
+
+
+class TestEnergyProfile:
+    def test_reading_updates_running_statistics(self, energy_repo):
+        levels = [4.0, 6.0, 8.0]
+        for level in levels:
+            record(energy_repo, MONDAY.replace(hour=9), level)
+
+        stats = energy_repo.profiles.get_hour("u1", "energy", 9, weekday=1)
+
+        assert stats["n"] == 3
+        assert stats["mean"] == pytest.approx(6.0)
+        assert stats["variance"] == pytest.approx(statistics.pvariance(levels))
+        assert (stats["min"], stats["max"]) == (4.0, 8.0)
+
+    def test_hour_folds_weekdays(self, energy_repo):
+        record(energy_repo, MONDAY.replace(hour=9), 4.0)
+        record(energy_repo, (MONDAY + timedelta(days=1)).replace(hour=9), 8.0)
+
+        profile = energy_repo.profiles.get_weekly_profile("u1", "energy")
+        assert profile[1 * 24 + 9]["mean"] == 4.0
+        assert profile[2 * 24 + 9]["mean"] == 8.0
+        assert energy_repo.profiles.get_hour("u1", "energy", 9)["mean"] == pytest.approx(6.0)
+
+    def test_energy_patterns(self, energy_repo):
+        for level in (8.0, 9.0):
+            record(energy_repo, MONDAY.replace(hour=10), level)
+        record(energy_repo, MONDAY.replace(hour=14), 3.0)
+
+        patterns = energy_repo.get_energy_patterns("u1")
+
+        assert patterns["hourly_patterns"]["10:00"]["avg_energy"] == 8.5
+        assert patterns["hourly_patterns"]["10:00"]["reading_count"] == 2
+        assert patterns["peak_energy_hours"] == ["10:00"]
+        assert patterns["low_energy_hours"] == ["14:00"]
+        assert patterns["average_energy"] == pytest.approx(5.75)
+
+    def test_energy_patterns_without_readings(self, energy_repo):
+        assert energy_repo.get_energy_patterns("u1")["hourly_patterns"] == {}
+
+    def test_rebuild_matches_incremental(self, test_db, energy_repo):
+        for i, level in enumerate([5.0, 7.0, 2.0, 9.0]):
+            record(energy_repo, MONDAY.replace(hour=9 + i % 2), level)
+        incremental = energy_repo.profiles.get_weekly_profile("u1", "energy")
+
+        energy_repo.profiles.rebuild()
+        rebuilt = energy_repo.profiles.get_weekly_profile("u1", "energy")
+
+        for before, after in zip(incremental, rebuilt, strict=True):
+            if before is None:
+                assert after is None
+            else:
+                assert after["n"] == before["n"]
+                assert after["mean"] == pytest.approx(before["mean"])
+                assert after["m2"] == pytest.approx(before["m2"])
+
+    def test_first_install_fills_from_history(self, test_db, user):
+        EnhancedEnergyRepository(test_db)
+        test_db.execute_write(
+            "INSERT INTO energy_readings (reading_id, user_id, timestamp, energy_level, created_at) "
+            "VALUES ('r1', 'u1', ?, 6.0, ?)",
+            (MONDAY.replace(hour=9).isoformat(), MONDAY.isoformat()),
+        )
+        test_db.execute_write("DROP TABLE circadian_profile_buckets")
+
+        repo = CircadianProfileRepository(test_db)
+        repo.install()
+
+        assert repo.get_hour("u1", "energy", 9)["n"] == 1
+
+    def test_schema_is_installed_once_per_database(self, test_db, energy_repo, focus_repo):
+        statements = []
+        test_db.get_connection().set_trace_callback(statements.append)
+
+        EnhancedEnergyRepository(test_db)
+        EnhancedFocusSessionRepository(test_db)
+
+        assert statements == []
+
+    def test_delete_reverses_reading(self, test_db, energy_repo):
+        for level in (4.0, 6.0, 8.0):
+            record(energy_repo, MONDAY.replace(hour=9), level)
+
+        test_db.execute_write("DELETE FROM energy_readings WHERE energy_level = 8.0")
+        stats = energy_repo.profiles.get_hour("u1", "energy", 9, weekday=1)
+
+        assert stats["n"] == 2
+        assert stats["mean"] == pytest.approx(5.0)
+        assert stats["variance"] == pytest.approx(statistics.pvariance([4.0, 6.0]))
+        assert (stats["min"], stats["max"]) == (4.0, 6.0)
+
+        test_db.execute_write("DELETE FROM energy_readings")
+
+        assert energy_repo.profiles.get_hour("u1", "energy", 9) is None
+
+    def test_update_moves_reading_between_buckets(self, test_db, energy_repo):
+        record(energy_repo, MONDAY.replace(hour=9), 4.0)
+        record(energy_repo, MONDAY.replace(hour=9), 6.0)
+
+        test_db.execute_write(
+            "UPDATE energy_readings SET timestamp = ?, energy_level = 9.0 WHERE energy_level = 6.0",
+            (MONDAY.replace(hour=14).isoformat(),),
+        )
+        before = energy_repo.profiles.get_hour("u1", "energy", 9, weekday=1)
+        after = energy_repo.profiles.get_hour("u1", "energy", 14, weekday=1)
+
+        assert (before["n"], before["mean"], before["max"]) == (1, 4.0, 4.0)
+        assert (after["n"], after["mean"]) == (1, 9.0)
+
+    def test_edits_match_rebuild(self, test_db, energy_repo):
+        for i, level in enumerate([5.0, 7.0, 2.0, 9.0, 3.0, 6.0]):
+            record(energy_repo, MONDAY.replace(hour=9 + i % 3), level)
+        test_db.execute_write("UPDATE energy_readings SET energy_level = energy_level + 1")
+        test_db.execute_write("DELETE FROM energy_readings WHERE energy_level IN (3.0, 10.0)")
+        incremental = energy_repo.profiles.get_weekly_profile("u1", "energy")
+
+        energy_repo.profiles.rebuild()
+        rebuilt = energy_repo.profiles.get_weekly_profile("u1", "energy")
+
+        for before, after in zip(incremental, rebuilt, strict=True):
+            if before is None:
+                assert after is None
+            else:
+                assert after["n"] == before["n"]
+                assert after["mean"] == pytest.approx(before["mean"])
+                assert after["m2"] == pytest.approx(before["m2"])
+                assert (after["min"], after["max"]) == (before["min"], before["max"])
+
+
+class TestFocusProfile:
+    def test_sessions_update_focus_series(self, focus_repo):
+        started = MONDAY.replace(hour=9)
+        for completed, actual in ((True, 25), (False, 10)):
+            session = FocusSession(user_id="u1", planned_duration_minutes=25, started_at=started)
+            focus_repo.create(session)
+            session.ended_at = started + timedelta(minutes=actual)
+            session.actual_duration_minutes = actual
+            session.was_completed = completed
+            focus_repo.update(session)
+
+        # Updates that don't end the session are not counted again
+        focus_repo.update(session)
+
+        patterns = focus_repo.get_user_patterns("u1")
+
+        assert patterns["total_sessions"] == 2
+        assert patterns["avg_planned_duration"] == 25
+        assert patterns["avg_actual_duration"] == 17.5
+        assert patterns["completion_rate"] == 0.5
+        assert patterns["peak_hours"] == ["09:00"]
+
+    def test_open_session_counts_as_started_only(self, focus_repo):
+        focus_repo.create(
+            FocusSession(user_id="u1", planned_duration_minutes=45, started_at=MONDAY)
+        )
+
+        patterns = focus_repo.get_user_patterns("u1")
+
+        assert patterns["total_sessions"] == 1
+        assert patterns["avg_actual_duration"] == 0
+        assert patterns["patterns"]["prefers_longer_sessions"] is True
+
+
+class TestCircadianAdjustment:
+    @pytest.fixture
+    def agent(self, energy_repo):
+        from src.agents.energy_proxy_advanced import AdvancedEnergyAgent
+
+        return AdvancedEnergyAgent(db=Mock(), energy_repo=energy_repo, metrics_repo=Mock())
+
+    @pytest.mark.asyncio
+    async def test_default_curve_without_profile(self, agent):
+        assert await agent._get_circadian_adjustment("u1", 3) == -3.0
+
+    @pytest.mark.asyncio
+    async def test_profile_replaces_default_with_enough_readings(self, agent, energy_repo):
+        for day in range(10):
+            record(energy_repo, (MONDAY + timedelta(days=day)).replace(hour=3), 9.0)
+            record(energy_repo, (MONDAY + timedelta(days=day)).replace(hour=15), 5.0)
+
+        # Night owl: 2 points above their average at 03:00, where the default is -3
+        assert await agent._get_circadian_adjustment("u1", 3) == pytest.approx(2.0)
+        assert await agent._get_circadian_adjustment("u1", 15) == pytest.approx(-2.0)
@@ -2,10 +2,7 @@
 Shared pytest fixtures for service tests
 """
 
-import os
-import tempfile
-from collections.abc import Generator
-from pathlib import Path
+from datetime import datetime
 from uuid import uuid4
 
 import pytest
@@ -17,48 +14,45 @@ from src.services.micro_step_service import MicroStepService
 from src.services.task_service import TaskService
 
 
-@pytest.fixture(scope="function")
-def test_db() -> Generator[EnhancedDatabaseAdapter, None, None]:
-    """
-    Create a temporary test database for each test function.
-
-    Yields:
-        EnhancedDatabaseAdapter: Test database instance
-    """
-    # Create temporary database file
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
-    temp_file.close()
-
-    # Initialize database with thread safety disabled for testing
-    db = EnhancedDatabaseAdapter(temp_file.name, check_same_thread=False)
-
-    # Apply migrations 007, 008, 009
-    migrations_dir = Path(__file__).parent.parent.parent / "database" / "migrations"
-
-    migration_files = [
-        "007_add_micro_steps.sql",
-        "008_add_reflections.sql",
-        "009_add_user_progress.sql",
-    ]
-
+def add_task(
+    db: EnhancedDatabaseAdapter,
+    user_id: str,
+    task_id: str,
+    completed_at: datetime | None = None,
+    completion_time_minutes: float | None = None,
+) -> None:
+    """Insert a task assigned to user_id, completed if completed_at is given."""
     conn = db.get_connection()
-
-    for migration_file in migration_files:
-        migration_path = migrations_dir / migration_file
-        if migration_path.exists():
-            with open(migration_path) as f:
-                migration_sql = f.read()
-                conn.executescript(migration_sql)
-
+    conn.execute(
+        "INSERT OR IGNORE INTO users (user_id, username, email) VALUES (?, ?, ?)",
+        (user_id, user_id, f"{user_id}@example.com"),
+    )
+    conn.execute(
+        "INSERT OR IGNORE INTO projects (project_id, name, description) VALUES ('p', 'P', '')"
+    )
+    conn.execute(
+        """
+        INSERT INTO tasks (task_id, title, description, project_id, assignee_id,
+                           status, completed_at, actual_hours)
+        VALUES (?, ?, '', 'p', ?, ?, ?, ?)
+        """,
+        (
+            task_id,
+            task_id,
+            user_id,
+            "completed" if completed_at else "todo",
+            completed_at.isoformat() if completed_at else None,
+            completion_time_minutes / 60 if completion_time_minutes else 0,
+        ),
+    )
     conn.commit()
 
-    yield db
 
-    # Cleanup
-    try:
-        os.unlink(temp_file.name)
-    except Exception:
-        pass  # Ignore cleanup errors
+def complete_task(db: EnhancedDatabaseAdapter, task_id: str, completed_at: datetime) -> None:
+    db.execute_write(
+        "UPDATE tasks SET status = 'completed', completed_at = ? WHERE task_id = ?",
+        (completed_at.isoformat(), task_id),
+    )
 
 
 @pytest.fixture(scope="function")
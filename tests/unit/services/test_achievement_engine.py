@@ -0,0 +1,211 @@
+"""Unit tests for AchievementEngine."""
+
+import json
+import sqlite3
+import time
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from src.agents.gamification_proxy_advanced import AdvancedGamificationAgent
+from src.services.achievement_engine import AchievementEngine, compile_criteria
+
+# A Monday, before the early completion cut-off
+MONDAY_MORNING = datetime(2026, 10, 12, 8, 30)
+MONDAY_NOON = MONDAY_MORNING.replace(hour=12)
+
+
+@pytest.fixture
+def user(test_db):
+    test_db.execute_write(
+        "INSERT INTO users (user_id, username, email) VALUES ('u1', 'u1', 'u1@example.com')"
+    )
+    return "u1"
+
+
+@pytest.fixture
+def leaderboard():
+    return Mock()
+
+
+@pytest.fixture
+def engine(test_db, user, leaderboard):
+    return AchievementEngine(test_db, leaderboard=leaderboard)
+
+
+def user_achievements(db, user_id="u1"):
+    return {
+        row["achievement_id"]: row
+        for row in db.execute_read(
+            "SELECT achievement_id, progress, is_completed, earned_at "
+            "FROM user_achievements WHERE user_id = ?",
+            (user_id,),
+        )
+    }
+
+
+class TestCompileCriteria:
+    def test_aliases_and_boolean_targets(self):
+        rule = compile_criteria("early_bird", {"early_completion": True})
+
+        assert rule.conditions == [("early_completions", 1)]
+
+    def test_progress_averages_conditions(self):
+        rule = compile_criteria("combo", {"tasks_completed": 10, "streak_days": 4})
+        values = {"tasks_completed": 5, "streak_days": 8}
+
+        assert rule.progress(values) == 75.0
+        assert not rule.is_met(values)
+
+    @pytest.mark.parametrize("criteria", [{}, {"karma": 5}, {"tasks_completed": 0}])
+    def test_invalid_criteria(self, criteria):
+        with pytest.raises(ValueError):
+            compile_criteria("bad", criteria)
+
+
+class TestAchievementEngine:
+    def test_catalog_is_indexed_by_event(self, engine):
+        assert {r.achievement_id for r in engine.rules_for_event("task_completed")} == {
+            "first_task",
+            "task_master",
+            "early_bird",
+        }
+        assert [r.achievement_id for r in engine.rules_for_event("focus_session_completed")] == [
+            "focus_warrior"
+        ]
+        assert engine.rules_for_event("xp_awarded") == []
+
+    def test_event_unlocks_affected_achievements(self, test_db, engine, leaderboard):
+        unlocked = engine.record("u1", "task_completed", occurred_at=MONDAY_MORNING)
+
+        assert {a["achievement_id"] for a in unlocked} == {"first_task", "early_bird"}
+        assert next(a for a in unlocked if a["achievement_id"] == "first_task")["xp_reward"] == 100
+        leaderboard.add_badges.assert_called_once_with("u1", 2)
+
+        # Unlocks are written immediately, with the other progress of the event
+        rows = user_achievements(test_db)
+        assert rows["first_task"]["is_completed"] == 1
+        assert rows["task_master"]["progress"] == 10.0
+        assert "focus_warrior" not in rows
+
+    def test_earned_achievements_are_not_evaluated_again(self, engine, leaderboard):
+        engine.record("u1", "task_completed", occurred_at=MONDAY_MORNING)
+
+        assert engine.record("u1", "task_completed", occurred_at=MONDAY_MORNING) == []
+        assert leaderboard.add_badges.call_count == 1
+
+    def test_progress_is_batched_until_flush(self, test_db, engine):
+        engine.record("u1", "task_completed", occurred_at=MONDAY_MORNING)
+        for _ in range(3):
+            engine.record("u1", "task_completed", occurred_at=MONDAY_NOON)
+
+        assert user_achievements(test_db)["task_master"]["progress"] == 10.0
+        assert engine.flush() == 3  # Two counters and task_master, coalesced
+        assert user_achievements(test_db)["task_master"]["progress"] == 40.0
+
+    def test_batch_size_triggers_flush(self, test_db, user):
+        engine = AchievementEngine(test_db, batch_size=2)
+
+        engine.record("u1", "focus_session_completed")
+
+        assert user_achievements(test_db)["focus_warrior"]["progress"] == 20.0
+
+    def test_timer_flushes_a_quiet_batch(self, test_db, user):
+        engine = AchievementEngine(test_db, flush_interval_seconds=0.05)
+
+        engine.record("u1", "focus_session_completed")
+
+        deadline = time.monotonic() + 2
+        while "focus_warrior" not in user_achievements(test_db) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert user_achievements(test_db)["focus_warrior"]["progress"] == 20.0
+
+    def test_failed_flush_keeps_batch_pending(self, test_db, engine):
+        engine.record("u1", "focus_session_completed")
+        test_db.get_connection().execute("PRAGMA busy_timeout = 0")
+        other = sqlite3.connect(test_db.db_path)
+        other.execute("BEGIN IMMEDIATE")
+
+        with pytest.raises(sqlite3.OperationalError):
+            engine.flush()
+        other.rollback()
+        other.close()
+
+        assert engine.flush() == 2  # The counter and focus_warrior
+        assert user_achievements(test_db)["focus_warrior"]["progress"] == 20.0
+
+    def test_counters_survive_restart(self, test_db, engine):
+        for _ in range(4):
+            engine.record("u1", "focus_session_completed")
+        engine.flush()
+
+        restarted = AchievementEngine(test_db)
+        unlocked = restarted.record("u1", "focus_session_completed")
+
+        assert [a["achievement_id"] for a in unlocked] == ["focus_warrior"]
+        assert restarted.get_counters("u1")["focus_sessions_completed"] == 5
+
+    def test_daily_counters_reset(self, engine):
+        engine.record("u1", "task_completed", occurred_at=MONDAY_NOON)
+        engine.record("u1", "task_completed", occurred_at=MONDAY_NOON)
+        engine.record("u1", "task_completed", occurred_at=MONDAY_NOON.replace(day=13))
+
+        counters = engine._users["u1"].counters
+        assert counters["tasks_completed_today"].value == 1
+        assert counters["tasks_completed"].value == 3
+
+    def test_streak_sets_latest_value(self, test_db, engine):
+        engine.record("u1", "streak_updated", {"streak_days": 6})
+        assert engine.get_counters("u1")["streak_days"] == 6
+
+        unlocked = engine.record("u1", "streak_updated", {"streak_days": 7})
+        assert [a["achievement_id"] for a in unlocked] == ["productivity_streak"]
+
+    def test_new_achievement_uses_existing_counters(self, test_db, engine):
+        for _ in range(3):
+            engine.record("u1", "xp_awarded", {"amount": 400})
+        test_db.execute_write(
+            "INSERT INTO achievements (achievement_id, name, description, category, criteria) "
+            "VALUES ('xp_1000', 'Big XP', 'Earn 1000 XP', 'xp', ?)",
+            (json.dumps({"total_xp": 1000}),),
+        )
+        engine.reload_catalog()
+
+        unlocked = engine.record("u1", "xp_awarded", {"amount": 1})
+
+        assert [a["achievement_id"] for a in unlocked] == ["xp_1000"]
+
+    def test_unknown_user_does_not_drop_batch(self, test_db, engine):
+        engine.record("ghost", "task_completed", occurred_at=MONDAY_NOON)
+        engine.record("u1", "task_completed", occurred_at=MONDAY_NOON)
+        engine.flush()
+
+        assert user_achievements(test_db)["first_task"]["is_completed"] == 1
+
+    def test_unknown_event(self, engine):
+        with pytest.raises(ValueError):
+            engine.record("u1", "karma_gained")
+
+
+class TestGamificationAgentTriggers:
+    @pytest.fixture
+    def agent(self):
+        return AdvancedGamificationAgent(
+            db=Mock(), achievement_repo=Mock(), user_achievement_repo=Mock(), leaderboard=Mock()
+        )
+
+    @pytest.mark.asyncio
+    async def test_only_reported_metrics_are_evaluated(self, agent):
+        result = await agent._detect_achievement_triggers(
+            {"user_id": "u1", "tasks_completed_today": 10, "focus_sessions_completed": 20}
+        )
+
+        assert [a["achievement_id"] for a in result["triggered_achievements"]] == [
+            "productivity_master"
+        ]
+        assert [p["achievement_id"] for p in result["progress_towards_next"]] == ["focus_champion"]
+        assert (
+            result["progress_towards_next"][0]["next_milestone"]
+            == "5 more focus sessions completed"
+        )
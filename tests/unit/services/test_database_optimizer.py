@@ -0,0 +1,123 @@
+"""Unit tests for the slow-query log and index advisor (DatabaseOptimizer)."""
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.database.enhanced_adapter import EnhancedDatabaseAdapter
+from src.services.database_optimizer import DatabaseOptimizer, fingerprint, normalize_sql
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Enhanced database with an unindexed events table."""
+    adapter = EnhancedDatabaseAdapter(str(tmp_path / "optimizer.db"))
+    conn = adapter.get_connection()
+    conn.execute(
+        "CREATE TABLE events (id INTEGER PRIMARY KEY, owner TEXT, kind TEXT, created_at TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO events (owner, kind, created_at) VALUES (?, ?, ?)",
+        [(f"user-{i}", f"kind-{i % 3}", f"2025-10-{i % 28 + 1:02d}") for i in range(300)],
+    )
+    conn.commit()
+    yield adapter
+    adapter.close_connection()
+
+
+@pytest.fixture
+def optimizer(db):
+    """Optimizer that treats every statement as slow."""
+    advisor = DatabaseOptimizer(db, slow_query_threshold=0.0)
+    yield advisor
+    advisor.detach()
+
+
+class TestNormalization:
+    """Test suite for SQL fingerprinting."""
+
+    def test_literals_and_in_lists_share_a_fingerprint(self):
+        assert normalize_sql(
+            "SELECT * FROM events  WHERE owner = 'a' AND id IN (1, 2, 3) -- note"
+        ) == ("select * from events where owner = ? and id in (?+)")
+        assert fingerprint("SELECT * FROM t WHERE id = 7") == fingerprint(
+            "select *\n from t where id = ?"
+        )
+        assert fingerprint("SELECT * FROM t1") != fingerprint("SELECT * FROM t2")
+
+
+class TestDatabaseOptimizer:
+    """Test suite for DatabaseOptimizer."""
+
+    def test_adapter_queries_are_aggregated_per_fingerprint(self, optimizer, db):
+        for owner in ("user-1", "user-2", "user-3"):
+            db.execute_read("SELECT * FROM events WHERE owner = ?", (owner,))
+
+        (stats,) = [
+            s for s in optimizer.get_query_stats() if s["query"].startswith("select * from events")
+        ]
+        assert stats["count"] == 3
+        assert stats["slow_count"] == 3
+        assert stats["full_scans"] == ["events"]
+        assert any("SCAN events" in line for line in stats["plan"])
+        assert optimizer.get_slow_queries(limit=1)[0]["fingerprint"] == stats["fingerprint"]
+
+    def test_suggests_selective_index_until_it_exists(self, optimizer, db):
+        """Suggestions lead with the most selective equality column."""
+        db.execute_read("SELECT * FROM events WHERE kind = ? AND owner = ?", ("kind-1", "user-4"))
+
+        (suggestion,) = optimizer.get_index_suggestions()
+        assert suggestion["columns"] == ["owner", "kind"]
+        assert (
+            suggestion["statement"] == "CREATE INDEX idx_events_owner_kind ON events(owner, kind)"
+        )
+        assert suggestion["rows"] == 300
+
+        db.execute_write(suggestion["statement"])
+        assert optimizer.get_index_suggestions() == []
+
+    def test_fingerprints_are_bounded(self, db):
+        optimizer = DatabaseOptimizer(db, max_fingerprints=2)
+        try:
+            for column in ("owner", "kind", "created_at"):
+                db.execute_read(f"SELECT {column} FROM events LIMIT 1")
+            queries = [s["query"] for s in optimizer.get_query_stats()]
+        finally:
+            optimizer.detach()
+
+        assert sorted(queries) == [
+            "select created_at from events limit ?",
+            "select kind from events limit ?",
+        ]
+
+    def test_sqlalchemy_engine_statements_are_recorded(self, optimizer, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'orm.db'}")
+        optimizer.attach_engine(engine)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)"))
+            conn.execute(text("SELECT * FROM notes WHERE body = :body"), {"body": "x"})
+
+        (stats,) = [s for s in optimizer.get_query_stats() if "from notes" in s["query"]]
+        assert stats["query"] == "select * from notes where body = ?"
+        assert stats["full_scans"] == ["notes"]
+
+    @pytest.mark.asyncio
+    async def test_analyze_query_uses_real_plan(self, optimizer):
+        scan = await optimizer.analyze_query_performance("SELECT * FROM events WHERE owner = ?")
+        lookup = await optimizer.analyze_query_performance("SELECT * FROM events WHERE id = 1")
+
+        assert scan["full_scans"] == ["events"]
+        assert scan["suggested_index"] == "CREATE INDEX idx_events_owner ON events(owner)"
+        assert lookup["full_scans"] == []
+        assert lookup["optimization_hint"] == "Query appears optimized"
+
+    @pytest.mark.asyncio
+    async def test_database_health_reports_real_counts(self, optimizer, db):
+        await optimizer.create_index("events", "owner")
+        db.execute_read("SELECT COUNT(*) FROM events")
+
+        health = await optimizer.get_database_health()
+
+        assert health["query_performance"]["total_queries"] >= 2
+        assert health["index_usage"]["indexes_by_table"]["events"] == 1
+        with pytest.raises(ValueError):
+            await optimizer.create_index("events", "missing")
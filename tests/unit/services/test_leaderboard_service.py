@@ -0,0 +1,272 @@
+"""Unit tests for LeaderboardService."""
+
+import random
+import sqlite3
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import UTC, date, datetime, timedelta
+from unittest.mock import Mock
+
+import pytest
+
+from src.agents.gamification_proxy_advanced import AdvancedGamificationAgent
+from src.services.leaderboard_service import (
+    LeaderboardService,
+    _Ranking,
+    _SkipList,
+    period_key,
+)
+from src.services.xp_ledger_service import XPLedgerService
+
+
+@pytest.fixture
+def service(test_db):
+    return LeaderboardService(test_db)
+
+
+@pytest.fixture
+def ranked(service):
+    """Five users with all-time XP 500, 400, 400, 200, 100"""
+    for user_id, xp in (("alice", 500), ("bob", 400), ("carol", 400), ("dan", 200), ("eve", 100)):
+        service.add_xp(user_id, xp)
+    return service
+
+
+class TestPeriodKey:
+    def test_windows(self):
+        day = date(2026, 10, 18)  # Sunday
+
+        assert period_key("daily", day) == "daily:2026-10-18"
+        assert period_key("weekly", day) == "weekly:2026-10-12"
+        assert period_key("all_time", day) == "all_time"
+
+
+class TestSkipList:
+    def test_matches_a_sorted_list(self):
+        rng = random.Random(7)
+        keys, expected = _SkipList(), []
+        for _ in range(2000):
+            key = (-rng.randrange(50), f"u{rng.randrange(200)}")
+            if key in expected:
+                keys.remove(key)
+                expected.remove(key)
+            else:
+                keys.add(key)
+                insort(expected, key)
+
+        assert len(keys) == len(expected)
+        assert [keys[i] for i in range(len(keys))] == expected
+        probe = (-25, "u100")
+        assert keys.bisect_left(probe) == bisect_left(expected, probe)
+        with pytest.raises(KeyError):
+            keys.remove((1, "missing"))
+
+    def test_bulk_load_supports_updates(self):
+        keys = _SkipList([(i, "u") for i in range(0, 100, 2)])
+
+        keys.add((51, "u"))
+        keys.remove((0, "u"))
+
+        assert len(keys) == 50
+        assert keys[0] == (2, "u")
+        assert keys.bisect_left((51, "u")) == 25
+        assert keys[25] == (51, "u")
+        assert keys[49] == (98, "u")
+
+
+class TestLeaderboardService:
+    def test_top_uses_competition_ranking(self, ranked):
+        top = ranked.top("xp", "all_time", limit=4)
+
+        assert [(e["rank"], e["user_id"], e["score"]) for e in top] == [
+            (1, "alice", 500),
+            (2, "bob", 400),
+            (2, "carol", 400),
+            (4, "dan", 200),
+        ]
+
+    def test_position(self, ranked):
+        position = ranked.get_position("dan")
+
+        assert position["rank"] == 4
+        assert position["total_participants"] == 5
+        assert position["percentile"] == 20.0
+        assert position["next_rank_gap"] == 200
+        assert ranked.get_position("alice")["next_rank_gap"] == 0
+        assert ranked.get_position("nobody") is None
+
+    def test_around(self, ranked):
+        nearby = ranked.around("carol", radius=1)
+
+        assert [e["user_id"] for e in nearby] == ["bob", "carol", "dan"]
+        assert ranked.around("nobody") == []
+
+    def test_awards_update_cached_ranking(self, ranked):
+        assert ranked.get_position("eve")["rank"] == 5
+
+        ranked.add_xp("eve", 1000)
+
+        assert ranked.get_position("eve")["rank"] == 1
+        assert ranked.top(limit=1)[0]["user_id"] == "eve"
+        assert ranked.count() == 5
+
+    def test_windows_are_separate(self, service):
+        last_week = datetime.now(UTC) - timedelta(days=8)
+        service.add_xp("alice", 300, awarded_at=last_week)
+        service.add_xp("bob", 50)
+
+        assert [e["user_id"] for e in service.top("xp", "all_time")] == ["alice", "bob"]
+        assert [e["user_id"] for e in service.top("xp", "weekly")] == ["bob"]
+        assert [e["user_id"] for e in service.top("xp", "daily")] == ["bob"]
+
+    def test_streak_is_set_and_badges_accumulate(self, service):
+        service.set_streak("alice", 5)
+        service.set_streak("alice", 2)
+        service.add_badges("alice")
+        service.add_badges("alice", 2)
+
+        assert service.get_score("alice", "streak") == 2
+        assert service.get_score("alice", "badges") == 3
+
+    def test_unknown_board(self, service):
+        with pytest.raises(ValueError):
+            service.top("karma")
+
+    def test_other_connections_invalidate_cache(self, test_db, ranked):
+        assert ranked.get_position("eve")["rank"] == 5
+
+        other = sqlite3.connect(test_db.db_path)
+        other.execute(
+            "UPDATE leaderboard_scores SET score = 900 WHERE user_id = 'eve' AND period = 'all_time'"
+        )
+        other.commit()
+        other.close()
+
+        assert ranked.get_position("eve")["rank"] == 1
+
+    def test_first_award_of_the_day_prunes_expired_windows(self, test_db, service):
+        old = datetime.now(UTC) - timedelta(weeks=20)
+        service._pruned_day = datetime.now(UTC).date()
+        service.add_xp("alice", 100, awarded_at=old)
+        assert service.prune(old.date()) == 0  # Still within retention then
+
+        service._pruned_day = None
+        service.add_xp("alice", 10)
+
+        periods = {
+            row["period"] for row in test_db.execute_read("SELECT period FROM leaderboard_scores")
+        }
+        assert period_key("daily", old.date()) not in periods
+        assert period_key("weekly", old.date()) not in periods
+        assert service.get_score("alice") == 110
+
+    def test_first_install_ranks_existing_users(self, test_db):
+        XPLedgerService(test_db)  # Installs user_progress
+        for user_id, xp, streak in (("u1", 300, 4), ("u2", 700, 0)):
+            test_db.execute_write(
+                "INSERT INTO users (user_id, username, email) VALUES (?, ?, ?)",
+                (user_id, user_id, f"{user_id}@example.com"),
+            )
+            test_db.execute_write(
+                "INSERT INTO user_progress (user_id, total_xp, current_streak) VALUES (?, ?, ?)",
+                (user_id, xp, streak),
+            )
+        for user_id, achievement_id, completed in (
+            ("u1", "first_task", 1),
+            ("u1", "early_bird", 1),
+            ("u2", "focus_warrior", 0),
+        ):
+            test_db.execute_write(
+                "INSERT INTO user_achievements "
+                "(user_achievement_id, user_id, achievement_id, is_completed) VALUES (?, ?, ?, ?)",
+                (f"{user_id}-{achievement_id}", user_id, achievement_id, completed),
+            )
+
+        service = LeaderboardService(test_db)
+        service.add_xp("u1", 50)
+        restarted = LeaderboardService(test_db)
+
+        assert [(e["user_id"], e["score"]) for e in restarted.top()] == [("u2", 700), ("u1", 350)]
+        assert restarted.top("streak") == [{"rank": 1, "user_id": "u1", "score": 4}]
+        assert restarted.top("badges") == [{"rank": 1, "user_id": "u1", "score": 2}]
+
+    def test_windowed_reads_only_for_xp(self, service):
+        with pytest.raises(ValueError):
+            service.top("streak", "weekly")
+
+    def test_rank_queries_use_covering_index(self, test_db, ranked):
+        plan = test_db.execute_read(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT user_id, score FROM leaderboard_scores
+            WHERE board = 'xp' AND period = 'all_time'
+            ORDER BY score DESC, user_id
+            """
+        )
+        detail = " ".join(row["detail"] for row in plan)
+
+        assert "COVERING INDEX idx_leaderboard_ranking" in detail
+        assert "TEMP B-TREE" not in detail
+
+    def test_award_waits_for_a_concurrent_read(self, monkeypatch, ranked):
+        entry = _Ranking.entry
+        reading = threading.Event()
+
+        def slow_entry(ranking, index):
+            # Pause the reader after its first entry
+            if not reading.is_set():
+                reading.set()
+                time.sleep(0.2)
+            return entry(ranking, index)
+
+        monkeypatch.setattr(_Ranking, "entry", slow_entry)
+        writer = threading.Thread(target=lambda: (reading.wait(5), ranked.add_xp("eve", 450)))
+        writer.start()
+        top = ranked.top()
+        writer.join()
+
+        assert [(e["rank"], e["user_id"], e["score"]) for e in top] == [
+            (1, "alice", 500),
+            (2, "bob", 400),
+            (2, "carol", 400),
+            (4, "dan", 200),
+            (5, "eve", 100),
+        ]
+        assert ranked.get_position("eve")["rank"] == 1
+
+
+class TestGamificationAgentLeaderboard:
+    @pytest.fixture
+    def agent(self, test_db, ranked):
+        for user_id in ("alice", "bob", "carol", "dan", "eve"):
+            test_db.execute_write(
+                "INSERT INTO users (user_id, username, email) VALUES (?, ?, ?)",
+                (user_id, user_id.title(), f"{user_id}@example.com"),
+            )
+        ranked.add_badges("alice", 3)
+        ranked.set_streak("dan", 7)
+        return AdvancedGamificationAgent(
+            db=Mock(), achievement_repo=Mock(), user_achievement_repo=Mock(), leaderboard=ranked
+        )
+
+    @pytest.mark.asyncio
+    async def test_generate_leaderboard(self, agent):
+        board = await agent.generate_leaderboard("weekly_xp", {"user_id": "dan", "level": 4})
+
+        assert board["user_rank"] == 4
+        assert board["total_participants"] == 5
+        assert board["percentile"] == 20.0
+        assert board["top_10"][0]["username"] == "Alice"
+        assert board["top_10"][0]["badge_count"] == 3
+        assert board["user_entry"]["streak_days"] == 7
+        assert board["user_entry"]["level"] == 4
+        assert board["category_leaders"]["streak"]["user_id"] == "dan"
+
+    @pytest.mark.asyncio
+    async def test_unranked_user(self, agent):
+        board = await agent.generate_leaderboard("daily_streak", {"user_id": "eve"})
+
+        assert board["user_rank"] == 0
+        assert board["total_participants"] == 1
+        assert board["top_10"][0]["user_id"] == "dan"
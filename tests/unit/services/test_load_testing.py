@@ -0,0 +1,117 @@
+"""Unit tests for the async load-testing harness."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from src.services.load_testing import (
+    Baseline,
+    LoadGenerator,
+    LoadSession,
+    compare_to_baselines,
+    load_baselines,
+)
+
+
+@pytest.fixture
+def app():
+    """Tiny app with a fast, a slow and a failing endpoint."""
+    api = FastAPI()
+
+    @api.get("/fast")
+    async def fast():
+        return {"ok": True}
+
+    @api.get("/slow")
+    async def slow():
+        await asyncio.sleep(0.02)
+        return {"ok": True}
+
+    @api.get("/fail")
+    async def fail():
+        raise HTTPException(status_code=500, detail="boom")
+
+    return api
+
+
+async def fast_then_fail(session: LoadSession) -> None:
+    await session.request("fast", "GET", "/fast")
+    await session.request("fail", "GET", "/fail")
+
+
+async def slow_only(session: LoadSession) -> None:
+    await session.request("slow", "GET", "/slow")
+
+
+class TestLoadGenerator:
+    """Test suite for LoadGenerator."""
+
+    @pytest.mark.asyncio
+    async def test_closed_model_records_every_step(self, app):
+        report = await LoadGenerator(app=app).run(
+            fast_then_fail, concurrency=4, duration=10, max_iterations=20
+        )
+
+        result = report.to_dict()
+        assert result["iterations"] == 20
+        assert result["total_requests"] == 40
+        assert result["failed_requests"] == 20
+        assert result["steps"]["fast"]["statuses"] == {200: 20}
+        assert result["steps"]["fail"]["success_rate"] == 0.0
+        assert result["p99_response_time"] >= result["p50_response_time"] > 0
+
+    @pytest.mark.asyncio
+    async def test_open_model_holds_target_rate(self, app):
+        """Iterations start on a fixed schedule, independent of response time."""
+        report = await LoadGenerator(app=app).run(
+            slow_only, concurrency=10, duration=0.5, target_rps=40
+        )
+
+        assert 15 <= report.iterations <= 21
+        assert report.dropped_iterations == 0
+        assert report.steps["slow"].requests == report.iterations
+
+    @pytest.mark.asyncio
+    async def test_open_model_counts_dropped_iterations(self, app):
+        """When every slot is busy, scheduled iterations are dropped and counted."""
+        report = await LoadGenerator(app=app).run(
+            slow_only, concurrency=1, duration=0.3, target_rps=200
+        )
+
+        assert report.dropped_iterations > report.iterations
+
+    def test_requires_app_or_base_url(self):
+        with pytest.raises(ValueError):
+            LoadGenerator()
+
+
+class TestBaselines:
+    """Test suite for baseline parsing and regression detection."""
+
+    def test_reads_baselines_document(self):
+        baselines = load_baselines()
+
+        scenario = baselines[("adhd_workflow", "*")]
+        assert scenario.p95_ms > 0
+        assert scenario.throughput > 0
+        assert scenario.success_rate == 0.95
+        assert baselines[("adhd_workflow", "split")].throughput is None
+
+    @pytest.mark.asyncio
+    async def test_flags_regressions_beyond_tolerance(self, app):
+        report = await LoadGenerator(app=app).run(
+            fast_then_fail, concurrency=1, duration=10, max_iterations=5
+        )
+        baselines = {
+            ("fast_then_fail", "fast"): Baseline("fast_then_fail", "fast", success_rate=0.95),
+            ("fast_then_fail", "fail"): Baseline("fast_then_fail", "fail", success_rate=0.95),
+            ("fast_then_fail", "*"): Baseline("fast_then_fail", "*", p95_ms=0.001),
+            ("other", "*"): Baseline("other", "*", throughput=1e9),
+        }
+
+        regressions = compare_to_baselines(report, baselines)
+
+        assert len(regressions) == 2
+        assert regressions[0].startswith("fast_then_fail/*: p95")
+        assert regressions[1].startswith("fast_then_fail/fail: success rate")
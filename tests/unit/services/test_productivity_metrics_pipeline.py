@@ -0,0 +1,209 @@
+"""Unit tests for ProductivityMetricsPipeline."""
+
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+
+from src.agents.progress_proxy_advanced import AdvancedProgressAgent
+from src.repositories.enhanced_repositories_extensions import EnhancedMetricsRepository
+from src.services.productivity_metrics_pipeline import (
+    ProductivityMetricsPipeline,
+    metrics_date,
+    period_end,
+    period_start,
+)
+from tests.unit.services.conftest import add_task, complete_task
+
+
+def at_noon(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day, 12, tzinfo=UTC)
+
+
+def metrics_row(db, user_id: str, day: date, period_type: str = "daily"):
+    rows = db.execute_read(
+        "SELECT * FROM productivity_metrics WHERE user_id = ? AND date = ? AND period_type = ?",
+        (user_id, metrics_date(day), period_type),
+    )
+    return rows[0] if rows else None
+
+
+class TestPeriods:
+    def test_week_starts_on_monday(self):
+        assert period_start(date(2026, 10, 18), "weekly") == date(2026, 10, 12)
+        assert period_end(date(2026, 10, 12), "weekly") == date(2026, 10, 18)
+
+    def test_month_bounds(self):
+        assert period_start(date(2026, 2, 14), "monthly") == date(2026, 2, 1)
+        assert period_end(date(2026, 2, 14), "monthly") == date(2026, 2, 28)
+        assert period_end(date(2026, 12, 5), "monthly") == date(2026, 12, 31)
+
+
+class TestProductivityMetricsPipeline:
+    @pytest.fixture
+    def pipeline(self, test_db):
+        return ProductivityMetricsPipeline(test_db)
+
+    @pytest.fixture
+    def today(self):
+        return datetime.now(UTC).date()
+
+    def test_completion_queues_its_day(self, test_db, pipeline, today):
+        day = today - timedelta(days=3)
+        add_task(test_db, "user_1", "t1", completed_at=at_noon(day))
+
+        queued = {
+            row["day"] for row in test_db.execute_read("SELECT day FROM productivity_metrics_dirty")
+        }
+        assert day.isoformat() in queued
+
+    def test_process_pending_writes_all_grains(self, test_db, pipeline, today):
+        day = today - timedelta(days=3)
+        add_task(test_db, "user_1", "t1", completed_at=at_noon(day), completion_time_minutes=30)
+        add_task(test_db, "user_1", "t2", completed_at=at_noon(day), completion_time_minutes=90)
+
+        assert pipeline.process_pending() > 0
+        assert pipeline.pending() == 0
+
+        daily = metrics_row(test_db, "user_1", day)
+        assert daily["tasks_completed"] == 2
+        assert daily["streak_days"] == 1
+        assert daily["average_productivity_score"] > 0
+
+        weekly = metrics_row(test_db, "user_1", period_start(day, "weekly"), "weekly")
+        monthly = metrics_row(test_db, "user_1", period_start(day, "monthly"), "monthly")
+        assert weekly["tasks_completed"] >= 2
+        assert monthly["tasks_completed"] >= 2
+
+    def test_backfill_is_idempotent(self, test_db, pipeline, today):
+        start = today - timedelta(days=5)
+        for i in range(3):
+            add_task(test_db, "user_1", f"t{i}", completed_at=at_noon(start + timedelta(days=i)))
+
+        assert pipeline.backfill(start, today) == 1
+        first = test_db.execute_read(
+            "SELECT date, period_type, tasks_completed, streak_days FROM productivity_metrics "
+            "ORDER BY date, period_type"
+        )
+        pipeline.backfill(start, today)
+        second = test_db.execute_read(
+            "SELECT date, period_type, tasks_completed, streak_days FROM productivity_metrics "
+            "ORDER BY date, period_type"
+        )
+
+        assert [dict(r) for r in first] == [dict(r) for r in second]
+
+    def test_late_completion_extends_later_streaks(self, test_db, pipeline, today):
+        first = today - timedelta(days=6)
+        add_task(test_db, "user_1", "t1", completed_at=at_noon(first))
+        add_task(test_db, "user_1", "t3", completed_at=at_noon(first + timedelta(days=2)))
+        add_task(test_db, "user_1", "t4", completed_at=at_noon(first + timedelta(days=3)))
+        pipeline.process_pending()
+        assert metrics_row(test_db, "user_1", first + timedelta(days=3))["streak_days"] == 2
+
+        # The gap day is completed late: the run that follows it lengthens
+        add_task(test_db, "user_1", "t2")
+        complete_task(test_db, "t2", at_noon(first + timedelta(days=1)))
+        pipeline.process_pending()
+
+        assert metrics_row(test_db, "user_1", first + timedelta(days=1))["streak_days"] == 2
+        assert metrics_row(test_db, "user_1", first + timedelta(days=3))["streak_days"] == 4
+
+    def test_recompute_keeps_xp(self, test_db, pipeline, today):
+        day = today - timedelta(days=2)
+        add_task(test_db, "user_1", "t1", completed_at=at_noon(day))
+        pipeline.process_pending()
+        test_db.execute_write(
+            "UPDATE productivity_metrics SET xp_earned = 120 WHERE date = ? AND period_type = 'daily'",
+            (metrics_date(day),),
+        )
+
+        add_task(test_db, "user_1", "t2", completed_at=at_noon(day))
+        pipeline.process_pending()
+
+        daily = metrics_row(test_db, "user_1", day)
+        assert daily["tasks_completed"] == 2
+        assert daily["xp_earned"] == 120
+        assert (
+            metrics_row(test_db, "user_1", period_start(day, "weekly"), "weekly")["xp_earned"]
+            == 120
+        )
+
+    def test_overdue_counted_for_finished_days(self, test_db, pipeline, today):
+        due = today - timedelta(days=2)
+        add_task(test_db, "user_1", "late")
+        test_db.execute_write(
+            "UPDATE tasks SET due_date = ? WHERE task_id = 'late'", (at_noon(due).isoformat(),)
+        )
+        pipeline.process_pending()
+
+        assert metrics_row(test_db, "user_1", due)["tasks_overdue"] == 1
+
+    def test_unknown_user_is_skipped(self, test_db, pipeline, today):
+        pipeline.mark_dirty("ghost", today)
+
+        assert pipeline.process_pending() == 1
+        assert test_db.execute_read("SELECT COUNT(*) AS n FROM productivity_metrics")[0]["n"] == 0
+
+    def test_failing_user_does_not_lose_other_users_days(
+        self, test_db, pipeline, today, monkeypatch
+    ):
+        day = today - timedelta(days=2)
+        for user_id in ("user_1", "user_2", "user_3"):
+            add_task(test_db, user_id, f"{user_id}_t1", completed_at=at_noon(day))
+        refresh_days = pipeline._refresh_days
+
+        def flaky_refresh(user_id, days):
+            if user_id == "user_2":
+                raise RuntimeError("database is locked")
+            refresh_days(user_id, days)
+
+        monkeypatch.setattr(pipeline, "_refresh_days", flaky_refresh)
+        queued = pipeline.pending()
+        user_2_days = test_db.execute_read(
+            "SELECT user_id, day FROM productivity_metrics_dirty WHERE user_id = 'user_2'"
+        )
+
+        assert pipeline.process_pending() == queued - len(user_2_days)
+        assert metrics_row(test_db, "user_1", day)["tasks_completed"] == 1
+        assert metrics_row(test_db, "user_3", day)["tasks_completed"] == 1
+        assert metrics_row(test_db, "user_2", day) is None
+        assert (
+            test_db.execute_read("SELECT user_id, day FROM productivity_metrics_dirty")
+            == user_2_days
+        )
+
+    @pytest.mark.asyncio
+    async def test_tick_queues_finished_day_at_rollover(self, test_db, pipeline, today):
+        yesterday = today - timedelta(days=1)
+        add_task(test_db, "user_1", "late")
+        test_db.execute_write(
+            "UPDATE tasks SET due_date = ? WHERE task_id = 'late'",
+            (at_noon(yesterday).isoformat(),),
+        )
+        await pipeline.tick()
+        test_db.execute_write("DELETE FROM productivity_metrics")
+
+        pipeline._last_day = today - timedelta(days=1)
+        await pipeline.tick()
+
+        assert metrics_row(test_db, "user_1", yesterday)["tasks_overdue"] == 1
+
+    @pytest.mark.asyncio
+    async def test_agent_reads_materialized_rows(self, test_db, pipeline, today):
+        for i in range(3):
+            day = today - timedelta(days=3 - i)
+            add_task(test_db, "user_1", f"t{i}", completed_at=at_noon(day))
+        pipeline.process_pending()
+
+        agent = AdvancedProgressAgent(test_db, metrics_repo=EnhancedMetricsRepository(test_db))
+        viz = await agent._generate_progress_visualization("user_1", "7d")
+
+        # Three completion days, plus today when the tasks were created
+        scores = viz["productivity_score_trend"]
+        assert len(scores) == 4
+        assert all(0 < score <= 10 for score in scores[:3])
+        assert viz["performance_insights"]["avg_daily_xp"] > 0
+
+        trends = EnhancedMetricsRepository(test_db).get_productivity_trends("user_1", days=7)
+        assert trends["best_day"] is not None
+        assert trends["average_daily_score"] > 0
@@ -0,0 +1,139 @@
+"""Unit tests for request metrics, the metrics middleware and PerformanceService."""
+
+import random
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from src.api.metrics import RequestMetricsMiddleware
+from src.api.metrics import router as metrics_router
+from src.database.enhanced_adapter import EnhancedDatabaseAdapter
+from src.services.performance_service import PerformanceService
+from src.services.request_metrics import (
+    LatencyHistogram,
+    get_request_metrics,
+    track_llm_call,
+)
+
+
+@pytest.fixture
+def registry():
+    """Process-wide registry, cleared around each test."""
+    metrics = get_request_metrics()
+    metrics.reset()
+    yield metrics
+    metrics.reset()
+
+
+@pytest.fixture
+def client(tmp_path, registry):  # noqa: ARG001
+    """Small app with the metrics middleware, a DB route and an LLM route."""
+    db = EnhancedDatabaseAdapter(str(tmp_path / "metrics.db"))
+    app = FastAPI()
+    app.add_middleware(RequestMetricsMiddleware)
+    app.include_router(metrics_router)
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: int):
+        # Sync endpoint: runs in the threadpool, like most DB-backed routes
+        db.execute_read("SELECT 1")
+        db.execute_read("SELECT 2")
+        if item_id == 0:
+            raise HTTPException(status_code=404, detail="missing")
+        return {"item_id": item_id}
+
+    @app.get("/ask")
+    async def ask():
+        async with track_llm_call():
+            pass
+        return {"answer": 42}
+
+    return TestClient(app)
+
+
+class TestLatencyHistogram:
+    """Test suite for LatencyHistogram."""
+
+    def test_quantiles_within_relative_precision(self):
+        """Quantiles stay within the configured relative error."""
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(-3, 1) for _ in range(5000))
+        histogram = LatencyHistogram(precision=0.02)
+        for value in values:
+            histogram.record(value)
+
+        for q in (0.5, 0.95, 0.99):
+            exact = values[int(q * len(values)) - 1]
+            assert histogram.quantile(q) == pytest.approx(exact, rel=0.03)
+        assert histogram.count == 5000
+        assert histogram.quantile(1.0) == max(values)
+        assert len(histogram.counts) < 600
+
+    def test_empty_histogram(self):
+        assert LatencyHistogram().quantile(0.99) == 0.0
+        assert LatencyHistogram().mean == 0.0
+
+
+class TestRequestMetricsMiddleware:
+    """Test suite for RequestMetricsMiddleware and /metrics."""
+
+    def test_records_route_templates_status_and_db_work(self, client, registry):
+        """Requests are grouped by route template with DB queries attributed."""
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/items/0")
+        client.get("/nope")
+
+        snapshot = registry.snapshot()
+        route = snapshot["routes"]["GET /items/{item_id}"]
+        assert route["requests"] == 3
+        assert route["db_queries_per_request"] == 2
+        assert registry.routes[("GET", "/items/{item_id}")].statuses == {200: 2, 404: 1}
+        assert "GET unmatched" in snapshot["routes"]
+        assert snapshot["in_flight_requests"] == 0
+        assert snapshot["p99_response_time"] > 0
+
+    def test_attributes_llm_time(self, client, registry):
+        client.get("/ask")
+
+        assert registry.llm_calls == 1
+        assert registry.routes[("GET", "/ask")].llm_calls == 1
+
+    def test_prometheus_exposition(self, client):
+        """/metrics renders counters and cumulative histogram buckets."""
+        client.get("/items/1")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        assert 'http_requests_total{method="GET",route="/items/{item_id}",status="200"} 1' in body
+        assert (
+            'http_request_duration_seconds_bucket{method="GET",route="/items/{item_id}",le="+Inf"} 1'
+            in body
+        )
+        assert 'http_request_db_queries_total{method="GET",route="/items/{item_id}"} 2' in body
+        assert "# TYPE http_requests_in_flight gauge" in body
+
+
+class TestPerformanceService:
+    """Test suite for PerformanceService metrics reporting."""
+
+    @pytest.mark.asyncio
+    async def test_metrics_reflect_tracked_requests(self, registry):
+        service = PerformanceService(registry)
+        await service.track_request("/api/v1/tasks", 0.1, cached=True)
+        await service.track_request("/api/v1/tasks", 0.3)
+
+        metrics = await service.get_metrics()
+
+        assert metrics["total_requests"] == 2
+        assert metrics["average_response_time"] == pytest.approx(0.2)
+        assert metrics["cache_hit_ratio"] == 0.5
+        assert metrics["p99_response_time"] == pytest.approx(0.3, rel=0.02)
+        assert metrics["health_status"] == "healthy"
+
+        await service.reset()
+        assert (await service.get_metrics())["total_requests"] == 0
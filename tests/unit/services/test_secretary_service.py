@@ -0,0 +1,198 @@
+"""Unit tests for SecretaryService."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.database.enhanced_adapter import EnhancedDatabaseAdapter
+from src.services.secretary_service import SecretaryService
+
+NOW = datetime.now(UTC)
+
+
+@pytest.fixture
+def owners(test_db):
+    """Users u1 and u2 and project p, which the tasks below belong to"""
+    conn = test_db.get_connection()
+    for user_id in ("u1", "u2"):
+        conn.execute(
+            "INSERT INTO users (user_id, username, email) VALUES (?, ?, ?)",
+            (user_id, user_id, f"{user_id}@example.com"),
+        )
+    conn.execute("INSERT INTO projects (project_id, name, description) VALUES ('p', 'P', '')")
+    conn.commit()
+
+
+@pytest.fixture
+def service(test_db, owners):
+    return SecretaryService(test_db)
+
+
+def add_task(
+    db: EnhancedDatabaseAdapter,
+    task_id: str,
+    priority: str = "medium",
+    due_in: timedelta | None = None,
+    status: str = "todo",
+    user_id: str = "u1",
+    completed_at: datetime | None = None,
+) -> None:
+    """Insert a task due due_in from now (naive UTC, as some writers store it)"""
+    due_date = (NOW + due_in).replace(tzinfo=None).isoformat() if due_in is not None else None
+    db.execute_write(
+        """
+        INSERT INTO tasks (task_id, title, description, project_id, assignee_id,
+                           status, priority, due_date, completed_at)
+        VALUES (?, ?, '', 'p', ?, ?, ?, ?, ?)
+        """,
+        (
+            task_id,
+            task_id,
+            user_id,
+            status,
+            priority,
+            due_date,
+            completed_at.isoformat() if completed_at else None,
+        ),
+    )
+
+
+def ids(tasks):
+    return [t["id"] for t in tasks]
+
+
+class TestDashboard:
+    def test_categories_and_stats(self, test_db, service):
+        add_task(test_db, "main", "high", timedelta(days=1))
+        add_task(test_db, "urgent", "low", timedelta(hours=-3))
+        add_task(test_db, "important", "critical", timedelta(days=10))
+        add_task(test_db, "week", "medium", timedelta(days=5))
+        add_task(test_db, "later", "low", timedelta(days=20))
+        add_task(test_db, "done", "high", timedelta(days=1), status="completed")
+        add_task(test_db, "other_user", "high", timedelta(days=1), user_id="u2")
+
+        dashboard = service.get_secretary_dashboard("u1")
+
+        categories = dashboard["categories"]
+        assert ids(categories["main_priority"]) == ["main"]
+        assert ids(categories["urgent_tasks"]) == ["urgent"]
+        assert ids(categories["important_tasks"]) == ["important"]
+        assert ids(categories["this_week"]) == ["week"]
+        assert dashboard["stats"] == {
+            "total_tasks": 6,
+            "active_tasks": 5,
+            "completed_tasks": 1,
+            "overdue_tasks": 1,
+            "main_priority_count": 1,
+            "urgent_count": 1,
+            "important_count": 1,
+        }
+        assert [(d["task_id"], d["days_until_due"]) for d in dashboard["upcoming_deadlines"]] == [
+            ("main", 0),
+            ("week", 4),
+        ]
+
+    def test_counts_every_task_not_one_page(self, test_db, service):
+        for i in range(60):
+            add_task(test_db, f"t{i}", "high", timedelta(days=1))
+
+        dashboard = service.get_secretary_dashboard("u1")
+
+        assert dashboard["stats"]["total_tasks"] == 60
+        assert len(dashboard["categories"]["main_priority"]) == 60
+
+    def test_without_user_includes_all_tasks(self, test_db, service):
+        add_task(test_db, "a", "high", timedelta(days=1))
+        add_task(test_db, "b", "high", timedelta(days=1), user_id="u2")
+
+        assert service.get_secretary_dashboard()["stats"]["total_tasks"] == 2
+
+
+class TestPriorityMatrix:
+    def test_quadrants(self, test_db, service):
+        add_task(test_db, "do_first", "high", timedelta(days=2))
+        add_task(test_db, "schedule", "critical", timedelta(days=5))
+        add_task(test_db, "delegate", "low", timedelta(days=1))
+        add_task(test_db, "eliminate", "medium")
+        add_task(test_db, "done", "high", timedelta(days=1), status="completed")
+
+        result = service.get_priority_matrix("u1")
+
+        assert {q: ids(tasks) for q, tasks in result["matrix"].items()} == {
+            "do_first": ["do_first"],
+            "schedule": ["schedule"],
+            "delegate": ["delegate"],
+            "eliminate": ["eliminate"],
+        }
+        assert result["stats"]["total_active"] == 4
+
+
+class TestDailyBriefing:
+    def test_briefing(self, test_db, service):
+        add_task(test_db, "overdue", "low", timedelta(days=-2))
+        add_task(test_db, "tomorrow_high", "high", timedelta(days=1))
+        add_task(test_db, "done_today", status="completed", completed_at=NOW)
+        add_task(test_db, "done_earlier", status="completed", completed_at=NOW - timedelta(days=3))
+
+        briefing = service.get_daily_briefing("u1", "evening")
+
+        assert briefing["time_of_day"] == "evening"
+        assert ids(briefing["completed_today"]) == ["done_today"]
+        assert ids(briefing["upcoming_tasks"]) == ["tomorrow_high"]
+        assert briefing["stats"]["overdue_tasks"] == 1
+        assert briefing["stats"]["urgent_tasks"] == 1
+        assert [a["type"] for a in briefing["alerts"]] == ["overdue", "urgent"]
+
+
+class TestPrioritySuggestions:
+    def test_raise_due_soon_then_lower_undated(self, test_db, service):
+        add_task(test_db, "undated_high", "high")
+        add_task(test_db, "due_soon", "low", timedelta(hours=30))
+        add_task(test_db, "due_later", "low", timedelta(days=5))
+
+        suggestions = service.suggest_priority_changes("u1")
+
+        assert [(s["task_id"], s["suggested_priority"]) for s in suggestions] == [
+            ("due_soon", "high"),
+            ("undated_high", "medium"),
+        ]
+        assert suggestions[0]["reason"] == "Task is due in 1 day(s)"
+
+
+class TestCaching:
+    def test_views_are_cached_until_a_task_changes(self, test_db, service):
+        add_task(test_db, "a", "high", timedelta(days=1))
+        first = service.get_secretary_dashboard("u1")
+
+        assert service.get_secretary_dashboard("u1") is first
+
+        test_db.execute_write("UPDATE tasks SET status = 'completed' WHERE task_id = 'a'")
+        refreshed = service.get_secretary_dashboard("u1")
+
+        assert refreshed is not first
+        assert refreshed["stats"]["completed_tasks"] == 1
+
+    def test_other_users_changes_keep_cache(self, test_db, service):
+        add_task(test_db, "a", "high", timedelta(days=1))
+        first = service.get_priority_matrix("u1")
+
+        add_task(test_db, "b", "high", timedelta(days=1), user_id="u2")
+
+        assert service.get_priority_matrix("u1") is first
+        assert service.get_priority_matrix()["stats"]["total_active"] == 2
+
+    def test_reassignment_invalidates_both_users(self, test_db, service):
+        add_task(test_db, "a", "high", timedelta(days=1))
+        service.get_priority_matrix("u1")
+        service.get_priority_matrix("u2")
+
+        test_db.execute_write("UPDATE tasks SET assignee_id = 'u2' WHERE task_id = 'a'")
+
+        assert service.get_priority_matrix("u1")["stats"]["total_active"] == 0
+        assert service.get_priority_matrix("u2")["stats"]["total_active"] == 1
+
+    def test_views_expire(self, test_db, owners):
+        service = SecretaryService(test_db, max_age_seconds=0)
+        first = service.suggest_priority_changes("u1")
+
+        assert service.suggest_priority_changes("u1") is not first
@@ -0,0 +1,214 @@
+"""Unit tests for the background job engine (BackgroundTaskQueue)."""
+
+import asyncio
+
+import pytest
+
+from src.services.task_queue_service import (
+    BackgroundTaskQueue,
+    Job,
+    JobStatus,
+    SQLiteJobStore,
+)
+
+
+@pytest.fixture
+async def store(tmp_path):
+    """File-backed SQLite job store in a temp directory."""
+    job_store = SQLiteJobStore(str(tmp_path / "jobs.db"))
+    yield job_store
+    await job_store.close()
+
+
+@pytest.fixture
+async def queue(store):
+    """Job engine with fast polling and near-zero backoff for tests."""
+    engine = BackgroundTaskQueue(store, concurrency=2, poll_interval=0.02, backoff_base=0.01)
+    yield engine
+    await engine.stop()
+
+
+class TestBackgroundTaskQueue:
+    """Test suite for BackgroundTaskQueue."""
+
+    @pytest.mark.asyncio
+    async def test_runs_registered_handler(self, queue):
+        """Enqueued jobs run through their handler and store the result."""
+        queue.register("double", lambda payload: payload["n"] * 2)
+        await queue.start()
+
+        job = await queue.enqueue("double", {"n": 21})
+        await queue.wait_idle(timeout=5)
+
+        stored = await queue.get_job(job.job_id)
+        assert stored.status == JobStatus.SUCCEEDED
+        assert stored.result == 42
+
+    @pytest.mark.asyncio
+    async def test_higher_priority_runs_first(self, store):
+        """Pending jobs are claimed highest priority first, FIFO within a priority."""
+        order = []
+        queue = BackgroundTaskQueue(store, concurrency=1, poll_interval=0.02)
+
+        async def record(payload):
+            order.append(payload["name"])
+
+        queue.register("record", record)
+        await queue.enqueue("record", {"name": "low"}, priority=1)
+        await queue.enqueue("record", {"name": "high-1"}, priority=9)
+        await queue.enqueue("record", {"name": "high-2"}, priority=9)
+
+        await queue.start()
+        await queue.wait_idle(timeout=5)
+        await queue.stop()
+
+        assert order == ["high-1", "high-2", "low"]
+
+    @pytest.mark.asyncio
+    async def test_retries_then_succeeds(self, queue):
+        """Transient failures are retried with backoff."""
+        calls = {"count": 0}
+
+        async def flaky(payload):
+            calls["count"] += 1
+            if calls["count"] < 3:
+                raise RuntimeError("temporary outage")
+            return "ok"
+
+        queue.register("flaky", flaky)
+        await queue.start()
+
+        job = await queue.enqueue("flaky", max_attempts=3)
+        for _ in range(100):
+            stored = await queue.get_job(job.job_id)
+            if stored.status == JobStatus.SUCCEEDED:
+                break
+            await asyncio.sleep(0.02)
+
+        assert stored.status == JobStatus.SUCCEEDED
+        assert stored.attempts == 3
+        metrics = await queue.get_metrics()
+        assert metrics["queues"]["default"]["retried"] == 2
+
+    @pytest.mark.asyncio
+    async def test_exhausted_job_goes_to_dead_letter(self, queue):
+        """Jobs that keep failing land in the dead-letter table and can be requeued."""
+
+        async def broken(payload):
+            raise ValueError("bad payload")
+
+        queue.register("broken", broken)
+        await queue.start()
+
+        job = await queue.enqueue("broken", {"id": 1}, max_attempts=2)
+        for _ in range(100):
+            if (await queue.get_job(job.job_id)).status == JobStatus.DEAD:
+                break
+            await asyncio.sleep(0.02)
+
+        dead = await queue.list_dead_letters()
+        assert [d.job_id for d in dead] == [job.job_id]
+        assert "bad payload" in dead[0].last_error
+
+        requeued = await queue.retry_dead_letter(job.job_id)
+        assert requeued.status == JobStatus.PENDING
+        assert requeued.attempts == 0
+
+    @pytest.mark.asyncio
+    async def test_idempotency_key_deduplicates(self, queue):
+        """Repeating an enqueue with the same idempotency key returns the original job."""
+        first = await queue.enqueue("noop", idempotency_key="sync:user-1:2024-01-01")
+        second = await queue.enqueue("noop", idempotency_key="sync:user-1:2024-01-01")
+
+        assert first.job_id == second.job_id
+        metrics = await queue.get_metrics()
+        assert metrics["total_enqueued"] == 1
+
+    @pytest.mark.asyncio
+    async def test_jobs_survive_restart(self, tmp_path):
+        """Pending jobs persist in SQLite and run after a new engine starts."""
+        db_path = str(tmp_path / "durable.db")
+        job = await BackgroundTaskQueue(SQLiteJobStore(db_path)).enqueue("echo", {"v": 1})
+
+        results = []
+        restarted = BackgroundTaskQueue(SQLiteJobStore(db_path), poll_interval=0.02)
+        restarted.register("echo", lambda payload: results.append(payload["v"]))
+        await restarted.start()
+        await restarted.wait_idle(timeout=5)
+        await restarted.stop()
+
+        assert results == [1]
+        assert (await restarted.get_job(job.job_id)).status == JobStatus.SUCCEEDED
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_reclaimed(self, store):
+        """A job left running by a crashed worker is released on startup."""
+        queue = BackgroundTaskQueue(store, poll_interval=0.02)
+        job = await queue.enqueue("echo")
+        await store.claim("default", lease_seconds=-1)  # Simulate a worker that died
+
+        queue.register("echo", lambda payload: "recovered")
+        await queue.start()
+        await queue.wait_idle(timeout=5)
+        await queue.stop()
+
+        assert (await queue.get_job(job.job_id)).result == "recovered"
+
+    @pytest.mark.asyncio
+    async def test_long_running_job_keeps_its_lease(self, store):
+        """The lease is renewed while the handler runs, so the reaper does not rerun the job."""
+        runs = []
+        queue = BackgroundTaskQueue(store, poll_interval=0.02, lease_seconds=0.3)
+
+        async def slow(payload):
+            runs.append(1)
+            await asyncio.sleep(0.5)
+            return "done"
+
+        queue.register("slow", slow)
+        job = await queue.enqueue("slow")
+        await queue.start()
+        await asyncio.sleep(0.35)  # Past the original lease
+        assert await store.release_expired() == 0
+        await queue.wait_idle(timeout=5)
+        await queue.stop()
+
+        assert len(runs) == 1
+        assert (await queue.get_job(job.job_id)).result == "done"
+
+    @pytest.mark.asyncio
+    async def test_stale_worker_cannot_overwrite_newer_attempt(self, store):
+        """Outcome writes are discarded once the worker's lease was released and reclaimed."""
+        await store.enqueue(Job(job_type="echo"))
+        stale = await store.claim("default", lease_seconds=-1)
+        await store.release_expired()
+        current = await store.claim("default", lease_seconds=60)
+
+        assert not await store.renew(stale, 60)
+        assert not await store.complete(stale, "stale")
+        assert not await store.retry(stale, 0, "stale")
+        assert not await store.dead_letter(stale, "stale")
+        assert await store.complete(current, "fresh")
+
+        stored = await store.get(current.job_id)
+        assert (stored.status, stored.result, stored.attempts) == (JobStatus.SUCCEEDED, "fresh", 2)
+        assert await store.list_dead_letters() == []
+
+    @pytest.mark.asyncio
+    async def test_missing_handler_dead_letters_immediately(self, queue):
+        """Unknown job types are not retried."""
+        await queue.start()
+        job = await queue.enqueue("does.not.exist", max_attempts=5)
+        await queue.wait_idle(timeout=5)
+
+        stored = await queue.get_job(job.job_id)
+        assert stored.status == JobStatus.DEAD
+        assert stored.attempts == 1
+
+    def test_backoff_grows_exponentially_with_jitter(self):
+        """Backoff stays within [ceiling/2, ceiling] and is capped."""
+        queue = BackgroundTaskQueue(backoff_base=1.0, backoff_max=10.0)
+
+        assert 0.5 <= queue._backoff(1) <= 1.0
+        assert 4.0 <= queue._backoff(4) <= 8.0
+        assert 5.0 <= queue._backoff(10) <= 10.0
@@ -1,21 +1,28 @@
 """Unit tests for StatisticsService."""
 
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 
 import pytest
 
+from src.database.enhanced_adapter import EnhancedDatabaseAdapter
 from src.services.task_statistics_service import StatisticsService
+from tests.unit.services.conftest import add_task, complete_task
 
 
 class TestStatisticsService:
     """Test suite for StatisticsService."""
 
     @pytest.fixture
-    def service(self):
-        """Create a fresh StatisticsService instance for each test."""
-        svc = StatisticsService()
-        svc._clear_data()
-        return svc
+    def db(self, tmp_path):
+        """Create a fresh database for each test."""
+        adapter = EnhancedDatabaseAdapter(str(tmp_path / "stats.db"))
+        yield adapter
+        adapter.close_connection()
+
+    @pytest.fixture
+    def service(self, db):
+        """Create a StatisticsService on the test database."""
+        return StatisticsService(db)
 
     @pytest.mark.asyncio
     async def test_get_user_statistics_with_no_tasks(self, service):
@@ -31,10 +38,10 @@ class TestStatisticsService:
         assert stats["streak_days"] == 0
 
     @pytest.mark.asyncio
-    async def test_get_user_statistics_with_tasks_no_completions(self, service):
+    async def test_get_user_statistics_with_tasks_no_completions(self, db, service):
         """Test statistics for user with tasks but no completions."""
-        service._add_task("user_1", {"id": "task_1", "title": "Task 1"})
-        service._add_task("user_1", {"id": "task_2", "title": "Task 2"})
+        add_task(db, "user_1", "task_1")
+        add_task(db, "user_1", "task_2")
 
         stats = await service.get_user_statistics("user_1")
 
@@ -44,26 +51,12 @@ class TestStatisticsService:
         assert stats["streak_days"] == 0
 
     @pytest.mark.asyncio
-    async def test_get_user_statistics_with_full_completion(self, service):
+    async def test_get_user_statistics_with_full_completion(self, db, service):
         """Test statistics for user with 100% completion rate."""
-        # Add 3 tasks
-        service._add_task("user_2", {"id": "task_1"})
-        service._add_task("user_2", {"id": "task_2"})
-        service._add_task("user_2", {"id": "task_3"})
-
-        # Add 3 completions
-        service._add_completion(
-            "user_2",
-            {"task_id": "task_1", "completion_time_minutes": 20, "completed_at": datetime.now()},
-        )
-        service._add_completion(
-            "user_2",
-            {"task_id": "task_2", "completion_time_minutes": 30, "completed_at": datetime.now()},
-        )
-        service._add_completion(
-            "user_2",
-            {"task_id": "task_3", "completion_time_minutes": 25, "completed_at": datetime.now()},
-        )
+        now = datetime.now(UTC)
+        add_task(db, "user_2", "task_1", completed_at=now, completion_time_minutes=20)
+        add_task(db, "user_2", "task_2", completed_at=now, completion_time_minutes=30)
+        add_task(db, "user_2", "task_3", completed_at=now, completion_time_minutes=25)
 
         stats = await service.get_user_statistics("user_2")
 
@@ -74,21 +67,16 @@ class TestStatisticsService:
         assert stats["streak_days"] == 1  # All completed today
 
     @pytest.mark.asyncio
-    async def test_get_user_statistics_with_partial_completion(self, service):
+    async def test_get_user_statistics_with_partial_completion(self, db, service):
         """Test statistics for user with partial completion."""
-        # Add 5 tasks
+        # Add 5 tasks, complete 3
         for i in range(5):
-            service._add_task("user_3", {"id": f"task_{i}"})
-
-        # Complete 3 tasks
+            add_task(db, "user_3", f"task_{i}")
         for i in range(3):
-            service._add_completion(
-                "user_3",
-                {
-                    "task_id": f"task_{i}",
-                    "completion_time_minutes": 30,
-                    "completed_at": datetime.now(),
-                },
+            db.execute_write(
+                "UPDATE tasks SET status = 'completed', completed_at = ?, actual_hours = 0.5 "
+                "WHERE task_id = ?",
+                (datetime.now(UTC).isoformat(), f"task_{i}"),
             )
 
         stats = await service.get_user_statistics("user_3")
@@ -108,14 +96,9 @@ class TestStatisticsService:
             await service.get_user_statistics(None)
 
     @pytest.mark.asyncio
-    async def test_get_productivity_score_returns_correct_value(self, service):
+    async def test_get_productivity_score_returns_correct_value(self, db, service):
         """Test that productivity score endpoint returns correct score."""
-        # Add tasks and completions
-        service._add_task("user_4", {"id": "task_1"})
-        service._add_completion(
-            "user_4",
-            {"task_id": "task_1", "completion_time_minutes": 30, "completed_at": datetime.now()},
-        )
+        add_task(db, "user_4", "task_1", datetime.now(UTC), completion_time_minutes=30)
 
         score = await service.get_productivity_score("user_4")
 
@@ -128,49 +111,144 @@ class TestStatisticsService:
         with pytest.raises(ValueError, match="Invalid user_id"):
             await service.get_productivity_score("")
 
-    def test_calculate_streak_with_no_completions(self, service):
-        """Test streak calculation with no completions."""
-        streak = service._calculate_streak([])
-        assert streak == 0
-
-    def test_calculate_streak_with_consecutive_days(self, service):
+    @pytest.mark.asyncio
+    async def test_streak_with_consecutive_days(self, db, service):
         """Test streak calculation with consecutive days."""
-        today = datetime.now()
-        completions = [
-            {"completed_at": today},
-            {"completed_at": today - timedelta(days=1)},
-            {"completed_at": today - timedelta(days=2)},
-        ]
+        today = datetime.now(UTC)
+        for i in range(3):
+            add_task(db, "user_5", f"task_{i}", today - timedelta(days=2 - i))
+
+        stats = await service.get_user_statistics("user_5")
 
-        streak = service._calculate_streak(completions)
-        assert streak == 3
+        assert stats["streak_days"] == 3
 
-    def test_calculate_streak_with_gap(self, service):
+    @pytest.mark.asyncio
+    async def test_streak_with_gap(self, db, service):
         """Test streak calculation with gap in days."""
-        today = datetime.now()
-        completions = [
-            {"completed_at": today},
-            {"completed_at": today - timedelta(days=3)},  # Gap here
-        ]
+        today = datetime.now(UTC)
+        add_task(db, "user_6", "task_1", today - timedelta(days=3))
+        add_task(db, "user_6", "task_2", today)  # Gap before this
 
-        streak = service._calculate_streak(completions)
-        assert streak == 1  # Only today counts
+        stats = await service.get_user_statistics("user_6")
 
-    def test_calculate_streak_multiple_completions_same_day(self, service):
+        assert stats["streak_days"] == 1  # Only today counts
+
+    @pytest.mark.asyncio
+    async def test_streak_counts_days_not_completions(self, db, service):
         """Test streak counts days, not individual completions."""
-        today = datetime.now()
-        completions = [
-            {"completed_at": today},
-            {"completed_at": today},  # Same day
-            {"completed_at": today},  # Same day
-        ]
+        today = datetime.now(UTC)
+        for i in range(3):
+            add_task(db, "user_7", f"task_{i}", today)
+
+        stats = await service.get_user_statistics("user_7")
+
+        assert stats["streak_days"] == 1
+
+    @pytest.mark.asyncio
+    async def test_streak_ended_before_today_is_zero(self, db, service):
+        """Test a streak that doesn't reach today no longer counts."""
+        yesterday = datetime.now(UTC) - timedelta(days=1)
+        add_task(db, "user_8", "task_1", yesterday)
+
+        stats = await service.get_user_statistics("user_8")
+
+        assert stats["streak_days"] == 0
+
+    @pytest.mark.asyncio
+    async def test_late_completion_bridging_a_gap_is_recounted(self, db, service):
+        """Test a completion recorded for an earlier day repairs the streak."""
+        today = datetime.now(UTC)
+        add_task(db, "user_9", "task_1", today - timedelta(days=2))
+        add_task(db, "user_9", "task_2", today)
+        add_task(db, "user_9", "task_3")
+        assert (await service.get_user_statistics("user_9"))["streak_days"] == 1
+
+        complete_task(db, "task_3", today - timedelta(days=1))
+        stats = await service.get_user_statistics("user_9")
+
+        assert stats["streak_days"] == 3
+        assert stats["completed_tasks"] == 3
+
+    @pytest.mark.asyncio
+    async def test_reopening_and_deleting_tasks_updates_rollups(self, db, service):
+        """Test un-completing and deleting tasks remove their contribution."""
+        now = datetime.now(UTC)
+        add_task(db, "user_10", "task_1", now, completion_time_minutes=10)
+        add_task(db, "user_10", "task_2", now, completion_time_minutes=50)
+
+        db.execute_write("UPDATE tasks SET status = 'todo' WHERE task_id = 'task_1'")
+        db.execute_write("DELETE FROM tasks WHERE task_id = 'task_2'")
+        stats = await service.get_user_statistics("user_10")
+
+        assert stats["total_tasks"] == 1
+        assert stats["completed_tasks"] == 0
+        assert stats["avg_completion_time_minutes"] == 0.0
+        assert stats["streak_days"] == 0
+
+    @pytest.mark.asyncio
+    async def test_reassigned_task_moves_between_users(self, db, service):
+        """Test changing the assignee moves the task's counts."""
+        add_task(db, "user_a", "task_1", datetime.now(UTC))
+        add_task(db, "user_b", "task_2")
+
+        db.execute_write("UPDATE tasks SET assignee_id = 'user_b' WHERE task_id = 'task_1'")
+
+        assert (await service.get_user_statistics("user_a"))["total_tasks"] == 0
+        stats_b = await service.get_user_statistics("user_b")
+        assert (stats_b["total_tasks"], stats_b["completed_tasks"]) == (2, 1)
+
+    @pytest.mark.asyncio
+    async def test_focus_sessions_are_rolled_up(self, db, service):
+        """Test completed focus sessions count towards focus totals."""
+        add_task(db, "user_11", "task_1")
+        for session_id, minutes, completed in [("s1", 25, 1), ("s2", 50, 1), ("s3", 25, 0)]:
+            db.execute_write(
+                """
+                INSERT INTO focus_sessions (session_id, user_id, planned_duration_minutes,
+                                            actual_duration_minutes, was_completed)
+                VALUES (?, 'user_11', 25, ?, ?)
+                """,
+                (session_id, minutes, completed),
+            )
+        db.execute_write("UPDATE focus_sessions SET was_completed = 1 WHERE session_id = 's3'")
+
+        stats = await service.get_user_statistics("user_11")
+
+        assert stats["total_focus_minutes"] == 100
+        assert stats["focus_sessions_completed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_rebuild_matches_incremental_rollups(self, db, service):
+        """Test rebuilding from raw tables reproduces the trigger-maintained rollups."""
+        today = datetime.now(UTC)
+        for i in range(6):
+            add_task(db, "user_12", f"task_{i}", today - timedelta(days=i % 3) if i % 2 else None)
+        add_task(db, "user_13", "task_x", today, completion_time_minutes=40)
+        before = [await service.get_user_statistics(u) for u in ("user_12", "user_13")]
+        daily = service.get_daily_stats("user_12", (today - timedelta(days=7)).date(), today.date())
+
+        assert service.rebuild() == 2
+        assert [await service.get_user_statistics(u) for u in ("user_12", "user_13")] == before
+        assert (
+            service.get_daily_stats("user_12", (today - timedelta(days=7)).date(), today.date())
+            == daily
+        )
+
+    @pytest.mark.asyncio
+    async def test_existing_tasks_are_backfilled_on_install(self, tmp_path):
+        """Test rollups are backfilled from tasks written before the service existed."""
+        db = EnhancedDatabaseAdapter(str(tmp_path / "legacy.db"))
+        add_task(db, "user_14", "task_1", datetime.now(UTC), completion_time_minutes=30)
+        add_task(db, "user_14", "task_2")
+
+        stats = await StatisticsService(db).get_user_statistics("user_14")
 
-        streak = service._calculate_streak(completions)
-        assert streak == 1  # Only one day
+        assert (stats["total_tasks"], stats["completed_tasks"], stats["streak_days"]) == (2, 1, 1)
+        db.close_connection()
 
     def test_calculate_productivity_score_perfect_conditions(self, service):
         """Test productivity score with ideal conditions."""
-        score = service._calculate_productivity_score(
+        score = service.calculate_productivity_score(
             completion_rate=100.0,
             avg_completion_time=30.0,  # Optimal time
             streak_days=30,  # Max streak score
@@ -181,7 +259,7 @@ class TestStatisticsService:
 
     def test_calculate_productivity_score_zero_activity(self, service):
         """Test productivity score with no activity."""
-        score = service._calculate_productivity_score(
+        score = service.calculate_productivity_score(
             completion_rate=0.0, avg_completion_time=0.0, streak_days=0, total_completed=0
         )
 
@@ -190,7 +268,7 @@ class TestStatisticsService:
     def test_calculate_productivity_score_boundaries(self, service):
         """Test productivity score stays within 0-100 bounds."""
         # Test with extreme values
-        score = service._calculate_productivity_score(
+        score = service.calculate_productivity_score(
             completion_rate=100.0,
             avg_completion_time=1.0,  # Very fast
             streak_days=365,  # Very long streak
@@ -202,14 +280,14 @@ class TestStatisticsService:
     def test_calculate_productivity_score_slow_completion(self, service):
         """Test productivity score with slow task completion."""
         # Slow completion should reduce velocity score
-        score_slow = service._calculate_productivity_score(
+        score_slow = service.calculate_productivity_score(
             completion_rate=100.0,
             avg_completion_time=120.0,  # 2 hours per task
             streak_days=0,
             total_completed=10,
         )
 
-        score_fast = service._calculate_productivity_score(
+        score_fast = service.calculate_productivity_score(
             completion_rate=100.0,
             avg_completion_time=30.0,  # Optimal
             streak_days=0,
@@ -221,7 +299,7 @@ class TestStatisticsService:
     def test_calculate_productivity_score_components_weighted(self, service):
         """Test that productivity score components have correct weights."""
         # Test completion rate weight (40%)
-        score_high_completion = service._calculate_productivity_score(
+        score_high_completion = service.calculate_productivity_score(
             completion_rate=100.0, avg_completion_time=0.0, streak_days=0, total_completed=0
         )
 
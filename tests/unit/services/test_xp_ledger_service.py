@@ -0,0 +1,181 @@
+"""Unit tests for XPLedgerService."""
+
+import sqlite3
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src.core.progression import level_for_xp
+from src.database.enhanced_adapter import EnhancedDatabaseAdapter
+from src.services.xp_ledger_service import XPLedgerService
+
+
+@pytest.fixture
+def ledger(test_db):
+    return XPLedgerService(test_db)
+
+
+def balance_row(db, user_id="u1"):
+    rows = db.execute_read(
+        "SELECT total_xp, current_level FROM user_progress WHERE user_id = ?", (user_id,)
+    )
+    return (rows[0]["total_xp"], rows[0]["current_level"]) if rows else None
+
+
+def ledger_count(db, user_id="u1"):
+    return db.execute_read("SELECT COUNT(*) AS n FROM xp_ledger WHERE user_id = ?", (user_id,))[0][
+        "n"
+    ]
+
+
+class TestLevels:
+    @pytest.mark.parametrize("total_xp", [1, 99, 100, 381, 382, 5000])
+    def test_level_column_matches_shared_curve(self, test_db, ledger, total_xp):
+        ledger.award("u1", total_xp, source="task")
+
+        assert balance_row(test_db) == (total_xp, level_for_xp(total_xp))
+
+
+class TestAward:
+    def test_award_updates_balance_and_level(self, test_db, ledger):
+        first = ledger.award("u1", 90, source="task")
+        second = ledger.award("u1", 20, source="task")
+
+        assert (first.total_xp, first.level, first.leveled_up) == (90, 1, False)
+        assert (second.total_xp, second.level, second.previous_level) == (110, 2, 1)
+        assert second.leveled_up
+        assert balance_row(test_db) == (110, 2)
+        assert ledger_count(test_db) == 2
+
+    def test_award_adds_to_existing_progress(self, test_db, ledger):
+        test_db.execute_write(
+            "INSERT INTO user_progress (user_id, total_xp, current_level, current_streak) "
+            "VALUES ('u1', 380, 2, 4)"
+        )
+
+        award = ledger.award("u1", 5, source="pomodoro")
+
+        assert (award.total_xp, award.level) == (385, 3)
+        rows = test_db.execute_read("SELECT current_streak FROM user_progress WHERE user_id = 'u1'")
+        assert rows[0]["current_streak"] == 4
+
+    def test_repeated_reference_is_ignored(self, test_db, ledger):
+        ledger.award("u1", 50, source="pomodoro", reference_id="s1")
+        repeat = ledger.award("u1", 50, source="pomodoro", reference_id="s1")
+
+        assert repeat.amount == 0
+        assert repeat.total_xp == 50
+        assert ledger_count(test_db) == 1
+
+        # The same entity may be awarded by another source
+        assert ledger.award("u1", 10, source="task", reference_id="s1").total_xp == 60
+
+    def test_awards_from_two_connections_are_not_lost(self, test_db, ledger):
+        other_db = EnhancedDatabaseAdapter(test_db.db_path)
+        other = XPLedgerService(other_db)
+
+        ledger.award("u1", 30, source="task")
+        other.award("u1", 40, source="task")
+        ledger.award("u1", 50, source="task")
+        other_db.close_connection()
+
+        assert balance_row(test_db) == (120, 2)
+
+    def test_notifies_leaderboard_and_achievements(self, test_db):
+        leaderboard, achievements = Mock(), Mock()
+        ledger = XPLedgerService(test_db, leaderboard=leaderboard, achievements=achievements)
+
+        ledger.award("u1", 25, source="task")
+
+        leaderboard.add_xp.assert_called_once_with("u1", 25)
+        achievements.record.assert_called_once_with("u1", "xp_awarded", {"amount": 25})
+
+    def test_rejects_non_positive_amounts(self, ledger):
+        with pytest.raises(ValueError):
+            ledger.award("u1", 0, source="task")
+
+
+class TestQueue:
+    def test_queued_awards_apply_in_one_batch(self, test_db):
+        achievements = Mock()
+        ledger = XPLedgerService(test_db, achievements=achievements)
+        for i in range(5):
+            ledger.queue("u1", 10, source="micro_step", reference_id=f"step-{i}")
+        ledger.queue("u2", 7, source="micro_step")
+
+        assert balance_row(test_db) is None
+        assert ledger.get_balance("u1")["total_xp"] == 50
+        assert ledger.get_balance("u1")["pending_xp"] == 50
+
+        results = {r.user_id: r for r in ledger.flush()}
+
+        assert results["u1"].amount == 50
+        assert balance_row(test_db) == (50, 1)
+        assert balance_row(test_db, "u2") == (7, 1)
+        assert ledger_count(test_db) == 5
+        # One notification per user and batch
+        assert achievements.record.call_count == 2
+
+    def test_batch_size_triggers_flush(self, test_db):
+        ledger = XPLedgerService(test_db, batch_size=3)
+        for _ in range(3):
+            ledger.queue("u1", 10, source="micro_step")
+
+        assert balance_row(test_db) == (30, 1)
+
+    def test_timer_applies_a_lone_queued_award(self, test_db):
+        ledger = XPLedgerService(test_db, flush_interval_seconds=0.05)
+        ledger.queue("u1", 10, source="micro_step")
+
+        deadline = time.monotonic() + 2
+        while balance_row(test_db) is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert balance_row(test_db) == (10, 1)
+        assert ledger.get_balance("u1")["pending_xp"] == 0
+
+    def test_award_applies_queued_awards(self, test_db, ledger):
+        ledger.queue("u1", 60, source="micro_step")
+
+        award = ledger.award("u1", 50, source="task")
+
+        assert (award.amount, award.total_xp, award.level) == (110, 110, 2)
+        assert ledger.get_balance("u1")["pending_xp"] == 0
+
+    def test_failed_flush_keeps_awards_queued(self, test_db, ledger):
+        conn = test_db.get_connection()
+        conn.execute(
+            "CREATE TEMP TRIGGER fail_award BEFORE INSERT ON xp_ledger "
+            "BEGIN SELECT RAISE(ABORT, 'database is locked'); END"
+        )
+        ledger.queue("u1", 10, source="micro_step")
+
+        with pytest.raises(sqlite3.DatabaseError):
+            ledger.award("u1", 50, source="task")
+        conn.execute("DROP TRIGGER fail_award")
+        ledger.queue("u1", 5, source="micro_step")
+
+        assert ledger.get_balance("u1")["pending_xp"] == 15
+        assert [r.amount for r in ledger.flush()] == [15]
+        assert balance_row(test_db) == (15, 1)
+
+
+class TestBalance:
+    def test_balance_without_progress(self, ledger):
+        balance = ledger.get_balance("nobody")
+
+        assert balance["total_xp"] == 0
+        assert balance["level"] == 1
+        assert (balance["level_floor_xp"], balance["next_level_xp"]) == (0, 100)
+
+    def test_history_newest_first(self, ledger):
+        ledger.award("u1", 10, source="task", reason="first")
+        ledger.award("u1", 20, source="pomodoro", reason="second")
+
+        history = ledger.history("u1")
+
+        assert [(e["amount"], e["source"], e["reason"]) for e in history] == [
+            (20, "pomodoro", "second"),
+            (10, "task", "first"),
+        ]
@@ -151,5 +151,19 @@ async def test_conversation_flow(temp_db):
     assert len(history) >= 6  # 3 user messages + 3 agent responses
 
 
+def test_agent_registry_constructs_agents_on_first_use(temp_db):
+    """Agents are built when first requested and then reused"""
+    registry = AgentRegistry(temp_db)
+
+    assert registry.agents == {}
+    assert registry.list_agents()["capture"] == "CaptureAgent"
+
+    agent = registry.get_agent("focus")
+    assert isinstance(agent, FocusAgent)
+    assert registry.get_agent("focus") is agent
+    assert list(registry.agents) == ["focus"]
+    assert registry.get_agent("unknown") is None
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
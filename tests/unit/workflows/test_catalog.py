@@ -0,0 +1,121 @@
+"""
+Tests for the compiled workflow catalog.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from src.workflows.catalog import WorkflowCatalog, get_workflow_catalog, rank_workflows
+from src.workflows.models import WorkflowType
+
+WORKFLOW_TOML = """
+workflow_id = "{workflow_id}"
+name = "{name}"
+description = "{description}"
+workflow_type = "{workflow_type}"
+tags = {tags}
+system_prompt = "You are a test assistant."
+user_prompt_template = "Steps for: {{task_title}}"
+"""
+
+
+def write_workflow(path: Path, workflow_id: str, workflow_type: str, tags: list[str], **kw):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        WORKFLOW_TOML.format(
+            workflow_id=workflow_id,
+            name=kw.get("name", workflow_id.replace("_", " ").title()),
+            description=kw.get("description", "A test workflow"),
+            workflow_type=workflow_type,
+            tags=str(tags).replace("'", '"'),
+        )
+    )
+    # Make every rewrite visible to the mtime check, even within one clock tick
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def workflows_dir(tmp_path: Path) -> Path:
+    root = tmp_path / "workflows"
+    write_workflow(root / "dev" / "api.toml", "api_tdd", "backend", ["backend", "api", "tdd"])
+    write_workflow(root / "dev" / "bug.toml", "bug_fix", "bugfix", ["bugfix", "debugging"])
+    write_workflow(
+        root / "personal" / "plan.toml",
+        "daily_plan",
+        "planning",
+        ["planning", "productivity"],
+        description="Plan your day with time blocking",
+    )
+    return root
+
+
+def test_indexes_by_type_tag_and_domain(workflows_dir: Path):
+    catalog = WorkflowCatalog(workflows_dir)
+
+    assert len(catalog) == 3
+    assert [w.workflow_id for w in catalog.list_workflows(WorkflowType.BUGFIX)] == ["bug_fix"]
+    assert [w.workflow_id for w in catalog.list_workflows(tag="API")] == ["api_tdd"]
+    assert [w.workflow_id for w in catalog.list_workflows(domain="personal")] == ["daily_plan"]
+    assert catalog.list_workflows(workflow_type=WorkflowType.BACKEND, tag="bugfix") == []
+    assert catalog.get("daily_plan").domain == "personal"
+
+
+def test_reloads_only_after_check_interval(workflows_dir: Path):
+    clock = FakeClock()
+    catalog = WorkflowCatalog(workflows_dir, check_interval=5, clock=clock)
+    write_workflow(workflows_dir / "dev" / "docs.toml", "docs", "documentation", ["docs"])
+
+    assert catalog.get("docs") is None
+
+    clock.now = 6
+    assert catalog.get("docs") is not None
+    assert catalog.reloads == 2
+
+
+def test_reload_reparses_changed_files_and_drops_removed(workflows_dir: Path):
+    catalog = WorkflowCatalog(workflows_dir, check_interval=0)
+    unchanged = catalog.get("api_tdd")
+
+    write_workflow(workflows_dir / "dev" / "bug.toml", "bug_fix", "bugfix", ["bugfix", "hotfix"])
+    (workflows_dir / "personal" / "plan.toml").unlink()
+
+    assert catalog.refresh()
+    assert catalog.get("bug_fix").tags == ["bugfix", "hotfix"]
+    assert catalog.get("daily_plan") is None
+    assert catalog.get("api_tdd") is unchanged
+    assert not catalog.refresh()
+
+
+def test_invalid_file_is_skipped(workflows_dir: Path):
+    (workflows_dir / "dev" / "broken.toml").write_text("workflow_id = ")
+
+    catalog = WorkflowCatalog(workflows_dir)
+
+    assert len(catalog) == 3
+
+
+def test_candidates_rank_by_task_keywords(workflows_dir: Path):
+    catalog = WorkflowCatalog(workflows_dir)
+
+    top = catalog.candidates("Fix crash bug", "debugging the login flow", limit=2)
+
+    assert top[0].workflow_id == "bug_fix"
+    assert len(top) == 2
+    assert rank_workflows("plan my day", catalog.workflows.values())[0].workflow_id == (
+        "daily_plan"
+    )
+
+
+def test_shared_catalog_per_directory(workflows_dir: Path):
+    assert get_workflow_catalog(workflows_dir) is get_workflow_catalog(workflows_dir / ".")
@@ -0,0 +1,156 @@
+"""
+Tests for cached, template-based and concurrent workflow step generation.
+"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from src.workflows.executor import WorkflowExecutor
+from src.workflows.models import WorkflowContext, WorkflowStep
+from src.workflows.step_cache import StepCache
+
+WORKFLOW_TOML = """
+workflow_id = "plan"
+name = "Plan"
+description = "Plan the day"
+workflow_type = "planning"
+default_icon = "📅"
+system_prompt = "You are a planner."
+user_prompt_template = "Plan: {task_title} at {user_energy_label} energy"
+
+[[step_templates]]
+title = "Brain dump for {task_title}"
+description = "List everything ({user_energy_label} energy, {unknown})"
+estimated_minutes = 10
+
+[[step_templates]]
+title = "Commit"
+icon = "✅"
+"""
+
+
+@pytest.fixture
+def executor(tmp_path: Path) -> WorkflowExecutor:
+    (tmp_path / "plan.toml").write_text(WORKFLOW_TOML)
+    return WorkflowExecutor(tmp_path)
+
+
+@pytest.fixture
+def calls(executor: WorkflowExecutor) -> list[str]:
+    """Replace the LLM call with a slow fake that records each generation"""
+    calls = []
+
+    async def fake_generate(workflow, context, llm_api_key=None):
+        calls.append(context.task_title)
+        await asyncio.sleep(0.05)
+        if context.task_title == "boom":
+            raise RuntimeError("LLM unavailable")
+        return [WorkflowStep(title=f"Do {context.task_title}", description="")]
+
+    executor._generate_steps = fake_generate
+    return calls
+
+
+def make_context(title: str = "Groceries", **kw) -> WorkflowContext:
+    return WorkflowContext(task_id="t-1", task_title=title, user_id="u-1", **kw)
+
+
+@pytest.mark.asyncio
+async def test_repeated_context_is_served_from_cache(executor, calls):
+    first = await executor.execute_workflow("plan", make_context())
+    second = await executor.execute_workflow("plan", make_context("  Groceries "))
+
+    assert calls == ["Groceries"]
+    assert not first.cache_hit and second.cache_hit
+    assert second.steps[0].title == first.steps[0].title
+    assert second.steps[0].step_id != first.steps[0].step_id
+
+
+@pytest.mark.asyncio
+async def test_cached_steps_are_independent_copies(executor, calls):
+    first = await executor.execute_workflow("plan", make_context())
+    executor.mark_step_complete(first, first.steps[0].step_id)
+
+    second = await executor.execute_workflow("plan", make_context())
+
+    assert second.steps[0].status == "pending"
+
+
+@pytest.mark.asyncio
+async def test_different_context_or_no_cache_regenerates(executor, calls):
+    await executor.execute_workflow("plan", make_context())
+    await executor.execute_workflow("plan", make_context(user_energy=3))
+    await executor.execute_workflow("plan", make_context(), use_cache=False)
+
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_executions_share_generation_and_overlap(executor, calls):
+    runs = [("plan", make_context()), ("plan", make_context()), ("plan", make_context("Gym"))]
+
+    start = asyncio.get_running_loop().time()
+    executions = await executor.execute_workflows(runs)
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert sorted(calls) == ["Groceries", "Gym"]
+    assert [e.status for e in executions] == ["completed"] * 3
+    assert executions[2].steps[0].title == "Do Gym"
+    assert elapsed < 0.1
+
+
+@pytest.mark.asyncio
+async def test_failed_run_is_reported_without_failing_batch(executor, calls):
+    executions = await executor.execute_workflows(
+        [("plan", make_context("boom")), ("plan", make_context()), ("missing", make_context())]
+    )
+
+    assert [e.status for e in executions] == ["failed", "completed", "failed"]
+    assert executions[0].error_message == "LLM unavailable"
+    assert "Workflow not found" in executions[2].error_message
+    assert executor.step_cache.stats()["entries"] == 1
+
+
+def test_step_templates_are_prerendered(executor):
+    workflow = executor.get_workflow("plan")
+
+    steps = executor.render_step_templates(
+        workflow, executor._template_vars(workflow, make_context())
+    )
+
+    assert steps[0].title == "Brain dump for Groceries"
+    assert steps[0].description == "List everything (Medium energy, {unknown})"
+    assert (steps[1].icon, steps[1].order) == ("✅", 1)
+    assert steps[0].icon == "📅"
+
+
+def test_ai_output_falls_back_to_template_fields(executor):
+    workflow = executor.get_workflow("plan")
+    templates = executor.render_step_templates(
+        workflow, executor._template_vars(workflow, make_context())
+    )
+
+    steps = executor._to_steps(
+        workflow, [{"title": "Dump groceries list", "estimated_minutes": None}, {}], templates
+    )
+
+    assert steps[0].title == "Dump groceries list"
+    assert steps[0].estimated_minutes == 10
+    assert steps[1].title == "Commit"
+
+
+def test_step_cache_expires_and_evicts():
+    now = [0.0]
+    cache = StepCache(max_entries=2, ttl=10, clock=lambda: now[0])
+    step = WorkflowStep(title="a", description="")
+    cache.put("w:1", [step])
+    cache.put("w:2", [step])
+    cache.get("w:1")
+    cache.put("w:3", [step])
+
+    assert cache.get("w:2") is None
+    assert cache.get("w:1") is not None
+    now[0] = 11
+    assert cache.get("w:1") is None